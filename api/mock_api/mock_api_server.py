@@ -0,0 +1,328 @@
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict, deque
+from datetime import timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from preferences.mock_api.mock_api_server_preference import MockApiServerPreference
+from preferences.mock_api.mock_endpoint_preference import LatencyPreference, MockEndpointPreference
+from util.time_helper import TimeHelper
+
+
+class MockApiServer:
+    """
+    SwitchBot・OpenWeatherMap・気象庁のAPIの代わりに応答するローカルのHTTPサーバー。
+
+    SwitchBotApi、OpenWeatherMapApi、JmaForecastApiが使うエンドポイントに、設定した遅延の後で
+    記録した応答または合成した応答を返します。設定した割合でHTTP 500やAPIのエラーを返し、
+    1分あたりのリクエスト数の上限を超えた場合はHTTP 429を返します。
+    GET /mock/statsで、APIと結果ごとのリクエスト数を返します。
+
+    Attributes:
+        preference (MockApiServerPreference): サーバーの設定
+        stats (Counter): 「API名.結果」ごとのリクエスト数
+    """
+
+    SWITCHBOT = "switchbot"
+    OPEN_WEATHER_MAP = "open_weather_map"
+    JMA = "jma"
+
+    _SWITCHBOT_PATH = re.compile(r"^/v1\.1/devices(?:/(?P<device_id>[^/]+)/(?P<action>status|commands))?$")
+    _JMA_PATH = re.compile(r"^/bosai/forecast/data/forecast/(?P<area_code>[^/]+)\.json$")
+
+    def __init__(self, preference: MockApiServerPreference):
+        self.preference = preference
+        self.stats: Counter = Counter()
+        self._random = random.Random(preference.seed)
+        self._lock = threading.Lock()
+        self._request_times: dict[str, deque[float]] = defaultdict(deque)
+        self._playback_positions: dict[str, int] = defaultdict(int)
+        self._server = _MockHttpServer((preference.host, preference.port), _MockApiRequestHandler)
+        self._server.mock_api_server = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """サーバーのURL（末尾の/なし）"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_environment(self) -> dict[str, str]:
+        """
+        各APIのクライアントがこのサーバーを使うための環境変数を返すメソッド。
+
+        Returns:
+            dict[str, str]: 環境変数の名前と値
+        """
+        return {
+            "SWITCHBOT_BASE_URL": self.base_url,
+            "OPEN_WEATHER_MAP_BASE_URL": f"{self.base_url}/data/2.5/",
+            "JMA_BASE_URL": f"{self.base_url}/bosai/forecast/data/forecast/",
+            "JMA_AREA_NAME": self.preference.jma_area_name,
+        }
+
+    def start(self):
+        """別のスレッドでリクエストの受け付けを開始するメソッド。"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """停止されるまでリクエストを受け付けるメソッド。"""
+        self._server.serve_forever()
+
+    def stop(self):
+        """リクエストの受け付けを停止してポートを閉じるメソッド。"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def handle(self, method: str, url: str) -> tuple[int, Any]:
+        """
+        リクエストに対する応答を決めるメソッド。
+
+        Args:
+            method (str): HTTPメソッド
+            url (str): リクエストのパスとクエリ
+
+        Returns:
+            tuple[int, Any]: HTTPステータスコードと、JSONで返す内容
+        """
+        parts = urlsplit(url)
+        path = parts.path
+        if method == "GET" and path == "/mock/stats":
+            with self._lock:
+                return 200, dict(self.stats)
+
+        switchbot = self._SWITCHBOT_PATH.match(path)
+        if switchbot:
+            device_id, action = switchbot.group("device_id"), switchbot.group("action")
+            if (method == "POST") != (action == "commands"):
+                return 405, {"message": "Method Not Allowed"}
+            return self._respond(
+                self.SWITCHBOT,
+                self.preference.switchbot,
+                lambda: self._switchbot_response(device_id, action),
+            )
+
+        jma = self._JMA_PATH.match(path)
+        if jma and method == "GET":
+            area_code = jma.group("area_code")
+            return self._respond(
+                self.JMA,
+                self.preference.jma,
+                lambda: self._play_recording(f"jma/{area_code}", "jma/forecast")
+                or self._create_jma_forecast(),
+            )
+
+        if path.endswith("/forecast") and method == "GET":
+            count = int(parse_qs(parts.query).get("cnt", ["40"])[0])
+            return self._respond(
+                self.OPEN_WEATHER_MAP,
+                self.preference.open_weather_map,
+                lambda: self._play_recording("open_weather_map/forecast")
+                or self._create_open_weather_map_forecast(count),
+            )
+
+        return 404, {"message": "Not Found"}
+
+    def _respond(self, api: str, endpoint: MockEndpointPreference, create_body) -> tuple[int, Any]:
+        """遅延の後で、リクエスト数の上限とエラーの割合に応じた応答を返す。"""
+        with self._lock:
+            delay = self._sample_latency(endpoint.latency)
+            rate_limited = self._is_rate_limited(api, endpoint.rate_limit_per_minute)
+            draw = self._random.random()
+        time.sleep(delay)
+
+        if rate_limited:
+            status, outcome, body = 429, "rate_limited", {"message": "Too Many Requests"}
+        elif draw < endpoint.error_rate:
+            status, outcome, body = 500, "error", {"message": "Internal Server Error"}
+        elif api == self.SWITCHBOT and draw < endpoint.error_rate + endpoint.api_error_rate:
+            status, outcome = 200, "api_error"
+            body = {"statusCode": 190, "body": {}, "message": "Device internal error"}
+        else:
+            status, outcome, body = 200, "ok", create_body()
+        with self._lock:
+            self.stats[f"{api}.{outcome}"] += 1
+        return status, body
+
+    def _sample_latency(self, latency: LatencyPreference) -> float:
+        """設定した分布から遅延（秒）を1つ選ぶ。"""
+        mean, spread = latency.mean_ms, latency.spread_ms
+        if latency.distribution == "uniform":
+            value = self._random.uniform(mean - spread, mean + spread)
+        elif latency.distribution == "normal":
+            value = self._random.gauss(mean, spread)
+        elif latency.distribution == "lognormal" and mean > 0:
+            # 平均と標準偏差が設定の値になる対数正規分布のパラメータ
+            sigma = math.sqrt(math.log(1 + (spread / mean) ** 2))
+            value = self._random.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+        else:
+            value = mean
+        return max(value, 0.0) / 1000
+
+    def _is_rate_limited(self, api: str, limit: int) -> bool:
+        """直近1分間のリクエスト数が上限を超えたかどうかを返し、今回のリクエストを数える。"""
+        if limit == 0:
+            return False
+        now = time.monotonic()
+        request_times = self._request_times[api]
+        while request_times and request_times[0] <= now - 60:
+            request_times.popleft()
+        if len(request_times) >= limit:
+            return True
+        request_times.append(now)
+        return False
+
+    def _play_recording(self, *names: str) -> Any | None:
+        """記録した応答があれば返す（.jsonlは1行ずつ順に返す）。"""
+        directory = self.preference.recordings_dir
+        if directory is None:
+            return None
+        for name in names:
+            path = os.path.join(directory, f"{name}.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+            path = os.path.join(directory, f"{name}.jsonl")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    lines = [line for line in f if line.strip()]
+                if not lines:
+                    continue
+                with self._lock:
+                    position = self._playback_positions[path]
+                    self._playback_positions[path] = (position + 1) % len(lines)
+                return json.loads(lines[position])
+        return None
+
+    def _switchbot_response(self, device_id: str | None, action: str | None) -> Any:
+        """SwitchBotのAPIの応答を返す。"""
+        if action == "commands":
+            return {"statusCode": 100, "body": {}, "message": "success"}
+        if action == "status":
+            return self._play_recording(f"switchbot/status/{device_id}", "switchbot/status") or {
+                "statusCode": 100,
+                "body": self._create_switchbot_status(device_id),
+                "message": "success",
+            }
+        return self._play_recording("switchbot/devices") or {
+            "statusCode": 100,
+            "body": {
+                "deviceList": [
+                    {"deviceId": value, "deviceName": key, "deviceType": "Meter", "hubDeviceId": ""}
+                    for key, value in sorted(os.environ.items())
+                    if key.startswith("SWITCHBOT_") and key.endswith("_DEVICE_ID")
+                ],
+                "infraredRemoteList": [],
+            },
+            "message": "success",
+        }
+
+    @staticmethod
+    def _create_switchbot_status(device_id: str) -> dict:
+        """時刻に応じて変化する温湿度計の状態を合成する（デバイスごとに少しずらす）。"""
+        now = TimeHelper.get_current_time()
+        offset = zlib.crc32(device_id.encode()) % 100 / 50 - 1
+        hour = now.hour + now.minute / 60
+        return {
+            "deviceId": device_id,
+            "deviceType": "Meter",
+            "temperature": round(26 + offset + 2 * math.sin(2 * math.pi * (hour - 9) / 24), 1),
+            "humidity": round(55 + 10 * offset),
+            "CO2": round(600 + 200 * offset),
+            "battery": 100,
+        }
+
+    @staticmethod
+    def _create_open_weather_map_forecast(count: int) -> dict:
+        """現在時刻から3時間ごとのOpenWeatherMapの天気予報を合成する。"""
+        now = TimeHelper.get_current_time()
+        start = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=now.hour % 3)
+        entries = []
+        for index in range(count):
+            forecast_time = start + timedelta(hours=3 * (index + 1))
+            hour = forecast_time.hour
+            entries.append(
+                {
+                    "dt": int(forecast_time.timestamp()),
+                    "main": {
+                        "temp": round(28 + 5 * math.sin(2 * math.pi * (hour - 9) / 24), 2),
+                        "humidity": 60,
+                        "pressure": 1010,
+                    },
+                    "weather": [{"main": "Clear" if 6 <= hour < 18 else "Clouds"}],
+                    "clouds": {"all": 20 if 6 <= hour < 18 else 60},
+                    "wind": {"speed": 2.5, "deg": 180},
+                    "pop": 0.1,
+                    "dt_txt": forecast_time.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                }
+            )
+        return {"cod": "200", "message": 0, "cnt": count, "list": entries}
+
+    def _create_jma_forecast(self) -> list:
+        """今日と明日の最低・最高気温を含む気象庁の天気予報を合成する。"""
+        today = TimeHelper.get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
+        time_defines = [
+            (today + timedelta(days=day, hours=hour)).isoformat(timespec="seconds")
+            for day in (0, 1)
+            for hour in (0, 9)
+        ]
+        return [
+            {
+                "publishingOffice": "気象庁",
+                "reportDatetime": time_defines[0],
+                "timeSeries": [
+                    {
+                        "timeDefines": time_defines,
+                        "areas": [
+                            {
+                                "area": {"name": self.preference.jma_area_name, "code": "00000"},
+                                "temps": ["24", "32", "25", "33"],
+                            }
+                        ],
+                    }
+                ],
+            }
+        ]
+
+
+class _MockHttpServer(ThreadingHTTPServer):
+    """負荷試験で多数の接続を同時に受け付けるHTTPサーバー"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _MockApiRequestHandler(BaseHTTPRequestHandler):
+    """MockApiServerにリクエストを渡してJSONで応答するハンドラー"""
+
+    def do_GET(self):
+        self._reply("GET")
+
+    def do_POST(self):
+        # 本文は読み捨てる（読まないと接続を使い回せない）
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._reply("POST")
+
+    def _reply(self, method: str):
+        status, payload = self.server.mock_api_server.handle(method, self.path)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,61 @@
+from api.smart_home_devices.smart_home_device_interface import SmartHomeDeviceInterface
+from api.smart_home_devices.smart_home_device_response import SmartHomeDeviceResponse
+from logger.system_event_logger import SystemEventLogger
+from settings import app_preference
+from shared.dataclass.air_quality import AirQuality
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.sensor import Sensor
+from util.api_quota import ApiQuota
+
+
+class QuotaSmartHomeDevice(SmartHomeDeviceInterface):
+    """
+    API呼び出し回数が上限を超えそうな場合に、センサーの読み取りを減らすスマートホームデバイス。
+
+    実際のデバイスを包み、読み取ったセンサーの値を保存します。節約中は、メイン以外のセンサーの
+    保存した値が設定した時間内であれば、読み取らずにその値を返します。コマンドはそのまま送信します。
+
+    Attributes:
+        device (SmartHomeDeviceInterface): 実際にコマンドを送信するデバイス
+    """
+
+    def __init__(self, device: SmartHomeDeviceInterface):
+        self.device = device
+
+    def circulator_on(self) -> SmartHomeDeviceResponse:
+        return self.device.circulator_on()
+
+    def circulator_off(self) -> SmartHomeDeviceResponse:
+        return self.device.circulator_off()
+
+    def circulator_fan_speed(
+        self, speed: int, current_spped: int | None = None
+    ) -> SmartHomeDeviceResponse | None:
+        return self.device.circulator_fan_speed(speed, current_spped)
+
+    def electric_fan_on(self) -> SmartHomeDeviceResponse:
+        return self.device.electric_fan_on()
+
+    def electric_fan_off(self) -> SmartHomeDeviceResponse:
+        return self.device.electric_fan_off()
+
+    def aircon(self, aircon_settings: AirconSettings) -> SmartHomeDeviceResponse:
+        return self.device.aircon(aircon_settings)
+
+    def get_air_quality_by_sensor(self, sensor: Sensor) -> AirQuality:
+        # メインのセンサーは制御の基準なので、節約中も毎回読み取る
+        if sensor.id != app_preference.sensors.main.id and ApiQuota.is_degraded():
+            reading = ApiQuota.get_cached_reading(
+                sensor.id, app_preference.api_quota.degraded_sensor_ttl_minutes
+            )
+            if reading is not None:
+                SystemEventLogger.log_info(
+                    "api_quota.sensor_cached",
+                    sensor=sensor.label,
+                    read_at=reading.read_at.strftime("%H:%M:%S"),
+                )
+                return reading.air_quality
+
+        air_quality = self.device.get_air_quality_by_sensor(sensor)
+        ApiQuota.save_reading(sensor.id, air_quality)
+        return air_quality
@@ -0,0 +1,66 @@
+from collections import Counter
+from datetime import datetime
+
+from api.smart_home_devices.smart_home_device_interface import SmartHomeDeviceInterface
+from api.smart_home_devices.smart_home_device_response import SmartHomeDeviceResponse
+from shared.dataclass.air_quality import AirQuality
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.sensor import Sensor
+from util.time_helper import TimeHelper
+
+
+class RecordingSmartHomeDevice(SmartHomeDeviceInterface):
+    """
+    実際のデバイスを操作せず、送信したコマンドを記録するスマートホームデバイス。
+
+    記録したデータを再生する場合に、SmartHomeDeviceFactory.set_deviceで差し替えて使います。
+
+    Attributes:
+        commands (list[tuple[datetime, str, str]]): 送信した日時、コマンド名、パラメータの記録
+        air_qualities (dict[str, AirQuality]): センサーIDごとに返す空気質情報
+    """
+
+    def __init__(self):
+        self.commands: list[tuple[datetime, str, str]] = []
+        self.air_qualities: dict[str, AirQuality] = {}
+
+    def _record(self, command: str, parameter: str = "") -> SmartHomeDeviceResponse:
+        """コマンドを記録し、成功のレスポンスを返す。"""
+        self.commands.append((TimeHelper.get_current_time(), command, parameter))
+        return SmartHomeDeviceResponse(success=True)
+
+    def count_commands(self) -> Counter:
+        """
+        コマンド名ごとの送信回数を返す。
+
+        Returns:
+            Counter: コマンド名と送信回数
+        """
+        return Counter(command for _, command, _ in self.commands)
+
+    def circulator_on(self) -> SmartHomeDeviceResponse:
+        return self._record("circulator_on")
+
+    def circulator_off(self) -> SmartHomeDeviceResponse:
+        return self._record("circulator_off")
+
+    def circulator_fan_speed(
+        self, speed: int, current_spped: int | None = None
+    ) -> SmartHomeDeviceResponse:
+        return self._record("circulator_fan_speed", f"{current_spped}->{speed}")
+
+    def electric_fan_on(self) -> SmartHomeDeviceResponse:
+        return self._record("electric_fan_on")
+
+    def electric_fan_off(self) -> SmartHomeDeviceResponse:
+        return self._record("electric_fan_off")
+
+    def aircon(self, aircon_settings: AirconSettings) -> SmartHomeDeviceResponse:
+        return self._record(
+            "aircon",
+            f"{aircon_settings.temperature},{aircon_settings.mode.label},"
+            f"{aircon_settings.fan_speed.label},{aircon_settings.power.name}",
+        )
+
+    def get_air_quality_by_sensor(self, sensor: Sensor) -> AirQuality:
+        return self.air_qualities.get(sensor.id, sensor.air_quality)
@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+from api.smart_home_devices.smart_home_device_interface import SmartHomeDeviceInterface
+from api.smart_home_devices.smart_home_device_response import SmartHomeDeviceResponse
+from logger.system_event_logger import SystemEventLogger
+from settings import app_preference
+from shared.dataclass.air_quality import AirQuality
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.sensor import Sensor
+from shared.enums.power_mode import PowerMode
+from util.device_shadow import DeviceShadow
+from util.time_helper import TimeHelper
+
+
+class ShadowSmartHomeDevice(SmartHomeDeviceInterface):
+    """
+    最後に送信した状態と同じ状態へのコマンドを送信しないスマートホームデバイス。
+
+    実際のデバイスを包み、コマンドの対象の状態がシャドウと同じ場合は送信せずに
+    成功のレスポンス（skipped=True）を返します。送信に成功した場合はシャドウを更新して保存します。
+
+    Attributes:
+        device (SmartHomeDeviceInterface): 実際にコマンドを送信するデバイス
+        shadow (DeviceShadow): 最後に送信した機器の状態
+    """
+
+    def __init__(self, device: SmartHomeDeviceInterface, shadow: DeviceShadow):
+        self.device = device
+        self.shadow = shadow
+
+    def circulator_on(self) -> SmartHomeDeviceResponse:
+        # 電源の切り替えは同じコマンドなので、既にオンの場合に送信すると逆にオフになる
+        if self.shadow.circulator_power == PowerMode.ON:
+            return self._skip("circulator_on", 1)
+        response = self.device.circulator_on()
+        if response.success:
+            self.shadow.circulator_power = PowerMode.ON
+            self._update_circulator()
+        return response
+
+    def circulator_off(self) -> SmartHomeDeviceResponse:
+        if self.shadow.circulator_power == PowerMode.OFF:
+            return self._skip("circulator_off", 1)
+        response = self.device.circulator_off()
+        if response.success:
+            self.shadow.circulator_power = PowerMode.OFF
+            self._update_circulator()
+        return response
+
+    def circulator_fan_speed(
+        self, speed: int, current_spped: int | None = None
+    ) -> SmartHomeDeviceResponse | None:
+        # 風量は増減のコマンドで変えるため、シャドウの風量がある場合はそこから増減する
+        current_speed = (
+            self.shadow.circulator_fan_speed
+            if self.shadow.circulator_fan_speed is not None
+            else current_spped
+        )
+        if (current_speed or 0) == speed:
+            return self._skip("circulator_fan_speed", abs(speed - (current_spped or 0)))
+        response = self.device.circulator_fan_speed(speed, current_speed)
+        if response is None or response.success:
+            self.shadow.circulator_fan_speed = speed
+            self._update_circulator()
+        return response
+
+    def electric_fan_on(self) -> SmartHomeDeviceResponse:
+        if self.shadow.electric_fan_power == PowerMode.ON:
+            return self._skip("electric_fan_on", 1)
+        response = self.device.electric_fan_on()
+        if response.success:
+            self.shadow.electric_fan_power = PowerMode.ON
+            self._update_electric_fan()
+        return response
+
+    def electric_fan_off(self) -> SmartHomeDeviceResponse:
+        if self.shadow.electric_fan_power == PowerMode.OFF:
+            return self._skip("electric_fan_off", 1)
+        response = self.device.electric_fan_off()
+        if response.success:
+            self.shadow.electric_fan_power = PowerMode.OFF
+            self._update_electric_fan()
+        return response
+
+    def aircon(self, aircon_settings: AirconSettings) -> SmartHomeDeviceResponse:
+        if DeviceShadow.is_same_aircon_settings(
+            self.shadow.aircon, aircon_settings
+        ) and not self._is_aircon_refresh_due():
+            return self._skip("aircon", 1)
+        response = self.device.aircon(aircon_settings)
+        if response.success:
+            self.shadow.aircon = aircon_settings.model_copy()
+            self.shadow.aircon_updated_at = TimeHelper.get_current_time()
+            self._save()
+        return response
+
+    def get_air_quality_by_sensor(self, sensor: Sensor) -> AirQuality:
+        return self.device.get_air_quality_by_sensor(sensor)
+
+    def _is_aircon_refresh_due(self) -> bool:
+        """同じ設定でもエアコンに送信し直す時刻を過ぎているかどうかを返す。"""
+        refresh_minutes = app_preference.device_shadow.aircon_refresh_minutes
+        if refresh_minutes == 0 or self.shadow.aircon_updated_at is None:
+            return False
+        return TimeHelper.get_current_time() - self.shadow.aircon_updated_at >= timedelta(
+            minutes=refresh_minutes
+        )
+
+    def _update_circulator(self):
+        """サーキュレーターの状態を更新した日時を記録して保存する。"""
+        self.shadow.circulator_updated_at = TimeHelper.get_current_time()
+        self._save()
+
+    def _update_electric_fan(self):
+        """扇風機の状態を更新した日時を記録して保存する。"""
+        self.shadow.electric_fan_updated_at = TimeHelper.get_current_time()
+        self._save()
+
+    def _skip(self, command: str, calls: int) -> SmartHomeDeviceResponse:
+        """コマンドを送信せず、送信しなかったAPI呼び出し回数を数えて成功のレスポンスを返す。"""
+        if calls > 0:
+            self.shadow.saved_calls += calls
+            self.shadow.total_saved_calls += calls
+            self._save()
+            SystemEventLogger.log_info(
+                "device_shadow.skipped",
+                command=command,
+                saved_calls=self.shadow.saved_calls,
+                total_saved_calls=self.shadow.total_saved_calls,
+            )
+        return SmartHomeDeviceResponse(success=True, skipped=True)
+
+    def _save(self):
+        """シャドウをファイルに保存する。"""
+        self.shadow.save(app_preference.device_shadow.state_path)
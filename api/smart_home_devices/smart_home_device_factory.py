@@ -1,14 +1,35 @@
+from api.smart_home_devices.quota_smart_home_device import QuotaSmartHomeDevice
+from api.smart_home_devices.shadow_smart_home_device import ShadowSmartHomeDevice
 from api.smart_home_devices.smart_home_device_interface import SmartHomeDeviceInterface
 from api.smart_home_devices.switchbot_api import SwitchBotApi
+from api.smart_home_devices.timed_smart_home_device import TimedSmartHomeDevice
 from settings import app_preference
 from shared.enums.smart_home_device import SmartHomeDevice
+from util.device_shadow import DeviceShadow
 
 
 class SmartHomeDeviceFactory:
     """
     スマートホームデバイスを生成するファクトリークラス
+
+    Attributes:
+        _device (SmartHomeDeviceInterface or None): set_deviceで差し替えたデバイス。
     """
 
+    _device: SmartHomeDeviceInterface | None = None
+
+    @classmethod
+    def set_device(cls, device: SmartHomeDeviceInterface | None):
+        """
+        生成するデバイスを指定したインスタンスに差し替える。
+
+        記録したデータを再生する場合など、実際のデバイスを操作せずに処理を実行するために使う。
+
+        Args:
+            device (SmartHomeDeviceInterface | None): 使用するデバイス。Noneの場合は設定に基づいて生成する。
+        """
+        cls._device = device
+
     @classmethod
     def create_device(cls) -> SmartHomeDeviceInterface:
         """
@@ -18,6 +39,11 @@ class SmartHomeDeviceFactory:
         対応するデバイスインスタンスを生成して返す。
         現在はSwitchBotデバイスのみサポートしており、それ以外のデバイスタイプは
         TranslatedValueErrorをスローする。
+        処理時間を計測する設定が有効な場合は、TimedSmartHomeDeviceで包む。
+        API呼び出し回数を記録する設定が有効な場合は、QuotaSmartHomeDeviceで包む
+        （節約中に使い回したセンサーの値は計測しない）。
+        同じ状態へのコマンドを送信しない設定が有効な場合は、さらにShadowSmartHomeDeviceで包んで返す
+        （送信しなかったコマンドは計測しない）。
 
         Returns:
             SmartHomeDeviceInterface: 生成されたスマートホームデバイスのインスタンス。
@@ -25,7 +51,18 @@ class SmartHomeDeviceFactory:
         Raises:
             TranslatedValueError: 設定ファイルで指定されたデバイスタイプがサポートされていない場合。
         """
+        if cls._device is not None:
+            return cls._device
+
         if app_preference.smart_home_device.device_type == SmartHomeDevice.SWITCH_BOT:
-            return SwitchBotApi()  # SwitchBotデバイスを生成して返す
+            device = SwitchBotApi()  # SwitchBotデバイスを生成して返す
+        else:
+            device = SwitchBotApi()
 
-        return SwitchBotApi()
+        if app_preference.cycle_metrics.enabled:
+            device = TimedSmartHomeDevice(device)
+        if app_preference.api_quota.enabled:
+            device = QuotaSmartHomeDevice(device)
+        if app_preference.device_shadow.enabled:
+            return ShadowSmartHomeDevice(device, DeviceShadow.get())
+        return device
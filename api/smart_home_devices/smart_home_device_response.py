@@ -9,9 +9,10 @@ class SmartHomeDeviceResponse:
     Attributes:
         success (bool): 操作が成功したかどうかを示すフラグ。
         message (Optional[str]): 操作成功時に返されるメッセージ。
+        skipped (bool): 既に同じ状態のため、コマンドを送信しなかったかどうか。
     """
 
-    def __init__(self, success: bool = True, message: str | None = None):
+    def __init__(self, success: bool = True, message: str | None = None, skipped: bool = False):
         """
         SmartHomeDeviceResponseのコンストラクタ。
 
@@ -20,9 +21,11 @@ class SmartHomeDeviceResponse:
         Args:
             success (bool, optional): 操作が成功したかどうか。デフォルトはTrue。
             message (Optional[str], optional): 成功時のメッセージ。デフォルトはNone。
+            skipped (bool, optional): コマンドを送信しなかったかどうか。デフォルトはFalse。
         """
         self._success = success
         self._message = message
+        self._skipped = skipped
 
     def __str__(self):
         """
@@ -64,3 +67,13 @@ class SmartHomeDeviceResponse:
             Optional[str]: 操作が成功した場合のメッセージ。失敗時はNone。
         """
         return self._message
+
+    @property
+    def skipped(self) -> bool:
+        """
+        既に同じ状態のため、コマンドを送信しなかったかどうかを確認するプロパティ。
+
+        Returns:
+            bool: コマンドを送信しなかった場合はTrue、それ以外はFalse。
+        """
+        return self._skipped
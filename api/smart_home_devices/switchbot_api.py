@@ -20,6 +20,7 @@ from shared.enums.circulator_fan_speed import CirculatorFanSpeed
 from shared.enums.power_mode import PowerMode
 from shared.enums.sensor_type import SensorType
 from translations.translated_value_error import TranslatedValueError
+from util.api_quota import ApiQuota
 from util.env_config_loader import EnvConfigLoader
 
 
@@ -42,6 +43,14 @@ class SwitchBotApi(SmartHomeDeviceInterface):
         # APIのベースURL
         self._API_BASE_URL = EnvConfigLoader.get_variable("SWITCHBOT_BASE_URL")
 
+        # API呼び出し回数を記録するときのデバイスIDと名前の対応（センサーは読み取り時に加える）
+        self._device_names: Dict[str, str] = {
+            self._CIRCULATOR_DEVICE_ID: "circulator",
+            self._ELECTRIC_FAN_DEVICE_ID: "electric_fan",
+            self._AIR_CONDITIONER_DEVICE_ID: "aircon",
+            self._AIR_CONDITIONER_SUPPORT_DEVICE_ID: "aircon_support",
+        }
+
     def circulator_on(self) -> SmartHomeDeviceResponse:
         """サーキュレーターをオンにする"""
         try:
@@ -118,6 +127,7 @@ class SwitchBotApi(SmartHomeDeviceInterface):
         device_id = os.getenv(device_id_key)
         if not device_id:
             raise TranslatedValueError(device_id_key=device_id_key)
+        self._device_names[device_id] = sensor.id
 
         try:
             if sensor.type == SensorType.TEMPERATURE_HUMIDITY:
@@ -200,8 +210,10 @@ class SwitchBotApi(SmartHomeDeviceInterface):
                 response.raise_for_status()  # HTTPエラーがあれば例外を発生
                 data = response.json()
                 if data["statusCode"] == 100:
+                    self._record_call(device_id, "commands", "success")
                     return SmartHomeDeviceResponse(message=data)
                 else:
+                    self._record_call(device_id, "commands", "api_error")
                     # 置換処理
                     url_with_masked_device_id = url.replace(f"{device_id}", "XXXXX")
                     raise SmartHomeDeviceException(
@@ -209,6 +221,7 @@ class SwitchBotApi(SmartHomeDeviceInterface):
                         f"url: {url_with_masked_device_id}, body: {body}, data: {data}",
                     )
         except requests.exceptions.RequestException as e:
+            self._record_call(device_id, "commands", "http_error")
             raise SmartHomeDeviceException(str(e))
 
     def _get_temperature_and_humidity(self, device_id: str) -> AirQuality:
@@ -259,11 +272,14 @@ class SwitchBotApi(SmartHomeDeviceInterface):
                     response.raise_for_status()  # HTTPエラーがあれば例外を発生
                     data = response.json()
                     if data["statusCode"] == 100:
+                        self._record_call(device_id, "status", "success")
                         return data["body"]
                     else:
+                        self._record_call(device_id, "status", "api_error")
                         error_message = data["message"]
                         print(error_message)
             except requests.exceptions.RequestException as e:
+                self._record_call(device_id, "status", "http_error")
                 print(e)    
                 time.sleep(retry_delay)
 
@@ -352,15 +368,29 @@ class SwitchBotApi(SmartHomeDeviceInterface):
                 data = response.json()
 
                 if data["statusCode"] == 100:
+                    ApiQuota.record_call("all", "devices", "success")
                     return data["body"]
 
+                ApiQuota.record_call("all", "devices", "api_error")
                 raise SmartHomeDeviceException(
                     data["message"],
                     f"url: {url}, data: {data}",
                 )
 
         except requests.exceptions.RequestException as e:
+            ApiQuota.record_call("all", "devices", "http_error")
             raise SmartHomeDeviceException(str(e))
+
+    def _record_call(self, device_id: str, endpoint: str, outcome: str):
+        """
+        APIの呼び出しを、デバイスIDに対応する名前で記録します。
+
+        Args:
+            device_id (str): 呼び出したデバイスのID
+            endpoint (str): 呼び出したエンドポイント
+            outcome (str): 結果（success、api_error、http_error）
+        """
+        ApiQuota.record_call(self._device_names.get(device_id, "unknown"), endpoint, outcome)
         
     def _generate_swt_header(self) -> Dict[str, str]:
         """
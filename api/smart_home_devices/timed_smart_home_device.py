@@ -0,0 +1,51 @@
+from api.smart_home_devices.smart_home_device_interface import SmartHomeDeviceInterface
+from api.smart_home_devices.smart_home_device_response import SmartHomeDeviceResponse
+from shared.dataclass.air_quality import AirQuality
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.sensor import Sensor
+from util.cycle_metrics import CycleMetrics
+
+
+class TimedSmartHomeDevice(SmartHomeDeviceInterface):
+    """
+    コマンドの送信とセンサーの読み取りにかかった時間を計測するスマートホームデバイス。
+
+    実際のデバイスを包み、コマンドは"device_command"、センサーの読み取りは"sensor_read"として
+    CycleMetricsに所要時間を記録します。
+
+    Attributes:
+        device (SmartHomeDeviceInterface): 実際にコマンドを送信するデバイス
+    """
+
+    def __init__(self, device: SmartHomeDeviceInterface):
+        self.device = device
+
+    def circulator_on(self) -> SmartHomeDeviceResponse:
+        with CycleMetrics.measure("device_command", "circulator_on"):
+            return self.device.circulator_on()
+
+    def circulator_off(self) -> SmartHomeDeviceResponse:
+        with CycleMetrics.measure("device_command", "circulator_off"):
+            return self.device.circulator_off()
+
+    def circulator_fan_speed(
+        self, speed: int, current_spped: int | None = None
+    ) -> SmartHomeDeviceResponse | None:
+        with CycleMetrics.measure("device_command", "circulator_fan_speed"):
+            return self.device.circulator_fan_speed(speed, current_spped)
+
+    def electric_fan_on(self) -> SmartHomeDeviceResponse:
+        with CycleMetrics.measure("device_command", "electric_fan_on"):
+            return self.device.electric_fan_on()
+
+    def electric_fan_off(self) -> SmartHomeDeviceResponse:
+        with CycleMetrics.measure("device_command", "electric_fan_off"):
+            return self.device.electric_fan_off()
+
+    def aircon(self, aircon_settings: AirconSettings) -> SmartHomeDeviceResponse:
+        with CycleMetrics.measure("device_command", "aircon"):
+            return self.device.aircon(aircon_settings)
+
+    def get_air_quality_by_sensor(self, sensor: Sensor) -> AirQuality:
+        with CycleMetrics.measure("sensor_read", sensor.label):
+            return self.device.get_air_quality_by_sensor(sensor)
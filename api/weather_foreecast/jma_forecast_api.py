@@ -1,3 +1,4 @@
+import os
 from datetime import date, datetime
 
 import requests
@@ -14,14 +15,19 @@ class JmaForecastApi(WeatherForecastInterface):
     環境変数から以下の情報を取得します:
     - JMA_AREA_NAME: 取得したいエリアの名称
     - JMA_AREA_CODE: 取得したいエリアのコード
+    - JMA_BASE_URL: 天気予報のURLのエリアコードより前の部分（省略時は気象庁のURL。モックサーバーを使う場合に指定）
 
     主な機能:
     - 指定された日付の最大気温を取得するメソッド
     """
 
+    DEFAULT_BASE_URL = "https://www.jma.go.jp/bosai/forecast/data/forecast/"
+    """気象庁の天気予報のURLのエリアコードより前の部分"""
+
     def __init__(self):
         self._AREA_NAME = EnvConfigLoader.get_variable("JMA_AREA_NAME")
         self._AREA_CODE = EnvConfigLoader.get_variable("JMA_AREA_CODE")
+        self._BASE_URL = os.getenv("JMA_BASE_URL", self.DEFAULT_BASE_URL)
 
     def fetch_forecast(self, start_date: date) -> list[WeatherDate]:
         max_temprature = self.get_max_temperature_by_date(start_date.isoformat())
@@ -34,7 +40,7 @@ class JmaForecastApi(WeatherForecastInterface):
         :param target_date: 取得したい日付（フォーマット: 'YYYY-MM-DD'）
         :return: 最大気温 (度) または None
         """
-        jma_url = f"https://www.jma.go.jp/bosai/forecast/data/forecast/{self._AREA_CODE}.json"
+        jma_url = f"{self._BASE_URL}{self._AREA_CODE}.json"
 
         # セッションを使用してリクエストを管理
         with requests.Session() as session:
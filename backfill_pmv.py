@@ -0,0 +1,33 @@
+# 保存済みの測定のPMVを現在の熱特性設定で再計算するスクリプト
+# 実行方法: python backfill_pmv.py [--chunk-size 1000] [--checkpoint data/pmv_backfill.json] [--restart] [--dry-run]
+#
+# 中断した場合は同じコマンドで続きから再開します。熱特性設定やMET・CLOの設定を変更した場合は最初から再計算します。
+# MET値と衣服の断熱性も測定日時と保存済みの天気予報から現在の設定で求め直します。
+import argparse
+
+from util.pmv_backfill import PMVBackfill
+
+
+def report_progress(backfill: PMVBackfill, elapsed_seconds: float):
+    # 処理件数とスループットを表示する
+    throughput = backfill.processed / elapsed_seconds if elapsed_seconds > 0 else 0
+    print(
+        f"測定ID {backfill.last_measurement_id}まで: {backfill.processed}件を再計算, "
+        f"{backfill.updated}件を更新（{throughput:.0f}件/秒）",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="保存済みの測定のPMVを再計算します")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="まとめて再計算・更新する件数")
+    parser.add_argument("--checkpoint", default="data/pmv_backfill.json")
+    parser.add_argument("--restart", action="store_true", help="チェックポイントを無視して最初から再計算する")
+    parser.add_argument("--dry-run", action="store_true", help="再計算だけを行い、書き込まない")
+    args = parser.parse_args()
+
+    backfill = PMVBackfill(args.checkpoint, restart=args.restart)
+    if backfill.last_measurement_id:
+        print(f"測定ID {backfill.last_measurement_id}の次から再開します")
+    backfill.run(chunk_size=args.chunk_size, dry_run=args.dry_run, on_progress=report_progress)
+    print(f"完了しました: {backfill.processed}件を再計算, {backfill.updated}件を更新")
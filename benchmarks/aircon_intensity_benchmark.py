@@ -0,0 +1,132 @@
+# 日ごとのエアコン強度スコアの計算結果と処理速度を確認するスクリプト
+# 実行方法: python -m benchmarks.aircon_intensity_benchmark
+#
+# データベースは使わず、5分間隔のエアコン設定1年分を生成し、変更前の1行ずつの計算と比較します。
+import time
+from collections import defaultdict, namedtuple
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from models.aircon_setting_model import AirconSettingModel
+from settings import LOCAL_TZ
+from shared.enums.aircon_fan_speed import AirconFanSpeed
+from shared.enums.aircon_mode import AirconMode
+from shared.enums.power_mode import PowerMode
+from util.aircon_intensity_calculator import AirconIntensityCalculator
+
+Row = namedtuple("Row", "created_at temperature mode_id fan_speed_id power")
+
+
+def generate_rows(days: int, seed: int = 0) -> list[Row]:
+    rng = np.random.default_rng(seed)
+    start = LOCAL_TZ.localize(datetime(2024, 1, 1))
+    rows = []
+    for index in range(days * 24 * 12):
+        rows.append(
+            Row(
+                created_at=start
+                + timedelta(minutes=5 * index, seconds=int(rng.integers(0, 30)), microseconds=int(rng.integers(1, 999_999))),
+                temperature=float(rng.choice([20, 22, 23, 24, 25, 26, 27, 28, 29, 25.5])),
+                mode_id=int(rng.choice([mode.id for mode in AirconMode])),
+                fan_speed_id=int(rng.choice([fan_speed.id for fan_speed in AirconFanSpeed])),
+                power=str(rng.choice([PowerMode.ON.name, PowerMode.OFF.name])),
+            )
+        )
+    return rows
+
+
+def get_rows_by_date(rows: list[Row], date: str) -> list[Row]:
+    # AirconSettingService.get_aircon_settings_by_dateと同じ範囲の設定を取得する
+    start_datetime = datetime.strptime(f"{date} 00:00:00", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ)
+    end_datetime = datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ)
+    return [row for row in rows if start_datetime <= row.created_at < end_datetime]
+
+
+def calculate_with_rows(aircon_settings_list: list[Row], date: str, calculate_last_duration: bool) -> int:
+    # 比較用：変更前のAirconIntensityScoreService.get_daily_aircon_intensityの計算
+    intensity_by_mode = defaultdict(float)
+    last_setting: AirconSettingModel | None = None
+
+    for settings in aircon_settings_list:
+        created_at_str = settings.created_at.isoformat()
+        created_at_str = created_at_str.split(".")[0] + created_at_str[-6:]
+        current_time = datetime.fromisoformat(created_at_str)
+
+        if last_setting is not None:
+            time_difference = (current_time - last_setting.created_at).total_seconds()
+            intensity_score = AirconIntensityCalculator.calculate_intensity(
+                temperature=last_setting.temperature,
+                mode_id=last_setting.mode_id,
+                fan_speed_id=last_setting.fan_speed_id,
+                power=last_setting.power,
+            )
+            intensity_by_mode[last_setting.mode_id] += intensity_score * time_difference
+
+        last_setting = AirconSettingModel(
+            mode_id=settings.mode_id,
+            temperature=settings.temperature,
+            fan_speed_id=settings.fan_speed_id,
+            power=settings.power,
+            created_at=current_time,
+        )
+
+    if calculate_last_duration and last_setting is not None:
+        end_of_day = datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ)
+        time_difference = (end_of_day - last_setting.created_at).total_seconds()
+        intensity_score = AirconIntensityCalculator.calculate_intensity(
+            temperature=last_setting.temperature,
+            mode_id=last_setting.mode_id,
+            fan_speed_id=last_setting.fan_speed_id,
+            power=last_setting.power,
+        )
+        intensity_by_mode[last_setting.mode_id] += intensity_score * time_difference
+
+    return int(sum(intensity_by_mode.values()))
+
+
+def calculate_with_arrays(rows: list[Row], dates: list[str], calculate_last_duration: bool) -> list[int]:
+    # AirconIntensityScoreService.get_daily_aircon_intensitiesと同じ計算
+    day_starts = [
+        datetime.strptime(f"{date} 00:00:00", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ).timestamp()
+        for date in dates
+    ]
+    day_ends = [
+        datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ).timestamp()
+        for date in dates
+    ]
+    return AirconIntensityCalculator.integrate_daily_intensity(
+        created_at=[row.created_at.timestamp() for row in rows],
+        temperature=[row.temperature for row in rows],
+        mode_id=[row.mode_id for row in rows],
+        fan_speed_id=[row.fan_speed_id for row in rows],
+        power=[row.power for row in rows],
+        day_starts=day_starts,
+        day_ends=day_ends,
+        calculate_last_duration=calculate_last_duration,
+    ).tolist()
+
+
+if __name__ == "__main__":
+    days = 366
+    rows = generate_rows(days)
+    dates = [(date(2024, 1, 1) + timedelta(days=day)).strftime("%Y-%m-%d") for day in range(days)]
+    rows_by_date = {date: get_rows_by_date(rows, date) for date in dates}
+
+    for calculate_last_duration in (True, False):
+        start = time.perf_counter()
+        expected = [
+            calculate_with_rows(rows_by_date[date], date, calculate_last_duration) for date in dates
+        ]
+        row_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = calculate_with_arrays(rows, dates, calculate_last_duration)
+        array_elapsed = time.perf_counter() - start
+
+        mismatches = sum(a != e for a, e in zip(actual, expected))
+        print(
+            f"最後の設定の持続時間{'あり' if calculate_last_duration else 'なし'}: "
+            f"{days}日分（{len(rows)}件）, 不一致 {mismatches}日, "
+            f"1行ずつ {row_elapsed:.2f}秒, 配列 {array_elapsed:.3f}秒"
+        )
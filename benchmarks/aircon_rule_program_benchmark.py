@@ -0,0 +1,71 @@
+# エアコンの設定の判断の処理時間を確認するスクリプト
+# 実行方法: python -m benchmarks.aircon_rule_program_benchmark
+#
+# 快適管理の無効期間を全曜日に設定し、1回の判断にかかる時間を計測します。
+import logging
+import timeit
+from datetime import datetime
+
+from devices.aircon.aircon_rule_program import AirconRuleProgram
+from devices.aircon.aircon_settings_determiner import AirconSettingsDeterminer
+from logger.system_event_logger import logger
+from preferences.app.comfort_period_preference import ComfortPeriodPreference
+from settings import LOCAL_TZ, app_preference
+from shared.dataclass.home_sensor import HomeSensor
+from shared.dataclass.pmv_result import PMVResult
+from shared.dataclass.sensor import Sensor
+from shared.dataclass.sensor_features import SensorFeatures
+from util.time_helper import TimeHelper
+from util.weekday_helper import WeekdayHelper
+
+
+def sensor(name: str, temperature: float, humidity: float) -> Sensor:
+    return Sensor(
+        id=name,
+        label=name,
+        location=name,
+        type="温湿度計",
+        air_quality={"temperature": temperature, "humidity": humidity},
+    )
+
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)
+    app_preference.comfort_control.enabled = True
+    app_preference.comfort_control.disabled_periods = [
+        ComfortPeriodPreference(
+            day=WeekdayHelper.index_to_name(day),
+            times=[f"{hour:02d}:00-{hour:02d}:30" for hour in range(0, 24, 2)],
+        )
+        for day in range(7)
+    ]
+    TimeHelper.set_current_time(LOCAL_TZ.localize(datetime(2024, 7, 5, 15, 45)))
+    home_sensor = HomeSensor(
+        main=sensor("main", 27.0, 60),
+        sub=sensor("sub", 28.0, 58),
+        supplementaries=[sensor("supplementary", 26.5, 62)],
+        outdoor=sensor("outdoor", 33.0, 70),
+    )
+    pmv_result = PMVResult(
+        pmv=0.35, ppd=8, clo=0.5, air=0.1, met=1.0, wall=28, ceiling=29, floor=27,
+        mean_radiant_temperature=28, dry_bulb_temperature=27.2, relative_air_speed=0.1,
+        dynamic_clothing_insulation=0.5,
+    )
+    sensor_features = SensorFeatures.from_home_sensor(home_sensor)
+    program = AirconRuleProgram.get()
+
+    number = 20_000
+    cases = {
+        "PMV閾値の検索": lambda: program.find_pmv_threshold_settings(pmv_result.pmv),
+        "無効期間の判定": lambda: program.find_disabled_period(TimeHelper.get_current_time()),
+        "センサー測定値の集計": lambda: SensorFeatures.from_home_sensor(home_sensor),
+        "設定の判断（集計済み）": lambda: AirconSettingsDeterminer.determine_aircon_settings(
+            pmv_result, home_sensor, None, False, sensor_features
+        ),
+        "設定の判断": lambda: AirconSettingsDeterminer.determine_aircon_settings(
+            pmv_result, home_sensor, None, False
+        ),
+    }
+    for name, case in cases.items():
+        elapsed = timeit.timeit(case, number=number)
+        print(f"{name}: {elapsed / number * 1e6:.1f}µs/回")
@@ -0,0 +1,106 @@
+# SwitchBot APIの呼び出し回数の記録と、日末の見込み・節約の動作を確認するスクリプト
+# 実行方法: python -m benchmarks.api_quota_benchmark
+#
+# モックサーバーに向けてセンサーの読み取りと風量の変更を行い、記録した呼び出し回数が
+# サーバーが受けたリクエスト数と一致することを確認します（APIエラーによるリトライも含む）。
+# 次に、呼び出しの速さが途中で変わる1日を作り、各時刻の日末の見込みを実際の回数と比べます。
+# 最後に上限を下げて節約中にし、メイン以外のセンサーを読み取らずに前回の値を使うことを確認します。
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from api.mock_api.mock_api_server import MockApiServer
+from api.smart_home_devices.smart_home_device_exception import SmartHomeDeviceException
+from api.smart_home_devices.smart_home_device_factory import SmartHomeDeviceFactory
+from preferences.mock_api.mock_api_server_preference import MockApiServerPreference
+from preferences.mock_api.mock_endpoint_preference import MockEndpointPreference
+from settings import LOCAL_TZ, app_preference
+from shared.dataclass.api_quota_state import ApiQuotaState
+from util.api_quota import ApiQuota
+from util.time_helper import TimeHelper
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    app_preference.api_quota.enabled = True
+    app_preference.api_quota.state_path = os.path.join(directory, "api_quota.json")
+    app_preference.cycle_metrics.enabled = False
+    app_preference.device_shadow.enabled = False
+
+    server = MockApiServer(
+        MockApiServerPreference(port=0, seed=0, switchbot=MockEndpointPreference(api_error_rate=0.2))
+    )
+    server.start()
+    os.environ.update(server.get_environment())
+    os.environ.update(
+        {
+            "SWITCHBOT_ACCESS_TOKEN": "mock",
+            "SWITCHBOT_SECRET": "mock",
+            "SWITCHBOT_CIRCULATOR_DEVICE_ID": "mock-circulator",
+            "SWITCHBOT_ELECTRIC_FAN_DEVICE_ID": "mock-electric-fan",
+            "SWITCHBOT_AIR_CONDITIONER_DEVICE_ID": "mock-aircon",
+            "SWITCHBOT_AIR_CONDITIONER_SUPPORT_DEVICE_ID": "mock-aircon-support",
+        }
+    )
+    main_sensor, sub_sensor = app_preference.sensors.main, app_preference.sensors.sub
+    for sensor in (main_sensor, sub_sensor):
+        os.environ[f"SWITCHBOT_{sensor.id.upper()}_DEVICE_ID"] = f"mock-{sensor.id}"
+
+    # 記録した呼び出し回数とサーバーが受けたリクエスト数を比べる
+    device = SmartHomeDeviceFactory.create_device()
+    failures = 0
+    for _ in range(20):
+        for sensor in (main_sensor, sub_sensor):
+            try:
+                device.get_air_quality_by_sensor(sensor)
+            except SmartHomeDeviceException:
+                failures += 1
+    # 風量は1段階ずつ変えるため、0から2にすると2回呼び出す
+    device.circulator_fan_speed(2, 0)
+    requests_received = sum(server.stats.values())
+    print(
+        f"センサー40回・風量0→2: サーバーのリクエスト {requests_received}回, "
+        f"記録した呼び出し {ApiQuota.count_calls()}回（3回とも失敗した読み取り {failures}回）"
+    )
+    for key, count in sorted(ApiQuota.get().calls.items()):
+        print(f"  {key}: {count}")
+
+    # 呼び出しの速さが途中で変わる1日の日末の見込み
+    day = LOCAL_TZ.localize(datetime(2024, 8, 1))
+    state = ApiQuotaState(budget_date=day.date())
+    calls_by_minute = {}
+    for minute in range(0, 24 * 60, 5):
+        # 8時から20時は5分ごとに12回、それ以外は6回
+        calls_by_minute[minute] = 12 if 8 * 60 <= minute < 20 * 60 else 6
+    actual = sum(calls_by_minute.values())
+    print(f"1日の実際の呼び出し: {actual}回")
+    for minute, calls in calls_by_minute.items():
+        state.calls["sensor:status:success"] = state.calls.get("sensor:status:success", 0) + calls
+        state.slot_calls[minute // ApiQuota.SLOT_MINUTES] += calls
+        if minute % (4 * 60) == 4 * 60 - 5:
+            # 4時間ごとの区切りの直前（最後は日付が変わる直前）の見込み
+            current_time = day + timedelta(minutes=minute + 5, seconds=-1)
+            print(
+                f"  {current_time.strftime('%H:%M:%S')}: 本日 {sum(state.calls.values())}回, "
+                f"日末の見込み {ApiQuota.project_daily_calls(state, current_time)}回"
+            )
+
+    # 節約中はメイン以外のセンサーを読み取らない
+    app_preference.polling.daily_api_budget = ApiQuota.count_calls()
+    ApiQuota._degraded = None
+    requests_before = sum(server.stats.values())
+    device.get_air_quality_by_sensor(main_sensor)
+    device.get_air_quality_by_sensor(sub_sensor)
+    print(
+        f"節約中: {ApiQuota.is_degraded()}, メインとサブの読み取りでサーバーが受けたリクエスト "
+        f"{sum(server.stats.values()) - requests_before}回"
+    )
+    server.stop()
+
+    # 呼び出し1回の記録にかかる時間（毎回ファイルに保存する）
+    TimeHelper.set_current_time(datetime.now(LOCAL_TZ))
+    count = 1000
+    started = time.perf_counter()
+    for _ in range(count):
+        ApiQuota.record_call("circulator", "commands", "success")
+    print(f"record_call: {(time.perf_counter() - started) / count * 1e6:.1f}µs/回")
@@ -0,0 +1,381 @@
+# 主要な処理の実行時間を計測し、保存した基準値と比べるスクリプト
+# 実行方法: python -m benchmarks.benchmark_suite [--update-baseline] [--threshold 0.25] [--case calculate_pmv ...]
+#
+# 入力は記録した測定と同じ形式（ReplayCycle）の5分間隔1日分の測定と時間単位の天気予報を生成して使います。
+# PMVキャッシュと表面温度モデルは無効にして計算そのものを計測します。
+# PMVは測定時刻のMET値（食事・就寝前の時間帯は1を超える）で計算し、暑いサイクルでは
+# サーキュレーターの風速で計算して、冷却効果の計算を含めます。
+# データベースの処理は.envのデータベース（ローカルのPostgreSQL）で計測し、書き込んだデータは最後にロールバックします。
+# データベースに接続できない場合、その処理は計測しません。
+# SwitchBotはローカルで起動するモックサーバー（api/mock_api/mock_api_server.py）を使います。
+#
+# 各処理の1回あたりの時間（繰り返しの中央値）をbenchmarks/baselines.jsonの基準値と比べ、
+# 閾値（既定25%）を超えて遅くなった処理がある場合は終了コード1で終了します。
+# 基準値は同じマシンで計測した値と比べてください（--update-baselineで計測した値を基準値として保存します）。
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, ContextManager
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from api.mock_api.mock_api_server import MockApiServer
+from api.smart_home_devices.switchbot_api import SwitchBotApi
+from benchmarks.replay_engine_benchmark import START, generate_cycles, generate_forecasts
+from db.db_session_manager import DBSessionManager
+from devices.aircon.aircon_settings_determiner import AirconSettingsDeterminer
+from logger.system_event_logger import logger
+from models.aircon_setting_model import AirconSettingModel
+from preferences.mock_api.mock_api_server_preference import MockApiServerPreference
+from repository.queries.measurement_queries import MeasurementQueries
+from repository.services.aircon_intensity_score_service import AirconIntensityScoreService
+from repository.services.measurement_service import MeasurementService
+from settings import app_preference, thermal_preference
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.circulator_settings import CirculatorSettings
+from shared.dataclass.effective_outdoor_temperature import EffectiveOutdoorTemperature
+from shared.dataclass.electric_fan_settings import ElectricFanSettings
+from shared.enums.aircon_fan_speed import AirconFanSpeed
+from shared.enums.aircon_mode import AirconMode
+from shared.enums.power_mode import PowerMode
+from util.met_clo_adjuster import MetCloAdjuster
+from util.replay_engine import ReplayEngine
+from util.thermal_comfort import ThermalComfort
+from util.time_helper import TimeHelper
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_THRESHOLD = 0.25
+ROUNDS = 5
+
+# 5分間隔1日分
+CYCLE_COUNT = 288
+
+# データベースの既存のデータと重ならないように、エアコン設定を保存する年
+INTENSITY_YEAR = 2000
+
+# 計測する処理と、1回の実行で処理する回数（データベースに接続できない場合はNone）
+Case = ContextManager[tuple[Callable[[], None], int] | None]
+
+
+class Fixture:
+    # 各処理の入力をまとめて生成する
+    def __init__(self):
+        self.cycles = generate_cycles(CYCLE_COUNT)
+        self.forecasts = generate_forecasts(48)
+        self.temperatures = [
+            EffectiveOutdoorTemperature(
+                outdoor_temperature=cycle.home_sensor.outdoor.air_quality.temperature,
+                forecast_temperature=None,
+            )
+            for cycle in self.cycles
+        ]
+        self.closest_forecasts = [
+            self.forecasts[(cycle.measurement_time - START) // timedelta(hours=1) + 1]
+            for cycle in self.cycles
+        ]
+        # 食事の時間帯などのMET値の調整は現在時刻で決まるため、測定時刻で計算する
+        self.comfort_factors = []
+        for cycle, temperature, forecast in zip(
+            self.cycles, self.temperatures, self.closest_forecasts
+        ):
+            TimeHelper.set_current_time(cycle.measurement_time)
+            self.comfort_factors.append(
+                MetCloAdjuster.calculate_comfort_factors(temperature, False, forecast)
+            )
+        self.pmv_results = []
+        self.wind_speeds = []
+        for cycle, temperature, factors in zip(self.cycles, self.temperatures, self.comfort_factors):
+            TimeHelper.set_current_time(cycle.measurement_time)
+            pmv_result = ThermalComfort.calculate_pmv(cycle.home_sensor, temperature.value, factors)
+            # 暑い場合はサーキュレーターを動かすものとして、その風速で計算し直す
+            wind_speed = ReplayEngine.WIND_SPEED
+            if pmv_result.pmv > 0:
+                wind_speed = ReplayEngine.CIRCULATOR_WIND_SPEED
+                pmv_result = ThermalComfort.calculate_pmv(
+                    cycle.home_sensor, temperature.value, factors, wind_speed
+                )
+            self.pmv_results.append(pmv_result)
+            self.wind_speeds.append(wind_speed)
+        TimeHelper.set_current_time(None)
+
+
+@contextmanager
+def database_session():
+    # 書き込んだデータを最後にロールバックするセッション（接続できない場合はNone）
+    session = DBSessionManager.session()
+    try:
+        session.execute(text("SELECT 1"))
+    except OperationalError:
+        session.close()
+        yield None
+        return
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@contextmanager
+def bench_calculate_pmv(fixture: Fixture) -> Case:
+    def run():
+        for cycle, temperature, factors, wind_speed in zip(
+            fixture.cycles, fixture.temperatures, fixture.comfort_factors, fixture.wind_speeds
+        ):
+            TimeHelper.set_current_time(cycle.measurement_time)
+            ThermalComfort.calculate_pmv(cycle.home_sensor, temperature.value, factors, wind_speed)
+        TimeHelper.set_current_time(None)
+
+    yield run, CYCLE_COUNT
+
+
+@contextmanager
+def bench_calculate_comfort_factors(fixture: Fixture) -> Case:
+    def run():
+        for cycle, temperature, forecast in zip(
+            fixture.cycles, fixture.temperatures, fixture.closest_forecasts
+        ):
+            TimeHelper.set_current_time(cycle.measurement_time)
+            MetCloAdjuster.calculate_comfort_factors(temperature, False, forecast)
+        TimeHelper.set_current_time(None)
+
+    yield run, CYCLE_COUNT
+
+
+@contextmanager
+def bench_determine_aircon_settings(fixture: Fixture) -> Case:
+    def run():
+        for cycle, forecast, pmv_result in zip(
+            fixture.cycles, fixture.closest_forecasts, fixture.pmv_results
+        ):
+            TimeHelper.set_current_time(cycle.measurement_time)
+            AirconSettingsDeterminer.determine_aircon_settings(
+                pmv_result, cycle.home_sensor, forecast, False
+            )
+        TimeHelper.set_current_time(None)
+
+    yield run, CYCLE_COUNT
+
+
+@contextmanager
+def bench_get_daily_aircon_intensity(fixture: Fixture) -> Case:
+    with database_session() as session:
+        if session is None:
+            yield None
+            return
+
+        # 5分間隔1日分のエアコン設定を保存し、その日の強度を計算する
+        rng = np.random.default_rng(0)
+        measurement_queries = MeasurementQueries(session)
+        for cycle in fixture.cycles:
+            created_at = cycle.measurement_time.replace(year=INTENSITY_YEAR)
+            measurement = measurement_queries.insert(created_at.isoformat())
+            session.add(
+                AirconSettingModel(
+                    measurement_id=measurement.id,
+                    temperature=float(rng.choice([22, 24, 26, 28])),
+                    mode_id=int(
+                        rng.choice([AirconMode.COOLING.id, AirconMode.DRY.id, AirconMode.FAN.id])
+                    ),
+                    fan_speed_id=AirconFanSpeed.AUTO.id,
+                    power=str(rng.choice([PowerMode.ON.name, PowerMode.OFF.name])),
+                    created_at=created_at,
+                )
+            )
+        session.flush()
+        date = START.replace(year=INTENSITY_YEAR).strftime("%Y-%m-%d")
+        service = AirconIntensityScoreService(session)
+
+        def run():
+            service.get_daily_aircon_intensity(date)
+
+        yield run, 1
+
+
+@contextmanager
+def bench_create_measurement_and_related_data(fixture: Fixture) -> Case:
+    with database_session() as session:
+        if session is None:
+            yield None
+            return
+
+        aircon_settings = AirconSettings(temperature=26, mode=AirconMode.COOLING)
+        circulator_settings = CirculatorSettings(power=PowerMode.ON, fan_speed=2)
+        electric_fan_settings = ElectricFanSettings()
+        service = MeasurementService(session)
+        count = 50
+
+        def run():
+            for cycle, pmv_result in zip(fixture.cycles[:count], fixture.pmv_results):
+                service.create_measurement_and_related_data(
+                    cycle.measurement_time,
+                    cycle.home_sensor,
+                    pmv_result,
+                    aircon_settings,
+                    circulator_settings,
+                    electric_fan_settings,
+                )
+                session.flush()
+
+        yield run, count
+
+
+@contextmanager
+def bench_settings_import(fixture: Fixture) -> Case:
+    # 新しいプロセスでsettingsのimportにかかる時間（Pythonの起動時間は含まない）
+    code = "import time; s = time.perf_counter(); import settings; print(time.perf_counter() - s)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    elapsed = []
+
+    def run():
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+        )
+        elapsed.append(float(result.stdout.strip().splitlines()[-1]))
+
+    # 計測した時間の代わりに子プロセスが出力した時間を使う
+    run.reported = elapsed
+    yield run, 1
+
+
+@contextmanager
+def bench_switchbot_sensor_read(fixture: Fixture) -> Case:
+    # コマンドの送信はAPIの呼び出し前に2秒待つため計測せず、センサーの読み取りを計測する
+    # 遅延やエラーのないモックサーバーで、クライアント側の処理時間を計測する
+    server = MockApiServer(MockApiServerPreference(port=0))
+    server.start()
+    os.environ.update(server.get_environment())
+    for key in (
+        "SWITCHBOT_ACCESS_TOKEN",
+        "SWITCHBOT_SECRET",
+        "SWITCHBOT_CIRCULATOR_DEVICE_ID",
+        "SWITCHBOT_ELECTRIC_FAN_DEVICE_ID",
+        "SWITCHBOT_AIR_CONDITIONER_DEVICE_ID",
+        "SWITCHBOT_AIR_CONDITIONER_SUPPORT_DEVICE_ID",
+    ):
+        os.environ[key] = "benchmark"
+    sensor = fixture.cycles[0].home_sensor.main
+    os.environ[f"SWITCHBOT_{sensor.id.upper()}_DEVICE_ID"] = "benchmark"
+    api = SwitchBotApi()
+    count = 20
+
+    def run():
+        for _ in range(count):
+            api.get_air_quality_by_sensor(sensor)
+
+    try:
+        yield run, count
+    finally:
+        server.stop()
+
+
+CASES: dict[str, Callable[[Fixture], Case]] = {
+    "calculate_pmv": bench_calculate_pmv,
+    "calculate_comfort_factors": bench_calculate_comfort_factors,
+    "determine_aircon_settings": bench_determine_aircon_settings,
+    "get_daily_aircon_intensity": bench_get_daily_aircon_intensity,
+    "create_measurement_and_related_data": bench_create_measurement_and_related_data,
+    "settings_import": bench_settings_import,
+    "switchbot_sensor_read": bench_switchbot_sensor_read,
+}
+
+
+def measure(run: Callable[[], None], number: int) -> float:
+    # 1回あたりの時間（秒）の、ROUNDS回の繰り返しの中央値を返す
+    run()  # 1回目はimportや接続の確立を含むため除く
+    reported = getattr(run, "reported", None)
+    if reported is not None:
+        reported.clear()
+    elapsed = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        run()
+        elapsed.append((time.perf_counter() - start) / number)
+    return statistics.median(reported if reported else elapsed)
+
+
+def load_baselines() -> dict:
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}µs"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="主要な処理の実行時間を基準値と比べます")
+    parser.add_argument("--update-baseline", action="store_true", help="計測した値を基準値として保存する")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="遅くなったとみなす割合（0.25は25%%）"
+    )
+    parser.add_argument("--case", nargs="+", choices=list(CASES), help="計測する処理（省略時はすべて）")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    thermal_preference.pmv_cache.enabled = False
+    thermal_preference.surface_model.enabled = False
+    app_preference.database.enabled = False
+
+    fixture = Fixture()
+    baselines = load_baselines()
+    environment = {"python": platform.python_version(), "machine": platform.machine()}
+    if baselines and baselines.get("environment") != environment:
+        print(f"基準値の環境が異なります: {baselines.get('environment')} -> {environment}")
+    baseline_cases = baselines.get("cases", {})
+
+    results = {}
+    regressions = []
+    for name in args.case or CASES:
+        with CASES[name](fixture) as case:
+            if case is None:
+                print(f"{name:<38} {'-':>10}  （データベースに接続できないため計測しません）")
+                continue
+            seconds = measure(*case)
+        results[name] = seconds
+        baseline = baseline_cases.get(name)
+        if baseline is None:
+            print(f"{name:<38} {format_seconds(seconds):>10}  （基準値なし）")
+            continue
+        ratio = seconds / baseline - 1
+        regressed = ratio > args.threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<38} {format_seconds(seconds):>10}  基準値 {format_seconds(baseline):>10}"
+            f"  {ratio:+7.1%}{'  遅くなりました' if regressed else ''}"
+        )
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "environment": environment,
+                    "updated_at": datetime.now().isoformat(timespec="seconds"),
+                    "cases": {**baseline_cases, **results},
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        print(f"基準値を保存しました: {BASELINE_PATH}")
+    elif regressions:
+        print(f"閾値{args.threshold:.0%}を超えて遅くなった処理: {', '.join(regressions)}")
+        sys.exit(1)
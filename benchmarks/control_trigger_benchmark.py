@@ -0,0 +1,83 @@
+# 測定値の変化による制御の実行回数と判定時間を確認するスクリプト
+# 実行方法: python -m benchmarks.control_trigger_benchmark
+#
+# データベースは使わず、5分間隔の測定1週間分をゆるやかな変化で生成し、
+# 制御を実行したサイクルの数と理由、1回の判定にかかる時間を表示します。
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from logger.system_event_logger import logger
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
+from settings import LOCAL_TZ, app_preference
+from shared.dataclass.home_sensor import HomeSensor
+from shared.dataclass.sensor import Sensor
+from util.control_trigger import ControlTrigger
+from util.time_helper import TimeHelper
+
+START = LOCAL_TZ.localize(datetime(2024, 7, 1))
+
+
+def sensor(name: str, temperature: float, humidity: float, co2_level: int | None = None) -> Sensor:
+    return Sensor(
+        id=name,
+        label=name,
+        location=name,
+        type="温湿度計",
+        air_quality={
+            "temperature": round(temperature, 1),
+            "humidity": round(humidity),
+            "co2_level": co2_level,
+        },
+    )
+
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)
+    rng = np.random.default_rng(0)
+    count = 7 * 24 * 12
+    minutes = np.arange(count) * 5
+    outdoor = 28 + 6 * np.sin(2 * np.pi * (minutes / 60 - 9) / 24) + rng.normal(0, 0.05, count)
+    # 室温と湿度はセンサーの分解能程度の揺らぎを含むゆるやかな変化
+    indoor = 26 + np.cumsum(rng.normal(0, 0.03, count))
+    humidity = 55 + np.cumsum(rng.normal(0, 0.2, count))
+    co2 = 600 + np.cumsum(rng.normal(0, 5, count)).astype(int)
+
+    state_path = os.path.join(tempfile.mkdtemp(), "control_trigger_state.json")
+    app_preference.control_trigger.state_path = state_path
+    reasons = Counter()
+    elapsed = 0.0
+    for index in range(count):
+        current_time = START + timedelta(minutes=int(minutes[index]))
+        TimeHelper.set_current_time(current_time)
+        home_sensor = HomeSensor(
+            main=sensor("main", indoor[index], humidity[index], int(co2[index])),
+            sub=sensor("sub", indoor[index] + 1, humidity[index] - 2),
+            supplementaries=[sensor("supplementary", indoor[index] - 0.5, humidity[index] + 1)],
+            outdoor=sensor("outdoor", outdoor[index], 70),
+        )
+        forecast = WeatherForecastHourlyModel(
+            forecast_time=current_time.replace(minute=0) + timedelta(hours=1)
+        )
+
+        started = time.perf_counter()
+        snapshot = ControlTrigger.create_snapshot(home_sensor, forecast)
+        reason = ControlTrigger.find_trigger(ControlTrigger.load_snapshot(state_path), snapshot)
+        elapsed += time.perf_counter() - started
+
+        if reason:
+            reasons[reason[0]] += 1
+            ControlTrigger.save_snapshot(state_path, snapshot)
+        else:
+            reasons["steady"] += 1
+
+    controlled = count - reasons["steady"]
+    print(f"サイクル数: {count}, 制御したサイクル: {controlled} ({controlled / count:.1%})")
+    for reason, number in reasons.most_common():
+        print(f"  {reason}: {number}")
+    print(f"1回の判定: {elapsed / count * 1e6:.0f}µs")
@@ -0,0 +1,89 @@
+# 処理ごとの所要時間の計測にかかる時間と、ヒストグラムから求めた分位数の精度を確認するスクリプト
+# 実行方法: python -m benchmarks.cycle_metrics_benchmark
+#
+# 計測しない設定と計測する設定でmeasureを繰り返した時間、1サイクル分の計測結果をflushする時間、
+# 対数正規分布の所要時間から求めた分位数と実際の分位数を比べます。
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from logger.system_event_logger import logger
+from settings import app_preference
+from shared.dataclass.stage_histogram import StageHistogram
+from util.cycle_metrics import CycleMetrics
+
+# 1サイクルで計測する処理（main.pyと同じ程度の数）
+STAGES = [
+    ("cycle", ""),
+    ("sensor_read", "リビング"),
+    ("sensor_read", "寝室"),
+    ("sensor_read", "屋外"),
+    ("forecast_fetch", ""),
+    ("forecast_query", ""),
+    ("pmv", ""),
+    ("decision", "aircon"),
+    ("device_update", "aircon"),
+    ("device_command", "aircon"),
+    ("device_update", "circulator"),
+    ("device_update", "electric_fan"),
+    ("db_write", ""),
+]
+
+
+def time_measure(count: int) -> float:
+    # measureを空の処理で繰り返し、1回あたりの時間（マイクロ秒）を返す
+    started = time.perf_counter()
+    for _ in range(count):
+        with CycleMetrics.measure("pmv"):
+            pass
+    elapsed = time.perf_counter() - started
+    CycleMetrics._observations = []
+    return elapsed / count * 1e6
+
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)
+    directory = tempfile.mkdtemp()
+    preference = app_preference.cycle_metrics
+    preference.state_path = os.path.join(directory, "cycle_metrics.json")
+    preference.textfile_path = os.path.join(directory, "metrics", "home_comfort_control.prom")
+
+    preference.enabled = False
+    disabled = time_measure(100000)
+    preference.enabled = True
+    enabled = time_measure(100000)
+    print(f"measure 1回: 計測しない {disabled:.2f}µs, 計測する {enabled:.2f}µs")
+
+    # 1サイクル分の計測結果を保存・出力する時間（保存したヒストグラムを毎回読み込む）
+    rng = np.random.default_rng(0)
+    cycles = 200
+    flush_seconds = []
+    for _ in range(cycles):
+        for stage, target in STAGES:
+            CycleMetrics._observations.append((stage, target, float(rng.lognormal(-4, 1))))
+        started = time.perf_counter()
+        CycleMetrics.flush()
+        flush_seconds.append(time.perf_counter() - started)
+    print(
+        f"flush 1回（{len(STAGES)}処理）: 中央値 {np.median(flush_seconds) * 1000:.2f}ms, "
+        f"最大 {np.max(flush_seconds) * 1000:.2f}ms"
+    )
+    histograms = CycleMetrics.load_histograms(preference.state_path, preference.buckets)
+    print(f"保存したヒストグラム: {len(histograms)}系列, 各{histograms[0].count}回")
+
+    # ヒストグラムから求めた分位数と実際の分位数の比較
+    samples = rng.lognormal(-4, 1, 10000)
+    histogram = StageHistogram(stage="pmv", bucket_counts=[0] * (len(preference.buckets) + 1))
+    for sample in samples:
+        CycleMetrics.observe(histogram, preference.buckets, float(sample))
+    for quantile in CycleMetrics.QUANTILES:
+        estimated = CycleMetrics.calculate_quantile(histogram, preference.buckets, quantile)
+        actual = np.quantile(samples, quantile)
+        print(f"p{quantile * 100:g}: 実際 {actual * 1000:.2f}ms, ヒストグラム {estimated * 1000:.2f}ms")
+
+    with open(preference.textfile_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    print(f"テキストファイル: {len(lines)}行, 最後の行 {lines[-1]}")
@@ -0,0 +1,41 @@
+# 機器の状態のシャドウで送信しなかったコマンドの数を確認するスクリプト
+# 実行方法: python -m benchmarks.device_shadow_benchmark
+#
+# データベースは使わず、5分間隔の測定1週間分を再生し、
+# シャドウを使わない場合と使う場合で送信したコマンドの数を比べます。
+import logging
+import os
+import tempfile
+
+from api.smart_home_devices.recording_smart_home_device import RecordingSmartHomeDevice
+from api.smart_home_devices.shadow_smart_home_device import ShadowSmartHomeDevice
+from benchmarks.replay_engine_benchmark import create_engine, generate_cycles
+from logger.system_event_logger import logger
+from settings import app_preference, thermal_preference
+from util.device_shadow import DeviceShadow
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)
+    thermal_preference.surface_model.enabled = False
+    app_preference.device_shadow.state_path = os.path.join(tempfile.mkdtemp(), "device_shadow.json")
+    cycles = generate_cycles(12 * 24 * 7)
+
+    engine = create_engine(cycles)
+    engine.run()
+    without_shadow = engine.count_commands()
+
+    engine = create_engine(cycles)
+    recording = RecordingSmartHomeDevice()
+    shadow = DeviceShadow()
+    engine.device = ShadowSmartHomeDevice(recording, shadow)
+    engine.run()
+    with_shadow = recording.count_commands()
+
+    print(f"{len(cycles)}サイクル")
+    for command in sorted(without_shadow):
+        print(f"  {command}: {without_shadow[command]}回 -> {with_shadow[command]}回")
+    print(f"送信しなかったAPI呼び出し: {shadow.saved_calls}回")
+
+    # 保存した状態を読み込めることを確認
+    loaded = DeviceShadow.load(app_preference.device_shadow.state_path)
+    print(f"保存した状態の読み込み: {DeviceShadow.is_same_aircon_settings(loaded.aircon, shadow.aircon)}")
@@ -0,0 +1,76 @@
+# 絶対湿度・露点温度の配列版と1件ずつのmathモジュール版の1行あたりの計算時間を計測し、結果が一致することを確認するスクリプト
+# 実行方法: python -m benchmarks.humidity_metrics_benchmark [--rows 1000000]
+import argparse
+import time
+
+import numpy as np
+
+from util.humidity_metrics import HumidityMetrics
+
+# 1件ずつ計算する場合の計測に使う行数
+SCALAR_ROWS = 100_000
+
+
+def create_readings(rows: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    # センサーの分解能（温度0.1度、湿度1%）で丸めた計測値を乱数で作成
+    rng = np.random.default_rng(seed)
+    temperature = np.round(rng.uniform(-10, 40, rows), 1)
+    humidity = np.round(rng.uniform(1, 100, rows))
+    return temperature, humidity
+
+
+def measure(label: str, rows: int, function, *args) -> np.ndarray:
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    print(f"{label}: 合計 {seconds * 1000:.1f}ms, 1行あたり {seconds / rows * 1e9:.1f}ns")
+    return np.asarray(result, dtype=float)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="絶対湿度・露点温度の計算時間を計測します")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    temperature, humidity = create_readings(args.rows)
+    scalar_temperature = temperature[:SCALAR_ROWS].tolist()
+    scalar_humidity = humidity[:SCALAR_ROWS].tolist()
+
+    absolute_humidity = measure(
+        f"絶対湿度（配列版, {args.rows}行）",
+        args.rows,
+        HumidityMetrics.calculate_absolute_humidity_array,
+        temperature,
+        humidity,
+    )
+    scalar_absolute_humidity = measure(
+        f"絶対湿度（1件ずつ, {SCALAR_ROWS}行）",
+        SCALAR_ROWS,
+        lambda: [
+            HumidityMetrics.calculate_absolute_humidity(t, h)
+            for t, h in zip(scalar_temperature, scalar_humidity)
+        ],
+    )
+    dew_point = measure(
+        f"露点温度（配列版, {args.rows}行）",
+        args.rows,
+        HumidityMetrics.calculate_dew_point_array,
+        temperature,
+        humidity,
+    )
+    scalar_dew_point = measure(
+        f"露点温度（1件ずつ, {SCALAR_ROWS}行）",
+        SCALAR_ROWS,
+        lambda: [
+            HumidityMetrics.calculate_dew_point(t, h)
+            for t, h in zip(scalar_temperature, scalar_humidity)
+        ],
+    )
+
+    # 絶対湿度はNumPyとmathのべき乗の実装の違いで最下位の桁が異なることがあるため、相対誤差で比べる
+    relative_error = np.abs(absolute_humidity[:SCALAR_ROWS] / scalar_absolute_humidity - 1)
+    print(
+        "1件ずつの計算（mathモジュール版）との差: "
+        f"絶対湿度の最大相対誤差 {relative_error.max():.1e}, "
+        f"露点温度の不一致 {np.sum(dew_point[:SCALAR_ROWS] != scalar_dew_point)}件"
+    )
@@ -0,0 +1,70 @@
+# SystemEventLogger.log_errorの1回あたりの時間を、呼び出し元の取得方法ごとに比べるスクリプト
+# 実行方法: python -m benchmarks.log_error_benchmark
+#
+# inspect.stackでスタック全体を取得していた以前の方法と、sys._getframeで呼び出し元のフレームだけを
+# 参照する現在の方法を、呼び出しの深さを変えて比べます。エラーが続けて発生する状況を想定し、
+# ハンドラーはコンソールの代わりに通知用のバッファだけにします。
+# ERRORを出力しないレベルに設定した場合は、メッセージを翻訳しない時間も計測します。
+import inspect
+import logging
+import time
+
+import i18n
+
+from api.weather_foreecast.open_weather_map_api import OpenWeatherMapApi
+from logger.system_event_logger import SystemEventLogger, console_handler, logger
+from util.string_helper import StringHelper
+
+
+def legacy_log_error(class_type=None, **kwargs):
+    # 以前の実装（inspect.stackで呼び出し元を取得し、すぐに翻訳する）
+    stack = inspect.stack()[1]
+    class_name = class_type.__name__
+    method_name = stack.function
+    message_key = f"{StringHelper.camel_to_snake(class_name)}.{method_name}"
+    logger.error(i18n.t(key=f"error.{message_key}", **kwargs))
+
+
+def fetch_forecast_api(log_error, depth: int):
+    # 呼び出しの深さを変えるために再帰し、翻訳ファイルにあるメソッド名から呼び出す
+    if depth > 0:
+        return fetch_forecast_api(log_error, depth - 1)
+    log_error(class_type=OpenWeatherMapApi, message="timeout")
+
+
+def measure(log_error, depth: int, count: int) -> float:
+    # 1回あたりの時間（µs）
+    started = time.perf_counter()
+    for _ in range(count):
+        fetch_forecast_api(log_error, depth)
+    elapsed = time.perf_counter() - started
+    SystemEventLogger.reset_log_buffer()
+    return elapsed / count * 1e6
+
+
+if __name__ == "__main__":
+    logger.removeHandler(console_handler)
+    count = 2000
+
+    # どちらも同じメッセージを出力する
+    for log_error in (legacy_log_error, SystemEventLogger.log_error):
+        fetch_forecast_api(log_error, 0)
+    first, second = SystemEventLogger.get_buffered_logs().splitlines()
+    SystemEventLogger.reset_log_buffer()
+    print(f"メッセージ: {second}（以前の実装と同じ: {first == second}）")
+
+    for depth in (0, 10, 30):
+        legacy = measure(legacy_log_error, depth, count)
+        current = measure(SystemEventLogger.log_error, depth, count)
+        print(
+            f"呼び出しの深さ {depth:2d}: inspect.stack {legacy:8.1f}µs/回, "
+            f"sys._getframe {current:6.1f}µs/回（{legacy / current:.0f}倍）"
+        )
+
+    logger.setLevel(logging.CRITICAL)
+    legacy = measure(legacy_log_error, 10, count)
+    current = measure(SystemEventLogger.log_error, 10, count)
+    print(
+        f"ERRORを出力しないレベル（深さ10）: inspect.stack {legacy:.1f}µs/回, "
+        f"sys._getframe {current:.1f}µs/回"
+    )
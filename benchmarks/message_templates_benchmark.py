@@ -0,0 +1,114 @@
+# 変換したテンプレートでのメッセージの翻訳を、i18n.tと比べるスクリプト
+# 実行方法: python -m benchmarks.message_templates_benchmark
+#
+# 翻訳ファイルのすべてのキーで、i18n.tと同じメッセージになることを確認し、
+# 1回の翻訳と、制御サイクル1回分の環境情報・PMVのログの出力にかかる時間を比べます
+# （ハンドラーはコンソールの代わりに通知用のバッファだけにします）。
+# 別のプロセスで、設定を読み込んでから最初のメッセージを翻訳するまでの時間も、
+# i18n.t・テンプレートを変換する場合・保存したテンプレートを読み込む場合で比べます。
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+import i18n
+
+from benchmarks.benchmark_suite import Fixture
+from logger.system_event_logger import SystemEventLogger, console_handler, logger
+from translations.message_templates import MessageTemplates
+from util.time_helper import TimeHelper
+
+FIRST_TRANSLATION = """
+import time
+import settings
+started = time.perf_counter()
+import i18n
+from translations.message_templates import MessageTemplates
+MessageTemplates.CACHE_PATH = {cache_path!r}
+translate = i18n.t if {legacy} else MessageTemplates.translate
+translate("log.time_related.current_time", current_time="2024-07-01 12:00:00")
+print(time.perf_counter() - started)
+"""
+
+
+def measure(run, count: int) -> float:
+    # 1回あたりの時間（µs）
+    started = time.perf_counter()
+    for _ in range(count):
+        run()
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def measure_first_translation(cache_path: str, legacy: bool, cached: bool) -> float:
+    # 設定を読み込んでから最初のメッセージを翻訳するまでの時間（ms）。5回のうち最も短い時間
+    script = FIRST_TRANSLATION.format(cache_path=cache_path, legacy=legacy)
+    times = []
+    for _ in range(5):
+        if not cached and os.path.exists(cache_path):
+            os.remove(cache_path)
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        times.append(float(result.stdout) * 1000)
+    return min(times)
+
+
+if __name__ == "__main__":
+    logger.removeHandler(console_handler)
+    locale = i18n.config.get("locale")
+    templates = MessageTemplates.compile(locale)
+
+    # すべてのキーで、データがある場合・一部がない場合に同じメッセージになる
+    random.seed(0)
+    mismatches = 0
+    for key, template in templates.items():
+        names = {name.lstrip("%") for _, name, _, _ in string.Formatter().parse(template) if name}
+        for kwargs in (
+            {name: random.choice([1, 2.5, "文字列", None]) for name in names},
+            {name: "値" for name in list(names)[: len(names) // 2]},
+        ):
+            if MessageTemplates.translate(key, **kwargs) != i18n.t(key, **kwargs):
+                mismatches += 1
+                print(f"異なるメッセージ: {key} {kwargs}")
+    print(f"変換したメッセージ: {len(templates)}件, i18n.tと異なるメッセージ: {mismatches}件")
+
+    # 1回の翻訳
+    count = 20000
+    kwargs = {"wall": "25.0", "ceiling": "26.0", "floor": "24.0", "mrt": "25.0"}
+    key = "log.pmv_calculation.surface_temperatures"
+    legacy = measure(lambda: i18n.t(key, **kwargs), count)
+    current = measure(lambda: MessageTemplates.translate(key, **kwargs), count)
+    print(f"1回の翻訳: i18n.t {legacy:.1f}µs, テンプレート {current:.1f}µs（{legacy / current:.1f}倍）")
+
+    # 制御サイクル1回分の環境情報とPMVのログ
+    fixture = Fixture()
+    cycle, pmv_result = fixture.cycles[0], fixture.pmv_results[0]
+    comfort_factors, forecast = fixture.comfort_factors[0], fixture.closest_forecasts[0]
+    TimeHelper.set_current_time(cycle.measurement_time)
+
+    def log_cycle():
+        SystemEventLogger.log_environment_data(cycle.home_sensor, 30.0, forecast)
+        SystemEventLogger.log_pmv(pmv_result, comfort_factors)
+        SystemEventLogger.reset_log_buffer()
+
+    count = 2000
+    current = measure(log_cycle, count)
+    translate = MessageTemplates.translate
+    MessageTemplates.translate = i18n.t
+    try:
+        legacy = measure(log_cycle, count)
+    finally:
+        MessageTemplates.translate = translate
+    print(f"制御サイクル1回分のログ: i18n.t {legacy:.1f}µs, テンプレート {current:.1f}µs（{legacy / current:.1f}倍）")
+
+    # 設定を読み込んでから最初のメッセージを翻訳するまで
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "message_templates.json")
+        legacy = measure_first_translation(cache_path, True, False)
+        compiled = measure_first_translation(cache_path, False, False)
+        cached = measure_first_translation(cache_path, False, True)
+    print(
+        f"最初の翻訳まで: i18n.t {legacy:.1f}ms, "
+        f"テンプレートを変換 {compiled:.1f}ms, 保存したテンプレート {cached:.1f}ms"
+    )
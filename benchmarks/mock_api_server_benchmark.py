@@ -0,0 +1,99 @@
+# モックサーバーの応答・遅延・エラーの注入を確認するスクリプト
+# 実行方法: python -m benchmarks.mock_api_server_benchmark
+#
+# 各APIのクライアントをモックサーバーに向けて実行し、応答を解釈できることを確認します。
+# その後、遅延の分布とエラーの割合を設定したSwitchBotのステータス取得に並列でリクエストを送り、
+# 観測した遅延の分位数とエラーの割合を設定と比べ、リクエスト数の上限でHTTP 429を返すことを確認します。
+# クライアントも同じプロセスで動かすため、並列数を増やすと観測する遅延にクライアントの処理待ちが加わります。
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import requests
+
+from api.mock_api.mock_api_server import MockApiServer
+from api.smart_home_devices.switchbot_api import SwitchBotApi
+from api.weather_foreecast.jma_forecast_api import JmaForecastApi
+from api.weather_foreecast.open_weather_map_api import OpenWeatherMapApi
+from preferences.mock_api.mock_api_server_preference import MockApiServerPreference
+from preferences.mock_api.mock_endpoint_preference import LatencyPreference, MockEndpointPreference
+from shared.dataclass.sensor import Sensor
+
+if __name__ == "__main__":
+    # 遅延とエラーのない設定で、各APIのクライアントが応答を解釈できることを確認
+    server = MockApiServer(MockApiServerPreference(port=0))
+    server.start()
+    os.environ.update(server.get_environment())
+    os.environ.update(
+        {
+            "SWITCHBOT_ACCESS_TOKEN": "mock",
+            "SWITCHBOT_SECRET": "mock",
+            "SWITCHBOT_CIRCULATOR_DEVICE_ID": "mock-circulator",
+            "SWITCHBOT_ELECTRIC_FAN_DEVICE_ID": "mock-electric-fan",
+            "SWITCHBOT_AIR_CONDITIONER_DEVICE_ID": "mock-aircon",
+            "SWITCHBOT_AIR_CONDITIONER_SUPPORT_DEVICE_ID": "mock-aircon-support",
+            "SWITCHBOT_MAIN_DEVICE_ID": "mock-main",
+            "OPEN_WEATHER_MAP_API_KEY": "mock",
+            "OPEN_WEATHER_MAP_LAT": "35.0",
+            "OPEN_WEATHER_MAP_LON": "139.0",
+            "JMA_AREA_CODE": "130000",
+        }
+    )
+    sensor = Sensor(id="main", label="リビング", location="リビング", type="温湿度計")
+    print(f"SwitchBot センサー: {SwitchBotApi().get_air_quality_by_sensor(sensor)}")
+    print(f"SwitchBot デバイス一覧: {len(SwitchBotApi().get_device_list()['deviceList'])}台")
+    forecasts = OpenWeatherMapApi().fetch_forecast(date.today())
+    print(f"OpenWeatherMap: {len(forecasts)}日分, 最高気温 {forecasts[0].max_temperature}℃")
+    print(f"気象庁: 最高気温 {JmaForecastApi().fetch_forecast(date.today())[0].max_temperature}℃")
+    server.stop()
+
+    # 遅延の分布とエラーの割合
+    switchbot = MockEndpointPreference(
+        latency=LatencyPreference(distribution="lognormal", mean_ms=50, spread_ms=25),
+        error_rate=0.05,
+        api_error_rate=0.05,
+    )
+    server = MockApiServer(MockApiServerPreference(port=0, seed=0, switchbot=switchbot))
+    server.start()
+    url = f"{server.base_url}/v1.1/devices/mock-main/status"
+
+    def request(_) -> tuple[float, int, int | None]:
+        started = time.perf_counter()
+        response = requests.get(url)
+        return time.perf_counter() - started, response.status_code, response.json().get("statusCode")
+
+    count = 1000
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(request, range(count)))
+    elapsed = time.perf_counter() - started
+    latencies = np.array([result[0] for result in results]) * 1000
+    server_errors = sum(status == 500 for _, status, _ in results)
+    api_errors = sum(status == 200 and code != 100 for _, status, code in results)
+    print(
+        f"{count}リクエスト（8並列）: {elapsed:.2f}秒, 遅延 平均 {latencies.mean():.1f}ms "
+        f"p50 {np.percentile(latencies, 50):.1f}ms p95 {np.percentile(latencies, 95):.1f}ms"
+        f"（設定 平均{switchbot.latency.mean_ms:g}ms 標準偏差{switchbot.latency.spread_ms:g}ms）"
+    )
+    print(
+        f"HTTP 500: {server_errors / count:.1%}（設定 {switchbot.error_rate:.0%}）, "
+        f"statusCode 190: {api_errors / count:.1%}（設定 {switchbot.api_error_rate:.0%}）"
+    )
+    server.stop()
+
+    # リクエスト数の上限
+    server = MockApiServer(
+        MockApiServerPreference(
+            port=0, open_weather_map=MockEndpointPreference(rate_limit_per_minute=60)
+        )
+    )
+    server.start()
+    statuses = [
+        requests.get(f"{server.base_url}/data/2.5/forecast", params={"cnt": 1}).status_code
+        for _ in range(70)
+    ]
+    print(f"1分間の上限60回に70回リクエスト: HTTP 429 {statuses.count(429)}回")
+    print(f"サーバーの集計: {dict(sorted(server.stats.items()))}")
+    server.stop()
@@ -0,0 +1,111 @@
+# 中立温度の逆算の精度と速度を計測するスクリプト
+# 実行方法: python -m benchmarks.neutral_temperature_benchmark
+import time
+import warnings
+
+import numpy as np
+from scipy.optimize import brentq
+
+from util.thermal_comfort import ThermalComfort
+
+# 計測する条件の数
+CONDITION_COUNT = 200
+# 室温の探索範囲
+LOWER_TEMPERATURE = 10.0
+UPPER_TEMPERATURE = 40.0
+# 1件ずつ計算する場合の繰り返し回数
+SINGLE_REPEAT = 20
+
+
+def create_conditions(count: int, seed: int = 0) -> dict:
+    # 制御で扱う範囲の条件を乱数で作成
+    rng = np.random.default_rng(seed)
+    dry_bulb_temperature = rng.uniform(18, 30, count)
+    return {
+        "humidity": rng.uniform(30, 80, count),
+        "relative_air_speed": rng.choice([0.08, 0.1, 0.2, 0.3], count),
+        "met": rng.uniform(0.8, 1.5, count),
+        "dynamic_clothing_insulation": rng.uniform(0.3, 1.2, count),
+        "mean_radiant_temperature": dry_bulb_temperature + rng.uniform(-2, 2, count),
+        "dry_bulb_temperature": dry_bulb_temperature,
+        "target_pmv": rng.uniform(-0.5, 0.5, count),
+    }
+
+
+def pmv_at(temperature: np.ndarray, conditions: dict) -> np.ndarray:
+    # 逆算した室温でPMVを計算し直す
+    sensitivity = ThermalComfort.calculate_mean_radiant_temperature_sensitivity()
+    radiant_temperature = conditions["mean_radiant_temperature"] + sensitivity * (
+        temperature - conditions["dry_bulb_temperature"]
+    )
+    return ThermalComfort._calculate_pmv_unrounded(
+        temperature,
+        radiant_temperature,
+        conditions["relative_air_speed"],
+        conditions["humidity"],
+        conditions["met"],
+        conditions["dynamic_clothing_insulation"],
+    )
+
+
+def solve_with_scalar_brentq(conditions: dict) -> np.ndarray:
+    # 比較用：条件ごとにscipyのbrentqで逆算する
+    results = []
+    for i in range(CONDITION_COUNT):
+        condition = {key: value[i : i + 1] for key, value in conditions.items()}
+        results.append(
+            brentq(
+                lambda t: pmv_at(np.array([t]), condition).item(0)
+                - condition["target_pmv"].item(0),
+                LOWER_TEMPERATURE,
+                UPPER_TEMPERATURE,
+                xtol=1e-6,
+            )
+        )
+    return np.array(results)
+
+
+def measure_single_condition(relative_air_speed: float) -> float:
+    # 制御サイクルと同じく、1件の条件で逆算する時間（ms）
+    condition = {
+        "humidity": 60.0,
+        "relative_air_speed": relative_air_speed,
+        "met": 1.2,
+        "dynamic_clothing_insulation": 0.5,
+        "mean_radiant_temperature": 29.0,
+        "dry_bulb_temperature": 28.0,
+        "target_pmv": 0.0,
+    }
+    ThermalComfort.calculate_neutral_temperature(**condition)
+    start = time.perf_counter()
+    for _ in range(SINGLE_REPEAT):
+        ThermalComfort.calculate_neutral_temperature(**condition)
+    return (time.perf_counter() - start) / SINGLE_REPEAT * 1000
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    conditions = create_conditions(CONDITION_COUNT)
+
+    start = time.perf_counter()
+    neutral_temperature = ThermalComfort.calculate_neutral_temperature(**conditions)
+    vectorized_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference_temperature = solve_with_scalar_brentq(conditions)
+    scalar_seconds = time.perf_counter() - start
+
+    pmv_error = np.abs(pmv_at(neutral_temperature, conditions) - conditions["target_pmv"])
+    temperature_error = np.abs(neutral_temperature - reference_temperature)
+
+    print(f"条件数: {CONDITION_COUNT}")
+    print(f"一括計算: {vectorized_seconds * 1000:.1f}ms")
+    print(f"条件ごとのbrentq: {scalar_seconds * 1000:.1f}ms")
+    print(f"PMVの最大誤差: {np.max(pmv_error):.5f}")
+    print(f"brentqとの室温の最大差: {np.max(temperature_error):.5f}°")
+
+    for relative_air_speed in [0.08, 0.2, 0.38]:
+        print(
+            f"1件（相対風速{relative_air_speed}m/s）: "
+            f"{measure_single_condition(relative_air_speed):.2f}ms"
+        )
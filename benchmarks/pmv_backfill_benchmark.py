@@ -0,0 +1,167 @@
+# PMVの再計算の結果と処理速度を確認するスクリプト
+# 実行方法: python -m benchmarks.pmv_backfill_benchmark
+#
+# データベースは使わず、PmvService.stream_with_sensor_readingsと同じ形の行を生成して確認します。
+# 制御サイクルと同じくMetCloAdjusterでMETとCLOを求めてから計算した結果と比べます。
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from home_comfort_control import HomeComfortControl
+from settings import LOCAL_TZ, app_preference, thermal_preference
+from shared.dataclass.effective_outdoor_temperature import EffectiveOutdoorTemperature
+from shared.dataclass.home_sensor import HomeSensor
+from shared.dataclass.sensor import Sensor
+from util.met_clo_adjuster import MetCloAdjuster
+from util.pmv_backfill import PMVBackfill
+from util.thermal_comfort import ThermalComfort
+from util.time_helper import TimeHelper
+
+Row = namedtuple(
+    "Row",
+    "measurement_id measurement_time pmv_id met relative_air_speed dynamic_clo pmv ppd "
+    "wall_surface_temperature mean_radiant_temperature dry_bulb_temperature "
+    "category temperature humidity",
+)
+CATEGORIES = ("main", "sub", "supplementary", "outdoor")
+START = datetime(2024, 7, 1, tzinfo=LOCAL_TZ)
+
+
+def generate_rows(count: int, seed: int = 0) -> Iterator[Row]:
+    # 5分間隔の測定を、センサー4台分の行として1件ずつ生成する
+    rng = np.random.default_rng(seed)
+    for index in range(count):
+        measurement_time = START + timedelta(minutes=5 * index)
+        hour = measurement_time.hour + measurement_time.minute / 60
+        outdoor = 28 + 6 * np.sin(2 * np.pi * (hour - 9) / 24) + rng.normal(0, 1)
+        indoor = 26 + rng.normal(0, 1.5)
+        temperatures = (indoor, indoor + rng.normal(1, 0.5), indoor + rng.normal(0, 0.5), outdoor)
+        humidities = rng.uniform(40, 70, 4)
+        met = float(rng.choice([1.0, 1.1, 1.2]))
+        for category, temperature, humidity in zip(CATEGORIES, temperatures, humidities):
+            yield Row(
+                index + 1, measurement_time, index + 1, met, 0.08 + 0.3 * (met - 1) * (met > 1),
+                float(rng.choice([0.5, 0.6, 0.7])), None, None, None, None, None,
+                category, round(float(temperature), 1), round(float(humidity)),
+            )
+
+
+def calculate_with_control_cycle(rows: list[Row]) -> list[tuple[float, ...]]:
+    # 比較用：制御サイクルと同じくThermalComfort.calculate_pmvで1件ずつ計算する
+    results = []
+    for index in range(0, len(rows), len(CATEGORIES)):
+        readings = {row.category: row for row in rows[index : index + len(CATEGORIES)]}
+
+        def sensor(category: str) -> Sensor:
+            return Sensor(
+                id=category,
+                label=category,
+                location=category,
+                type="温湿度計",
+                air_quality={
+                    "temperature": readings[category].temperature,
+                    "humidity": readings[category].humidity,
+                },
+            )
+
+        main = readings["main"]
+        home_sensor = HomeSensor(
+            main=sensor("main"),
+            sub=sensor("sub"),
+            supplementaries=[sensor("supplementary")],
+            outdoor=sensor("outdoor"),
+        )
+        TimeHelper.set_current_time(main.measurement_time)
+        comfort_factors = MetCloAdjuster.calculate_comfort_factors(
+            EffectiveOutdoorTemperature(
+                outdoor_temperature=readings["outdoor"].temperature, forecast_temperature=None
+            ),
+            HomeComfortControl().is_within_sleeping_period(),
+        )
+        pmv_result = ThermalComfort.calculate_pmv(
+            home_sensor,
+            readings["outdoor"].temperature,
+            comfort_factors,
+        )
+        results.append(
+            (
+                pmv_result.pmv,
+                pmv_result.ppd,
+                pmv_result.wall,
+                pmv_result.mean_radiant_temperature,
+                pmv_result.dry_bulb_temperature,
+                pmv_result.met,
+                pmv_result.relative_air_speed,
+                pmv_result.dynamic_clothing_insulation,
+            )
+        )
+    return results
+
+
+def calculate_with_backfill(rows, chunk_size: int) -> list[tuple[float, ...]]:
+    results = []
+    surface_state = None
+    for chunk in PMVBackfill.iterate_chunks(rows, chunk_size, {}, []):
+        values, surface_state = PMVBackfill.calculate(chunk, surface_state)
+        results.extend(
+            (
+                value["pmv"],
+                value["ppd"],
+                value["wall_surface_temperature"],
+                value["mean_radiant_temperature"],
+                value["dry_bulb_temperature"],
+                value["met"],
+                value["relative_air_speed"],
+                value["dynamic_clo"],
+            )
+            for value in values
+        )
+    return results
+
+
+if __name__ == "__main__":
+    thermal_preference.pmv_cache.enabled = False
+    # PMVBackfill.runと同じく、保存済みの天気予報がない場合にデータベースから取得しない
+    app_preference.database.enabled = False
+
+    # 制御サイクルの計算と一致するか確認
+    rows = list(generate_rows(600))
+    with tempfile.TemporaryDirectory() as directory:
+        for enabled in (False, True):
+            thermal_preference.surface_model.enabled = enabled
+            thermal_preference.surface_model.state_path = os.path.join(
+                directory, f"surface_state_{enabled}.json"
+            )
+            expected = np.array(calculate_with_control_cycle(rows))
+            actual = np.array(calculate_with_backfill(iter(rows), chunk_size=64))
+            difference = np.abs(actual - expected).max(axis=0)
+            print(
+                f"表面温度モデル{'有効' if enabled else '無効'}: {len(expected)}件, "
+                f"最大差 pmv={difference[0]:.2g}, ppd={difference[1]:.2g}, "
+                f"壁={difference[2]:.2g}, 平均放射温度={difference[3]:.2g}, 乾球温度={difference[4]:.2g}, "
+                f"MET={difference[5]:.2g}, 相対風速={difference[6]:.2g}, 動的な衣服の断熱性={difference[7]:.2g}"
+            )
+    thermal_preference.surface_model.enabled = False
+
+    # 1件ずつの計算とチャンクごとの計算の処理速度を比較
+    count = 200
+    start = time.perf_counter()
+    calculate_with_control_cycle(rows[: count * len(CATEGORIES)])
+    cycle_rate = count / (time.perf_counter() - start)
+
+    count = 20_000
+    tracemalloc.start()
+    start = time.perf_counter()
+    for chunk in PMVBackfill.iterate_chunks(generate_rows(count), 1000, {}, []):
+        PMVBackfill.calculate(chunk)
+    backfill_rate = count / (time.perf_counter() - start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"1件ずつ: {cycle_rate:.0f}件/秒, チャンク（1000件）: {backfill_rate:.0f}件/秒")
+    print(f"{count}件を再計算した際のメモリ使用量の最大値: {peak / 1024 / 1024:.1f}MB")
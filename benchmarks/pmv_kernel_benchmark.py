@@ -0,0 +1,186 @@
+# NumPy実装のPMV計算がpythermalcomfortと同じ結果になることを確認し、読み込み時間とメモリを計測するスクリプト
+# 実行方法: python -m benchmarks.pmv_kernel_benchmark [--cases 2000] [--rounds 5]
+import argparse
+import subprocess
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from util.pmv_kernel import PMVKernel
+
+# 1件ずつの冷却効果の計算をpythermalcomfortと比較する入力数（1回あたり）
+SCALAR_CASES = 200
+
+# 読み込み時間とメモリを計測するコード（別プロセスで実行）
+# ru_maxrssは親プロセスのメモリを引き継ぐため、/proc/self/statusのVmHWMを使う
+IMPORT_PROBE = """
+import re, time
+start = time.perf_counter()
+{import_statement}
+imported = time.perf_counter() - start
+{call_statement}
+called = time.perf_counter() - start
+with open("/proc/self/status") as f:
+    print(imported, called, re.search(r"VmHWM:\\s+(\\d+)", f.read()).group(1))
+"""
+
+BACKENDS = {
+    "native": (
+        "from util.pmv_kernel import PMVKernel",
+        "PMVKernel.calculate_pmv_ppd(25.0, 25.0, 0.2, 50.0, 1.1, 0.6)",
+    ),
+    "pythermalcomfort": (
+        "from pythermalcomfort.models import pmv_ppd",
+        "pmv_ppd(25.0, 25.0, 0.2, 50.0, 1.1, 0.6, standard='ASHRAE', limit_inputs=False)",
+    ),
+}
+
+
+def create_inputs(rng: np.random.Generator, count: int) -> dict[str, np.ndarray]:
+    # 制御で扱う範囲より広い入力を乱数で作成し、境界値を混ぜる
+    inputs = {
+        "tdb": rng.uniform(5, 40, count),
+        "tr": rng.uniform(5, 45, count),
+        "vr": rng.uniform(0, 2, count),
+        "rh": rng.uniform(0, 100, count),
+        "met": rng.uniform(0.7, 2.5, count),
+        "clo": rng.uniform(0, 2, count),
+    }
+    boundaries = {"vr": [0.0, 0.1, 0.1 + 1e-9], "met": [1.0, 1.2], "clo": [0.0, 0.078 / 0.155]}
+    for name, values in boundaries.items():
+        picked = rng.random(count) < 0.1
+        inputs[name][picked] = rng.choice(values, int(picked.sum()))
+    return inputs
+
+
+def check_equivalence(cases: int, rounds: int) -> bool:
+    # 乱数の入力で、pmv_ppd・cooling_effect・v_relative・clo_dynamicの結果を比較する
+    from pythermalcomfort.models import pmv_ppd
+    from pythermalcomfort.models.cooling_effect import cooling_effect
+    from pythermalcomfort.utilities import clo_dynamic, v_relative
+
+    identical = True
+    native_seconds = 0.0
+    reference_seconds = 0.0
+    for seed in range(rounds):
+        inputs = create_inputs(np.random.default_rng(seed), cases)
+
+        # pmv_ppdに配列を渡すと、先頭の要素の冷却効果が整数の0の場合に全要素の冷却効果が
+        # 整数に切り捨てられるため、正解は要素ごとに計算する
+        with warnings.catch_warnings(record=True):
+            start = time.perf_counter()
+            pmv_ppd(**inputs, standard="ASHRAE", limit_inputs=False)
+            reference_seconds += time.perf_counter() - start
+            expected_results = [
+                pmv_ppd(*values, standard="ASHRAE", limit_inputs=False)
+                for values in zip(*inputs.values())
+            ]
+            expected = {
+                key: np.array([float(result[key]) for result in expected_results])
+                for key in ("pmv", "ppd")
+            }
+            expected_cooling = np.array(
+                [float(cooling_effect(*values)) for values in zip(*inputs.values())]
+            )
+
+        start = time.perf_counter()
+        actual = PMVKernel.calculate_pmv_ppd(**inputs)
+        native_seconds += time.perf_counter() - start
+        actual_cooling = PMVKernel.cooling_effect(**inputs)
+        # 件数が少ない場合の1件ずつの計算も、先頭の入力で比較する
+        scalar_cooling = np.array(
+            [
+                float(PMVKernel.cooling_effect(*values))
+                for values in list(zip(*inputs.values()))[:SCALAR_CASES]
+            ]
+        )
+
+        mismatches = {
+            "pmv": np.flatnonzero(actual["pmv"] != expected["pmv"]),
+            "ppd": np.flatnonzero(actual["ppd"] != expected["ppd"]),
+            "cooling_effect": np.flatnonzero(actual_cooling != expected_cooling),
+            "cooling_effect（1件ずつ）": np.flatnonzero(
+                scalar_cooling != expected_cooling[:SCALAR_CASES]
+            ),
+            "v_relative": np.flatnonzero(
+                PMVKernel.v_relative(inputs["vr"], inputs["met"])
+                != v_relative(inputs["vr"], inputs["met"])
+            ),
+            "clo_dynamic": np.flatnonzero(
+                PMVKernel.clo_dynamic(inputs["clo"], inputs["met"])
+                != clo_dynamic(inputs["clo"], inputs["met"])
+            ),
+        }
+        for name, indices in mismatches.items():
+            if indices.size == 0:
+                continue
+            identical = False
+            worst = indices[0]
+            print(
+                f"seed={seed} {name}: {indices.size}件不一致 例: "
+                + ", ".join(f"{key}={value[worst]!r}" for key, value in inputs.items())
+            )
+
+    print(f"比較した入力数: {cases * rounds}")
+    print(f"結果: {'すべて一致' if identical else '不一致あり'}")
+    print(f"pythermalcomfort: {reference_seconds * 1000:.0f}ms, NumPy実装: {native_seconds * 1000:.0f}ms")
+    return identical
+
+
+def measure_single_call(repeat: int = 20):
+    # 制御サイクルと同じく1件だけ計算する場合の時間（静穏気流と、冷却効果を計算する風速）
+    from pythermalcomfort.models import pmv_ppd
+
+    for vr in (0.08, 0.2, 0.38):
+        conditions = (26.0, 26.5, vr, 55.0, 1.2, 0.5)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            PMVKernel.calculate_pmv_ppd(*conditions)
+        native = (time.perf_counter() - start) / repeat
+        with warnings.catch_warnings(record=True):
+            pmv_ppd(*conditions, standard="ASHRAE", limit_inputs=False)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                pmv_ppd(*conditions, standard="ASHRAE", limit_inputs=False)
+            reference = (time.perf_counter() - start) / repeat
+        print(
+            f"1件の計算（相対風速{vr}m/s）: NumPy実装 {native * 1000:.2f}ms, "
+            f"pythermalcomfort {reference * 1000:.2f}ms"
+        )
+
+
+def measure_import(backend: str) -> tuple[float, float, int]:
+    # 新しいプロセスで読み込み時間・初回計算までの時間・最大RSSを計測する
+    import_statement, call_statement = BACKENDS[backend]
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            IMPORT_PROBE.format(import_statement=import_statement, call_statement=call_statement),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(output[0]), float(output[1]), int(output[2])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NumPy実装のPMV計算を検証します")
+    parser.add_argument("--cases", type=int, default=2000, help="1回あたりの入力数")
+    parser.add_argument("--rounds", type=int, default=5, help="乱数のシードを変えて比較する回数")
+    args = parser.parse_args()
+
+    identical = check_equivalence(args.cases, args.rounds)
+    measure_single_call()
+
+    for backend in BACKENDS:
+        imported, called, max_rss = measure_import(backend)
+        print(
+            f"{backend}: 読み込み {imported * 1000:.0f}ms, 初回計算まで {called * 1000:.0f}ms, "
+            f"最大RSS {max_rss / 1024:.1f}MB"
+        )
+
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,83 @@
+# 実行間隔を変化の速さから決めた場合の実行回数を、固定間隔の場合と比べるスクリプト
+# 実行方法: python -m benchmarks.polling_scheduler_benchmark
+#
+# 夜は安定し、午後に急に暑くなる1日分の室温を1分ごとに生成し、
+# 次の実行時刻に達した時点だけ測定した場合の実行回数、API呼び出し回数、
+# 測定の間に室温が変化した量の最大値を、5分間隔で測定した場合と比べます。
+import logging
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from logger.system_event_logger import logger
+from settings import LOCAL_TZ, app_preference
+from shared.dataclass.home_sensor import HomeSensor
+from shared.dataclass.sensor import Sensor
+from util.polling_scheduler import PollingScheduler
+from util.time_helper import TimeHelper
+from util.weekly_calendar import WeeklyCalendar
+
+START = LOCAL_TZ.localize(datetime(2024, 7, 1))
+
+
+def room_temperature(minute: int) -> float:
+    hour = minute / 60
+    # 13時から16時にかけて急に上がり、夜はほとんど変化しない
+    return 26 + 3 / (1 + np.exp(-(hour - 14) * 2.5)) - 3 / (1 + np.exp(-(hour - 20) * 1.5))
+
+
+def sensor(name: str, temperature: float) -> Sensor:
+    return Sensor(
+        id=name,
+        label=name,
+        location=name,
+        type="温湿度計",
+        air_quality={"temperature": round(temperature, 1), "humidity": 55},
+    )
+
+
+def max_change(samples: list[int]) -> float:
+    temperatures = [room_temperature(minute) for minute in samples]
+    return max(abs(b - a) for a, b in zip(temperatures, temperatures[1:]))
+
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)
+    app_preference.polling.state_path = os.path.join(tempfile.mkdtemp(), "polling_state.json")
+    calendar = WeeklyCalendar.get()
+
+    samples = []
+    reasons = Counter()
+    api_calls = 0
+    for minute in range(24 * 60):
+        current_time = START + timedelta(minutes=minute)
+        TimeHelper.set_current_time(current_time)
+        if not PollingScheduler.is_due():
+            continue
+
+        temperature = room_temperature(minute)
+        home_sensor = HomeSensor(
+            main=sensor("main", temperature),
+            sub=sensor("sub", temperature + 1),
+            outdoor=sensor("outdoor", temperature + 5),
+        )
+        is_sleeping = not calendar.is_active(WeeklyCalendar.AWAKE, current_time)
+        PollingScheduler.schedule_next(home_sensor, (temperature - 26) * 0.3, is_sleeping)
+        state = PollingScheduler.load_state(app_preference.polling.state_path)
+        samples.append(minute)
+        api_calls = state.api_calls
+        reasons[
+            "就寝中" if is_sleeping else "13〜17時" if 13 <= minute / 60 < 17 else "その他の時間"
+        ] += 1
+
+    fixed = list(range(0, 24 * 60, 5))
+    calls_per_cycle = api_calls // len(samples)
+    print(f"固定間隔（5分）: 実行{len(fixed)}回, API呼び出し{len(fixed) * calls_per_cycle}回, "
+          f"測定間の室温変化の最大値{max_change(fixed):.2f}°")
+    print(f"変化の速さで決めた間隔: 実行{len(samples)}回, API呼び出し{api_calls}回, "
+          f"測定間の室温変化の最大値{max_change(samples):.2f}°")
+    for name, count in reasons.items():
+        print(f"  {name}: {count}回")
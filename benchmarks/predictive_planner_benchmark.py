@@ -0,0 +1,113 @@
+# 先読み制御の運転計画の計算時間と、予冷による電力の目安の変化を確認するスクリプト
+# 実行方法: python -m benchmarks.predictive_planner_benchmark
+#
+# データベースは使わず、明け方に涼しく14時に最も暑くなる夏の2日分の天気予報を生成し、
+# 30分ごとに計画した最初の運転で家の熱モデルを進めます。
+# 8時間先まで評価した場合と、次の30分だけを評価した場合（先読みなし）の電力の目安、
+# 快適範囲を外れた回数、1回の計画にかかった時間を、既定の設定の場合と
+# エアコンの能力が足りない猛暑日の場合で比べます。
+import logging
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from devices.aircon.aircon_predictive_planner import AirconPredictivePlanner
+from logger.system_event_logger import logger
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
+from settings import LOCAL_TZ, aircon_preference
+from shared.dataclass.pmv_result import PMVResult
+from util.house_thermal_model import HouseThermalModel
+from util.thermal_comfort import ThermalComfort
+from util.time_helper import TimeHelper
+
+START = LOCAL_TZ.localize(datetime(2024, 8, 1))
+HUMIDITY = 55
+MET = 1.1
+CLO = 0.5
+RELATIVE_AIR_SPEED = 0.15
+
+
+def create_forecasts(lowest: float, highest: float) -> list[WeatherForecastHourlyModel]:
+    mean = (lowest + highest) / 2
+    amplitude = (highest - lowest) / 2
+    return [
+        WeatherForecastHourlyModel(
+            forecast_time=START + timedelta(hours=hour),
+            temperature=round(float(mean + amplitude * np.cos(2 * np.pi * (hour - 14) / 24)), 1),
+        )
+        for hour in range(24 * 3)
+    ]
+
+
+def create_pmv_result(temperature: float) -> PMVResult:
+    radiant_temperature = temperature + 0.5
+    pmv = float(
+        ThermalComfort.calculate_pmv_ppd(
+            tdb=temperature, tr=radiant_temperature, vr=RELATIVE_AIR_SPEED,
+            rh=HUMIDITY, met=MET, clo=CLO,
+        )["pmv"]
+    )
+    return PMVResult(
+        pmv=pmv, ppd=0, clo=CLO, air=0.1, met=MET, wall=radiant_temperature,
+        ceiling=radiant_temperature, floor=radiant_temperature,
+        mean_radiant_temperature=radiant_temperature, dry_bulb_temperature=temperature,
+        relative_air_speed=RELATIVE_AIR_SPEED, dynamic_clothing_insulation=CLO,
+    )
+
+
+def simulate(forecasts: list[WeatherForecastHourlyModel], horizon_hours: float):
+    aircon_preference.predictive_control.horizon_hours = horizon_hours
+    step_hours = aircon_preference.predictive_control.step_minutes / 60
+    comfort_band = aircon_preference.predictive_control.comfort_band
+    forecast_hours = np.array([(f.forecast_time - START).total_seconds() / 3600 for f in forecasts])
+    forecast_temperatures = np.array([f.temperature for f in forecasts])
+    temperature = 28.0
+    energy = 0.0
+    uncomfortable = 0
+    elapsed = []
+    for step in range(int(48 / step_hours)):
+        TimeHelper.set_current_time(START + timedelta(hours=step * step_hours))
+        pmv_result = create_pmv_result(temperature)
+        if not comfort_band.lower <= pmv_result.pmv <= comfort_band.upper:
+            uncomfortable += 1
+
+        started = time.perf_counter()
+        settings = AirconPredictivePlanner.plan(pmv_result, HUMIDITY, forecasts)
+        elapsed.append(time.perf_counter() - started)
+
+        outdoor = float(np.interp((step + 0.5) * step_hours, forecast_hours, forecast_temperatures))
+        if settings is None or not (settings.mode.is_cooling() or settings.mode.is_heating()):
+            direction = HouseThermalModel.IDLE
+            setpoint = 28.0
+        else:
+            direction = HouseThermalModel.COOLING if settings.mode.is_cooling() else HouseThermalModel.HEATING
+            setpoint = settings.temperature
+        next_temperature, heat = HouseThermalModel.advance(
+            np.array([temperature]), outdoor, np.array([setpoint]), np.array([direction]), step_hours
+        )
+        energy += float(np.abs(heat[0]) / AirconPredictivePlanner._calculate_cop(outdoor, np.array([setpoint]))[0])
+        temperature = float(next_temperature[0])
+    return energy, uncomfortable, np.array(elapsed)
+
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)
+    predictive_control = aircon_preference.predictive_control
+    step_hours = predictive_control.step_minutes / 60
+    scenarios = (
+        ("既定の設定（最低26度、最高35度）", 26, 35, predictive_control.aircon_capacity),
+        ("能力が足りない猛暑日（最低26度、最高37度、能力1度/時間）", 26, 37, 1.0),
+    )
+
+    for name, lowest, highest, capacity in scenarios:
+        predictive_control.aircon_capacity = capacity
+        forecasts = create_forecasts(lowest, highest)
+        print(name)
+        for label, horizon_hours in (("先読みなし（30分）", step_hours), ("先読みあり（8時間）", 8)):
+            energy, uncomfortable, elapsed = simulate(forecasts, horizon_hours)
+            print(
+                f"  {label}: 電力の目安{energy:.2f}, 快適範囲外{uncomfortable}回, "
+                f"計画1回あたり平均{elapsed.mean() * 1000:.1f}ms（最大{elapsed.max() * 1000:.1f}ms）"
+            )
+    TimeHelper.set_current_time(None)
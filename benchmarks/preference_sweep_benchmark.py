@@ -0,0 +1,36 @@
+# 設定の候補の並列評価の処理速度を確認するスクリプト
+# 実行方法: python -m benchmarks.preference_sweep_benchmark
+#
+# データベースは使わず、replay_engine_benchmarkと同じ1週間分の測定を生成して評価します。
+import os
+import time
+
+from benchmarks.replay_engine_benchmark import create_engine, generate_cycles
+from settings import thermal_preference
+from util.preference_sweep import PreferenceSweep
+
+if __name__ == "__main__":
+    thermal_preference.surface_model.enabled = False
+    engine = create_engine(generate_cycles(12 * 24 * 7))
+    variants = PreferenceSweep.grid(
+        {
+            "aircon_preference.conditional.circulator_threshold": [1.5, 2.0, 2.5],
+            "aircon_preference.conditional.summer_condensation.dew_point_margin": [0, 1],
+            "met_clo_preference.high_temperature.clo.awake": [0.4, 0.5, 0.6],
+        }
+    )
+
+    # 1プロセスと全コアで処理時間を比較
+    for max_workers in sorted({1, os.cpu_count()}):
+        sweep = PreferenceSweep(engine, max_workers=max_workers)
+        start = time.perf_counter()
+        results = sweep.run(variants)
+        elapsed = time.perf_counter() - start
+        print(f"{max_workers}プロセス: {len(variants)}件を{elapsed:.1f}秒で評価しました")
+
+    for result in sorted(results, key=lambda result: result.outside_comfort_hours)[:5]:
+        print(
+            f"{result.overrides}: コマンド {result.command_count}回, "
+            f"快適範囲外 {result.outside_comfort_hours:.1f}時間, "
+            f"エアコン強度 {result.aircon_intensity_score:.0f}/日"
+        )
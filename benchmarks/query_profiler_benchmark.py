@@ -0,0 +1,125 @@
+# SQL文の記録の動作と、測定データの保存・機器の設定の更新が実行するSQL文の数を確認するスクリプト
+# 実行方法: python -m benchmarks.query_profiler_benchmark
+#
+# メモリ上のSQLiteで、記録しない場合と記録する場合の1文あたりの時間を比べ、
+# センサーを1件ずつ検索して測定値を挿入するN+1のパターンを記録してログに出力します。
+# 設定のデータベースに接続できる場合は、MeasurementService.create_measurement_and_related_dataと
+# サーキュレーター・扇風機のupdate_*_settingsが実行するSQL文の数が上限以下であることを確認します
+# （エアコンのupdate_aircon_settingsはデータベースに書き込んで確定するため対象にしません）。
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from api.smart_home_devices.recording_smart_home_device import RecordingSmartHomeDevice
+from api.smart_home_devices.smart_home_device_factory import SmartHomeDeviceFactory
+from benchmarks.benchmark_suite import Fixture, database_session
+from home_comfort_control import HomeComfortControl
+from repository.services.measurement_service import MeasurementService
+from settings import app_preference
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.circulator_settings import CirculatorSettings
+from shared.dataclass.electric_fan_settings import ElectricFanSettings
+from shared.enums.aircon_mode import AirconMode
+from shared.enums.power_mode import PowerMode
+from util.query_profiler import QueryProfiler
+
+
+def measure_per_statement(engine, count: int) -> float:
+    # 1文あたりの実行時間（µs）
+    with engine.connect() as connection:
+        started = time.perf_counter()
+        for _ in range(count):
+            connection.execute(text("SELECT 1"))
+        return (time.perf_counter() - started) / count * 1e6
+
+
+if __name__ == "__main__":
+    # 記録による1文あたりの時間の増加（記録していない間はイベントを登録しないため、登録しないエンジンと同じ）
+    count = 20000
+    plain_engine = create_engine("sqlite://")
+    engine = create_engine("sqlite://")
+    QueryProfiler.install(engine)
+    baseline = measure_per_statement(plain_engine, count)
+    idle = measure_per_statement(engine, count)
+    with QueryProfiler.record():
+        recorded = measure_per_statement(engine, count)
+    print(
+        f"SELECT 1 の1文あたり: 登録していないエンジン {baseline:.1f}µs, "
+        f"記録していない {idle:.1f}µs, 記録中 {recorded:.1f}µs"
+    )
+
+    # N+1のパターンの記録
+    engine = create_engine("sqlite://")
+    QueryProfiler.install(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE sensor (id INTEGER PRIMARY KEY, code TEXT)"))
+        connection.execute(
+            text("CREATE TABLE reading (sensor_id INTEGER, measurement_id INTEGER, value REAL)")
+        )
+        connection.execute(
+            text("INSERT INTO sensor (code) VALUES ('main'), ('sub'), ('outdoor')")
+        )
+        with QueryProfiler.record() as recording:
+            for measurement_id in range(10):
+                for code in ("main", "sub", "outdoor"):
+                    sensor_id = connection.execute(
+                        text("SELECT id FROM sensor WHERE code = :code"), {"code": code}
+                    ).scalar_one()
+                    connection.execute(
+                        text("INSERT INTO reading VALUES (:sensor_id, :measurement_id, 25.0)"),
+                        {"sensor_id": sensor_id, "measurement_id": measurement_id},
+                    )
+    QueryProfiler.log_report(recording)
+
+    # 測定データの保存と機器の設定の更新が実行するSQL文の数
+    fixture = Fixture()
+    cycle, pmv_result = fixture.cycles[0], fixture.pmv_results[0]
+    with database_session() as session:
+        if session is None:
+            print("データベースに接続できないため、SQL文の数の確認を省略します")
+        else:
+            service = MeasurementService(session)
+
+            def create_measurement():
+                service.create_measurement_and_related_data(
+                    cycle.measurement_time,
+                    cycle.home_sensor,
+                    pmv_result,
+                    AirconSettings(temperature=26, mode=AirconMode.COOLING),
+                    CirculatorSettings(power=PowerMode.ON, fan_speed=2),
+                    ElectricFanSettings(),
+                )
+
+            # 初回はセンサーを登録するため、2回目のSQL文の数を確認する
+            create_measurement()
+            sensor_count = 2 + len(cycle.home_sensor.supplementaries) + 1
+            # 測定日時1、エアコン設定3（モードと風量の検索を含む）、PMV1、センサーごとに検索と挿入の2、
+            # サーキュレーターと扇風機の設定がそれぞれ1
+            max_queries = (
+                1
+                + 3
+                + 1
+                + 2 * sensor_count
+                + app_preference.circulator.enabled
+                + app_preference.electric_fan.enabled
+            )
+            with QueryProfiler.assert_max_queries(max_queries) as recording:
+                create_measurement()
+            print(f"create_measurement_and_related_data: {recording.count}回（上限 {max_queries}回）")
+
+    try:
+        SmartHomeDeviceFactory.set_device(RecordingSmartHomeDevice())
+        control = HomeComfortControl()
+        # 最新の設定の検索のみ
+        with QueryProfiler.assert_max_queries(1) as recording:
+            control.update_circulator_settings(cycle.home_sensor, CirculatorSettings(), False, 30.0)
+        print(f"update_circulator_settings: {recording.count}回（上限 1回）")
+        # 最新の設定と、電源ONが続いている期間の最初の設定（最大3文）の検索
+        with QueryProfiler.assert_max_queries(4) as recording:
+            control.update_electric_fan_settings(False, 28.0)
+        print(f"update_electric_fan_settings: {recording.count}回（上限 4回）")
+    except OperationalError:
+        print("データベースに接続できないため、update_*_settingsのSQL文の数の確認を省略します")
+    finally:
+        SmartHomeDeviceFactory.set_device(None)
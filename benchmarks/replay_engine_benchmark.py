@@ -0,0 +1,122 @@
+# 制御の判断の再生結果と処理速度を確認するスクリプト
+# 実行方法: python -m benchmarks.replay_engine_benchmark
+#
+# データベースは使わず、5分間隔の測定1か月分と時間単位の天気予報を生成して再生します。
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from models.aircon_change_interval_model import AirconChangeIntervalModel
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
+from settings import LOCAL_TZ, thermal_preference
+from shared.dataclass.home_sensor import HomeSensor
+from shared.dataclass.replay_cycle import ReplayCycle
+from shared.dataclass.sensor import Sensor
+from shared.enums.aircon_mode import AirconMode
+from util.replay_engine import ReplayEngine
+from util.thermal_comfort import ThermalComfort
+from util.time_helper import TimeHelper
+
+START = datetime(2024, 7, 1, tzinfo=LOCAL_TZ)
+
+
+def outdoor_temperature(measurement_time: datetime) -> float:
+    hour = measurement_time.hour + measurement_time.minute / 60
+    return 28 + 6 * np.sin(2 * np.pi * (hour - 9) / 24)
+
+
+def generate_cycles(count: int, seed: int = 0) -> list[ReplayCycle]:
+    rng = np.random.default_rng(seed)
+
+    def sensor(name: str, temperature: float, humidity: float) -> Sensor:
+        return Sensor(
+            id=name,
+            label=name,
+            location=name,
+            type="温湿度計",
+            air_quality={"temperature": round(temperature, 1), "humidity": round(humidity)},
+        )
+
+    cycles = []
+    for index in range(count):
+        measurement_time = START + timedelta(minutes=5 * index)
+        outdoor = outdoor_temperature(measurement_time) + rng.normal(0, 1)
+        indoor = 24 + 0.3 * (outdoor - 28) + rng.normal(0, 1)
+        cycles.append(
+            ReplayCycle(
+                measurement_time=measurement_time,
+                home_sensor=HomeSensor(
+                    main=sensor("main", indoor, rng.uniform(45, 65)),
+                    sub=sensor("sub", indoor + rng.normal(1, 0.5), rng.uniform(45, 65)),
+                    supplementaries=[
+                        sensor("supplementary", indoor + rng.normal(0, 0.5), rng.uniform(45, 65))
+                    ],
+                    outdoor=sensor("outdoor", outdoor, rng.uniform(50, 80)),
+                ),
+            )
+        )
+    return cycles
+
+
+def generate_forecasts(hours: int) -> list[WeatherForecastHourlyModel]:
+    return [
+        WeatherForecastHourlyModel(
+            forecast_time=START + timedelta(hours=hour),
+            temperature=outdoor_temperature(START + timedelta(hours=hour)),
+            cloud_percentage=float(hour * 37 % 100),
+            weather="晴れ",
+        )
+        for hour in range(hours)
+    ]
+
+
+def generate_change_intervals() -> list[AirconChangeIntervalModel]:
+    return [
+        AirconChangeIntervalModel(
+            mode_id=mode.id, temperature_min=-50, temperature_max=50, duration_minutes=60
+        )
+        for mode in (AirconMode.COOLING, AirconMode.DRY, AirconMode.HEATING)
+    ]
+
+
+def create_engine(cycles: list[ReplayCycle]) -> ReplayEngine:
+    hours = len(cycles) // 12 + 48
+    return ReplayEngine(
+        cycles,
+        generate_forecasts(hours),
+        {},
+        generate_change_intervals(),
+    )
+
+
+if __name__ == "__main__":
+    thermal_preference.surface_model.enabled = False
+
+    # まとめて計算したPMVが制御サイクルのThermalComfort.calculate_pmvと一致するか確認
+    cycles = generate_cycles(500)
+    engine = create_engine(cycles)
+    engine.run(chunk_size=128)
+    differences = []
+    for cycle, decision in zip(cycles, engine.decisions):
+        if decision.pmv_result.relative_air_speed != decision.pmv_result.air:
+            continue
+        TimeHelper.set_current_time(cycle.measurement_time)
+        expected = ThermalComfort.calculate_pmv(
+            cycle.home_sensor,
+            cycle.home_sensor.outdoor.air_quality.temperature,
+            decision.comfort_factors,
+        )
+        differences.append(abs(expected.pmv - decision.pmv_result.pmv))
+    TimeHelper.set_current_time(None)
+    print(f"PMVの最大差: {max(differences):.2g}（{len(differences)}サイクル）")
+
+    # 5分間隔の1か月分を再生
+    cycles = generate_cycles(12 * 24 * 30)
+    engine = create_engine(cycles)
+    start = time.perf_counter()
+    engine.run()
+    elapsed = time.perf_counter() - start
+    print(f"{len(cycles)}サイクルを{elapsed:.1f}秒で再生しました（{len(cycles) / elapsed:.0f}サイクル/秒）")
+    for command, count in sorted(engine.count_commands().items()):
+        print(f"  {command}: {count}回")
@@ -0,0 +1,105 @@
+# PMV予測によるエアコン設定探索の1回あたりの時間と、冷却効果をまとめて計算することによる誤差を確認するスクリプト
+# 実行方法: python -m benchmarks.setpoint_optimizer_benchmark
+#
+# 設定ファイルの既定の設定（計算方法native）で、制御サイクルと同じく1件の状態から設定を探索します。
+# 誤差は、候補ごとに運転後の室温で冷却効果を計算し直した場合のPMVと比べます。
+import logging
+import time
+
+import numpy as np
+
+from devices.aircon.aircon_setpoint_optimizer import AirconSetpointOptimizer
+from logger.system_event_logger import logger
+from settings import aircon_preference, thermal_preference
+from shared.dataclass.pmv_result import PMVResult
+from shared.enums.aircon_fan_speed import AirconFanSpeed
+from shared.enums.aircon_mode import AirconMode
+from util.pmv_kernel import PMVKernel
+from util.thermal_comfort import ThermalComfort
+
+# 1つの状態あたりの探索回数
+REPEAT = 20
+
+
+def create_pmv_result(
+    temperature: float, radiant_temperature: float, met: float, clo: float
+) -> PMVResult:
+    # 制御サイクルと同じく、風速0.08m/sで計算した状態
+    relative_air_speed = PMVKernel.v_relative(0.08, met).item(0)
+    dynamic_clo = PMVKernel.clo_dynamic(clo, met).item(0)
+    return PMVResult(
+        pmv=0, ppd=0, clo=dynamic_clo, air=relative_air_speed, met=met, wall=radiant_temperature,
+        ceiling=radiant_temperature, floor=radiant_temperature,
+        mean_radiant_temperature=radiant_temperature, dry_bulb_temperature=temperature,
+        relative_air_speed=relative_air_speed, dynamic_clothing_insulation=dynamic_clo,
+    )
+
+
+def predict_exact_pmv(pmv_result: PMVResult, humidity: float) -> np.ndarray:
+    # 比較用：候補ごとに運転後の室温で冷却効果を計算し直す
+    modes, temperatures, fan_speeds, _ = AirconSetpointOptimizer._get_candidates()
+    fan_air_speeds = aircon_preference.setpoint_optimizer.fan_air_speeds
+    is_cooling = np.isin(modes, [AirconMode.COOLING.id, AirconMode.POWERFUL_COOLING.id])
+    is_heating = np.isin(modes, [AirconMode.HEATING.id, AirconMode.POWERFUL_HEATING.id])
+    temperature = np.full(temperatures.shape, pmv_result.dry_bulb_temperature)
+    temperature = np.where(is_cooling, np.minimum(temperature, temperatures), temperature)
+    temperature = np.where(is_heating, np.maximum(temperature, temperatures), temperature)
+    radiant_temperature = pmv_result.mean_radiant_temperature + (
+        temperature - pmv_result.dry_bulb_temperature
+    ) * ThermalComfort.calculate_mean_radiant_temperature_sensitivity()
+
+    base_air_speed = pmv_result.relative_air_speed
+    if pmv_result.met > 1:
+        base_air_speed -= 0.3 * (pmv_result.met - 1)
+    fan_speed_to_air_speed = {
+        AirconFanSpeed.AUTO.id: fan_air_speeds.auto,
+        AirconFanSpeed.LOW.id: fan_air_speeds.low,
+        AirconFanSpeed.MEDIUM.id: fan_air_speeds.medium,
+        AirconFanSpeed.HIGH.id: fan_air_speeds.high,
+    }
+    air_speed = np.maximum(
+        base_air_speed,
+        np.array([fan_speed_to_air_speed[fan_speed] for fan_speed in fan_speeds.tolist()]),
+    )
+    # 件数が多いため、冷却効果は配列でまとめて計算される
+    return PMVKernel.calculate_pmv_ppd(
+        temperature,
+        radiant_temperature,
+        PMVKernel.v_relative(air_speed, pmv_result.met),
+        humidity,
+        pmv_result.met,
+        pmv_result.dynamic_clothing_insulation,
+    )["pmv"]
+
+
+if __name__ == "__main__":
+    logger.setLevel(logging.WARNING)
+    print(f"計算方法: {thermal_preference.pmv_solver.backend}")
+
+    # 夏・冬・中間期と、MET値が1を超える時間帯（食事・就寝前など）の状態
+    states = [
+        ("夏（MET 1.0）", 29.0, 30.0, 1.0, 0.5, 65.0),
+        ("夏（MET 1.2）", 29.0, 30.0, 1.2, 0.5, 65.0),
+        ("冬（MET 1.0）", 17.0, 15.5, 1.0, 1.0, 40.0),
+        ("冬（MET 1.3）", 17.0, 15.5, 1.3, 1.0, 40.0),
+        ("中間期（MET 1.1）", 23.0, 23.0, 1.1, 0.7, 55.0),
+    ]
+    for label, temperature, radiant_temperature, met, clo, humidity in states:
+        pmv_result = create_pmv_result(temperature, radiant_temperature, met, clo)
+        AirconSetpointOptimizer.find_least_intensive_settings(pmv_result, humidity)
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            settings = AirconSetpointOptimizer.find_least_intensive_settings(pmv_result, humidity)
+        elapsed = (time.perf_counter() - start) / REPEAT
+
+        modes, temperatures, fan_speeds, _ = AirconSetpointOptimizer._get_candidates()
+        predicted = AirconSetpointOptimizer._predict_pmv(
+            pmv_result, humidity, modes, temperatures, fan_speeds
+        )
+        error = np.abs(predicted - predict_exact_pmv(pmv_result, humidity)).max()
+        print(
+            f"{label}: 1回 {elapsed * 1000:.2f}ms, 候補 {len(modes)}件, "
+            f"冷却効果を候補ごとに計算した場合とのPMVの最大差 {error:.3f}, "
+            f"選択: {settings.mode.name if settings else None} "
+            f"{settings.temperature if settings else ''} {settings.fan_speed.name if settings else ''}"
+        )
@@ -0,0 +1,217 @@
+# JSON Lines形式のログの記録・ファイルの切り替え・コレクターへの送信を確認し、ログ出力の時間を比べるスクリプト
+# 実行方法: python -m benchmarks.structured_log_benchmark
+#
+# 一時ディレクトリにログを記録し、出力したイベントがすべて1行のJSONとして書き込まれること、
+# 上限のサイズでファイルを切り替えること、ローカルで起動したコレクターにすべて送信されること、
+# コレクターが停止している場合は保持する上限を超えたイベントを捨てることを確認します。
+# ログ1回あたりの時間は、記録しない場合・バックグラウンドで書き込む場合・1回ごとに
+# ファイルに書き込む場合で比べます（ハンドラーはコンソールの代わりに通知用のバッファだけにします）。
+# SDカードなどの書き込みが遅いストレージを模して、書き込み1回ごとに待つ場合も比べます。
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from api.weather_foreecast.open_weather_map_api import OpenWeatherMapApi
+from logger.structured_log_handler import StructuredLogHandler
+from logger.system_event_logger import SystemEventLogger, console_handler, logger
+from preferences.app.structured_log_preference import StructuredLogPreference
+
+# 書き込みが遅いストレージで、書き込み1回ごとに待つ時間（秒）
+SLOW_WRITE_SECONDS = 0.001
+
+
+class SynchronousStructuredLogHandler(StructuredLogHandler):
+    # 比較用に、バックグラウンドのスレッドを使わずにイベントごとにファイルに書き込むハンドラー
+    def emit(self, record):
+        self._write([self._format_event(self.create_event(record))])
+
+
+class SlowStorageStructuredLogHandler(StructuredLogHandler):
+    # 書き込み1回ごとに待つハンドラー
+    def _write(self, lines):
+        time.sleep(SLOW_WRITE_SECONDS)
+        super()._write(lines)
+
+
+class SlowStorageSynchronousStructuredLogHandler(SynchronousStructuredLogHandler):
+    # 書き込み1回ごとに待ち、イベントごとに書き込むハンドラー
+    def _write(self, lines):
+        time.sleep(SLOW_WRITE_SECONDS)
+        super()._write(lines)
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    # 受け取ったイベントの行を数えるコレクター
+    received: list[dict] = []
+    requests = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        CollectorHandler.received.extend(json.loads(line) for line in body.decode("utf-8").splitlines())
+        CollectorHandler.requests += 1
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def log_cycle(count: int):
+    # 制御サイクルのログを模して、データを埋め込んだログとエラーを出力する
+    for index in range(count):
+        SystemEventLogger.log_info(
+            "pmv_calculation.pmv_ppd", pmv=f"{index % 30 / 10 - 1.5:.1f}", ppd=f"{index % 50:.1f}"
+        )
+        if index % 10 == 0:
+            SystemEventLogger.log_error(class_type=OpenWeatherMapApi, message="timeout")
+    SystemEventLogger.reset_log_buffer()
+
+
+def read_events(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def measure(handler: logging.Handler | None, count: int) -> float:
+    # ログ1回あたりの時間（µs）。バックグラウンドで書き込む場合も、書き込みの完了は含めない
+    if handler is not None:
+        logger.addHandler(handler)
+    try:
+        started = time.perf_counter()
+        log_cycle(count)
+        return (time.perf_counter() - started) / (count * 1.1) * 1e6
+    finally:
+        if handler is not None:
+            logger.removeHandler(handler)
+            handler.close()
+
+
+if __name__ == "__main__":
+    logger.removeHandler(console_handler)
+    count = 5000
+    expected = count + count // 10
+
+    with tempfile.TemporaryDirectory() as directory:
+        # すべてのイベントを記録する
+        preference = StructuredLogPreference(enabled=True, path=os.path.join(directory, "events.jsonl"))
+        handler = StructuredLogHandler(preference)
+        logger.addHandler(handler)
+        log_cycle(count)
+        handler.flush()
+        events = read_events(preference.path)
+        keys = {event["key"] for event in events}
+        print(f"記録したイベント: {len(events)}件（出力 {expected}件）, キー: {sorted(keys)}")
+        print(f"例: {json.dumps(events[0], ensure_ascii=False)}")
+        logger.removeHandler(handler)
+        handler.close()
+
+        # 書き込んだJSONからPMVの集計（キーとデータで絞り込むため、メッセージの文章を解析しない）
+        started = time.perf_counter()
+        pmvs = [
+            float(event["params"]["pmv"])
+            for event in read_events(preference.path)
+            if event["key"] == "log.pmv_calculation.pmv_ppd"
+        ]
+        elapsed = time.perf_counter() - started
+        print(f"PMVの平均: {sum(pmvs) / len(pmvs):.2f}（{len(pmvs)}件, 読み込みと集計 {elapsed * 1000:.1f}ms）")
+
+        # 上限のサイズでファイルを切り替える
+        preference = StructuredLogPreference(
+            enabled=True,
+            path=os.path.join(directory, "rotated.jsonl"),
+            max_bytes=64 * 1024,
+            backup_count=3,
+            batch_size=20,
+        )
+        handler = StructuredLogHandler(preference)
+        logger.addHandler(handler)
+        log_cycle(count)
+        logger.removeHandler(handler)
+        handler.close()
+        files = sorted(name for name in os.listdir(directory) if name.startswith("rotated.jsonl"))
+        sizes = [os.path.getsize(os.path.join(directory, name)) for name in files]
+        print(
+            f"ファイルの切り替え: {files}, 最大 {max(sizes)}バイト（上限 {preference.max_bytes}バイト）, "
+            f"書き込んだイベント {handler.written_count}件"
+        )
+
+        # ローカルのコレクターにまとめて送信する
+        server = HTTPServer(("127.0.0.1", 0), CollectorHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        preference = StructuredLogPreference(
+            enabled=True,
+            path=os.path.join(directory, "shipped.jsonl"),
+            collector_url=f"http://127.0.0.1:{server.server_port}/home_comfort_control",
+        )
+        handler = StructuredLogHandler(preference)
+        logger.addHandler(handler)
+        log_cycle(count)
+        logger.removeHandler(handler)
+        handler.close()
+        server.shutdown()
+        server.server_close()
+        print(
+            f"コレクターへの送信: {len(CollectorHandler.received)}件を{CollectorHandler.requests}回で送信"
+            f"（ファイルと同じ: {CollectorHandler.received == read_events(preference.path)}）"
+        )
+
+        # コレクターが停止している場合は、保持する上限を超えたイベントを捨てる
+        preference = StructuredLogPreference(
+            enabled=True,
+            path=os.path.join(directory, "unreachable.jsonl"),
+            collector_url=f"http://127.0.0.1:{server.server_port}/home_comfort_control",
+            ship_timeout_seconds=0.5,
+            max_pending_events=1000,
+        )
+        handler = StructuredLogHandler(preference)
+        logger.addHandler(handler)
+        log_cycle(count)
+        logger.removeHandler(handler)
+        handler.close()
+        print(
+            f"コレクターが停止している場合: 書き込み {handler.written_count}件, 送信 {handler.shipped_count}件, "
+            f"捨てたイベント {handler.dropped_count}件（保持する上限 {preference.max_pending_events}件）"
+        )
+
+        # ログ1回あたりの時間
+        none = measure(None, count)
+        background = measure(
+            StructuredLogHandler(
+                StructuredLogPreference(enabled=True, path=os.path.join(directory, "background.jsonl"))
+            ),
+            count,
+        )
+        synchronous = measure(
+            SynchronousStructuredLogHandler(
+                StructuredLogPreference(enabled=True, path=os.path.join(directory, "synchronous.jsonl"))
+            ),
+            count,
+        )
+        print(
+            f"ログ1回あたり: 記録しない {none:.1f}µs, バックグラウンドで書き込む {background:.1f}µs, "
+            f"1回ごとに書き込む {synchronous:.1f}µs"
+        )
+
+        # 書き込みが遅いストレージの場合
+        count = 500
+        none = measure(None, count)
+        background = measure(
+            SlowStorageStructuredLogHandler(
+                StructuredLogPreference(enabled=True, path=os.path.join(directory, "slow_background.jsonl"))
+            ),
+            count,
+        )
+        synchronous = measure(
+            SlowStorageSynchronousStructuredLogHandler(
+                StructuredLogPreference(enabled=True, path=os.path.join(directory, "slow_synchronous.jsonl"))
+            ),
+            count,
+        )
+        print(
+            f"書き込みに{SLOW_WRITE_SECONDS * 1000:.0f}msかかる場合のログ1回あたり: 記録しない {none:.1f}µs, "
+            f"バックグラウンドで書き込む {background:.1f}µs, 1回ごとに書き込む {synchronous:.1f}µs"
+        )
@@ -0,0 +1,92 @@
+# 表面温度モデルの計算量と精度を確認するスクリプト
+# 実行方法: python -m benchmarks.surface_temperature_model_benchmark
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from settings import LOCAL_TZ
+from shared.dataclass.surface_temperatures import SurfaceTemperatures
+from util.surface_temperature_model import SurfaceTemperatureModel
+from util.thermal_comfort import ThermalComfort
+
+# 履歴の再計算に使う期間（5分間隔で1年分）
+SAMPLE_COUNT = 365 * 24 * 12
+INTERVAL_SECONDS = 300
+# 時定数の推定に使う真の時定数（時間）
+TRUE_TIME_CONSTANT_HOURS = 3.5
+
+
+def create_history(count: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    # 日変化する平衡温度に、欠測による長い間隔を混ぜた履歴を作成
+    rng = np.random.default_rng(seed)
+    elapsed_seconds = np.full(count, float(INTERVAL_SECONDS))
+    elapsed_seconds[rng.random(count) < 0.001] = 6 * 3600
+    hours = np.cumsum(elapsed_seconds) / 3600
+    daily = 8 * np.sin(2 * np.pi * hours / 24)
+    equilibrium = np.column_stack(
+        (24 + daily, 28 + 1.5 * daily, 22 + 0.5 * daily)
+    ) + rng.normal(0, 0.3, (count, 3))
+    return elapsed_seconds, equilibrium
+
+
+def replay_with_advance(elapsed_seconds: np.ndarray, equilibrium: np.ndarray) -> np.ndarray:
+    # 比較用：制御サイクルと同じくadvanceを1件ずつ呼び出す
+    start = datetime(2024, 1, 1, tzinfo=LOCAL_TZ)
+    state = None
+    seconds = 0.0
+    results = []
+    for elapsed, (wall, ceiling, floor) in zip(elapsed_seconds.tolist(), equilibrium.tolist()):
+        seconds += elapsed
+        state = SurfaceTemperatureModel.advance(
+            state,
+            SurfaceTemperatures(
+                wall=wall,
+                ceiling=ceiling,
+                floor=floor,
+                updated_at=start + timedelta(seconds=seconds),
+            ),
+        )
+        results.append((state.wall, state.ceiling, state.floor))
+    return np.array(results)
+
+
+if __name__ == "__main__":
+    elapsed_seconds, equilibrium = create_history(SAMPLE_COUNT)
+
+    # 1サイクル分の更新とPMV計算の時間を比較
+    count = 2000
+    subset = slice(0, count)
+    start = time.perf_counter()
+    sequential = replay_with_advance(elapsed_seconds[subset], equilibrium[subset])
+    advance_seconds = (time.perf_counter() - start) / count
+    start = time.perf_counter()
+    for _ in range(20):
+        ThermalComfort._calculate_pmv_ppd(26.0, 27.0, 0.2, 55.0, 1.1, 0.5)
+    pmv_seconds = (time.perf_counter() - start) / 20
+    print(f"1サイクルの更新: {advance_seconds * 1e6:.1f}µs, PMVの計算: {pmv_seconds * 1e6:.0f}µs")
+
+    # 一括計算が1件ずつの更新と一致することを確認
+    batch = SurfaceTemperatureModel.replay(elapsed_seconds[subset], equilibrium[subset])
+    print(f"1件ずつの更新との最大差: {np.max(np.abs(batch - sequential)):.2e}°")
+
+    start = time.perf_counter()
+    SurfaceTemperatureModel.replay(elapsed_seconds, equilibrium)
+    print(f"{SAMPLE_COUNT}件の一括計算: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    # 既知の時定数で作った実測値から時定数を推定できることを確認
+    rng = np.random.default_rng(1)
+    fit_subset = slice(0, 14 * 24 * 12)
+    observed = SurfaceTemperatureModel.replay(
+        elapsed_seconds[fit_subset],
+        equilibrium[fit_subset, 0],
+        time_constants=TRUE_TIME_CONSTANT_HOURS * 3600,
+    ) + rng.normal(0, 0.2, equilibrium[fit_subset].shape[0])
+    start = time.perf_counter()
+    fitted = SurfaceTemperatureModel.fit_time_constant(
+        elapsed_seconds[fit_subset], equilibrium[fit_subset, 0], observed
+    )
+    print(
+        f"時定数の推定: {fitted:.2f}時間（真値 {TRUE_TIME_CONSTANT_HOURS}時間, "
+        f"{(time.perf_counter() - start) * 1000:.0f}ms）"
+    )
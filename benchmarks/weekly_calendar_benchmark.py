@@ -0,0 +1,46 @@
+# 週間カレンダーの検索時間と、次に時間帯が切り替わる日時を確認するスクリプト
+# 実行方法: python -m benchmarks.weekly_calendar_benchmark
+#
+# 1分ごとに1週間分の日時を調べ、次に切り替わる日時の前後で有効な時間帯が変わることを確認します。
+import timeit
+from datetime import datetime, timedelta
+
+from settings import LOCAL_TZ
+from util.weekly_calendar import WeeklyCalendar
+
+if __name__ == "__main__":
+    calendar = WeeklyCalendar.get()
+    current_datetime = LOCAL_TZ.localize(datetime(2024, 7, 1, 0, 0))
+    print(f"時間帯の数: {len(calendar.windows)}, 区間の数: {len(calendar.starts)}")
+
+    # 次に切り替わる日時の直前までは有効な時間帯が変わらず、その日時で変わることを確認
+    errors = 0
+    for minute in range(7 * 24 * 60):
+        target = current_datetime + timedelta(minutes=minute)
+        transition = calendar.next_transition(target)
+        if transition is None:
+            break
+        active = calendar.active_windows(target)
+        before = calendar.active_windows(transition - timedelta(microseconds=1))
+        if before != active or calendar.active_windows(transition) == active:
+            errors += 1
+    print(f"次に切り替わる日時の不一致: {errors}件")
+
+    target = current_datetime
+    for _ in range(8):
+        transition = calendar.next_transition(target)
+        if transition is None:
+            break
+        print(f"{transition:%a %H:%M:%S.%f}: {', '.join(sorted(calendar.active_windows(transition)))}")
+        target = transition
+
+    number = 100_000
+    cases = {
+        "有効な時間帯の検索": lambda: calendar.active_windows(current_datetime),
+        "時間帯の判定": lambda: calendar.is_active(WeeklyCalendar.AWAKE, current_datetime),
+        "次に切り替わる日時": lambda: calendar.next_transition(current_datetime),
+        "変換済みカレンダーの取得": WeeklyCalendar.get,
+    }
+    for name, case in cases.items():
+        elapsed = timeit.timeit(case, number=number)
+        print(f"{name}: {elapsed / number * 1e6:.2f}µs/回")
@@ -0,0 +1,19 @@
+# 翻訳ファイルのメッセージを、ログの出力に使うテンプレートに変換して保存するスクリプト
+# 実行方法: python build_message_templates.py [--locale ja]
+#
+# テンプレートは最初にログを出力するときにも作成されます。インストール時に実行しておくと、
+# 最初の実行で翻訳ファイルを読み込んで変換する時間を省けます。
+import argparse
+
+import i18n
+
+import settings  # noqa: F401  翻訳ファイルの場所とロケールを設定する
+from translations.message_templates import MessageTemplates
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="翻訳ファイルのメッセージをテンプレートに変換します")
+    parser.add_argument("--locale", default=i18n.config.get("locale"), help="ロケール")
+    args = parser.parse_args()
+
+    templates = MessageTemplates.build(MessageTemplates.CACHE_PATH, args.locale)
+    print(f"{len(templates)}件のメッセージを{MessageTemplates.CACHE_PATH}に保存しました")
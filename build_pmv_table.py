@@ -0,0 +1,108 @@
+# PMVの表を生成し、厳密な計算との誤差を報告するスクリプト
+# 実行方法: python build_pmv_table.py [--output data/pmv_table.npy] [--workers 4] [--samples 2000]
+import argparse
+import os
+import time
+import warnings
+
+import numpy as np
+from pythermalcomfort.models import pmv_ppd
+
+from settings import thermal_preference
+from util.pmv_kernel import PMVKernel
+from util.pmv_table import PMVTable
+
+# 基準のPMVKernelを、pythermalcomfortのpmv_ppdと1件ずつ比較する入力数
+SCALAR_SAMPLES = 200
+
+
+def create_operating_inputs(samples: int, seed: int = 0) -> dict[str, np.ndarray]:
+    # 制御で扱う範囲（室温と平均放射温度の差が3度以内、相対風速0.5m/s以下）の入力を乱数で作成する
+    rng = np.random.default_rng(seed)
+    tdb = rng.uniform(16, 32, samples)
+    return {
+        "tdb": tdb,
+        "tr": tdb + rng.uniform(-3, 3, samples),
+        "vr": rng.uniform(0, 0.5, samples),
+        "rh": rng.uniform(30, 80, samples),
+        "met": rng.uniform(0.8, 1.5, samples),
+        "clo": rng.uniform(0.3, 1.2, samples),
+    }
+
+
+def report_accuracy(path: str, samples: int, seed: int = 0):
+    # 表の範囲内の入力を乱数で作成し、PMVKernelの結果と比較する
+    # （pmv_ppdに配列で渡すと冷却効果が最初の要素に合わせて整数になることがあるため、基準にしない）
+    rng = np.random.default_rng(seed)
+    inputs = {
+        name: rng.uniform(axis[0], axis[-1], samples) for name, axis in PMVTable.AXES.items()
+    }
+    print("表の範囲全体:")
+
+    start = time.perf_counter()
+    exact = PMVKernel.calculate_pmv_ppd(**inputs)
+    exact_seconds = time.perf_counter() - start
+
+    # 基準のPMVKernelが、pmv_ppdを1件ずつ呼んだ結果と一致することを確認する
+    scalar_count = min(samples, SCALAR_SAMPLES)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scalar = np.array(
+            [
+                pmv_ppd(
+                    **{name: float(values[i]) for name, values in inputs.items()},
+                    limit_inputs=False,
+                    standard="ASHRAE",
+                )["pmv"]
+                for i in range(scalar_count)
+            ]
+        )
+    kernel_error = np.abs(exact["pmv"][:scalar_count] - scalar).max()
+
+    table = PMVTable(path)
+    start = time.perf_counter()
+    interpolated = table.calculate_pmv_ppd(**inputs)
+    table_seconds = time.perf_counter() - start
+
+    pmv_error = np.abs(interpolated["pmv"] - exact["pmv"])
+    ppd_error = np.abs(interpolated["ppd"] - exact["ppd"])
+    worst = int(np.argmax(pmv_error))
+
+    print(f"比較した入力数: {samples}（PMVKernelとpmv_ppdの最大差 {kernel_error:.3f}, {scalar_count}件）")
+    print(f"PMVの最大誤差: {pmv_error.max():.3f}（平均 {pmv_error.mean():.4f}, 99%点 {np.percentile(pmv_error, 99):.3f}）")
+    print(f"PPDの最大誤差: {ppd_error.max():.2f}%（平均 {ppd_error.mean():.3f}%）")
+    print(
+        "PMVの誤差が最大の入力: "
+        + ", ".join(f"{name}={values[worst]:.2f}" for name, values in inputs.items())
+    )
+    print(f"PMVKernel: {exact_seconds * 1000:.1f}ms, 表: {table_seconds * 1000:.1f}ms")
+
+    # 大きな誤差は、ASHRAEの冷却効果（SETの一致で求める）が入力に対して不連続に変わる箇所で出るため、
+    # 格子を細かくしても消えない。制御で扱う範囲での誤差を別に報告する
+    inputs = create_operating_inputs(samples, seed)
+    exact = PMVKernel.calculate_pmv_ppd(**inputs)
+    interpolated = table.calculate_pmv_ppd(**inputs)
+    pmv_error = np.abs(interpolated["pmv"] - exact["pmv"])
+    ppd_error = np.abs(interpolated["ppd"] - exact["ppd"])
+    print("制御で扱う範囲:")
+    print(f"PMVの最大誤差: {pmv_error.max():.3f}（平均 {pmv_error.mean():.4f}, 99%点 {np.percentile(pmv_error, 99):.3f}）")
+    print(f"PPDの最大誤差: {ppd_error.max():.2f}%（平均 {ppd_error.mean():.3f}%）")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PMVの表を生成します")
+    parser.add_argument("--output", default=thermal_preference.pmv_solver.table_path)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--report-only", action="store_true", help="生成せずに誤差だけを報告する")
+    args = parser.parse_args()
+
+    if not args.report_only:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        start = time.perf_counter()
+        PMVTable.generate(args.output, workers=args.workers)
+        print(f"{args.output}を生成しました（{time.perf_counter() - start:.0f}秒）")
+
+    report_accuracy(args.output, args.samples)
@@ -4,6 +4,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from util.env_config_loader import EnvConfigLoader
+from util.query_profiler import QueryProfiler
 
 
 class DBSessionManager:
@@ -36,6 +37,9 @@ class DBSessionManager:
     # エンジンの作成
     _engine = create_engine(create_url(), echo=False)
 
+    # 実行したSQL文を記録できるようにする（記録中でない場合はイベントを登録しない）
+    QueryProfiler.install(_engine)
+
     # セッションの作成
     _session = sessionmaker(bind=_engine)
 
@@ -0,0 +1,306 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from db.db_session_manager import DBSessionManager
+from logger.system_event_logger import SystemEventLogger
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
+from preferences.aircon.predictive_control_preference import PredictiveControlPreference
+from repository.services.weather_forecast_hourly_service import WeatherForecastHourlyService
+from settings import aircon_preference, app_preference
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.pmv_result import PMVResult
+from shared.enums.aircon_fan_speed import AirconFanSpeed
+from shared.enums.aircon_mode import AirconMode
+from shared.enums.power_mode import PowerMode
+from util.house_thermal_model import HouseThermalModel
+from util.pmv_kernel import PMVKernel
+from util.thermal_comfort import ThermalComfort
+from util.time_helper import TimeHelper
+
+
+class AirconPredictivePlanner:
+    """
+    天気予報と家の熱モデルで数時間先までの運転計画を評価し、最初の運転を決めるクラス。
+
+    運転計画は「最初の運転を続け、途中で別の運転に1回切り替える」形とし、
+    運転（送風・冷房・暖房と設定温度）の組み合わせと切り替える時刻のすべてを候補にします。
+    全候補の室温をHouseThermalModelでまとめて進め、PMVが期間中ずっと快適範囲に収まる計画
+    （収まる計画がない場合は範囲から外れる量が最も少ない計画）のうち、
+    消費電力の目安（エアコンが動かした熱量を成績係数で割った値）が最も小さい計画を選び、
+    その最初の運転を返します。
+    毎回の制御で計画し直すため、切り替え後の運転は次回以降の計画で決まります。
+
+    METとCLO、湿度、風速は期間中変わらないものとし、平均放射温度は室温の変化に追従させます。
+    """
+
+    _DISCOMFORT_TOLERANCE = 0.01
+    """快適範囲から外れる量（PMV×時間）の差をこれ以下なら同じとみなす"""
+
+    _actions: tuple | None = None
+    """運転の候補のキャッシュ（モード、設定温度、運転方向の配列）"""
+
+    _actions_preference: PredictiveControlPreference | None = None
+    """運転の候補を生成したときの設定"""
+
+    _schedules: dict[tuple[int, int], np.ndarray] = {}
+    """運転の数と区間の数ごとの運転計画のキャッシュ（計画×区間の運転の番号）"""
+
+    @staticmethod
+    def plan(
+        pmv_result: PMVResult,
+        humidity: float,
+        hourly_forecasts: list[WeatherForecastHourlyModel] | None = None,
+    ) -> AirconSettings | None:
+        """
+        快適範囲を保てる最も電力の少ない運転計画の、最初の運転のエアコン設定を返すメソッド。
+
+        Args:
+            pmv_result (PMVResult): 現在の状態でのPMV計算結果。
+            humidity (float): 室内の相対湿度（%）。
+            hourly_forecasts (list[WeatherForecastHourlyModel] | None): 時間単位の天気予報。
+                省略した場合はデータベースから取得し、データベースを使わない場合は計画しない。
+
+        Returns:
+            AirconSettings | None: 最初の運転のエアコン設定。天気予報が足りない場合はNone。
+        """
+        predictive_control = aircon_preference.predictive_control
+        current_time = TimeHelper.get_current_time()
+        step_hours = predictive_control.step_minutes / 60
+        steps = int(np.ceil(predictive_control.horizon_hours / step_hours))
+
+        if hourly_forecasts is None:
+            hourly_forecasts = AirconPredictivePlanner._load_forecasts(current_time)
+        outdoor_temperatures = AirconPredictivePlanner._interpolate_outdoor_temperatures(
+            hourly_forecasts, current_time, step_hours, steps
+        )
+        if outdoor_temperatures is None:
+            SystemEventLogger.log_info("aircon_related.predictive_control_no_forecast")
+            return None
+
+        modes, setpoints, directions = AirconPredictivePlanner._get_actions()
+        schedules = AirconPredictivePlanner._get_schedules(len(modes), steps)
+
+        # 全計画の室温・PMV・熱量を区間ごとにまとめて進める
+        temperature_grid, pmv_grid = AirconPredictivePlanner._build_pmv_table(
+            pmv_result, humidity, setpoints, outdoor_temperatures
+        )
+        lower = predictive_control.comfort_band.lower
+        upper = predictive_control.comfort_band.upper
+        parameters = HouseThermalModel.get_parameters()
+        temperature = np.full(schedules.shape[0], pmv_result.dry_bulb_temperature)
+        energy = np.zeros(schedules.shape[0])
+        discomfort = np.zeros(schedules.shape[0])
+        for step in range(steps):
+            actions = schedules[:, step]
+            outdoor_temperature = outdoor_temperatures[step]
+            temperature, heat = HouseThermalModel.advance(
+                temperature,
+                outdoor_temperature,
+                setpoints[actions],
+                directions[actions],
+                step_hours,
+                parameters,
+            )
+            energy += np.abs(heat) / AirconPredictivePlanner._calculate_cop(
+                outdoor_temperature, setpoints[actions]
+            )
+            pmv = np.interp(temperature, temperature_grid, pmv_grid)
+            discomfort += np.maximum(np.maximum(pmv - upper, lower - pmv), 0.0) * step_hours
+
+        # 快適範囲を保てる計画がない場合（現在の室温が範囲から大きく外れている場合など）は、
+        # 範囲から外れる量が最も少ない計画を快適な計画とみなす
+        comfortable = np.flatnonzero(
+            discomfort <= discomfort.min() + AirconPredictivePlanner._DISCOMFORT_TOLERANCE
+        )
+
+        # 電力の少ない順、同じなら最初の運転を長く続ける（切り替えの遅い）順で選択
+        switch_steps = np.argmax(schedules != schedules[:, :1], axis=1)
+        switch_steps[np.all(schedules == schedules[:, :1], axis=1)] = steps
+        best = comfortable[np.lexsort((-switch_steps[comfortable], energy[comfortable]))[0]]
+        first_action = schedules[best, 0]
+
+        aircon_settings = AirconSettings(
+            temperature=float(setpoints[first_action]),
+            mode=AirconMode.get_by_id(int(modes[first_action])),
+            fan_speed=AirconFanSpeed.AUTO,
+            power=PowerMode.ON,
+        )
+        next_action = schedules[best, -1]
+        SystemEventLogger.log_info(
+            "aircon_related.predictive_control_selected",
+            aircon_settings=SystemEventLogger.format_settings(aircon_settings),
+            switch_hours=round(float(switch_steps[best]) * step_hours, 1),
+            next_mode=AirconMode.get_by_id(int(modes[next_action])).label,
+            next_temperature=float(setpoints[next_action]),
+            energy=round(float(energy[best]), 2),
+        )
+        return aircon_settings
+
+    @staticmethod
+    def _load_forecasts(current_time: datetime) -> list[WeatherForecastHourlyModel]:
+        """現在時刻の前後を含めて、評価する期間の天気予報をデータベースから取得するメソッド。"""
+        if not app_preference.database.enabled:
+            return []
+        horizon_hours = aircon_preference.predictive_control.horizon_hours
+        with DBSessionManager.session() as session:
+            forecasts = WeatherForecastHourlyService(session).get_between(
+                current_time - timedelta(hours=1), current_time + timedelta(hours=horizon_hours + 1)
+            )
+            session.expunge_all()
+        return forecasts
+
+    @staticmethod
+    def _interpolate_outdoor_temperatures(
+        hourly_forecasts: list[WeatherForecastHourlyModel],
+        current_time: datetime,
+        step_hours: float,
+        steps: int,
+    ) -> np.ndarray | None:
+        """
+        各区間の中央の時刻の外気温を、天気予報の気温から線形補間で求めるメソッド。
+
+        Returns:
+            np.ndarray | None: 区間ごとの外気温。天気予報が期間の最後まで届かない場合はNone
+        """
+        if len(hourly_forecasts) < 2:
+            return None
+        forecast_hours = np.array(
+            [
+                (forecast.forecast_time - current_time).total_seconds() / 3600
+                for forecast in hourly_forecasts
+            ]
+        )
+        forecast_temperatures = np.array([forecast.temperature for forecast in hourly_forecasts])
+        order = np.argsort(forecast_hours)
+        forecast_hours = forecast_hours[order]
+        # 予報の間隔より先の外挿はしない（期間の最後の区間の中央まで予報があればよい）
+        if forecast_hours[-1] < (steps - 0.5) * step_hours:
+            return None
+        step_centers = (np.arange(steps) + 0.5) * step_hours
+        return np.interp(step_centers, forecast_hours, forecast_temperatures[order])
+
+    @staticmethod
+    def _calculate_cop(outdoor_temperature: float, setpoints: np.ndarray) -> np.ndarray:
+        """外気温と設定温度の差から成績係数を求めるメソッド。"""
+        predictive_control = aircon_preference.predictive_control
+        return np.maximum(
+            predictive_control.cop_rated
+            - predictive_control.cop_slope * np.abs(outdoor_temperature - setpoints),
+            predictive_control.cop_min,
+        )
+
+    @staticmethod
+    def _build_pmv_table(
+        pmv_result: PMVResult,
+        humidity: float,
+        setpoints: np.ndarray,
+        outdoor_temperatures: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        室温ごとのPMVの表を作るメソッド。
+
+        計画中の室温は現在の室温、設定温度、外気温に発熱分を加えた温度の間に収まるため、
+        その範囲を0.5度刻みで計算し、各区間の室温のPMVは表からの線形補間で求めます。
+        風による冷却効果の計算（SETの反復計算）は時間がかかるため、静穏気流でのPMVの室温による変化を
+        現在のPMVに加えて近似します。現在の室温から±4度の範囲での誤差は0.1以下です。
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: 室温と、その室温でのPMVの配列
+        """
+        dry_bulb_temperature = pmv_result.dry_bulb_temperature
+        heat_gain_offset = aircon_preference.predictive_control.heat_gain_offset
+        lowest = min(
+            dry_bulb_temperature,
+            float(setpoints.min()),
+            float(outdoor_temperatures.min()) + heat_gain_offset,
+        )
+        highest = max(
+            dry_bulb_temperature,
+            float(setpoints.max()),
+            float(outdoor_temperatures.max()) + heat_gain_offset,
+        )
+        temperature_grid = np.append(
+            np.arange(np.floor(lowest), np.ceil(highest) + 0.25, 0.5), dry_bulb_temperature
+        )
+        radiant_temperature = pmv_result.mean_radiant_temperature + (
+            temperature_grid - dry_bulb_temperature
+        ) * ThermalComfort.calculate_mean_radiant_temperature_sensitivity()
+        results = ThermalComfort.calculate_pmv_ppd(
+            tdb=temperature_grid,
+            tr=radiant_temperature,
+            vr=min(pmv_result.relative_air_speed, PMVKernel.STILL_AIR_SPEED),
+            rh=humidity,
+            met=pmv_result.met,
+            clo=pmv_result.dynamic_clothing_insulation,
+        )
+        # 末尾に加えた現在の室温でのPMVが、現在のPMVと一致するようにずらす
+        still_air_pmv = np.asarray(results["pmv"], dtype=float)
+        pmv_grid = still_air_pmv[:-1] + (pmv_result.pmv - still_air_pmv[-1])
+        return temperature_grid[:-1], pmv_grid
+
+    @staticmethod
+    def _get_actions() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        運転の候補（送風、各設定温度の冷房と暖房）を配列で返すメソッド。
+        候補は設定から生成してキャッシュし、設定が置き換えられている場合は生成し直します。
+
+        Returns:
+            tuple: モードID、設定温度、運転方向の配列
+        """
+        predictive_control = aircon_preference.predictive_control
+        if (
+            AirconPredictivePlanner._actions is not None
+            and AirconPredictivePlanner._actions_preference is predictive_control
+        ):
+            return AirconPredictivePlanner._actions
+
+        temperatures = np.arange(
+            predictive_control.temperature_min, predictive_control.temperature_max + 0.5, 1.0
+        ).tolist()
+        actions = [(AirconMode.FAN.id, predictive_control.temperature_max, HouseThermalModel.IDLE)]
+        actions += [
+            (AirconMode.COOLING.id, temperature, HouseThermalModel.COOLING)
+            for temperature in temperatures
+        ]
+        actions += [
+            (AirconMode.HEATING.id, temperature, HouseThermalModel.HEATING)
+            for temperature in temperatures
+        ]
+
+        AirconPredictivePlanner._actions = (
+            np.array([action[0] for action in actions]),
+            np.array([action[1] for action in actions], dtype=float),
+            np.array([action[2] for action in actions]),
+        )
+        AirconPredictivePlanner._actions_preference = predictive_control
+        return AirconPredictivePlanner._actions
+
+    @staticmethod
+    def _get_schedules(action_count: int, steps: int) -> np.ndarray:
+        """
+        最初の運転、切り替え後の運転、切り替える区間のすべての組み合わせの運転計画を返すメソッド。
+
+        切り替えない計画は運転ごとに1つだけ含めます。
+
+        Returns:
+            np.ndarray: 計画×区間の運転の番号の2次元配列
+        """
+        key = (action_count, steps)
+        if key not in AirconPredictivePlanner._schedules:
+            first, second, switch = np.meshgrid(
+                np.arange(action_count),
+                np.arange(action_count),
+                np.arange(1, steps),
+                indexing="ij",
+            )
+            switching = first != second
+            first = np.concatenate((first[switching], np.arange(action_count)))
+            second = np.concatenate((second[switching], np.arange(action_count)))
+            switch = np.concatenate((switch[switching], np.full(action_count, steps)))
+            AirconPredictivePlanner._schedules[key] = np.where(
+                np.arange(steps) < switch[:, np.newaxis],
+                first[:, np.newaxis],
+                second[:, np.newaxis],
+            )
+        return AirconPredictivePlanner._schedules[key]
@@ -0,0 +1,128 @@
+import bisect
+import itertools
+import math
+from datetime import datetime
+
+from preferences.app.comfort_period_preference import ComfortPeriodPreference
+from preferences.app.time_range_preference import TimeRangePreference
+from settings import aircon_preference, app_preference
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.pmv_threshold_settings import PMVThresholdSettings
+from util.weekly_calendar import WeeklyCalendar
+
+
+class AirconRuleProgram:
+    """
+    エアコンの設定の判断に使う設定を、検索しやすい形に変換して保持するクラス。
+
+    PMV閾値は先頭からの最大値の配列に変換し、二分探索で先頭から順に比較した場合と
+    同じ閾値を求めます。快適管理の無効期間は曜日ごとに判定に使う設定を選び、
+    現在時刻を含む時間帯はWeeklyCalendarで判定します。
+
+    設定のリストを置き換えた場合は、get()で自動的に変換し直します。
+    リストの要素を直接変更した場合は、compile()で変換し直してください。
+    """
+
+    _program: "AirconRuleProgram | None" = None
+
+    def __init__(
+        self,
+        pmv_thresholds: list[PMVThresholdSettings],
+        disabled_periods: list[ComfortPeriodPreference],
+    ):
+        """
+        Args:
+            pmv_thresholds (list[PMVThresholdSettings]): PMV閾値の設定（設定ファイルの順）
+            disabled_periods (list[ComfortPeriodPreference]): 快適管理の無効期間の設定
+        """
+        self.pmv_thresholds = pmv_thresholds
+        self.disabled_periods = disabled_periods
+
+        # 先頭からの閾値の最大値が初めてPMV以上になる位置は、
+        # 先頭から順に比較して初めてPMV以下の閾値が見つかる位置と同じ
+        self.threshold_bounds = list(
+            itertools.accumulate((threshold.threshold for threshold in pmv_thresholds), max)
+        )
+
+        # 曜日ごとに最初に一致する無効期間だけが判定に使われる
+        self.weekday_periods: list[ComfortPeriodPreference | None] = [None] * 7
+        for period in disabled_periods:
+            if 0 <= period.day < 7 and self.weekday_periods[period.day] is None:
+                self.weekday_periods[period.day] = period
+
+    @staticmethod
+    def compile() -> "AirconRuleProgram":
+        """
+        現在の設定から変換し直すメソッド。
+
+        Returns:
+            AirconRuleProgram: 変換した設定
+        """
+        AirconRuleProgram._program = AirconRuleProgram(
+            aircon_preference.aircon_settings.pmv_thresholds,
+            app_preference.comfort_control.disabled_periods,
+        )
+        return AirconRuleProgram._program
+
+    @staticmethod
+    def get() -> "AirconRuleProgram":
+        """
+        変換済みの設定を返すメソッド。設定のリストが置き換えられている場合は変換し直します。
+
+        Returns:
+            AirconRuleProgram: 変換した設定
+        """
+        program = AirconRuleProgram._program
+        if (
+            program is None
+            or program.pmv_thresholds is not aircon_preference.aircon_settings.pmv_thresholds
+            or program.disabled_periods is not app_preference.comfort_control.disabled_periods
+        ):
+            program = AirconRuleProgram.compile()
+        return program
+
+    def find_pmv_threshold_settings(self, pmv: float) -> AirconSettings | None:
+        """
+        PMVが閾値以下になる最初の閾値のエアコン設定を返すメソッド。
+
+        該当する閾値がない場合は最後の閾値の設定を返します。
+
+        Args:
+            pmv (float): PMV値
+
+        Returns:
+            AirconSettings | None: 閾値のエアコン設定。閾値が設定されていない場合はNone
+        """
+        if not self.pmv_thresholds:
+            return None
+        index = len(self.pmv_thresholds) if math.isnan(pmv) else bisect.bisect_left(
+            self.threshold_bounds, pmv
+        )
+        return self.pmv_thresholds[min(index, len(self.pmv_thresholds) - 1)].aircon_settings
+
+    def find_disabled_period(
+        self, current_datetime: datetime
+    ) -> tuple[ComfortPeriodPreference, TimeRangePreference | None] | None:
+        """
+        指定した日時が含まれる快適管理の無効期間を返すメソッド。
+
+        Args:
+            current_datetime (datetime): 判定する日時
+
+        Returns:
+            tuple | None: 無効期間と、現在時刻を含む時間帯（終日無効の場合はNone）。
+                無効期間に含まれない場合はNone
+        """
+        weekday = current_datetime.weekday()
+        period = self.weekday_periods[weekday]
+        if period is None:
+            return None
+        if not period.times:
+            return period, None
+
+        # ログに出力する時間帯は、設定ファイルの順で最初に一致する時間帯
+        active_windows = WeeklyCalendar.get().active_windows(current_datetime)
+        for index, time_range in enumerate(period.times):
+            if WeeklyCalendar.disabled_period_name(weekday, index) in active_windows:
+                return period, time_range
+        return None
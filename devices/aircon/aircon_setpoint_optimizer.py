@@ -0,0 +1,219 @@
+import numpy as np
+
+from logger.system_event_logger import SystemEventLogger
+from preferences.aircon.setpoint_optimizer_preference import SetpointOptimizerPreference
+from settings import aircon_preference
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.pmv_result import PMVResult
+from shared.enums.aircon_fan_speed import AirconFanSpeed
+from shared.enums.aircon_mode import AirconMode
+from shared.enums.power_mode import PowerMode
+from util.aircon_intensity_calculator import AirconIntensityCalculator
+from util.pmv_kernel import PMVKernel
+from util.thermal_comfort import ThermalComfort
+
+
+class AirconSetpointOptimizer:
+    """
+    PMV予測に基づいてエアコン設定を探索するクラス。
+
+    モード・設定温度・風量の全候補について運転後のPMVを一括で予測し、
+    快適範囲に収まる候補の中から最も強度の低い設定を選択します。
+    """
+
+    _candidates: tuple | None = None
+    """候補設定のキャッシュ（モード、設定温度、風量、強度の配列）"""
+
+    _candidates_preference: SetpointOptimizerPreference | None = None
+    """候補設定を生成したときの設定"""
+
+    @staticmethod
+    def find_least_intensive_settings(
+        pmv_result: PMVResult, humidity: float
+    ) -> AirconSettings | None:
+        """
+        快適範囲に収まる候補のうち、最も強度の低いエアコン設定を返すメソッド。
+
+        Args:
+            pmv_result (PMVResult): 現在の状態でのPMV計算結果。
+            humidity (float): 室内の相対湿度（%）。
+
+        Returns:
+            AirconSettings | None: 選択されたエアコン設定。快適範囲に収まる候補がない場合はNone。
+        """
+        optimizer_preference = aircon_preference.setpoint_optimizer
+        modes, temperatures, fan_speeds, intensities = AirconSetpointOptimizer._get_candidates()
+
+        # 全候補の運転後PMVを予測
+        pmv = AirconSetpointOptimizer._predict_pmv(
+            pmv_result, humidity, modes, temperatures, fan_speeds
+        )
+
+        # 快適範囲に収まる候補のみを対象にする
+        lower = optimizer_preference.comfort_band.lower
+        upper = optimizer_preference.comfort_band.upper
+        in_band = np.flatnonzero((pmv >= lower) & (pmv <= upper))
+        if in_band.size == 0:
+            return None
+
+        # 強度の低い順、同じ強度なら快適範囲の中心に近い順で選択
+        distance = np.abs(pmv[in_band] - (lower + upper) / 2)
+        best = in_band[np.lexsort((distance, intensities[in_band]))[0]]
+
+        aircon_settings = AirconSettings(
+            temperature=float(temperatures[best]),
+            mode=AirconMode.get_by_id(int(modes[best])),
+            fan_speed=AirconFanSpeed.get_by_id(int(fan_speeds[best])),
+            power=PowerMode.ON,
+        )
+        SystemEventLogger.log_info(
+            "aircon_related.setpoint_optimizer_selected",
+            aircon_settings=SystemEventLogger.format_settings(aircon_settings),
+            pmv=round(float(pmv[best]), 2),
+            intensity=int(intensities[best]),
+        )
+        return aircon_settings
+
+    @staticmethod
+    def _predict_pmv(
+        pmv_result: PMVResult,
+        humidity: float,
+        modes: np.ndarray,
+        temperatures: np.ndarray,
+        fan_speeds: np.ndarray,
+    ) -> np.ndarray:
+        """
+        各候補で運転した場合のPMVをまとめて予測するメソッド。
+
+        冷房は設定温度まで室温を下げ、暖房は設定温度まで室温を上げるものとし、
+        平均放射温度は室温の変化に追従させます。風速は風量ごとの想定風速と現在の風速の大きい方を使います。
+
+        風による冷却効果（SETの反復計算）は1件あたり数msかかるため、風速ごとに現在の室温で1回だけ計算し、
+        各候補では静穏気流のPMVをその冷却効果で補正します。運転後の室温による冷却効果の変化は無視します。
+        計算はPMVKernel（pmv_ppdのASHRAE基準と同じ計算）で行います。
+
+        Returns:
+            np.ndarray: 候補ごとのPMV
+        """
+        fan_air_speeds = aircon_preference.setpoint_optimizer.fan_air_speeds
+        dry_bulb_temperature = pmv_result.dry_bulb_temperature
+        met = pmv_result.met
+
+        # 運転後の室温を予測
+        is_cooling = np.isin(
+            modes, [AirconMode.COOLING.id, AirconMode.POWERFUL_COOLING.id]
+        )
+        is_heating = np.isin(
+            modes, [AirconMode.HEATING.id, AirconMode.POWERFUL_HEATING.id]
+        )
+        predicted_temperature = np.full(temperatures.shape, dry_bulb_temperature)
+        predicted_temperature = np.where(
+            is_cooling, np.minimum(predicted_temperature, temperatures), predicted_temperature
+        )
+        predicted_temperature = np.where(
+            is_heating, np.maximum(predicted_temperature, temperatures), predicted_temperature
+        )
+
+        # 平均放射温度を室温の変化に追従させる
+        predicted_radiant_temperature = pmv_result.mean_radiant_temperature + (
+            predicted_temperature - dry_bulb_temperature
+        ) * ThermalComfort.calculate_mean_radiant_temperature_sensitivity()
+
+        # 現在の相対風速から補正前の風速を逆算し、風量ごとの風速と比較
+        base_air_speed = pmv_result.relative_air_speed
+        if met > 1:
+            base_air_speed -= 0.3 * (met - 1)
+        fan_speed_to_air_speed = {
+            AirconFanSpeed.AUTO.id: fan_air_speeds.auto,
+            AirconFanSpeed.LOW.id: fan_air_speeds.low,
+            AirconFanSpeed.MEDIUM.id: fan_air_speeds.medium,
+            AirconFanSpeed.HIGH.id: fan_air_speeds.high,
+        }
+        air_speed = np.maximum(
+            base_air_speed,
+            np.array([fan_speed_to_air_speed[fan_speed] for fan_speed in fan_speeds.tolist()]),
+        )
+        relative_air_speed = PMVKernel.v_relative(air_speed, met)
+
+        # 冷却効果は風速ごとに現在の室温で1回だけ計算する
+        clo = pmv_result.dynamic_clothing_insulation
+        unique_air_speeds, air_speed_index = np.unique(relative_air_speed, return_inverse=True)
+        cooling = PMVKernel.cooling_effect(
+            dry_bulb_temperature,
+            pmv_result.mean_radiant_temperature,
+            unique_air_speeds,
+            humidity,
+            met,
+            clo,
+        )[air_speed_index.reshape(-1)]
+
+        # 入力が同じ候補はまとめて1回だけ計算する
+        inputs = np.column_stack(
+            (predicted_temperature, predicted_radiant_temperature, relative_air_speed, cooling)
+        )
+        unique_inputs, inverse = np.unique(inputs, axis=0, return_inverse=True)
+        pmv = PMVKernel.calculate_pmv(
+            tdb=unique_inputs[:, 0],
+            tr=unique_inputs[:, 1],
+            vr=unique_inputs[:, 2],
+            rh=humidity,
+            met=met,
+            clo=clo,
+            cooling=unique_inputs[:, 3],
+        )
+        # pmv_ppdと同じく小数第2位に丸める
+        return np.around(pmv, 2)[inverse.reshape(-1)]
+
+    @staticmethod
+    def _get_candidates() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        候補設定（モード、設定温度、風量）と各候補の強度を配列で返すメソッド。
+        候補は設定から生成してキャッシュし、設定が置き換えられている場合は生成し直します。
+
+        Returns:
+            tuple: モードID、設定温度、風量ID、強度の配列
+        """
+        optimizer_preference = aircon_preference.setpoint_optimizer
+        if (
+            AirconSetpointOptimizer._candidates is not None
+            and AirconSetpointOptimizer._candidates_preference is optimizer_preference
+        ):
+            return AirconSetpointOptimizer._candidates
+        temperatures = np.arange(
+            optimizer_preference.temperature_min,
+            optimizer_preference.temperature_max + optimizer_preference.temperature_step / 2,
+            optimizer_preference.temperature_step,
+        )
+
+        candidates = []
+        for mode in optimizer_preference.modes:
+            # 送風とドライは設定温度がPMVに影響しないので1候補にまとめる
+            mode_temperatures = (
+                temperatures
+                if mode.is_cooling() or mode.is_heating()
+                else temperatures[-1:]
+            )
+            for temperature in mode_temperatures.tolist():
+                for fan_speed in AirconFanSpeed:
+                    candidates.append((mode.id, temperature, fan_speed.id))
+
+        modes = np.array([candidate[0] for candidate in candidates])
+        candidate_temperatures = np.array([candidate[1] for candidate in candidates])
+        fan_speeds = np.array([candidate[2] for candidate in candidates])
+        intensities = np.array(
+            [
+                AirconIntensityCalculator.calculate_intensity(
+                    temperature, mode_id, fan_speed_id, PowerMode.ON.id
+                )
+                for mode_id, temperature, fan_speed_id in candidates
+            ]
+        )
+
+        AirconSetpointOptimizer._candidates = (
+            modes,
+            candidate_temperatures,
+            fan_speeds,
+            intensities,
+        )
+        AirconSetpointOptimizer._candidates_preference = optimizer_preference
+        return AirconSetpointOptimizer._candidates
@@ -1,3 +1,8 @@
+import math
+
+from devices.aircon.aircon_predictive_planner import AirconPredictivePlanner
+from devices.aircon.aircon_rule_program import AirconRuleProgram
+from devices.aircon.aircon_setpoint_optimizer import AirconSetpointOptimizer
 from logger.system_event_logger import SystemEventLogger
 from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
 from preferences.aircon.conditional_aircon_preference import ConditionalAirconPreference
@@ -6,10 +11,13 @@ from settings import aircon_preference, app_preference
 from shared.dataclass.aircon_settings import AirconSettings
 from shared.dataclass.home_sensor import HomeSensor
 from shared.dataclass.pmv_result import PMVResult
+from shared.dataclass.sensor_features import SensorFeatures
 from shared.enums.aircon_fan_speed import AirconFanSpeed
 from shared.enums.aircon_mode import AirconMode
+from util.thermal_comfort import ThermalComfort
 from util.time_helper import TimeHelper
 from util.weekday_helper import WeekdayHelper
+from util.weekly_calendar import WeeklyCalendar
 
 
 class AirconSettingsDeterminer:
@@ -24,6 +32,7 @@ class AirconSettingsDeterminer:
         home_sensor: HomeSensor,
         closest_future_forecast: WeatherForecastHourlyModel | None,
         is_sleeping: bool,
+        sensor_features: SensorFeatures | None = None,
     ) -> AirconSettings:
         """
         エアコンの設定を決定するメソッド
@@ -32,14 +41,39 @@ class AirconSettingsDeterminer:
             home_sensor (HomeSensor): 家庭の環境情報を格納したオブジェクト。
             closest_future_forecast (WeatherForecastHourlyModel | None): 最も近い未来の天気予報。
             is_sleeping (bool): 寝ている時間。
+            sensor_features (SensorFeatures | None): センサー測定値の集計値。
+                省略した場合はhome_sensorから集計する。
         Returns:
             AirconSettings: 設定されたエアコンの設定。
         """
+        # センサー測定値の集計は1回だけ行う
+        if sensor_features is None:
+            sensor_features = SensorFeatures.from_home_sensor(home_sensor)
+
         # エアコンの設定をPMVを元にひとまず決定
-        aircon_settings = AirconSettingsDeterminer._get_aircon_settings_for_pmv(pmvResult.pmv)
+        aircon_settings = None
+        if aircon_preference.predictive_control.enabled:
+            # 天気予報で数時間先までの運転計画を評価し、最初の運転を選択
+            aircon_settings = AirconPredictivePlanner.plan(
+                pmvResult, sensor_features.average_indoor_humidity
+            )
+        if aircon_settings is None and aircon_preference.setpoint_optimizer.enabled:
+            # 候補設定のPMV予測から最も強度の低い設定を探索
+            aircon_settings = AirconSetpointOptimizer.find_least_intensive_settings(
+                pmvResult, sensor_features.average_indoor_humidity
+            )
+            if aircon_settings is None:
+                SystemEventLogger.log_info("aircon_related.setpoint_optimizer_no_candidate")
+        if aircon_settings is None:
+            aircon_settings = AirconSettingsDeterminer._get_aircon_settings_for_pmv(pmvResult.pmv)
+            # 冷暖房の設定温度を中立温度にする
+            if aircon_preference.neutral_temperature.enabled:
+                AirconSettingsDeterminer._apply_neutral_temperature(
+                    pmvResult, sensor_features, aircon_settings
+                )
         # 特殊な条件によるエアコン設定を適用
         aircon_settings = AirconSettingsDeterminer._get_aircon_settings_for_conditions(
-            aircon_settings, pmvResult, home_sensor, closest_future_forecast, is_sleeping
+            aircon_settings, pmvResult, sensor_features, closest_future_forecast, is_sleeping
         )
         return aircon_settings
 
@@ -56,22 +90,44 @@ class AirconSettingsDeterminer:
 
         aircon_settings = AirconSettings()
 
-        # pmvによってエアコンの設定を判定
-        found_threshold = False  # 条件を満たすデータが見つかったかどうか
+        # PMVが閾値以下になる最初の閾値の設定（該当しない場合は最後の閾値の設定）を二分探索で取得
+        threshold_settings = AirconRuleProgram.get().find_pmv_threshold_settings(pmv)
+        if threshold_settings is not None:
+            # 設定を一括で更新
+            aircon_settings.update_if_none(threshold_settings)
 
-        for pmv_threshold in aircon_preference.aircon_settings.pmv_thresholds:
-            if pmv <= pmv_threshold.threshold:
-                # 設定を一括で更新
-                aircon_settings.update_if_none(pmv_threshold.aircon_settings)
-                found_threshold = True  # 条件を満たすデータが見つかった
-                break
+        return aircon_settings
 
-        # 条件を満たすデータがなかった場合、最後の要素の設定を使用
-        if not found_threshold and aircon_preference.aircon_settings.pmv_thresholds:
-            last_threshold = aircon_preference.aircon_settings.pmv_thresholds[-1]
-            aircon_settings.update_if_none(last_threshold.aircon_settings)
+    @staticmethod
+    def _apply_neutral_temperature(
+        pmv_result: PMVResult, sensor_features: SensorFeatures, aircon_settings: AirconSettings
+    ):
+        """
+        冷房・暖房の設定温度を、目標のPMVになる室温（中立温度）に置き換えるメソッド。
+        探索範囲内に中立温度がない場合は設定温度を変更しない。
+        """
+        if not (aircon_settings.mode.is_cooling() or aircon_settings.mode.is_heating()):
+            return
 
-        return aircon_settings
+        neutral_temperature = ThermalComfort.calculate_neutral_temperature(
+            sensor_features.average_indoor_humidity,
+            pmv_result.relative_air_speed,
+            pmv_result.met,
+            pmv_result.dynamic_clothing_insulation,
+            pmv_result.mean_radiant_temperature,
+            pmv_result.dry_bulb_temperature,
+            target_pmv=aircon_preference.neutral_temperature.target_pmv,
+        ).item()
+        if math.isnan(neutral_temperature):
+            return
+
+        # エアコンの設定可能範囲に収める
+        aircon_settings.temperature = float(min(max(round(neutral_temperature), 18), 30))
+        SystemEventLogger.log_info(
+            "aircon_related.neutral_temperature",
+            neutral_temperature=f"{neutral_temperature:.1f}",
+            temperature=aircon_settings.temperature,
+        )
 
     @staticmethod
     def _should_turn_off_cooling(
@@ -126,7 +182,7 @@ class AirconSettingsDeterminer:
     @staticmethod
     def _adjust_for_dew_point(
         pmv_result: PMVResult,
-        home_sensor: HomeSensor,
+        sensor_features: SensorFeatures,
         aircon_settings: AirconSettings,
         summer_condensation_pref: SummerCondensationPreference,
     ):
@@ -136,8 +192,8 @@ class AirconSettingsDeterminer:
         """
         if (
             # 室内温度が露点温度より低い場合（露点以下）
-            home_sensor.main.air_quality.temperature
-            < home_sensor.indoor_dew_point - summer_condensation_pref.dew_point_margin
+            sensor_features.main_temperature
+            < sensor_features.indoor_dew_point - summer_condensation_pref.dew_point_margin
         ):
             # PMV値が指定されたしきい値を超えるとき、露点に関する設定をオーバーライド
             if pmv_result.pmv > summer_condensation_pref.pmv_threshold:
@@ -159,7 +215,7 @@ class AirconSettingsDeterminer:
                 aircon_settings.force_fan_below_dew_point = True
 
     @staticmethod
-    def _adjust_for_humidity(home_sensor: HomeSensor, aircon_settings: AirconSettings):
+    def _adjust_for_humidity(sensor_features: SensorFeatures, aircon_settings: AirconSettings):
         """
         室内の絶対湿度に基づいてエアコン設定を調整するメソッド。
         湿度がしきい値を超えると、除湿モードを適用する。
@@ -169,7 +225,7 @@ class AirconSettingsDeterminer:
 
         if (
             # 室内の絶対湿度が設定されたしきい値を超える場合
-            home_sensor.average_indoor_absolute_humidity
+            sensor_features.average_indoor_absolute_humidity
             > app_preference.environment.dehumidification_threshold
         ):
             SystemEventLogger.log_info(
@@ -180,22 +236,22 @@ class AirconSettingsDeterminer:
             aircon_settings.update_if_none(aircon_preference.aircon_settings.dry.aircon_settings)
 
     @staticmethod
-    def _adjust_for_co2(home_sensor: HomeSensor, aircon_settings: AirconSettings):
+    def _adjust_for_co2(sensor_features: SensorFeatures, aircon_settings: AirconSettings):
         """
         CO2濃度に基づいてエアコンの風量を調整するメソッド。
         CO2濃度がしきい値を超えると風量を強くする。
         """
-        if home_sensor.main_co2_level is not None:
+        if sensor_features.main_co2_level is not None:
             # CO2濃度が警告しきい値を超えた場合
-            if home_sensor.main_co2_level > app_preference.co2_thresholds.warning:
+            if sensor_features.main_co2_level > app_preference.co2_thresholds.warning:
                 aircon_settings.fan_speed = AirconFanSpeed.HIGH
             # しきい値を超える場合、風量を中程度に設定
-            elif home_sensor.main_co2_level > app_preference.co2_thresholds.high:
+            elif sensor_features.main_co2_level > app_preference.co2_thresholds.high:
                 aircon_settings.fan_speed = AirconFanSpeed.MEDIUM
 
     @staticmethod
     def _adjust_for_temperature_difference(
-        home_sensor: HomeSensor,
+        sensor_features: SensorFeatures,
         aircon_settings: AirconSettings,
         is_sleeping: bool,
         circulator_threshold: float,
@@ -204,13 +260,8 @@ class AirconSettingsDeterminer:
         部屋間の温度差に基づいて風量を調整するメソッド。
         寝ていない時に部屋間の温度差が設定閾値を超えると風量を強くする。
         """
-        # 最大の温度差を取得
-        max_diff_value = max(
-            abs(home_sensor.main.air_quality.temperature - sup.air_quality.temperature)
-            for sup in home_sensor.supplementaries
-        )
-        # 寝ていない場合で、温度差が閾値を超えたら
-        if not is_sleeping and max_diff_value > circulator_threshold:
+        # 寝ていない場合で、最大の温度差が閾値を超えたら
+        if not is_sleeping and sensor_features.max_temperature_difference > circulator_threshold:
             SystemEventLogger.log_info(
                 "aircon_related.room_temp_diff_high", temp_diff=circulator_threshold
             )
@@ -221,7 +272,7 @@ class AirconSettingsDeterminer:
     def _get_aircon_settings_for_conditions(
         aircon_settings: AirconSettings,
         pmv_result: PMVResult,
-        home_sensor: HomeSensor,
+        sensor_features: SensorFeatures,
         closest_future_forecast: WeatherForecastHourlyModel | None,
         is_sleeping: bool,
     ) -> AirconSettings:
@@ -236,7 +287,7 @@ class AirconSettingsDeterminer:
         引数:
             aircon_settings: 現在のエアコン設定
             pmv_result: PMV（Predicted Mean Vote）計算結果
-            home_sensor: 室内・室外センサーの測定値
+            sensor_features: 室内・室外センサーの測定値の集計値
             closest_future_forecast: 直近の予報データ（天気・曇り度など）
             is_sleeping: 睡眠中かどうかのフラグ
 
@@ -245,13 +296,13 @@ class AirconSettingsDeterminer:
         """
 
         # --- 1. 外気温に基づく冷暖房の停止判定 ---
-        if home_sensor.outdoor:
+        if sensor_features.outdoor_temperature is not None:
             # 冷房モードの場合
             if aircon_settings.mode.is_cooling():
                 # 外気温・PMVに基づき冷房停止すべきか判定
                 if AirconSettingsDeterminer._should_turn_off_cooling(
                     pmv_result,
-                    home_sensor.outdoor.air_quality.temperature,
+                    sensor_features.outdoor_temperature,
                     aircon_preference.conditional.cooling,
                 ):
                     # 冷房停止用設定に更新（風量・温度・モードなどをオフ状態へ）
@@ -267,7 +318,7 @@ class AirconSettingsDeterminer:
                 # 外気温・PMVに基づき暖房停止すべきか判定
                 if AirconSettingsDeterminer._should_turn_off_heating(
                     pmv_result,
-                    home_sensor.outdoor.air_quality.temperature,
+                    sensor_features.outdoor_temperature,
                     aircon_preference.conditional.heating,
                 ):
                     # 暖房停止用設定に更新
@@ -295,14 +346,14 @@ class AirconSettingsDeterminer:
 
         # --- 3. その他の環境要因による微調整 ---
         # 湿度条件に応じた調整
-        AirconSettingsDeterminer._adjust_for_humidity(home_sensor, aircon_settings)
+        AirconSettingsDeterminer._adjust_for_humidity(sensor_features, aircon_settings)
 
         # CO₂濃度条件に応じた調整
-        AirconSettingsDeterminer._adjust_for_co2(home_sensor, aircon_settings)
+        AirconSettingsDeterminer._adjust_for_co2(sensor_features, aircon_settings)
 
         # 室内外の温度差に応じたサーキュレーター運転調整（特に睡眠中に配慮）
         AirconSettingsDeterminer._adjust_for_temperature_difference(
-            home_sensor,
+            sensor_features,
             aircon_settings,
             is_sleeping,
             aircon_preference.conditional.circulator_threshold,
@@ -311,7 +362,7 @@ class AirconSettingsDeterminer:
         # 露点温度に応じた結露防止調整（夏期など）
         AirconSettingsDeterminer._adjust_for_dew_point(
             pmv_result,
-            home_sensor,
+            sensor_features,
             aircon_settings,
             aircon_preference.conditional.summer_condensation,
         )
@@ -331,39 +382,30 @@ class AirconSettingsDeterminer:
         if app_preference.comfort_control.enabled is False:
             return False
 
-        # 曜日を日本語で取得
-        current_datetime = TimeHelper.get_current_time()
-        current_time = current_datetime.time()
+        # 曜日ごとの無効期間を二分探索で判定
+        disabled_period = AirconRuleProgram.get().find_disabled_period(
+            TimeHelper.get_current_time()
+        )
+        if disabled_period is None:
+            # どの無効期間にも該当しない場合
+            return False
 
-        for period in app_preference.comfort_control.disabled_periods:
-            # 現在の曜日と一致するか確認
-            if period.day == current_datetime.weekday():
-                # timesがNoneの場合、終日無効と判断
-                if period.times is None or len(period.times) == 0:
-                    SystemEventLogger.log_info(
-                        "comfort_control_disabled.all_day",
-                        weekday=WeekdayHelper.index_to_name(period.day),
-                    )
-                    return True
-
-                # timesがリストで、空ではない場合
-                if period.times:
-                    for time_range in period.times:
-                        # 現在時刻が時間帯の範囲内か判定
-                        if time_range.start_time <= current_time < time_range.end_time:
-                            SystemEventLogger.log_info(
-                                "comfort_control_disabled.specific_period",
-                                weekday=WeekdayHelper.index_to_name(period.day),
-                                start_time=time_range.start_time,
-                                end_time=time_range.end_time,
-                            )
-                            return True
-
-                # timesが空リストの場合は、その曜日は無効時間帯がないため、処理を継続
-                return False
-
-        # どの無効期間にも該当しない場合
-        return False
+        period, time_range = disabled_period
+        if time_range is None:
+            # timesがNoneまたは空の場合、終日無効と判断
+            SystemEventLogger.log_info(
+                "comfort_control_disabled.all_day",
+                weekday=WeekdayHelper.index_to_name(period.day),
+            )
+        else:
+            # 現在時刻が時間帯の範囲内
+            SystemEventLogger.log_info(
+                "comfort_control_disabled.specific_period",
+                weekday=WeekdayHelper.index_to_name(period.day),
+                start_time=time_range.start_time,
+                end_time=time_range.end_time,
+            )
+        return True
 
     @staticmethod
     def _is_solar_control_available(
@@ -383,9 +425,10 @@ class AirconSettingsDeterminer:
         SystemEventLogger.log_info("comfort_control_disabled.solar_panel_enabled")
 
         # 現在時刻と有効時間帯のチェック
-        current_time = TimeHelper.get_current_time().time()
         active_hours = app_preference.comfort_control.solar_active_hours
-        if not (active_hours.start_time <= current_time <= active_hours.end_time):
+        if not WeeklyCalendar.get().is_active(
+            WeeklyCalendar.SOLAR_ACTIVE_HOURS, TimeHelper.get_current_time()
+        ):
             return False
 
         SystemEventLogger.log_info(
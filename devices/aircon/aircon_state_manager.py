@@ -1,6 +1,7 @@
 from api.smart_home_devices.smart_home_device_factory import SmartHomeDeviceFactory
 from db.db_session_manager import DBSessionManager
 from logger.system_event_logger import SystemEventLogger
+from models.aircon_change_interval_model import AirconChangeIntervalModel
 from repository.services.aircon_change_intarval_service import AirconChangeIntarvalService
 from shared.dataclass.aircon_settings import AirconSettings
 from shared.enums.aircon_mode import AirconMode
@@ -8,7 +9,47 @@ from util.time_helper import TimeHelper
 
 
 class AirconStateManager:
-    """エアコンの状態を管理するクラス。"""
+    """エアコンの状態を管理するクラス。
+
+    Attributes:
+        _change_intervals (list[AirconChangeIntervalModel] or None): set_change_intervalsで指定した
+            最小運転時間の設定。指定した場合はデータベースの代わりに使います。
+    """
+
+    _change_intervals: list[AirconChangeIntervalModel] | None = None
+
+    @staticmethod
+    def set_change_intervals(change_intervals: list[AirconChangeIntervalModel] | None):
+        """最小運転時間の設定をメモリ上のリストに差し替える。
+
+        記録したデータを再生する場合に、データベースを更新せずに開始時刻を管理するために使う。
+
+        Args:
+            change_intervals (list[AirconChangeIntervalModel] | None): 最小運転時間の設定。
+                Noneの場合はデータベースを使う。
+        """
+        AirconStateManager._change_intervals = change_intervals
+
+    @staticmethod
+    def find_change_interval(
+        mode: AirconMode, temperature: float
+    ) -> AirconChangeIntervalModel | None:
+        """set_change_intervalsで指定した設定から、モードと気温に該当する設定を取得する。
+
+        Args:
+            mode (AirconMode): エアコンのモード。
+            temperature (float): 気温。
+
+        Returns:
+            AirconChangeIntervalModel | None: 該当する設定。ない場合はNone。
+        """
+        for change_interval in AirconStateManager._change_intervals or []:
+            if (
+                change_interval.mode_id == mode.id
+                and change_interval.temperature_min <= temperature <= change_interval.temperature_max
+            ):
+                return change_interval
+        return None
 
     # エアコンの設定を変更しても良いか判断
     @staticmethod
@@ -22,13 +63,21 @@ class AirconStateManager:
         Returns:
             bool: 設定変更が可能であればTrue、そうでなければFalse。
         """
-        with DBSessionManager.session() as session:
-            aircon_change_intarval = AirconChangeIntarvalService(session)
+        if AirconStateManager._change_intervals is not None:
+            change_interval = AirconStateManager.find_change_interval(mode, max_temperature)
             duration_minutes, start_time = (
-                aircon_change_intarval.get_aircon_min_runtime_tracker_for_conditions(
-                    mode, max_temperature
-                )
+                (change_interval.duration_minutes, change_interval.start_time)
+                if change_interval
+                else (None, None)
             )
+        else:
+            with DBSessionManager.session() as session:
+                aircon_change_intarval = AirconChangeIntarvalService(session)
+                duration_minutes, start_time = (
+                    aircon_change_intarval.get_aircon_min_runtime_tracker_for_conditions(
+                        mode, max_temperature
+                    )
+                )
 
         if duration_minutes is None:
             # 条件に合致する設定がない場合は変更可能
@@ -67,9 +116,11 @@ class AirconStateManager:
         # エアコンの設定をログに出力
         SystemEventLogger.log_aircon_settings(aircon_settings, current_aircon_settings)
         smart_device = SmartHomeDeviceFactory.create_device()
-        smart_device.aircon(aircon_settings)
-        SystemEventLogger.log_info(
-            "aircon_related.aircon_settings_success",
-            aircon_settings=SystemEventLogger.format_settings(aircon_settings),
-        )
+        response = smart_device.aircon(aircon_settings)
+        # 既に同じ設定のため送信しなかった場合は、送信のログを出力しない
+        if not response.skipped:
+            SystemEventLogger.log_info(
+                "aircon_related.aircon_settings_success",
+                aircon_settings=SystemEventLogger.format_settings(aircon_settings),
+            )
         return aircon_settings
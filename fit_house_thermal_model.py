@@ -0,0 +1,114 @@
+# 記録した室温・外気温・エアコンの設定から、先読み制御で使う家の熱モデルのパラメータを推定するスクリプト
+# 実行方法: python fit_house_thermal_model.py --start 2024-07-01 --end 2024-08-01
+#
+# 室温はメインのセンサー、外気温は屋外のセンサーの測定値を使い、屋外のセンサーがない測定は除きます。
+# エアコンの設定は、各測定の時点で最後に記録された設定を使います。
+import argparse
+import bisect
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from db.db_session_manager import DBSessionManager
+from repository.services.aircon_setting_service import AirconSettingService
+from settings import LOCAL_TZ, aircon_preference
+from shared.enums.aircon_mode import AirconMode
+from shared.enums.power_mode import PowerMode
+from util.house_thermal_model import HouseThermalModel
+from util.replay_engine import ReplayEngine
+
+
+def parse_date(value: str) -> datetime:
+    # 日付を現地時刻の0時として解釈する
+    return LOCAL_TZ.localize(datetime.strptime(value, "%Y-%m-%d"))
+
+
+def to_direction(mode_id: int, power: str) -> int:
+    # エアコンの設定を運転方向に変換する
+    if power != PowerMode.ON.name:
+        return HouseThermalModel.IDLE
+    mode = AirconMode.get_by_id(mode_id)
+    if mode.is_cooling():
+        return HouseThermalModel.COOLING
+    if mode.is_heating():
+        return HouseThermalModel.HEATING
+    return HouseThermalModel.IDLE
+
+
+def load_history(start: datetime, end: datetime) -> tuple[np.ndarray, ...]:
+    # 経過時間・室温・外気温・設定温度・運転方向の配列を作成する
+    cycles = [
+        cycle
+        for cycle in ReplayEngine.load_from_database(start, end).cycles
+        if cycle.home_sensor.outdoor is not None
+    ]
+    with DBSessionManager.session() as session:
+        rows = AirconSettingService(session).get_aircon_setting_values_by_date_range(
+            start.strftime("%Y-%m-%d"), (end - timedelta(days=1)).strftime("%Y-%m-%d")
+        )
+    created_at = [row.created_at for row in rows]
+
+    timestamps, temperatures, outdoor_temperatures, setpoints, directions = [], [], [], [], []
+    for cycle in cycles:
+        index = bisect.bisect_right(created_at, cycle.measurement_time) - 1
+        row = rows[index] if index >= 0 else None
+        timestamps.append(cycle.measurement_time.timestamp())
+        temperatures.append(cycle.home_sensor.main.air_quality.temperature)
+        outdoor_temperatures.append(cycle.home_sensor.outdoor.air_quality.temperature)
+        setpoints.append(row.temperature if row else np.nan)
+        directions.append(to_direction(row.mode_id, row.power) if row else HouseThermalModel.IDLE)
+
+    elapsed_hours = np.diff(np.array(timestamps), prepend=timestamps[0]) / 3600
+    return (
+        elapsed_hours,
+        np.array(temperatures),
+        np.array(outdoor_temperatures),
+        np.array(setpoints),
+        np.array(directions),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="家の熱モデルのパラメータを推定します")
+    parser.add_argument("--start", type=parse_date, required=True, help="開始日（YYYY-MM-DD）")
+    parser.add_argument("--end", type=parse_date, required=True, help="終了日（YYYY-MM-DD、含まない）")
+    args = parser.parse_args()
+
+    elapsed_hours, temperatures, outdoor_temperatures, setpoints, directions = load_history(
+        args.start, args.end
+    )
+    parameters = HouseThermalModel.fit(
+        elapsed_hours, temperatures, outdoor_temperatures, setpoints, directions
+    )
+    time_constant, capacity, offset = parameters
+
+    # 直前の時点から1区間だけ進めた予測の誤差を、変化しないとみなした場合と比べる
+    valid = (elapsed_hours[1:] > 0) & (elapsed_hours[1:] <= 0.5)
+    predicted = np.array(
+        [
+            HouseThermalModel.advance(
+                np.array([temperatures[i]]),
+                outdoor_temperatures[i],
+                np.array([setpoints[i]]),
+                np.array([directions[i]]),
+                elapsed_hours[i + 1],
+                parameters,
+            )[0][0]
+            for i in np.flatnonzero(valid)
+        ]
+    )
+    observed = temperatures[1:][valid]
+    constant_error = np.sqrt(np.mean((temperatures[:-1][valid] - observed) ** 2))
+    model_error = np.sqrt(np.mean((predicted - observed) ** 2))
+
+    print(f"家の時定数: {time_constant:.2f}時間")
+    print(f"エアコンの能力: {capacity:.2f}度/時間")
+    print(f"内部発熱と日射による室温の上昇: {offset:.2f}度")
+    print(f"次の測定の室温の二乗平均誤差: 変化なし {constant_error:.3f}°, モデル {model_error:.3f}°")
+    print(
+        "aircon_preference.yamlのpredictive_controlの"
+        "house_time_constant_hours、aircon_capacity、heat_gain_offsetに設定してください"
+        f"（現在の設定: {aircon_preference.predictive_control.house_time_constant_hours}, "
+        f"{aircon_preference.predictive_control.aircon_capacity}, "
+        f"{aircon_preference.predictive_control.heat_gain_offset}）"
+    )
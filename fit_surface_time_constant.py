@@ -0,0 +1,57 @@
+# 実測した表面温度から表面温度モデルの時定数を推定するスクリプト
+# 実行方法: python fit_surface_time_constant.py measurements.csv --surface wall
+#
+# CSVの列: timestamp（ISO 8601）, outdoor_temperature, floor_temperature, ceiling_temperature, surface_temperature
+# surface_temperatureには放射温度計などで測った対象の表面の温度を記録します。
+import argparse
+import csv
+from datetime import datetime
+
+import numpy as np
+
+from shared.dataclass.surface_temperatures import SurfaceTemperatures
+from util.surface_temperature_model import SurfaceTemperatureModel
+from util.thermal_comfort import ThermalComfort
+
+
+def load_measurements(path: str, surface: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # 経過時間・平衡温度・実測値の配列を作成する
+    timestamps = []
+    equilibrium = []
+    observed = []
+    with open(path, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            timestamp = datetime.fromisoformat(row["timestamp"])
+            steady: SurfaceTemperatures = ThermalComfort.calculate_steady_surface_temperatures(
+                float(row["outdoor_temperature"]),
+                float(row["floor_temperature"]),
+                float(row["ceiling_temperature"]),
+                timestamp,
+            )
+            timestamps.append(timestamp.timestamp())
+            equilibrium.append(getattr(steady, surface))
+            observed.append(float(row["surface_temperature"]))
+
+    elapsed_seconds = np.diff(np.array(timestamps), prepend=timestamps[0])
+    return elapsed_seconds, np.array(equilibrium), np.array(observed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="表面温度モデルの時定数を推定します")
+    parser.add_argument("path", help="実測値のCSVファイル")
+    parser.add_argument("--surface", choices=SurfaceTemperatureModel.SURFACES, default="wall")
+    args = parser.parse_args()
+
+    elapsed_seconds, equilibrium, observed = load_measurements(args.path, args.surface)
+    time_constant_hours = SurfaceTemperatureModel.fit_time_constant(
+        elapsed_seconds, equilibrium, observed
+    )
+    replayed = SurfaceTemperatureModel.replay(
+        elapsed_seconds, equilibrium, time_constants=time_constant_hours * 3600, initial=observed[0]
+    )
+    steady_error = np.sqrt(np.mean((equilibrium - observed) ** 2))
+    model_error = np.sqrt(np.mean((replayed - observed) ** 2))
+
+    print(f"{args.surface}の時定数: {time_constant_hours:.2f}時間")
+    print(f"二乗平均誤差: 定常状態 {steady_error:.2f}°, 過渡応答モデル {model_error:.2f}°")
+    print(f"thermal_preference.yamlのsurface_model.{args.surface}_time_constant_hoursに設定してください")
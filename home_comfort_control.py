@@ -18,7 +18,7 @@ from repository.services.electric_fan_setting_service import ElectricFanSettingS
 from repository.services.measurement_service import MeasurementService
 from repository.services.weather_forecast_hourly_service import WeatherForecastHourlyService
 from repository.services.weather_forecast_service import WeatherForecastService
-from settings import LOCAL_TZ, app_preference, electric_fan_preference
+from settings import app_preference, electric_fan_preference
 from shared.dataclass.aircon_settings import AirconSettings
 from shared.dataclass.circulator_settings import CirculatorSettings
 from shared.dataclass.comfort_factors import ComfortFactors
@@ -26,8 +26,11 @@ from shared.dataclass.electric_fan_settings import ElectricFanSettings
 from shared.dataclass.home_sensor import HomeSensor
 from shared.dataclass.pmv_result import PMVResult
 from shared.enums.power_mode import PowerMode
+from util.api_quota import ApiQuota
+from util.cycle_metrics import CycleMetrics
 from util.thermal_comfort import ThermalComfort
 from util.time_helper import TimeHelper
+from util.weekly_calendar import WeeklyCalendar
 
 
 class HomeComfortControl:
@@ -110,32 +113,11 @@ class HomeComfortControl:
         Returns:
             bool: 就寝時間内ならTrue、それ以外ならFalse
         """
-        now = TimeHelper.get_current_time()
-        if now.date().weekday() < 5:  # 土曜(5)または日曜(6)を休日と判定
-            # 起床時間を取得
-            awake_period_start = LOCAL_TZ.localize(
-                datetime.datetime.combine(
-                    now.date(), app_preference.weekday_awake_period.start_time
-                )
-            )
-            # 就寝時間を取得
-            awake_period_end = LOCAL_TZ.localize(
-                datetime.datetime.combine(now.date(), app_preference.weekday_awake_period.end_time)
-            )
-        else:
-            # 起床時間を取得
-            awake_period_start = LOCAL_TZ.localize(
-                datetime.datetime.combine(
-                    now.date(), app_preference.weekend_awake_period.start_time
-                )
-            )
-            # 就寝時間を取得
-            awake_period_end = LOCAL_TZ.localize(
-                datetime.datetime.combine(now.date(), app_preference.weekend_awake_period.end_time)
-            )
-
         # 就寝中かどうかを判断（起床時間内ならFalse、それ以外ならTrue）
-        return awake_period_start > now or awake_period_end < now
+        # 起床時間は平日と休日（土曜(5)・日曜(6)）で異なる
+        return not WeeklyCalendar.get().is_active(
+            WeeklyCalendar.AWAKE, TimeHelper.get_current_time()
+        )
 
     def activate_circulator_in_heat_conditions(
         self, home_sensor: HomeSensor, pmv: float, outdoor_temperature: float
@@ -204,9 +186,10 @@ class HomeComfortControl:
         """
 
         # エアコンの設定を決定
-        aircon_settings = AirconSettingsDeterminer.determine_aircon_settings(
-            pmv_result, home_sensor, closest_future_forecast, is_sleeping
-        )
+        with CycleMetrics.measure("decision", "aircon"):
+            aircon_settings = AirconSettingsDeterminer.determine_aircon_settings(
+                pmv_result, home_sensor, closest_future_forecast, is_sleeping
+            )
 
         # データバースの有効化
         if app_preference.database.enabled:
@@ -263,29 +246,14 @@ class HomeComfortControl:
                     circulator_setting_service.get_latest_circulator_settings()
                 )
 
-            if is_sleeping:
-                # 就寝中は風量を0に設定
-                circulator_settings.power = Circulator.set_circulator(
-                    current_circulator_settings, 0
-                )
-                circulator_settings.fan_speed = 0
-            else:
-                # 送風で節電する場合
-                if circulator_settings_heat_conditions.power == PowerMode.ON:
-                    # サーキュレーターは風量と電源を設定できないので、現在との差分を考慮して設定
-                    circulator_settings.power = Circulator.set_circulator(
-                        current_circulator_settings, circulator_settings_heat_conditions.fan_speed
-                    )
-                    circulator_settings.fan_speed = circulator_settings_heat_conditions.fan_speed
-                else:
-                    # 温度差に基づいてサーキュレーターを設定
-                    if home_sensor.sub:
-                        circulator_settings = Circulator.set_fan_speed_based_on_temperature_diff(
-                            outdoor_temperature,
-                            home_sensor.sub.air_quality.temperature
-                            - home_sensor.main.air_quality.temperature,
-                            current_circulator_settings,
-                        )
+            circulator_settings = self.decide_circulator_settings(
+                home_sensor,
+                circulator_settings_heat_conditions,
+                is_sleeping,
+                outdoor_temperature,
+                current_circulator_settings,
+                ApiQuota.is_degraded(),
+            )
 
             # ログ出力
             SystemEventLogger.log_circulator_settings(
@@ -326,25 +294,13 @@ class HomeComfortControl:
                     hours, _ = TimeHelper.calculate_elapsed_time(setting_time)
                     SystemEventLogger.log_electric_fan_on_elapsed_time(hours)
                     
-            if is_sleeping:
-                # 就寝中の場合
-                electric_fan_settings.power = ElectricFan.set_power(
-                    current_electric_fan_settings, PowerMode.OFF
-                )
-            elif (
-                electric_fan_preference.auto_off_countermeasure.enabled
-                and hours >= electric_fan_preference.auto_off_countermeasure.hours
-            ):
-                # 自動オフ対策
-                electric_fan_settings.power = ElectricFan.set_power(
-                    current_electric_fan_settings, PowerMode.OFF
-                )
-                SystemEventLogger.log_electric_fan_auto_off_countermeasure()
-            else:
-                electric_fan_settings = ElectricFan.set_electric_fan_by_temperature(
-                    current_electric_fan_settings,
-                    mean_radiant_temperature,
-                )
+            electric_fan_settings = self.decide_electric_fan_settings(
+                is_sleeping,
+                mean_radiant_temperature,
+                current_electric_fan_settings,
+                hours,
+                ApiQuota.is_degraded(),
+            )
 
             # ログ出力
             SystemEventLogger.log_electric_fan_settings(
@@ -353,6 +309,102 @@ class HomeComfortControl:
 
         return electric_fan_settings
 
+    def decide_circulator_settings(
+        self,
+        home_sensor: HomeSensor,
+        circulator_settings_heat_conditions: CirculatorSettings,
+        is_sleeping: bool,
+        outdoor_temperature: float,
+        current_circulator_settings: CirculatorSettings,
+        is_degraded: bool,
+    ) -> CirculatorSettings:
+        """
+        前回の設定からサーキュレーターの設定を決める（データベースは使わない）
+        Args:
+            home_sensor (HomeSensor): 家の温度と湿度データ
+            circulator_settings_heat_conditions (CirculatorSettings): 高温条件の場合のサーキュレーターの状態
+            is_sleeping (bool): 寝ている時間
+            outdoor_temperature (float): 外気温度
+            current_circulator_settings (CirculatorSettings): 前回のサーキュレーターの設定
+            is_degraded (bool): API呼び出し回数を節約するかどうか
+        Returns:
+            CirculatorSettings: サーキュレーターの状態
+        """
+        circulator_settings = CirculatorSettings()
+        if is_sleeping:
+            # 就寝中は風量を0に設定
+            circulator_settings.power = Circulator.set_circulator(current_circulator_settings, 0)
+            circulator_settings.fan_speed = 0
+        elif is_degraded:
+            # API呼び出し回数が上限を超えそうな場合は、風量を変えずに呼び出しを節約
+            circulator_settings = current_circulator_settings.model_copy()
+            SystemEventLogger.log_info("api_quota.hold_circulator")
+        else:
+            # 送風で節電する場合
+            if circulator_settings_heat_conditions.power == PowerMode.ON:
+                # サーキュレーターは風量と電源を設定できないので、現在との差分を考慮して設定
+                circulator_settings.power = Circulator.set_circulator(
+                    current_circulator_settings, circulator_settings_heat_conditions.fan_speed
+                )
+                circulator_settings.fan_speed = circulator_settings_heat_conditions.fan_speed
+            else:
+                # 温度差に基づいてサーキュレーターを設定
+                if home_sensor.sub:
+                    circulator_settings = Circulator.set_fan_speed_based_on_temperature_diff(
+                        outdoor_temperature,
+                        home_sensor.sub.air_quality.temperature
+                        - home_sensor.main.air_quality.temperature,
+                        current_circulator_settings,
+                    )
+
+        return circulator_settings
+
+    def decide_electric_fan_settings(
+        self,
+        is_sleeping: bool,
+        mean_radiant_temperature: float,
+        current_electric_fan_settings: ElectricFanSettings,
+        hours: int,
+        is_degraded: bool,
+    ) -> ElectricFanSettings:
+        """
+        前回の設定から扇風機の設定を決める（データベースは使わない）
+        Args:
+            is_sleeping (bool): 寝ている時間
+            mean_radiant_temperature (float): 平均放射温度
+            current_electric_fan_settings (ElectricFanSettings): 前回の扇風機の設定
+            hours (int): 電源がオンになり続けている時間
+            is_degraded (bool): API呼び出し回数を節約するかどうか
+        Returns:
+            ElectricFanSettings: 扇風機の状態
+        """
+        electric_fan_settings = ElectricFanSettings()
+        if is_sleeping:
+            # 就寝中の場合
+            electric_fan_settings.power = ElectricFan.set_power(
+                current_electric_fan_settings, PowerMode.OFF
+            )
+        elif (
+            electric_fan_preference.auto_off_countermeasure.enabled
+            and hours >= electric_fan_preference.auto_off_countermeasure.hours
+        ):
+            # 自動オフ対策
+            electric_fan_settings.power = ElectricFan.set_power(
+                current_electric_fan_settings, PowerMode.OFF
+            )
+            SystemEventLogger.log_electric_fan_auto_off_countermeasure()
+        elif is_degraded:
+            # API呼び出し回数が上限を超えそうな場合は、設定を変えずに呼び出しを節約
+            electric_fan_settings = current_electric_fan_settings.model_copy()
+            SystemEventLogger.log_info("api_quota.hold_electric_fan")
+        else:
+            electric_fan_settings = ElectricFan.set_electric_fan_by_temperature(
+                current_electric_fan_settings,
+                mean_radiant_temperature,
+            )
+
+        return electric_fan_settings
+
     def record_environment_data(
         self,
         home_sensor: HomeSensor,
@@ -0,0 +1,35 @@
+from translations.message_templates import MessageTemplates
+
+
+class ErrorRecord:
+    """
+    ログに出力するエラーの内容を、翻訳する前の形で保持するクラス。
+
+    メッセージはログのハンドラーが文字列にするときに初めて翻訳し、2回目以降は翻訳した結果を使います。
+    出力しないレベルのログでは翻訳しません。
+
+    Attributes:
+        class_name (str | None): エラーが発生したクラスの名前。クラスの外の場合はNone
+        method_name (str): エラーが発生したメソッドの名前
+        message_key (str): 翻訳ファイルのキー（"error."を除く）
+        params (dict): メッセージに埋め込むデータ
+    """
+
+    __slots__ = ("class_name", "method_name", "message_key", "params", "_message")
+
+    def __init__(self, class_name: str | None, method_name: str, message_key: str, params: dict):
+        self.class_name = class_name
+        self.method_name = method_name
+        self.message_key = message_key
+        self.params = params
+        self._message: str | None = None
+
+    @property
+    def message(self) -> str:
+        """翻訳したメッセージ"""
+        if self._message is None:
+            self._message = MessageTemplates.translate(f"error.{self.message_key}", **self.params)
+        return self._message
+
+    def __str__(self) -> str:
+        return self.message
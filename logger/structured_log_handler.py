@@ -0,0 +1,227 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import requests
+
+from preferences.app.structured_log_preference import StructuredLogPreference
+from settings import LOCAL_TZ
+
+_STOP = object()
+"""書き込みのスレッドを終了させるためにキューに入れる値"""
+
+
+class StructuredLogHandler(logging.Handler):
+    """
+    ログのイベントをJSON Lines形式のファイルに書き込むハンドラー。
+
+    emitではイベントの内容を辞書にしてキューに入れるだけで、JSONへの変換と書き込みは
+    バックグラウンドのスレッドでまとめて行います。ファイルが上限のサイズを超える場合は、
+    RotatingFileHandlerと同じく".1"〜を付けた名前に移してから書き込みます。
+    コレクターのURLを設定した場合は、書き込んだイベントをまとめてPOSTで送信します。
+    送信できなかったイベントは次の送信まで保持しますが、プロセスの終了までに送信できなかった
+    イベントはファイルにだけ残ります。
+
+    Attributes:
+        cycle_id (str): この実行のID。すべてのイベントに記録し、1回の制御サイクルのログをまとめるのに使う
+        written_count (int): ファイルに書き込んだイベントの数
+        shipped_count (int): コレクターに送信したイベントの数
+        dropped_count (int): 書き込めなかった、または保持する上限を超えて送信をあきらめたイベントの数
+    """
+
+    def __init__(self, preference: StructuredLogPreference, cycle_id: str | None = None):
+        super().__init__()
+        self.preference = preference
+        self.cycle_id = cycle_id or uuid.uuid4().hex
+        self.started_at = time.time()
+        self.written_count = 0
+        self.shipped_count = 0
+        self.dropped_count = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._stream = None
+        self._size = 0
+        self._pending: list[str] = []
+        self._retry_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="StructuredLogHandler", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        """ログのイベントを辞書にして、書き込みのスレッドに渡す。"""
+        try:
+            self._queue.put(self.create_event(record))
+        except Exception:
+            self.handleError(record)
+
+    def create_event(self, record: logging.LogRecord) -> dict:
+        """
+        ログレコードから記録するイベントを作成するメソッド。
+
+        ログを出力したスレッドで呼ぶため、時刻はUNIX時間のままにし、書き込むときに文字列にします。
+        SystemEventLogger.log_infoのログは翻訳ファイルのキーと埋め込んだデータを、
+        log_errorのログはErrorRecordのキー・データ・クラスとメソッドの名前を記録します。
+        それ以外のログはキーをNoneにします。
+
+        Args:
+            record (logging.LogRecord): ログレコード
+
+        Returns:
+            dict: 記録するイベント
+        """
+        event = {
+            "time": record.created,
+            "cycle_id": self.cycle_id,
+            "elapsed_ms": round((record.created - self.started_at) * 1000, 3),
+            "level": record.levelname,
+            "key": None,
+            "params": {},
+            "message": record.getMessage(),
+        }
+        error_record = getattr(record, "error_record", None)
+        if error_record is not None:
+            event["key"] = f"error.{error_record.message_key}"
+            event["params"] = error_record.params
+            event["class"] = error_record.class_name
+            event["method"] = error_record.method_name
+        elif hasattr(record, "message_key"):
+            event["key"] = record.message_key
+            event["params"] = record.params
+        if record.exc_info:
+            event["exception"] = logging.Formatter().formatException(record.exc_info)
+        return event
+
+    def flush(self):
+        """キューにあるイベントを書き込み、保持しているイベントを送信するまで待つ。"""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """キューにあるイベントを書き込んで送信し、書き込みのスレッドを終了する。"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        super().close()
+
+    def _run(self):
+        """キューからイベントをまとめて取り出して書き込むスレッドの処理。"""
+        preference = self.preference
+        running = True
+        while running:
+            batch = []
+            item = self._queue.get()
+            # 最初のイベントから一定の時間、後続のイベントを待ってまとめる
+            deadline = time.monotonic() + preference.flush_interval_seconds
+            while isinstance(item, dict):
+                batch.append(item)
+                timeout = deadline - time.monotonic()
+                if len(batch) >= preference.batch_size or timeout <= 0:
+                    item = None
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                    break
+
+            if batch:
+                lines = [self._format_event(event) for event in batch]
+                self._write(lines)
+                if preference.collector_url:
+                    self._pending.extend(lines)
+            if item is _STOP or isinstance(item, threading.Event):
+                self._ship(preference.collector_url, force=True)
+                if item is _STOP:
+                    running = False
+                else:
+                    item.set()
+            else:
+                self._ship(preference.collector_url, force=False)
+
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    @staticmethod
+    def _format_event(event: dict) -> str:
+        """イベントの時刻をローカルタイムゾーンのISO 8601形式にし、1行のJSONにするメソッド。"""
+        event["time"] = datetime.fromtimestamp(event["time"], LOCAL_TZ).isoformat(timespec="milliseconds")
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+    def _write(self, lines: list[str]):
+        """イベントの行をファイルに書き込むメソッド。上限のサイズを超える場合は先にファイルを切り替える。"""
+        data = "".join(f"{line}\n" for line in lines).encode("utf-8")
+        try:
+            if self._stream is None:
+                directory = os.path.dirname(self.preference.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._stream = open(self.preference.path, "ab")
+                self._size = self._stream.tell()
+            if self._size and self._size + len(data) > self.preference.max_bytes:
+                self._rotate()
+            self._stream.write(data)
+            self._stream.flush()
+            self._size += len(data)
+            self.written_count += len(lines)
+        except OSError:
+            # 書き込めない場合はイベントを捨て、次のまとまりでファイルを開き直す
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+            self.dropped_count += len(lines)
+
+    def _rotate(self):
+        """ファイルを".1"〜を付けた名前に移し、新しいファイルを開くメソッド。"""
+        path = self.preference.path
+        self._stream.close()
+        self._stream = None
+        backup_count = self.preference.backup_count
+        if backup_count > 0:
+            for index in range(backup_count - 1, 0, -1):
+                source = f"{path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{path}.{index + 1}")
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+        self._stream = open(path, "ab")
+        self._size = 0
+
+    def _ship(self, collector_url: str | None, force: bool):
+        """
+        保持しているイベントをまとめてコレクターに送信するメソッド。
+
+        forceがFalseの場合は、まとめて送信する数に達したイベントだけを送信します。
+        送信できない場合は残りを保持し、ship_retry_secondsが経つまで送信しません（forceの場合を除く）。
+        保持する上限を超えた古いイベントは捨てます。
+        """
+        if not collector_url or (not force and time.monotonic() < self._retry_at):
+            return
+        batch_size = self.preference.ship_batch_size
+        while self._pending and (force or len(self._pending) >= batch_size):
+            chunk = self._pending[:batch_size]
+            try:
+                response = requests.post(
+                    collector_url,
+                    data="".join(f"{line}\n" for line in chunk).encode("utf-8"),
+                    headers={"Content-Type": "application/x-ndjson"},
+                    timeout=self.preference.ship_timeout_seconds,
+                )
+                response.raise_for_status()
+            except requests.RequestException:
+                self._retry_at = time.monotonic() + self.preference.ship_retry_seconds
+                break
+            del self._pending[: len(chunk)]
+            self.shipped_count += len(chunk)
+
+        overflow = len(self._pending) - self.preference.max_pending_events
+        if overflow > 0:
+            del self._pending[:overflow]
+            self.dropped_count += overflow
@@ -1,15 +1,15 @@
-import inspect
 import logging
+import sys
 import unicodedata
 from datetime import timezone
 from io import StringIO
 from typing import Tuple, Type
 
-import i18n
-
 from api.notify.notify_factory import NotifyFactory
+from logger.error_record import ErrorRecord
+from logger.structured_log_handler import StructuredLogHandler
 from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
-from settings import DB_TZ, LOCAL_TZ
+from settings import DB_TZ, LOCAL_TZ, app_preference
 from shared.dataclass.aircon_settings import AirconSettings
 from shared.dataclass.circulator_settings import CirculatorSettings
 from shared.dataclass.comfort_factors import ComfortFactors
@@ -19,6 +19,7 @@ from shared.dataclass.pmv_result import PMVResult
 from shared.dataclass.sensor import Sensor
 from shared.enums.power_mode import PowerMode
 from shared.enums.sensor_type import SensorType
+from translations.message_templates import MessageTemplates
 from util.string_helper import StringHelper
 from util.time_helper import TimeHelper
 
@@ -41,6 +42,12 @@ logger.setLevel(logging.INFO)
 logger.addHandler(console_handler)  # 通常ログ用
 logger.addHandler(buffer_handler)  # メール送信用
 
+# JSON Lines形式のログのハンドラー（終了時にlogging.shutdownで残りを書き込んで送信する）
+structured_log_handler = None
+if app_preference.structured_log.enabled:
+    structured_log_handler = StructuredLogHandler(app_preference.structured_log)
+    logger.addHandler(structured_log_handler)
+
 
 class SystemEventLogger:
     """
@@ -81,44 +88,47 @@ class SystemEventLogger:
             message_key (str): メッセージKey
             **kwargs: テンプレートに埋め込むデータ
         """
-        # print(f"log.{message_key}")
-        message = i18n.t(f"log.{message_key}", **kwargs)
-        logger.info(message)
+        key = f"log.{message_key}"
+        message = MessageTemplates.translate(key, **kwargs)
+        # JSON Lines形式のログには、翻訳したメッセージと一緒にキーとデータを記録する
+        logger.info(message, extra={"message_key": key, "params": kwargs})
 
     @staticmethod
     def log_error(
         class_type: Type | None = None,
+        stacklevel: int = 1,
         **kwargs,
     ):
         """
         エラーメッセージをログに出力します。
 
+        メッセージのキーは呼び出し元のクラスとメソッドの名前から決めます。呼び出し元のフレームだけを
+        sys._getframeで参照し、スタック全体やソースコードは読み込みません。
+        メッセージはハンドラーが出力するときに翻訳し、ErrorRecordをログレコードのerror_recordに渡します。
+
         Args:
             class_type (Type | None): エラーが発生したクラス名
+            stacklevel (int): 呼び出し元とするフレームの深さ（ログ出力を包む関数から呼ぶ場合は2以上）
             **kwargs: テンプレートに埋め込むデータ
         """
-        class_name = ""
-        # 呼び出し元の情報を取得
-        stack = inspect.stack()[1]  # 呼び出し元のフレームを取得
+        # 呼び出し元のフレームを取得
+        frame = sys._getframe(stacklevel)
+        method_name = frame.f_code.co_name
         if class_type is None:
-            class_name = (
-                stack.frame.f_locals.get("self", None).__class__.__name__
-                if "self" in stack.frame.f_locals
-                else None
-            )
+            instance = frame.f_locals.get("self")
+            class_name = instance.__class__.__name__ if instance is not None else None
         else:
             class_name = class_type.__name__
-            method_name = stack.function
+        del frame
 
         if class_name:
             message_key = f"{StringHelper.camel_to_snake(class_name)}.{method_name}"
         else:
             message_key = method_name  # クラスがない場合はメソッド名のみ
 
-        # 翻訳ファイルからエラーメッセージを取得
-        message = i18n.t(key=f"error.{message_key}", **kwargs)
-
-        logger.error(message)
+        # 翻訳ファイルからのエラーメッセージの取得は、ハンドラーが出力するときに行う
+        record = ErrorRecord(class_name, method_name, message_key, kwargs)
+        logger.error(record, extra={"error_record": record})
 
         # エラーが記録されたことをフラグで追跡
         SystemEventLogger.error_logged = True
@@ -140,7 +150,7 @@ class SystemEventLogger:
         :param reference_sensor: 温度差を表示する場合の参照センサー（省略可能）
         """
         # 基本センサー情報を整形
-        sensor_info = i18n.t(
+        sensor_info = MessageTemplates.translate(
             "log.environment_data.sensor_data",
             label=SystemEventLogger._left(8, sensor.label),
             location=SystemEventLogger._left(4, sensor.location),
@@ -154,7 +164,7 @@ class SystemEventLogger:
             temp_diff = abs(
                 reference_sensor.air_quality.temperature - sensor.air_quality.temperature
             )
-            sensor_info += ", " + i18n.t(
+            sensor_info += ", " + MessageTemplates.translate(
                 "log.environment_data.temp_diff",
                 reference_label=reference_sensor.label,
                 reference_location=reference_sensor.location,
@@ -163,7 +173,7 @@ class SystemEventLogger:
 
         # CO2センサーの場合、CO2レベルも表示
         if sensor.type == SensorType.CO2:
-            sensor_info += ", " + i18n.t(
+            sensor_info += ", " + MessageTemplates.translate(
                 "log.environment_data.co2_level", co2_level=sensor.air_quality.co2_level
             )
 
@@ -185,11 +195,11 @@ class SystemEventLogger:
         """
         # 現在時刻と最高気温予報をログに出力
         SystemEventLogger.log_info(
-            i18n.t("time_related.current_time"),
+            "time_related.current_time",
             current_time=TimeHelper.get_current_time().strftime("%Y-%m-%d %H:%M:%S"),
         )
         SystemEventLogger.log_info(
-            i18n.t("time_related.forecast_max_temp"),
+            "time_related.forecast_max_temp",
             forecast_max_temperature=forecast_max_temperature,
         )
         if closest_future_forecast:
@@ -197,7 +207,7 @@ class SystemEventLogger:
         # CO2濃度があれば出力
         if home_sensor.main_co2_level:
             SystemEventLogger.log_info(
-                i18n.t("environment_data.co2_level"), co2_level=home_sensor.main_co2_level
+                "environment_data.co2_level", co2_level=home_sensor.main_co2_level
             )
 
         # メインセンサーの情報をログに出力
@@ -231,7 +241,7 @@ class SystemEventLogger:
             comfort_factors (ComfortFactors): コンフォーマンス因子の値
         """
         SystemEventLogger.log_info(
-            i18n.t("pmv_calculation.surface_temperatures"),
+            "pmv_calculation.surface_temperatures",
             wall=f"{pmv.wall:.1f}",
             ceiling=f"{pmv.ceiling:.1f}",
             floor=f"{pmv.floor:.1f}",
@@ -239,28 +249,28 @@ class SystemEventLogger:
         )
 
         SystemEventLogger.log_info(
-            i18n.t("pmv_calculation.sensible_temp"),
+            "pmv_calculation.sensible_temp",
             sensible_temperature=f"{(pmv.dry_bulb_temperature + pmv.mean_radiant_temperature) / 2:.1f}",
         )
 
         SystemEventLogger.log_info(
-            i18n.t("pmv_calculation.met_icl_values"),
+            "pmv_calculation.met_icl_values",
             met=f"{comfort_factors.met:.1f}",
             icl=f"{comfort_factors.clo:.1f}",
         )
 
         SystemEventLogger.log_info(
-            i18n.t("pmv_calculation.relative_air_speed"),
+            "pmv_calculation.relative_air_speed",
             relative_air_speed=f"{pmv.relative_air_speed:.1f}",
         )
 
         SystemEventLogger.log_info(
-            i18n.t("pmv_calculation.dynamic_clothing"),
+            "pmv_calculation.dynamic_clothing",
             dynamic_clothing_insulation=f"{pmv.dynamic_clothing_insulation:.1f}",
         )
 
         SystemEventLogger.log_info(
-            i18n.t("pmv_calculation.pmv_ppd"), pmv=f"{pmv.pmv:.1f}", ppd=f"{pmv.ppd:.1f}"
+            "pmv_calculation.pmv_ppd", pmv=f"{pmv.pmv:.1f}", ppd=f"{pmv.ppd:.1f}"
         )
 
     @staticmethod
@@ -273,7 +283,7 @@ class SystemEventLogger:
             minutes (int): 経過時間の分部分
         """
         SystemEventLogger.log_info(
-            i18n.t("aircon_related.elapsed_time"), hours=hours, minutes=minutes
+            "aircon_related.elapsed_time", hours=hours, minutes=minutes
         )
 
     @staticmethod
@@ -289,12 +299,12 @@ class SystemEventLogger:
         """
         if current_aircon_settings is None:
             SystemEventLogger.log_info(
-                i18n.t("aircon_related.aircon_settings_init"),
+                "aircon_related.aircon_settings_init",
                 new_settings=SystemEventLogger.format_settings(aircon_settings),
             )
         else:
             SystemEventLogger.log_info(
-                i18n.t("aircon_related.aircon_settings_change"),
+                "aircon_related.aircon_settings_change",
                 current_settings=SystemEventLogger.format_settings(current_aircon_settings),
                 new_settings=SystemEventLogger.format_settings(aircon_settings),
             )
@@ -311,12 +321,12 @@ class SystemEventLogger:
             fan_speed (str): サーキュレーターの設定された風量
         """
         SystemEventLogger.log_info(
-            i18n.t("circulator_related.circulator_status"),
+            "circulator_related.circulator_status",
             power=current_circulator_settings.power.label,
             fan_speed=current_circulator_settings.fan_speed,
         )
         SystemEventLogger.log_info(
-            i18n.t("circulator_related.circulator_settings_success"),
+            "circulator_related.circulator_settings_success",
             power=circulator_settings.power.label,
             fan_speed=circulator_settings.fan_speed,
         )
@@ -343,11 +353,11 @@ class SystemEventLogger:
             current_electric_fan_settings (ElectricFanSettings): 扇風機の電源
         """
         SystemEventLogger.log_info(
-            i18n.t("electric_fan_related.electric_fan_status"),
+            "electric_fan_related.electric_fan_status",
             power=current_electric_fan_settings.power.label,
         )
         SystemEventLogger.log_info(
-            i18n.t("electric_fan_related.electric_fan_settings_success"),
+            "electric_fan_related.electric_fan_settings_success",
             power=electric_fan_settings.power.label,
         )
 
@@ -360,7 +370,7 @@ class SystemEventLogger:
             hours (int): 経過時間
         """
         SystemEventLogger.log_info(
-            i18n.t("electric_fan_related.electric_fan_on_elapsed_time"),
+            "electric_fan_related.electric_fan_on_elapsed_time",
             hours=hours,
         )
 
@@ -371,7 +381,7 @@ class SystemEventLogger:
 
         """
         SystemEventLogger.log_info(
-            i18n.t("electric_fan_related.electric_fan_auto_off_countermeasure"),
+            "electric_fan_related.electric_fan_auto_off_countermeasure",
         )
 
     @staticmethod
@@ -383,7 +393,7 @@ class SystemEventLogger:
             scores (Tuple[int, int, int, int, int]): 先々週、先週、今週、昨日、今日のスコア
         """
         SystemEventLogger.log_info(
-            i18n.t("aircon_related.aircon_scores"),
+            "aircon_related.aircon_scores",
             week_before_last_score=scores[0],
             last_week_score=scores[1],
             this_week_score=scores[2],
@@ -400,7 +410,7 @@ class SystemEventLogger:
             weather_forecast_hourly_model (WeatherForecastHourlyModel): 最近の天気予報
         """
         SystemEventLogger.log_info(
-            i18n.t("aircon_related.closest_forecast_after"),
+            "aircon_related.closest_forecast_after",
             forecast_time=weather_forecast_hourly_model.forecast_time.replace(tzinfo=DB_TZ)
             .astimezone(LOCAL_TZ)
             .strftime("%Y-%m-%d %H:%M:%S"),
@@ -419,7 +429,7 @@ class SystemEventLogger:
         """
         日射利用率の温暖化削減をログに出力します。
         """
-        SystemEventLogger.log_info(i18n.t("aircon_related.solar_utilization.heating_reduction"))
+        SystemEventLogger.log_info("aircon_related.solar_utilization.heating_reduction")
 
     @staticmethod
     def log_exception(e: Exception):
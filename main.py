@@ -7,9 +7,15 @@ from api.notify.notify_factory import NotifyFactory
 from api.smart_home_devices.smart_home_device_exception import SmartHomeDeviceException
 from home_comfort_control import HomeComfortControl
 from logger.system_event_logger import SystemEventLogger, logger
+from settings import app_preference
 from shared.dataclass.effective_outdoor_temperature import EffectiveOutdoorTemperature
 from translations.translated_value_error import TranslatedValueError
+from util.api_quota import ApiQuota
+from util.control_trigger import ControlTrigger
+from util.cycle_metrics import CycleMetrics
 from util.met_clo_adjuster import MetCloAdjuster
+from util.polling_scheduler import PollingScheduler
+from util.query_profiler import QueryProfiler
 from util.thermal_comfort import ThermalComfort
 
 
@@ -17,14 +23,31 @@ from util.thermal_comfort import ThermalComfort
 def main():
     # ホームコンフォートコントロールを初期化
     home_comfort_control = HomeComfortControl()
-    # 天気予報を取得してDBに保存
-    home_comfort_control.fetch_forecast()
-    # 本日の最高気温を取得
-    forecast_max_temperature = home_comfort_control.fetch_forecast_max_temperature()
-    # 現在時刻を基準に次の時間単位の天気予報を取得する
-    closest_future_forecast = home_comfort_control.get_closest_future_forecast()
+    # 実行間隔を変化の速さから決める場合、次の実行時刻まではセンサーも読まずに終了する
+    if app_preference.polling.enabled and not PollingScheduler.is_due():
+        return False
     # センサー情報を取得
     home_sensor = home_comfort_control.initialize_home_sensor()
+    # 前回制御した時点から測定値が変化していない場合は、PMV計算・DB記録・機器操作を省略する
+    if app_preference.control_trigger.enabled and not ControlTrigger.should_control(
+        ControlTrigger.create_snapshot(
+            home_sensor, home_comfort_control.get_closest_future_forecast()
+        )
+    ):
+        # 次の実行時刻を決める（PMVは計算していないので室温の変化だけで決める）
+        if app_preference.polling.enabled:
+            PollingScheduler.schedule_next(
+                home_sensor, None, home_comfort_control.is_within_sleeping_period()
+            )
+        return False
+    # 天気予報を取得してDBに保存
+    with CycleMetrics.measure("forecast_fetch"):
+        home_comfort_control.fetch_forecast()
+    with CycleMetrics.measure("forecast_query"):
+        # 本日の最高気温を取得
+        forecast_max_temperature = home_comfort_control.fetch_forecast_max_temperature()
+        # 現在時刻を基準に次の時間単位の天気予報を取得する
+        closest_future_forecast = home_comfort_control.get_closest_future_forecast()
     # 外気の基準となる温度を決める
     eff_temperature = EffectiveOutdoorTemperature(
         outdoor_temperature=(
@@ -38,51 +61,75 @@ def main():
     SystemEventLogger.log_environment_data(
         home_sensor, eff_temperature.forecast_temperature, closest_future_forecast
     )
-    # METとICLの値を計算
-    comfort_factors = MetCloAdjuster.calculate_comfort_factors(
-        eff_temperature,
-        is_sleeping,
-    )
-    # PMV値を計算
-    pmv_result = ThermalComfort.calculate_pmv(home_sensor, eff_temperature.value, comfort_factors)
-    # 高温条件の場合の、サーキュレーターの状態を取得
-    circulator_settings_heat_conditions = (
-        home_comfort_control.activate_circulator_in_heat_conditions(
-            home_sensor, pmv_result.pmv, eff_temperature.value
+    with CycleMetrics.measure("pmv"):
+        # METとICLの値を計算
+        comfort_factors = MetCloAdjuster.calculate_comfort_factors(
+            eff_temperature,
+            is_sleeping,
+            closest_future_forecast,
+        )
+        # PMV値を計算
+        pmv_result = ThermalComfort.calculate_pmv(
+            home_sensor, eff_temperature.value, comfort_factors
+        )
+        # 高温条件の場合の、サーキュレーターの状態を取得
+        circulator_settings_heat_conditions = (
+            home_comfort_control.activate_circulator_in_heat_conditions(
+                home_sensor, pmv_result.pmv, eff_temperature.value
+            )
         )
-    )
 
-    # サーキュレーターがオンになる場合、風量を増やしてPMV値を再計算
-    pmv_result = (
-        home_comfort_control.recalculate_pmv_with_circulator(
-            home_sensor, eff_temperature.value, circulator_settings_heat_conditions, comfort_factors
+        # サーキュレーターがオンになる場合、風量を増やしてPMV値を再計算
+        pmv_result = (
+            home_comfort_control.recalculate_pmv_with_circulator(
+                home_sensor,
+                eff_temperature.value,
+                circulator_settings_heat_conditions,
+                comfort_factors,
+            )
+            or pmv_result
         )
-        or pmv_result
-    )
 
     # 結果をログに出力
     SystemEventLogger.log_pmv(pmv_result, comfort_factors)
+    # PMVキャッシュの利用状況をログに出力
+    pmv_cache = ThermalComfort.get_pmv_cache()
+    if pmv_cache:
+        SystemEventLogger.log_info("pmv_calculation.cache_stats", **pmv_cache.stats())
 
     # PMVを元にエアコンの設定を判断
-    aircon_settings = home_comfort_control.update_aircon_settings(
-        home_sensor, pmv_result, eff_temperature.value, closest_future_forecast, is_sleeping
-    )
+    with CycleMetrics.measure("device_update", "aircon"):
+        aircon_settings = home_comfort_control.update_aircon_settings(
+            home_sensor, pmv_result, eff_temperature.value, closest_future_forecast, is_sleeping
+        )
     # サーキュレーターの状態を更新
-    circulator_settings = home_comfort_control.update_circulator_settings(
-        home_sensor,
-        circulator_settings_heat_conditions,
-        is_sleeping,
-        eff_temperature.value,
-    )
+    with CycleMetrics.measure("device_update", "circulator"):
+        circulator_settings = home_comfort_control.update_circulator_settings(
+            home_sensor,
+            circulator_settings_heat_conditions,
+            is_sleeping,
+            eff_temperature.value,
+        )
     # 扇風機の状態を更新
-    electric_fan_settings = home_comfort_control.update_electric_fan_settings(
-        is_sleeping,
-        pmv_result.mean_radiant_temperature,
-    )
+    with CycleMetrics.measure("device_update", "electric_fan"):
+        electric_fan_settings = home_comfort_control.update_electric_fan_settings(
+            is_sleeping,
+            pmv_result.mean_radiant_temperature,
+        )
     # データベースに記録
-    home_comfort_control.record_environment_data(
-        home_sensor, pmv_result, aircon_settings, circulator_settings, electric_fan_settings
-    )
+    with CycleMetrics.measure("db_write"):
+        home_comfort_control.record_environment_data(
+            home_sensor, pmv_result, aircon_settings, circulator_settings, electric_fan_settings
+        )
+    # 制御した時点の測定値を保存
+    if app_preference.control_trigger.enabled:
+        ControlTrigger.save_snapshot(
+            app_preference.control_trigger.state_path,
+            ControlTrigger.create_snapshot(home_sensor, closest_future_forecast),
+        )
+    # 次の実行時刻を決める
+    if app_preference.polling.enabled:
+        PollingScheduler.schedule_next(home_sensor, pmv_result.pmv, is_sleeping)
 
     return True
 
@@ -94,13 +141,20 @@ if __name__ == "__main__":
     # os.environ.clear()
     # load_dotenv(".env", override=True)
     try:
-        main()
+        # 環境変数QUERY_PROFILERが有効な場合は、実行したSQL文の集計をログに出力
+        with CycleMetrics.measure("cycle"), QueryProfiler.profile_cycle():
+            controlled = main()
+        # 処理ごとの所要時間を集計してログに出力（通知に含めるため通知より前に行う）
+        CycleMetrics.flush()
+        # 本日のAPI呼び出し回数の内訳と日末の見込みをログに出力
+        ApiQuota.log_summary()
         notify_manager = NotifyFactory.create_manager()
         # エラーが発生した場合は重要通知を送る
         if SystemEventLogger.check_error():
             notify_manager.notify_important(SystemEventLogger.get_buffered_logs())
-        # 通常通知を送る
-        notify_manager.notify_normal(SystemEventLogger.get_buffered_logs())
+        # 通常通知を送る（制御を省略した場合は送らない）
+        if controlled:
+            notify_manager.notify_normal(SystemEventLogger.get_buffered_logs())
     except SmartHomeDeviceException as sde:
         SystemEventLogger.log_exception(sde)
         NotifyFactory.create_manager().notify_important(
@@ -0,0 +1,42 @@
+# SwitchBot・OpenWeatherMap・気象庁のAPIの代わりに応答するモックサーバーを起動するスクリプト
+# 実行方法: python mock_api_server.py [--port 8765] [--recordings data/recordings] [--seed 0]
+#
+# 設定はyaml/mock_api_server.yamlから読み込みます（引数で指定した値を優先します）。
+# 起動後に表示される環境変数を設定してmain.pyなどを実行すると、実際のAPIの代わりにこのサーバーを使います。
+# Ctrl+Cで停止すると、APIと結果ごとのリクエスト数を表示します。
+import argparse
+
+from api.mock_api.mock_api_server import MockApiServer
+from preferences.mock_api.mock_api_server_preference import MockApiServerPreference
+from preferences.yaml_loader import YamlLoader
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="APIの代わりに応答するモックサーバーを起動します")
+    parser.add_argument("--host", help="待ち受けるホスト")
+    parser.add_argument("--port", type=int, help="待ち受けるポート")
+    parser.add_argument("--recordings", help="記録した応答を置くディレクトリ")
+    parser.add_argument("--seed", type=int, help="遅延とエラーの乱数のシード")
+    args = parser.parse_args()
+
+    preference = MockApiServerPreference(**YamlLoader.load_config("mock_api_server.yaml"))
+    if args.host is not None:
+        preference.host = args.host
+    if args.port is not None:
+        preference.port = args.port
+    if args.recordings is not None:
+        preference.recordings_dir = args.recordings
+    if args.seed is not None:
+        preference.seed = args.seed
+
+    server = MockApiServer(preference)
+    print(f"{server.base_url} で待ち受けています。次の環境変数を設定してください:")
+    for key, value in server.get_environment().items():
+        print(f"  {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        for key, count in sorted(server.stats.items()):
+            print(f"{key}: {count}回")
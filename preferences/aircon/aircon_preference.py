@@ -2,6 +2,9 @@ from pydantic import BaseModel, Field
 
 from preferences.aircon.aircon_settings_preference import AirconSettingsPreference
 from preferences.aircon.conditional_preference import ConditionalPreference
+from preferences.aircon.neutral_temperature_preference import NeutralTemperaturePreference
+from preferences.aircon.predictive_control_preference import PredictiveControlPreference
+from preferences.aircon.setpoint_optimizer_preference import SetpointOptimizerPreference
 
 
 class AirconPreference(BaseModel):
@@ -17,3 +20,19 @@ class AirconPreference(BaseModel):
 
     conditional: ConditionalPreference
     """環境制御に関する設定を格納するフィールド。"""
+
+    setpoint_optimizer: SetpointOptimizerPreference = Field(
+        default_factory=SetpointOptimizerPreference
+    )
+    """PMV予測によるエアコン設定探索の設定を格納するフィールド。"""
+
+    neutral_temperature: NeutralTemperaturePreference = Field(
+        default_factory=NeutralTemperaturePreference
+    )
+    """中立温度による設定温度の決定を格納するフィールド。"""
+
+
+    predictive_control: PredictiveControlPreference = Field(
+        default_factory=PredictiveControlPreference
+    )
+    """天気予報と家の熱モデルによる先読み制御の設定を格納するフィールド。"""
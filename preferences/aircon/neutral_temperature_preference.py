@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+
+class NeutralTemperaturePreference(BaseModel):
+    """
+    中立温度による設定温度の決定を管理するクラス。
+
+    有効な場合、冷房・暖房の設定温度をPMV閾値表の値ではなく、
+    目標のPMVになる室温を逆算した値にします。
+    """
+
+    enabled: bool = Field(default=False, description="中立温度を設定温度に使うかどうか")
+    """中立温度を設定温度に使うかどうか"""
+
+    target_pmv: float = Field(default=0.0, ge=-3.0, le=3.0, description="目標のPMV")
+    """目標のPMV"""
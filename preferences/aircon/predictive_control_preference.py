@@ -0,0 +1,57 @@
+from pydantic import BaseModel, Field
+
+from preferences.aircon.setpoint_optimizer_preference import ComfortBandPreference
+
+
+class PredictiveControlPreference(BaseModel):
+    """
+    天気予報と家の熱モデルによる先読み制御（予冷・予熱）の設定項目を管理するクラス。
+
+    有効な場合、時間単位の天気予報から数時間先までの室温を予測し、
+    候補の運転計画の中から快適範囲を保てる最も電力の少ない計画を選んで、その最初の運転を行います。
+    """
+
+    enabled: bool = Field(default=False, description="先読み制御を有効にするかどうか")
+    """先読み制御を有効にするかどうか"""
+
+    horizon_hours: int = Field(default=8, ge=6, le=12, description="予測する時間（時間）")
+    """運転計画を評価する時間の長さ（時間）"""
+
+    step_minutes: int = Field(default=30, ge=10, le=60, description="運転計画の刻み（分）")
+    """運転計画で運転を切り替えられる刻み（分）"""
+
+    comfort_band: ComfortBandPreference = Field(
+        default_factory=lambda: ComfortBandPreference(lower=-0.5, upper=0.5),
+        description="快適とみなすPMVの範囲",
+    )
+    """運転計画の期間中に保つPMVの範囲"""
+
+    temperature_min: float = Field(default=20, ge=18, le=30, description="候補とする最低設定温度")
+    """候補とする最低設定温度（℃）"""
+
+    temperature_max: float = Field(default=28, ge=18, le=30, description="候補とする最高設定温度")
+    """候補とする最高設定温度（℃）。送風の設定温度にも使います"""
+
+    house_time_constant_hours: float = Field(
+        default=10, gt=0, description="室温が外気温に近づく時定数（時間）"
+    )
+    """エアコンを使わない場合に室温が外気温に近づく時定数（時間）。fit_house_thermal_model.pyで推定します"""
+
+    aircon_capacity: float = Field(
+        default=2, gt=0, description="エアコンが1時間に室温を動かせる最大の温度（度）"
+    )
+    """エアコンが能力いっぱいで運転した場合に1時間で室温を動かせる温度（度）。fit_house_thermal_model.pyで推定します"""
+
+    heat_gain_offset: float = Field(
+        default=2, ge=-10, le=10, description="内部発熱と日射による室温の上昇（度）"
+    )
+    """エアコンを使わない場合に室温が近づく温度（自然室温）の外気温との差（度）。fit_house_thermal_model.pyで推定します"""
+
+    cop_rated: float = Field(default=4, gt=0, description="外気温と設定温度が同じ場合の成績係数")
+    """外気温と設定温度の差がない場合のエアコンの成績係数（COP）"""
+
+    cop_slope: float = Field(default=0.08, ge=0, description="温度差1度あたりの成績係数の低下")
+    """外気温と設定温度の差1度あたりの成績係数の低下"""
+
+    cop_min: float = Field(default=1.5, gt=0, description="成績係数の下限")
+    """成績係数の下限"""
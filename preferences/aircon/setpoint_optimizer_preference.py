@@ -0,0 +1,113 @@
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from shared.enums.aircon_mode import AirconMode
+from translations.translated_pydantic_value_error import TranslatedPydanticValueError
+
+
+class SetpointOptimizerPreference(BaseModel):
+    """
+    PMV予測によるエアコン設定探索の設定項目を管理するクラス。
+
+    有効な場合、モード・設定温度・風量の候補をまとめてPMV予測し、
+    快適範囲に収まる候補の中から最も強度の低い設定を選択します。
+    """
+
+    enabled: bool = Field(default=False, description="設定探索を有効にするかどうか")
+    """設定探索を有効にするかどうか"""
+
+    comfort_band: "ComfortBandPreference" = Field(
+        default_factory=lambda: ComfortBandPreference(), description="快適とみなすPMVの範囲"
+    )
+    """快適とみなすPMVの範囲"""
+
+    temperature_min: float = Field(default=20, ge=18, le=30, description="候補とする最低設定温度")
+    """候補とする最低設定温度（℃）"""
+
+    temperature_max: float = Field(default=28, ge=18, le=30, description="候補とする最高設定温度")
+    """候補とする最高設定温度（℃）"""
+
+    temperature_step: float = Field(default=1, gt=0, le=5, description="候補とする設定温度の刻み")
+    """候補とする設定温度の刻み（℃）"""
+
+    modes: List[AirconMode] = Field(
+        default_factory=lambda: [
+            AirconMode.COOLING,
+            AirconMode.HEATING,
+            AirconMode.DRY,
+            AirconMode.FAN,
+        ],
+        description="候補とする運転モード",
+    )
+    """候補とする運転モード"""
+
+    fan_air_speeds: "FanAirSpeedPreference" = Field(
+        default_factory=lambda: FanAirSpeedPreference(), description="風量ごとの在室位置の風速"
+    )
+    """風量ごとの在室位置の風速（m/s）"""
+
+    @field_validator("modes", mode="before")
+    def convert_modes_to_enum(cls, value):
+        """modesを文字列からEnumに変換する"""
+        modes = []
+        for mode in value:
+            if isinstance(mode, AirconMode):
+                modes.append(mode)
+                continue
+            try:
+                modes.append(AirconMode[mode])
+            except KeyError:
+                raise TranslatedPydanticValueError(
+                    cls=SetpointOptimizerPreference,
+                    mode=mode,
+                )
+        return modes
+
+    @model_validator(mode="after")
+    def validate_temperature_range(self):
+        """最低設定温度が最高設定温度以下であることを確認する"""
+        if self.temperature_min > self.temperature_max:
+            raise TranslatedPydanticValueError(
+                cls=SetpointOptimizerPreference,
+                temperature_min=self.temperature_min,
+                temperature_max=self.temperature_max,
+            )
+        return self
+
+
+class ComfortBandPreference(BaseModel):
+    """快適とみなすPMVの範囲を管理するクラス"""
+
+    lower: float = Field(default=-0.2, ge=-3.0, le=3.0, description="PMVの下限")
+    """PMVの下限"""
+
+    upper: float = Field(default=0.2, ge=-3.0, le=3.0, description="PMVの上限")
+    """PMVの上限"""
+
+    @model_validator(mode="after")
+    def validate_range(self):
+        """PMVの下限が上限以下であることを確認する"""
+        if self.lower > self.upper:
+            raise TranslatedPydanticValueError(
+                cls=ComfortBandPreference,
+                lower=self.lower,
+                upper=self.upper,
+            )
+        return self
+
+
+class FanAirSpeedPreference(BaseModel):
+    """エアコンの風量ごとに想定する在室位置の風速を管理するクラス"""
+
+    auto: float = Field(default=0.15, ge=0, le=2, description="自動時の風速")
+    """自動時の風速（m/s）"""
+
+    low: float = Field(default=0.1, ge=0, le=2, description="弱時の風速")
+    """弱時の風速（m/s）"""
+
+    medium: float = Field(default=0.2, ge=0, le=2, description="中時の風速")
+    """中時の風速（m/s）"""
+
+    high: float = Field(default=0.3, ge=0, le=2, description="強時の風速")
+    """強時の風速（m/s）"""
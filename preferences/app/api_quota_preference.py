@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+
+
+class ApiQuotaPreference(BaseModel):
+    """
+    SwitchBot APIの呼び出し回数の記録と、上限を超えそうな場合の節約の設定を管理するクラス。
+
+    有効な場合、APIの呼び出しをデバイス・エンドポイント・結果ごとに数えて保存し、
+    直近の呼び出しの速さから日末の呼び出し回数を見込みます。見込みが1日の上限
+    （polling.daily_api_budget）を超える場合は、メイン以外のセンサーの測定値を使い回し、
+    サーキュレーターと扇風機の設定を変更しません。
+    """
+
+    enabled: bool = Field(default=False, description="API呼び出し回数を記録するかどうか")
+    """API呼び出し回数を記録し、上限を超えそうな場合に節約するかどうか"""
+
+    state_path: str = Field(
+        default="data/api_quota.json", description="呼び出し回数を保存するファイルのパス"
+    )
+    """呼び出し回数とセンサーの最後の測定値を保存するファイルのパス"""
+
+    projection_window_minutes: int = Field(
+        default=120, ge=10, le=1440, description="日末の見込みに使う直近の時間（分）"
+    )
+    """日末の呼び出し回数を見込むときに、呼び出しの速さを求める直近の時間（分）"""
+
+    degraded_sensor_ttl_minutes: float = Field(
+        default=30, ge=0, description="節約中にメイン以外のセンサーの測定値を使い回す時間（分）"
+    )
+    """節約中に、メイン以外のセンサーの前回の測定値を読み直さずに使う時間（分）"""
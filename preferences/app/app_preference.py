@@ -1,15 +1,21 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from preferences.app.api_quota_preference import ApiQuotaPreference
 from preferences.app.awake_period_preference import AwakePeriodPreference
 from preferences.app.circulator_preference import CirculatorPreference
 from preferences.app.co2_thresholds_preference import Co2ThresholdsPreference
 from preferences.app.comfort_control_preference import ComfortControlPreference
+from preferences.app.control_trigger_preference import ControlTriggerPreference
+from preferences.app.cycle_metrics_preference import CycleMetricsPreference
 from preferences.app.database_preference import Databaseference
+from preferences.app.device_shadow_preference import DeviceShadowPreference
 from preferences.app.electric_fan_preference import ElectricFanPreference
 from preferences.app.environment_preference import EnvironmentPreference
 from preferences.app.notify_preference import NotifyPreference
+from preferences.app.polling_preference import PollingPreference
 from preferences.app.sensor_preference import SensorsPreference
 from preferences.app.smart_home_device_preference import SmartHomeDevicePreference
+from preferences.app.structured_log_preference import StructuredLogPreference
 from preferences.app.temperature_thresholds_preference import TemperatureThresholdsPreference
 from preferences.app.weather_forecast_preference import WeatherForecastPreference
 
@@ -44,3 +50,15 @@ class AppPreference(BaseModel):
     weather_forecast: WeatherForecastPreference
     """天気予報"""
     notify: NotifyPreference  # 複数の通知設定がある場合
+    control_trigger: ControlTriggerPreference = Field(default_factory=ControlTriggerPreference)
+    """センサー測定値の変化による制御の実行条件"""
+    polling: PollingPreference = Field(default_factory=PollingPreference)
+    """制御サイクルの実行間隔"""
+    device_shadow: DeviceShadowPreference = Field(default_factory=DeviceShadowPreference)
+    """最後に送信した機器の状態"""
+    cycle_metrics: CycleMetricsPreference = Field(default_factory=CycleMetricsPreference)
+    """制御サイクルの処理ごとの所要時間の計測"""
+    api_quota: ApiQuotaPreference = Field(default_factory=ApiQuotaPreference)
+    """SwitchBot APIの呼び出し回数の記録と節約"""
+    structured_log: StructuredLogPreference = Field(default_factory=StructuredLogPreference)
+    """JSON Lines形式のログの記録と送信"""
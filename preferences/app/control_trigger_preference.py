@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+
+
+class ControlTriggerPreference(BaseModel):
+    """
+    センサー測定値の変化による制御の実行条件を管理するクラス。
+
+    有効な場合、前回制御を実行した時点の測定値から変化がない間は、
+    PMVの計算、データベースへの記録、機器の操作を行いません。
+    """
+
+    enabled: bool = Field(default=False, description="変化があった場合だけ制御するかどうか")
+    """変化があった場合だけ制御するかどうか（無効の場合は毎回制御する）"""
+
+    state_path: str = Field(
+        default="data/control_trigger_state.json",
+        description="前回制御した時点の測定値を保存するファイルのパス",
+    )
+    """前回制御した時点の測定値を保存するファイルのパス"""
+
+    temperature_delta: float = Field(default=0.3, gt=0, description="温度の変化量の閾値")
+    """いずれかのセンサーの温度がこの値（℃）以上変化した場合に制御する"""
+
+    humidity_delta: float = Field(default=3.0, gt=0, description="湿度の変化量の閾値")
+    """いずれかのセンサーの湿度がこの値（％）以上変化した場合に制御する"""
+
+    co2_delta: int = Field(default=100, gt=0, description="CO2濃度の変化量の閾値")
+    """いずれかのセンサーのCO2濃度がこの値（ppm）以上変化した場合に制御する"""
+
+    forecast_change: bool = Field(default=True, description="参照する予報の時刻が変わった場合に制御するかどうか")
+    """最も近い未来の天気予報の時刻が変わった場合に制御するかどうか"""
+
+    time_window_change: bool = Field(default=True, description="時間帯が切り替わった場合に制御するかどうか")
+    """起床時間や食事時間などの時間帯が切り替わった場合に制御するかどうか"""
+
+    max_interval_minutes: int = Field(default=30, gt=0, description="変化がなくても制御する間隔（分）")
+    """前回の制御からこの時間（分）以上経過した場合は、変化がなくても制御する"""
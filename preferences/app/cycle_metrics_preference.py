@@ -0,0 +1,39 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class CycleMetricsPreference(BaseModel):
+    """
+    制御サイクルの処理ごとの所要時間を計測する設定を管理するクラス。
+
+    有効な場合、センサーの読み取り・天気予報の取得・PMV計算・設定の判断・機器の操作・
+    データベースへの記録の所要時間をヒストグラムに集計し、OpenMetrics形式のテキストファイルと
+    サイクルごとのログに出力します。
+    """
+
+    enabled: bool = Field(default=False, description="処理ごとの所要時間を計測するかどうか")
+    """処理ごとの所要時間を計測するかどうか"""
+
+    state_path: str = Field(
+        default="data/cycle_metrics.json", description="ヒストグラムを保存するファイルのパス"
+    )
+    """実行をまたいで集計するヒストグラムを保存するファイルのパス"""
+
+    textfile_path: str = Field(
+        default="data/metrics/home_comfort_control.prom",
+        description="OpenMetrics形式で出力するファイルのパス",
+    )
+    """
+    OpenMetrics形式で出力するファイルのパス。
+    node_exporterのtextfileコレクタが読むディレクトリに置くと、Prometheusから収集できます。
+    """
+
+    buckets: List[float] = Field(
+        default_factory=lambda: [
+            0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+        ],
+        min_length=1,
+        description="ヒストグラムのバケットの上限（秒）",
+    )
+    """ヒストグラムのバケットの上限（秒）。変更すると集計をやり直します"""
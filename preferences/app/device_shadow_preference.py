@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+
+
+class DeviceShadowPreference(BaseModel):
+    """
+    最後に送信した機器の状態を保持し、同じ状態へのコマンドを送信しない設定を管理するクラス。
+    """
+
+    enabled: bool = Field(default=False, description="同じ状態へのコマンドを送信しないかどうか")
+    """最後に送信した状態と同じ状態へのコマンドを送信しないかどうか"""
+
+    state_path: str = Field(
+        default="data/device_shadow.json", description="最後に送信した状態を保存するファイルのパス"
+    )
+    """最後に送信した機器の状態と、送信しなかったAPI呼び出し回数を保存するファイルのパス"""
+
+    aircon_refresh_minutes: int = Field(
+        default=60, ge=0, description="同じ設定でもエアコンに送信し直す間隔（分）"
+    )
+    """
+    最後の送信からこの時間（分）以上経過した場合は、同じ設定でもエアコンに送信し直す（0の場合は送信し直さない）。
+    赤外線の取りこぼしやリモコンでの操作で実際の状態とずれた場合に戻すため。
+    電源の切り替えと風量の増減は同じコマンドで状態が反転するため、送信し直しません。
+    """
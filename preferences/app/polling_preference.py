@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+
+
+class PollingPreference(BaseModel):
+    """
+    制御サイクルの実行間隔を変化の速さから決める設定を管理するクラス。
+
+    有効な場合、cronなどで短い間隔で起動し、前回決めた次の実行時刻より前であれば
+    センサーを読まずに終了します。
+    """
+
+    enabled: bool = Field(default=False, description="実行間隔を変化の速さから決めるかどうか")
+    """実行間隔を変化の速さから決めるかどうか（無効の場合は起動のたびに実行する）"""
+
+    state_path: str = Field(
+        default="data/polling_state.json", description="次の実行時刻などを保存するファイルのパス"
+    )
+    """次の実行時刻と前回の測定値、API呼び出し回数を保存するファイルのパス"""
+
+    min_interval_minutes: float = Field(default=2, gt=0, description="最短の実行間隔（分）")
+    """最短の実行間隔（分）"""
+
+    max_interval_minutes: float = Field(default=30, gt=0, description="最長の実行間隔（分）")
+    """最長の実行間隔（分）"""
+
+    temperature_step: float = Field(default=0.3, gt=0, description="1回の間隔で許容する温度の変化量")
+    """1回の実行間隔で変化してよい室温（℃）。変化が速いほど間隔を短くする"""
+
+    pmv_step: float = Field(default=0.1, gt=0, description="1回の間隔で許容するPMVの変化量")
+    """1回の実行間隔で変化してよいPMV。変化が速いほど間隔を短くする"""
+
+    sleeping_factor: float = Field(default=2.0, ge=1, description="就寝中の実行間隔の倍率")
+    """就寝中は実行間隔をこの倍率で長くする（最長の実行間隔は超えない）"""
+
+    daily_api_budget: int = Field(default=9000, gt=0, description="1日に使うAPI呼び出し回数の上限")
+    """1日に使うスマートホーム機器のAPI呼び出し回数の上限"""
+
+    command_calls_per_cycle: int = Field(
+        default=1, ge=0, description="1回の実行で見込む機器操作のAPI呼び出し回数"
+    )
+    """1回の実行で見込む機器操作のAPI呼び出し回数（センサーの読み取り回数に加える）"""
@@ -0,0 +1,58 @@
+from pydantic import BaseModel, Field
+
+
+class StructuredLogPreference(BaseModel):
+    """
+    ログをJSON Lines形式のファイルに記録する設定を管理するクラス。
+
+    有効な場合、ログのイベントごとにメッセージのキー・埋め込んだデータ・レベル・実行のID・
+    実行を開始してからの時間を1行のJSONとして記録します。書き込みはバックグラウンドのスレッドで
+    まとめて行い、ファイルが上限のサイズを超えたら切り替えます。
+    collector_urlを設定すると、記録したイベントをまとめてコレクターに送信します。
+    """
+
+    enabled: bool = Field(default=False, description="ログをJSON Lines形式で記録するかどうか")
+    """ログをJSON Lines形式のファイルに記録するかどうか"""
+
+    path: str = Field(default="data/logs/events.jsonl", description="ログを記録するファイルのパス")
+    """ログを記録するファイルのパス"""
+
+    max_bytes: int = Field(
+        default=10 * 1024 * 1024, gt=0, description="ファイルを切り替えるサイズ（バイト）"
+    )
+    """ファイルを切り替えるサイズ（バイト）。超えた場合は".1"〜を付けた名前に移します"""
+
+    backup_count: int = Field(default=5, ge=0, description="残す切り替え前のファイルの数")
+    """残す切り替え前のファイルの数。0の場合は切り替え前のファイルを残しません"""
+
+    batch_size: int = Field(default=100, gt=0, description="まとめて書き込むイベントの最大数")
+    """まとめて書き込むイベントの最大数"""
+
+    flush_interval_seconds: float = Field(
+        default=1.0, gt=0, description="イベントをまとめるために待つ最大の時間（秒）"
+    )
+    """最初のイベントから書き込むまでに、後続のイベントを待つ最大の時間（秒）"""
+
+    collector_url: str | None = Field(
+        default=None, description="イベントを送信するコレクターのURL"
+    )
+    """
+    イベントを送信するコレクターのURL（例: http://127.0.0.1:9880/home_comfort_control）。
+    Noneの場合は送信しません。送信は1行1イベントのJSON Lines形式のPOSTです。
+    """
+
+    ship_batch_size: int = Field(default=500, gt=0, description="まとめて送信するイベントの最大数")
+    """まとめて送信するイベントの最大数"""
+
+    ship_timeout_seconds: float = Field(default=5.0, gt=0, description="送信のタイムアウト（秒）")
+    """コレクターへの送信のタイムアウト（秒）"""
+
+    ship_retry_seconds: float = Field(
+        default=30.0, ge=0, description="送信に失敗してから次に送信するまでの時間（秒）"
+    )
+    """送信に失敗してから次に送信するまでの時間（秒）。終了するときは待たずに送信します"""
+
+    max_pending_events: int = Field(
+        default=10000, gt=0, description="送信できなかったイベントを保持する最大数"
+    )
+    """送信できなかったイベントを次の送信まで保持する最大数。超えた場合は古いイベントから捨てます"""
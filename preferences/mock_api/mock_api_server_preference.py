@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field
+
+from preferences.mock_api.mock_endpoint_preference import MockEndpointPreference
+
+
+class MockApiServerPreference(BaseModel):
+    """
+    SwitchBot・OpenWeatherMap・気象庁のAPIの代わりに応答するモックサーバーの設定を管理するクラス。
+
+    APIごとに遅延の分布・エラーの割合・リクエスト数の上限を設定できます。
+    recordings_dirを指定した場合は、記録した応答を合成した応答より優先して返します。
+    """
+
+    host: str = Field(default="127.0.0.1", description="待ち受けるホスト")
+    """待ち受けるホスト"""
+
+    port: int = Field(default=8765, ge=0, le=65535, description="待ち受けるポート")
+    """待ち受けるポート（0の場合は空いているポートを使う）"""
+
+    seed: int | None = Field(default=None, description="遅延とエラーの乱数のシード")
+    """遅延とエラーを決める乱数のシード（Noneの場合は毎回異なる）"""
+
+    recordings_dir: str | None = Field(default=None, description="記録した応答のディレクトリ")
+    """
+    記録した応答を置くディレクトリ。次のファイルがあればその内容を返します。
+    .jsonの代わりに.jsonlを置くと、1行ずつ順に返し、最後まで返したら最初に戻ります。
+
+    - switchbot/devices.json: デバイス一覧
+    - switchbot/status/<デバイスID>.json（なければswitchbot/status.json）: デバイスの状態
+    - open_weather_map/forecast.json: OpenWeatherMapの天気予報
+    - jma/<エリアコード>.json（なければjma/forecast.json）: 気象庁の天気予報
+    """
+
+    jma_area_name: str = Field(default="東京", description="気象庁の天気予報のエリア名")
+    """合成する気象庁の天気予報の気温のエリア名（環境変数JMA_AREA_NAMEと同じにします）"""
+
+    switchbot: MockEndpointPreference = Field(
+        default_factory=MockEndpointPreference, description="SwitchBotのAPI"
+    )
+    """SwitchBotのAPIの応答"""
+
+    open_weather_map: MockEndpointPreference = Field(
+        default_factory=MockEndpointPreference, description="OpenWeatherMapのAPI"
+    )
+    """OpenWeatherMapのAPIの応答"""
+
+    jma: MockEndpointPreference = Field(
+        default_factory=MockEndpointPreference, description="気象庁の天気予報"
+    )
+    """気象庁の天気予報の応答"""
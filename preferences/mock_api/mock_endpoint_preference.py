@@ -0,0 +1,38 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class LatencyPreference(BaseModel):
+    """モックサーバーが応答を返すまでの遅延の分布を管理するクラス"""
+
+    distribution: Literal["constant", "uniform", "normal", "lognormal"] = Field(
+        default="constant", description="遅延の分布"
+    )
+    """遅延の分布（constant: 一定、uniform: 一様、normal: 正規、lognormal: 対数正規）"""
+
+    mean_ms: float = Field(default=0, ge=0, description="遅延の平均（ミリ秒）")
+    """遅延の平均（ミリ秒）"""
+
+    spread_ms: float = Field(default=0, ge=0, description="遅延のばらつき（ミリ秒）")
+    """遅延のばらつき（ミリ秒）。uniformは平均からの幅、normalとlognormalは標準偏差"""
+
+
+class MockEndpointPreference(BaseModel):
+    """モックサーバーの1つのAPIの応答の設定を管理するクラス"""
+
+    latency: LatencyPreference = Field(default_factory=LatencyPreference, description="遅延")
+    """応答を返すまでの遅延"""
+
+    error_rate: float = Field(default=0, ge=0, le=1, description="HTTP 500を返す割合")
+    """HTTP 500（サーバーエラー）を返す割合"""
+
+    api_error_rate: float = Field(
+        default=0, ge=0, le=1, description="HTTP 200でAPIのエラーを返す割合"
+    )
+    """HTTP 200で成功以外のステータスコードを返す割合（SwitchBotのみ。statusCode 190を返します）"""
+
+    rate_limit_per_minute: int = Field(
+        default=0, ge=0, description="1分あたりのリクエスト数の上限"
+    )
+    """直近1分間のリクエスト数の上限。超えた場合はHTTP 429を返します（0の場合は制限しない）"""
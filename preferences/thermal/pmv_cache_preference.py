@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+
+class PMVCachePreference(BaseModel):
+    """PMV計算結果のキャッシュを管理するクラス"""
+
+    enabled: bool = Field(default=True, description="キャッシュを使用するかどうか")
+    """キャッシュを使用するかどうか"""
+
+    max_size: int = Field(default=4096, ge=1, description="キャッシュする計算結果の最大件数")
+    """キャッシュする計算結果の最大件数"""
+
+    persist_path: str | None = Field(default=None, description="キャッシュを保存するファイルのパス")
+    """キャッシュを保存するファイルのパス（未指定の場合は保存しない）"""
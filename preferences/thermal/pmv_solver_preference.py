@@ -0,0 +1,21 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class PMVSolverPreference(BaseModel):
+    """PMVの計算方法を管理するクラス"""
+
+    backend: Literal["native", "pythermalcomfort", "table"] = Field(
+        default="native", description="PMVの計算方法"
+    )
+    """PMVの計算方法（native: NumPyで厳密に計算、pythermalcomfort: pythermalcomfortで厳密に計算、table: 事前計算した表から補間）
+
+    表で補間した値とnativeとの差は、制御で扱う範囲（室温と平均放射温度の差が3度以内、相対風速0.5m/s以下）で
+    平均PMV 0.01・PPD 0.3%、最大PMV 0.16・PPD 6%程度、表の範囲全体では最大PMV 0.4・PPD 15%程度です
+    （build_pmv_table.pyで確認）。大きな差はASHRAEの冷却効果が入力に対して不連続に変わる条件で出るもので、
+    格子を細かくしても小さくならないため、制御の判断にはnativeを使います。
+    """
+
+    table_path: str = Field(default="data/pmv_table.npy", description="PMVの表のファイルパス")
+    """事前計算したPMVの表のファイルパス（build_pmv_table.pyで生成）"""
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+
+
+class SurfaceModelPreference(BaseModel):
+    """表面温度の過渡応答モデルを管理するクラス"""
+
+    enabled: bool = Field(default=False, description="表面温度の過渡応答モデルを使用するかどうか")
+    """表面温度の過渡応答モデルを使用するかどうか（使用しない場合は定常状態の温度を使う）"""
+
+    state_path: str = Field(
+        default="data/surface_state.json", description="表面温度の状態を保存するファイルのパス"
+    )
+    """前回の表面温度を保存するファイルのパス"""
+
+    wall_time_constant_hours: float = Field(default=4.0, gt=0, description="壁の時定数（時間）")
+    """壁の表面温度が定常状態に近づく速さを表す時定数（時間）"""
+
+    ceiling_time_constant_hours: float = Field(default=2.0, gt=0, description="天井の時定数（時間）")
+    """天井の表面温度が定常状態に近づく速さを表す時定数（時間）"""
+
+    floor_time_constant_hours: float = Field(default=6.0, gt=0, description="床の時定数（時間）")
+    """床の表面温度が定常状態に近づく速さを表す時定数（時間）"""
+
+    reset_after_hours: float = Field(
+        default=24.0, gt=0, description="状態を破棄して定常状態から計算し直すまでの時間"
+    )
+    """前回の計算からこの時間以上経過した場合は、保存した状態を使わずに定常状態の温度を使う"""
@@ -1,9 +1,12 @@
 # ファイル名: thermal_preference.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from preferences.thermal.home_spec_preference import HomeSpecPreference
+from preferences.thermal.pmv_cache_preference import PMVCachePreference
+from preferences.thermal.pmv_solver_preference import PMVSolverPreference
 from preferences.thermal.roof_surface_temperatures_preference import RoofSurfaceTemperaturePreference
+from preferences.thermal.surface_model_preference import SurfaceModelPreference
 from preferences.thermal.wall_surface_temperatures_preference import WallSurfaceTemperaturePreference
 
 
@@ -23,4 +26,13 @@ class ThermalPreference(BaseModel):
     """屋根表面温度設定"""
 
     wall_surface_temperatures: WallSurfaceTemperaturePreference
-    """壁表面温度設定"""
\ No newline at end of file
+    """壁表面温度設定"""
+
+    pmv_cache: PMVCachePreference = Field(default_factory=PMVCachePreference)
+    """PMV計算結果のキャッシュ設定"""
+
+    pmv_solver: PMVSolverPreference = Field(default_factory=PMVSolverPreference)
+    """PMVの計算方法の設定"""
+
+    surface_model: SurfaceModelPreference = Field(default_factory=SurfaceModelPreference)
+    """表面温度の過渡応答モデルの設定"""
@@ -0,0 +1,71 @@
+# 記録した測定値と天気予報で制御の判断を再生するスクリプト
+# 実行方法: python replay.py --start 2024-07-01 --end 2024-08-01 [--output data/replay.csv]
+#
+# デバイスは操作せず、データベースにも書き込みません。送信したはずのコマンドの回数を表示します。
+import argparse
+import csv
+import time
+from datetime import datetime
+
+from settings import LOCAL_TZ
+from util.replay_engine import ReplayEngine
+
+
+def parse_date(value: str) -> datetime:
+    # 日付を現地時刻の0時として解釈する
+    return LOCAL_TZ.localize(datetime.strptime(value, "%Y-%m-%d"))
+
+
+def write_decisions(engine: ReplayEngine, path: str):
+    # サイクルごとの判断結果をCSVに書き出す
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            [
+                "measurement_time", "met", "clo", "pmv", "ppd", "mean_radiant_temperature",
+                "aircon_temperature", "aircon_mode", "aircon_fan_speed", "aircon_power",
+                "circulator_power", "circulator_fan_speed", "electric_fan_power",
+            ]
+        )
+        for decision in engine.decisions:
+            writer.writerow(
+                [
+                    decision.measurement_time.isoformat(),
+                    decision.comfort_factors.met,
+                    decision.comfort_factors.clo,
+                    round(decision.pmv_result.pmv, 2),
+                    round(decision.pmv_result.ppd, 2),
+                    round(decision.pmv_result.mean_radiant_temperature, 2),
+                    decision.aircon_settings.temperature,
+                    decision.aircon_settings.mode.label,
+                    decision.aircon_settings.fan_speed.label,
+                    decision.aircon_settings.power.name,
+                    decision.circulator_settings.power.name,
+                    decision.circulator_settings.fan_speed,
+                    decision.electric_fan_settings.power.name,
+                ]
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="記録した測定値で制御の判断を再生します")
+    parser.add_argument("--start", type=parse_date, required=True, help="開始日（YYYY-MM-DD）")
+    parser.add_argument("--end", type=parse_date, required=True, help="終了日（YYYY-MM-DD、含まない）")
+    parser.add_argument("--output", help="判断結果を書き出すCSVファイル")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = ReplayEngine.load_from_database(args.start, args.end)
+    loaded = time.perf_counter()
+    engine.run()
+    finished = time.perf_counter()
+
+    print(
+        f"{len(engine.decisions)}サイクルを再生しました"
+        f"（読み込み {loaded - start:.1f}秒, 再生 {finished - loaded:.1f}秒）"
+    )
+    for command, count in sorted(engine.count_commands().items()):
+        print(f"  {command}: {count}回")
+    if args.output:
+        write_decisions(engine, args.output)
+        print(f"判断結果を{args.output}に書き出しました")
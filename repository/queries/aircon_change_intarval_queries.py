@@ -85,3 +85,16 @@ class AirconChangeIntervalQueries:
         )
         if change_interval is not None:
             change_interval.start_time = start_time
+
+    def get_all(self) -> list[AirconChangeIntervalModel]:
+        """
+        すべての最小運転時間の設定を取得します。
+
+        Returns:
+            list[AirconChangeIntervalModel]: 最小運転時間の設定のリスト
+        """
+        return (
+            self.session.query(AirconChangeIntervalModel)
+            .order_by(AirconChangeIntervalModel.id)
+            .all()
+        )
@@ -1,4 +1,6 @@
-from sqlalchemy import and_, select
+from datetime import datetime
+
+from sqlalchemy import Row, and_, select
 from sqlalchemy.orm import Session
 
 from models import AirconSettingModel
@@ -96,4 +98,34 @@ class AirconSettingQueries:
                 AirconSettingModel.created_at < end_datetime,
             )
             .all()
-        )
\ No newline at end of file
+        )
+
+    def get_aircon_setting_values_between(
+        self, start_datetime: datetime, end_datetime: datetime
+    ) -> list[Row]:
+        """
+        指定した期間のエアコン設定の値を、作成日時の順に取得するメソッド。
+
+        ORMのインスタンスを作成せず、強度スコアの計算に使う列だけを取得します。
+
+        Args:
+            start_datetime (datetime): 期間の開始日時（この日時を含む）
+            end_datetime (datetime): 期間の終了日時（この日時を含まない）
+
+        Returns:
+            list[Row]: 作成日時・温度・モードID・風量ID・電源の行のリスト
+        """
+        return self.session.execute(
+            select(
+                AirconSettingModel.created_at,
+                AirconSettingModel.temperature,
+                AirconSettingModel.mode_id,
+                AirconSettingModel.fan_speed_id,
+                AirconSettingModel.power,
+            )
+            .where(
+                AirconSettingModel.created_at >= start_datetime,
+                AirconSettingModel.created_at < end_datetime,
+            )
+            .order_by(AirconSettingModel.created_at)
+        ).all()
@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from sqlalchemy.orm import Session, selectinload
 
 from models.measurement_model import MeasurementModel
+from models.sensor_reading_model import SensorReadingModel
 
 
 class MeasurementQueries:
@@ -27,3 +30,31 @@ class MeasurementQueries:
         self.session.add(new_measurement)
         self.session.flush()
         return new_measurement
+
+    def get_with_sensor_readings(
+        self, start_time: datetime, end_time: datetime
+    ) -> list[MeasurementModel]:
+        """
+        指定した期間の測定日時を、センサ測定値とセンサーを含めて測定日時の順に取得する。
+
+        Args:
+            start_time (datetime): 期間の開始日時（この日時を含む）
+            end_time (datetime): 期間の終了日時（この日時を含まない）
+
+        Returns:
+            list[MeasurementModel]: 測定日時のリスト
+        """
+        return (
+            self.session.query(MeasurementModel)
+            .filter(
+                MeasurementModel.measurement_time >= start_time,
+                MeasurementModel.measurement_time < end_time,
+            )
+            .order_by(MeasurementModel.measurement_time)
+            .options(
+                selectinload(MeasurementModel.sensor_readings).joinedload(
+                    SensorReadingModel.sensor
+                )
+            )
+            .all()
+        )
@@ -1,6 +1,12 @@
+from collections.abc import Iterator
+
+from sqlalchemy import Row, select, update
 from sqlalchemy.orm import Session
 
+from models.measurement_model import MeasurementModel
 from models.pmv_model import PmvModel
+from models.sensor_model import SensorModel
+from models.sensor_reading_model import SensorReadingModel
 
 
 class PmvQueries:
@@ -63,3 +69,55 @@ class PmvQueries:
         self.session.add(new_pmv)
         self.session.flush()
         return new_pmv
+
+    def stream_with_sensor_readings(
+        self, after_measurement_id: int, yield_per: int
+    ) -> Iterator[Row]:
+        """
+        PMVと同じ測定のセンサ測定値を、測定IDの順にサーバーサイドカーソルで少しずつ取得する。
+
+        1行はPMVとセンサ測定値1件の組で、同じPMVの行は連続して返されます。
+
+        Args:
+            after_measurement_id (int): この測定IDより後の測定だけを取得する
+            yield_per (int): 1回にデータベースから受け取る行数
+
+        Returns:
+            Iterator[Row]: 測定ID、測定日時、PMVのID、保存されているPMVの各列、
+                センサーのカテゴリ、温度、湿度の行
+        """
+        statement = (
+            select(
+                MeasurementModel.id.label("measurement_id"),
+                MeasurementModel.measurement_time,
+                PmvModel.id.label("pmv_id"),
+                PmvModel.met,
+                PmvModel.relative_air_speed,
+                PmvModel.dynamic_clo,
+                PmvModel.pmv,
+                PmvModel.ppd,
+                PmvModel.wall_surface_temperature,
+                PmvModel.mean_radiant_temperature,
+                PmvModel.dry_bulb_temperature,
+                SensorModel.category,
+                SensorReadingModel.temperature,
+                SensorReadingModel.humidity,
+            )
+            .join(PmvModel, PmvModel.measurement_id == MeasurementModel.id)
+            .join(SensorReadingModel, SensorReadingModel.measurement_id == MeasurementModel.id)
+            .join(SensorModel, SensorModel.id == SensorReadingModel.sensor_id)
+            .where(MeasurementModel.id > after_measurement_id)
+            .order_by(MeasurementModel.id, PmvModel.id, SensorReadingModel.id)
+            .execution_options(yield_per=yield_per)
+        )
+        return iter(self.session.execute(statement))
+
+    def bulk_update(self, values: list[dict]):
+        """
+        複数のPMVを主キーでまとめて更新する。
+
+        Args:
+            values (list[dict]): 更新するPMVのidと更新する列の値の辞書のリスト
+        """
+        if values:
+            self.session.execute(update(PmvModel), values)
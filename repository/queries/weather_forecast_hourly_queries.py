@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Session
 
 from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
@@ -94,3 +96,38 @@ class WeatherForecastHourlyQueries:
             .first()                                                           # 最初のデータを取得
         )
 
+    def get_between(
+        self, start_time: datetime, end_time: datetime
+    ) -> list[WeatherForecastHourlyModel]:
+        """
+        指定した期間の天気予報を予報時刻の順に取得する。
+
+        Args:
+            start_time (datetime): 期間の開始日時（この日時を含む）
+            end_time (datetime): 期間の終了日時（この日時を含まない）
+
+        Returns:
+            list[WeatherForecastHourlyModel]: 天気予報のリスト
+        """
+        return (
+            self.session.query(WeatherForecastHourlyModel)
+            .filter(
+                WeatherForecastHourlyModel.forecast_time >= start_time,
+                WeatherForecastHourlyModel.forecast_time < end_time,
+            )
+            .order_by(WeatherForecastHourlyModel.forecast_time.asc())
+            .all()
+        )
+
+    def get_all(self) -> list[WeatherForecastHourlyModel]:
+        """
+        すべての天気予報を予報時刻の順に取得する。
+
+        Returns:
+            list[WeatherForecastHourlyModel]: 天気予報のリスト
+        """
+        return (
+            self.session.query(WeatherForecastHourlyModel)
+            .order_by(WeatherForecastHourlyModel.forecast_time.asc())
+            .all()
+        )
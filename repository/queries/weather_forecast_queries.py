@@ -47,3 +47,16 @@ class WeatherForecastQueries:
         return (
             self.session.query(WeatherForecastModel).filter_by(forecast_date=forecast_date).first()
         )
+
+    def get_all(self) -> list[WeatherForecastModel]:
+        """
+        すべての天気予報を予報日付の順に取得する。
+
+        Returns:
+            list[WeatherForecastModel]: 天気予報のインスタンスのリスト
+        """
+        return (
+            self.session.query(WeatherForecastModel)
+            .order_by(WeatherForecastModel.forecast_date)
+            .all()
+        )
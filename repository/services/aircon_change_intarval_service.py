@@ -3,6 +3,7 @@ from typing import Tuple
 
 from sqlalchemy.orm import Session
 
+from models.aircon_change_interval_model import AirconChangeIntervalModel
 from repository.queries.aircon_change_intarval_queries import AirconChangeIntervalQueries
 from shared.enums.aircon_mode import AirconMode
 from util.time_helper import TimeHelper
@@ -56,3 +57,12 @@ class AirconChangeIntarvalService:
             return None, None
 
         return aircon_change_interval.duration_minutes, aircon_change_interval.start_time
+
+    def get_all(self) -> list[AirconChangeIntervalModel]:
+        """
+        すべての最小運転時間の設定を取得します。
+
+        Returns:
+            list[AirconChangeIntervalModel]: 最小運転時間の設定のリスト
+        """
+        return self.query.get_all()
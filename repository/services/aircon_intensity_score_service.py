@@ -1,10 +1,7 @@
-from collections import defaultdict
 from datetime import date, datetime, timedelta
 
-from sqlalchemy import Tuple
 from sqlalchemy.orm import Session
 
-from models.aircon_setting_model import AirconSettingModel
 from repository.queries.aircon_intensity_score_queries import AirconIntensityScoreQueries
 from repository.services.aircon_setting_service import AirconSettingService
 from settings import LOCAL_TZ
@@ -54,57 +51,54 @@ class AirconIntensityScoreService:
         Returns:
             int: 指定日付の強度スコア。
         """
-        aircon_settings_service = AirconSettingService(self.session)
-        aircon_settings_list = aircon_settings_service.get_aircon_settings_by_date(date)
-
-        intensity_by_mode = defaultdict(float)  # 各モードの強度スコアを格納
-        last_setting: AirconSettingModel | None = None
-
-        for settings in aircon_settings_list:
-            created_at_str = settings.created_at.isoformat()
-            created_at_str = (
-                created_at_str.split(".")[0] + created_at_str[-6:]
-            )  # 秒以下の部分を切り捨て
-            current_time = datetime.fromisoformat(created_at_str)
-
-            if last_setting is not None:
-                # 前の設定の持続時間を計算
-                time_difference = (current_time - last_setting.created_at).total_seconds()
-                intensity_score = AirconIntensityCalculator.calculate_intensity(
-                    temperature=last_setting.temperature,
-                    mode_id=last_setting.mode_id,
-                    fan_speed_id=last_setting.fan_speed_id,
-                    power=last_setting.power,
-                )
-                intensity_by_mode[last_setting.mode_id] += intensity_score * time_difference
-
-            # 新しい設定を記録
-            last_setting = AirconSettingModel(
-                mode_id=settings.mode_id,
-                temperature=settings.temperature,
-                fan_speed_id=settings.fan_speed_id,
-                power=settings.power,
-                created_at=current_time,
-            )
-
-        # 最後の設定の持続時間を計算するかどうか
-        if calculate_last_duration and last_setting is not None:
-            end_of_day = datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(
-                tzinfo=LOCAL_TZ
-            )
-            time_difference = (end_of_day - last_setting.created_at).total_seconds()
-            intensity_score = AirconIntensityCalculator.calculate_intensity(
-                temperature=last_setting.temperature,
-                mode_id=last_setting.mode_id,
-                fan_speed_id=last_setting.fan_speed_id,
-                power=last_setting.power,
-            )
-            intensity_by_mode[last_setting.mode_id] += intensity_score * time_difference
-
-        # 全てのモードの強度スコアを合計
-        total_intensity = sum(intensity_by_mode.values())
-
-        return int(total_intensity)
+        return self.get_daily_aircon_intensities(date, date, calculate_last_duration)[date]
+
+    def get_daily_aircon_intensities(
+        self, start_date: str, end_date: str, calculate_last_duration: bool = True
+    ) -> dict[str, int]:
+        """
+        指定した期間の日ごとのエアコン設定の強度を、1回の取得と計算でまとめて計算します。
+
+        各日の設定の強度スコアに次の設定までの秒数を掛けて合計します。
+        各日の最後の設定は、calculate_last_durationがTrueの場合に23:59:59まで続くものとします。
+
+        Args:
+            start_date (str): YYYY-MM-DD形式の開始日。
+            end_date (str): YYYY-MM-DD形式の終了日（この日を含む）。
+            calculate_last_duration (bool): 各日の最後の設定の持続時間を計算するかどうか。
+
+        Returns:
+            dict[str, int]: 日付（YYYY-MM-DD）と強度スコア。
+        """
+        first_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        dates = [
+            (first_date + timedelta(days=days)).strftime("%Y-%m-%d")
+            for days in range((datetime.strptime(end_date, "%Y-%m-%d").date() - first_date).days + 1)
+        ]
+        # 各日の範囲はAirconSettingService.get_aircon_settings_by_dateと同じ
+        day_starts = [
+            datetime.strptime(f"{date} 00:00:00", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ).timestamp()
+            for date in dates
+        ]
+        day_ends = [
+            datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ).timestamp()
+            for date in dates
+        ]
+
+        rows = AirconSettingService(self.session).get_aircon_setting_values_by_date_range(
+            start_date, end_date
+        )
+        intensities = AirconIntensityCalculator.integrate_daily_intensity(
+            created_at=[row.created_at.timestamp() for row in rows],
+            temperature=[row.temperature for row in rows],
+            mode_id=[row.mode_id for row in rows],
+            fan_speed_id=[row.fan_speed_id for row in rows],
+            power=[row.power for row in rows],
+            day_starts=day_starts,
+            day_ends=day_ends,
+            calculate_last_duration=calculate_last_duration,
+        )
+        return {date: int(intensity) for date, intensity in zip(dates, intensities)}
 
     def get_aircon_intensity_scores(self, today: date) -> tuple[int, int, int, int, int]:
         """
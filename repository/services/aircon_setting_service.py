@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Tuple
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from models.aircon_setting_model import AirconSettingModel
@@ -80,3 +81,17 @@ class AirconSettingService:
         return self.query.get_aircon_settings_by_date(
             start_datetime.isoformat(), end_datetime.isoformat()
         )
+
+    def get_aircon_setting_values_by_date_range(self, start_date: str, end_date: str) -> list[Row]:
+        """
+        指定した期間のエアコン設定の値を、作成日時の順に取得するメソッド。
+
+        各日の範囲はget_aircon_settings_by_dateと同じです。
+
+        :param start_date: 開始日（例: "2024-12-01"）
+        :param end_date: 終了日（この日を含む。例: "2024-12-31"）
+        :return: 作成日時・温度・モードID・風量ID・電源の行のリスト
+        """
+        start_datetime = datetime.strptime(f"{start_date} 00:00:00", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ)
+        end_datetime = datetime.strptime(f"{end_date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ)
+        return self.query.get_aircon_setting_values_between(start_datetime, end_datetime)
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Tuple
+
 from sqlalchemy.orm import Session
 
 from models.circulator_setting_model import CirculatorSettingModel
@@ -56,3 +59,23 @@ class CirculatorSettingService:
             power=PowerMode[circulator_settings.power],
             fan_speed=circulator_settings.fan_speed,
         )
+
+    def get_latest_circulator_settings_with_time(
+        self,
+    ) -> Tuple[CirculatorSettings | None, datetime | None]:
+        """
+        最新のサーキュレーター設定情報と、その測定日時を取得します。
+
+        Returns:
+            Tuple[CirculatorSettings | None, datetime | None]: 最新のサーキュレーター設定情報と測定日時
+        """
+        circulator_settings = self.query.get_latest_circulator_settings()
+        if circulator_settings is None:
+            return None, None
+        return (
+            CirculatorSettings(
+                power=PowerMode[circulator_settings.power],
+                fan_speed=circulator_settings.fan_speed,
+            ),
+            circulator_settings.measurement.measurement_time,
+        )
@@ -66,6 +66,29 @@ class ElectricFanSettingService:
             rhythm=PowerMode[electric_fan_settings.rhythm],
         )
 
+    def get_latest_electric_fan_settings_with_time(
+        self,
+    ) -> Tuple[ElectricFanSettings | None, datetime | None]:
+        """
+        最新の扇風機の設定情報と、その測定日時を取得します。
+
+        Returns:
+            Tuple[ElectricFanSettings | None, datetime | None]: 最新の扇風機の設定情報と測定日時
+        """
+        electric_fan_settings = self.query.get_latest_electric_fan_settings()
+        if electric_fan_settings is None:
+            return None, None
+        return (
+            ElectricFanSettings(
+                power=PowerMode[electric_fan_settings.power],
+                fan_speed=electric_fan_settings.fan_speed,
+                swing=PowerMode[electric_fan_settings.swing],
+                vertical_swing=PowerMode[electric_fan_settings.vertical_swing],
+                rhythm=PowerMode[electric_fan_settings.rhythm],
+            ),
+            electric_fan_settings.measurement.measurement_time,
+        )
+
     def get_first_electric_fan_on_settings(
         self,
     ) -> Tuple[ElectricFanSettings | None, datetime | None]:
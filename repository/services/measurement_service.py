@@ -84,3 +84,18 @@ class MeasurementService:
 
         # 最後にMeasurementインスタンスを返す
         return measurement
+
+    def get_with_sensor_readings(
+        self, start_time: datetime, end_time: datetime
+    ) -> list[MeasurementModel]:
+        """
+        指定した期間の測定日時を、センサ測定値とセンサーを含めて測定日時の順に取得する
+
+        Args:
+            start_time (datetime): 期間の開始日時（この日時を含む）
+            end_time (datetime): 期間の終了日時（この日時を含まない）
+
+        Returns:
+            list[MeasurementModel]: 測定日時のリスト
+        """
+        return self.measurement_queries.get_with_sensor_readings(start_time, end_time)
@@ -1,3 +1,6 @@
+from collections.abc import Iterator
+
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from models.pmv_model import PmvModel
@@ -40,3 +43,27 @@ class PmvService:
             mean_radiant_temperature=pmv_result.mean_radiant_temperature,
             dry_bulb_temperature=pmv_result.dry_bulb_temperature,
         )
+
+    def stream_with_sensor_readings(
+        self, after_measurement_id: int = 0, yield_per: int = 1000
+    ) -> Iterator[Row]:
+        """
+        PMVと同じ測定のセンサ測定値を、測定IDの順に少しずつ取得する
+
+        Args:
+            after_measurement_id (int): この測定IDより後の測定だけを取得する
+            yield_per (int): 1回にデータベースから受け取る行数
+
+        Returns:
+            Iterator[Row]: PMVとセンサ測定値の組の行
+        """
+        return self.pmv_queries.stream_with_sensor_readings(after_measurement_id, yield_per)
+
+    def bulk_update(self, values: list[dict]):
+        """
+        再計算したPMVをまとめて更新する
+
+        Args:
+            values (list[dict]): 更新するPMVのidと更新する列の値の辞書のリスト
+        """
+        self.pmv_queries.bulk_update(values)
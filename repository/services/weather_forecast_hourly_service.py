@@ -83,3 +83,27 @@ class WeatherForecastHourlyService:
             WeatherForecastHourlyModel: 直近の天気予報
         """
         return self.query.get_closest_forecast_after(TimeHelper.get_current_time().isoformat())
+
+    def get_between(
+        self, start_time: datetime, end_time: datetime
+    ) -> list[WeatherForecastHourlyModel]:
+        """
+        指定した期間の天気予報を予報時刻の順に取得する。
+
+        Args:
+            start_time (datetime): 期間の開始日時（この日時を含む）
+            end_time (datetime): 期間の終了日時（この日時を含まない）
+
+        Returns:
+            list[WeatherForecastHourlyModel]: 天気予報のリスト
+        """
+        return self.query.get_between(start_time, end_time)
+
+    def get_all(self) -> list[WeatherForecastHourlyModel]:
+        """
+        すべての天気予報を予報時刻の順に取得する。
+
+        Returns:
+            list[WeatherForecastHourlyModel]: 天気予報のリスト
+        """
+        return self.query.get_all()
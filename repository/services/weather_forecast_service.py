@@ -1,10 +1,11 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy.orm import Session
 
 from api.weather_foreecast.weather_forecast_factory import WeatherForecastFactory
 from repository.queries.weather_forecast_queries import WeatherForecastQueries
 from repository.services.weather_forecast_hourly_service import WeatherForecastHourlyService
+from settings import LOCAL_TZ
 from shared.dataclass.weather_date import WeatherDate
 from util.time_helper import TimeHelper
 
@@ -40,6 +41,18 @@ class WeatherForecastService:
         # 取得できた場合は、その値を返す
         return result.max_temperature  # 最高気温の値を返す
 
+    def get_max_temperatures_by_date(self) -> dict[date, float]:
+        """
+        保存されているすべての日の最高気温を日付ごとに取得します。
+
+        Returns:
+            dict[date, float]: 現地時刻の日付と最高気温の辞書
+        """
+        return {
+            result.forecast_date.astimezone(LOCAL_TZ).date(): result.max_temperature
+            for result in self.query.get_all()
+        }
+
     def upsert_with_hourly(self, start_date: datetime):
         """
         今日の最高気温と最低気温を取得し、存在しない場合は新たに挿入します。
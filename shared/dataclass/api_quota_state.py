@@ -0,0 +1,30 @@
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+from shared.dataclass.cached_air_quality import CachedAirQuality
+
+
+class ApiQuotaState(BaseModel):
+    """
+    SwitchBot APIの呼び出し回数と、センサーから最後に読み取った値を表すPydanticモデル。
+
+    Attributes:
+        budget_date (date): 呼び出し回数を数えている日付。
+        calls (dict[str, int]): 「デバイス/エンドポイント/結果」ごとのその日の呼び出し回数。
+        slot_calls (list[int]): その日の10分ごとの呼び出し回数。
+        readings (dict[str, CachedAirQuality]): センサーIDごとの最後に読み取った値。
+    """
+
+    budget_date: date = Field(..., description="呼び出し回数を数えている日付")
+    """呼び出し回数を数えている日付"""
+    calls: dict[str, int] = Field(default_factory=dict, description="その日の呼び出し回数")
+    """「デバイス/エンドポイント/結果」ごとのその日の呼び出し回数"""
+    slot_calls: list[int] = Field(
+        default_factory=lambda: [0] * 144, description="10分ごとの呼び出し回数"
+    )
+    """その日の10分ごとの呼び出し回数（日末の呼び出し回数の見込みに使う）"""
+    readings: dict[str, CachedAirQuality] = Field(
+        default_factory=dict, description="センサーごとの最後に読み取った値"
+    )
+    """センサーIDごとの最後に読み取った値（日付が変わっても残す）"""
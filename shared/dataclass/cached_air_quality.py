@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from shared.dataclass.air_quality import AirQuality
+
+
+class CachedAirQuality(BaseModel):
+    """
+    センサーから最後に読み取った空気の質と、読み取った日時を表すPydanticモデル。
+
+    Attributes:
+        air_quality (AirQuality): 読み取った空気の質。
+        read_at (datetime): 読み取った日時。
+    """
+
+    air_quality: AirQuality = Field(..., description="読み取った空気の質")
+    """読み取った空気の質"""
+    read_at: datetime = Field(..., description="読み取った日時")
+    """読み取った日時"""
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from shared.dataclass.air_quality import AirQuality
+
+
+class ControlSnapshot(BaseModel):
+    """
+    制御を実行するかどうかの判定に使う、ある時点の測定値を表すPydanticモデル。
+
+    Attributes:
+        measured_at (datetime): 測定した日時。
+        air_qualities (dict[str, AirQuality]): センサーのIDごとの空気質情報。
+        forecast_time (datetime | None): 最も近い未来の天気予報の時刻。
+        active_windows (list[str]): 有効な時間帯の名前。
+    """
+
+    measured_at: datetime = Field(..., description="測定した日時")
+    """測定した日時"""
+    air_qualities: dict[str, AirQuality] = Field(..., description="センサーのIDごとの空気質情報")
+    """センサーのIDごとの空気質情報"""
+    forecast_time: datetime | None = Field(default=None, description="最も近い未来の天気予報の時刻")
+    """最も近い未来の天気予報の時刻"""
+    active_windows: list[str] = Field(default_factory=list, description="有効な時間帯の名前")
+    """有効な時間帯の名前（WeeklyCalendarの時間帯の名前）"""
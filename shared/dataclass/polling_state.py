@@ -0,0 +1,33 @@
+from datetime import date, datetime
+
+from pydantic import BaseModel, Field
+
+
+class PollingState(BaseModel):
+    """
+    実行間隔の決定に使う、前回実行した時点の状態を表すPydanticモデル。
+
+    Attributes:
+        measured_at (datetime): 前回測定した日時。
+        temperature (float): 前回測定したメインセンサーの温度。
+        pmv (float | None): 前回計算したPMV。
+        pmv_measured_at (datetime | None): PMVを計算した日時。
+        next_run_at (datetime): 次に実行する日時。
+        budget_date (date): API呼び出し回数を数えている日付。
+        api_calls (int): その日のAPI呼び出し回数。
+    """
+
+    measured_at: datetime = Field(..., description="前回測定した日時")
+    """前回測定した日時"""
+    temperature: float = Field(..., description="前回測定したメインセンサーの温度")
+    """前回測定したメインセンサーの温度"""
+    pmv: float | None = Field(default=None, description="前回計算したPMV")
+    """前回計算したPMV（計算を省略した場合はそれより前の値）"""
+    pmv_measured_at: datetime | None = Field(default=None, description="PMVを計算した日時")
+    """pmvを計算した日時（計算を省略したサイクルでは更新しない）"""
+    next_run_at: datetime = Field(..., description="次に実行する日時")
+    """次に実行する日時"""
+    budget_date: date = Field(..., description="API呼び出し回数を数えている日付")
+    """API呼び出し回数を数えている日付"""
+    api_calls: int = Field(default=0, description="その日のAPI呼び出し回数")
+    """その日のAPI呼び出し回数（見込み）"""
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+
+
+class PreferenceSweepResult(BaseModel):
+    """
+    設定の候補を記録したデータで評価した結果を表すPydanticモデル。
+
+    Attributes:
+        overrides (dict[str, float | str]): 変更した設定のパスと値。
+        command_counts (dict[str, int]): コマンド名ごとの送信回数。
+        command_count (int): 送信したコマンドの合計回数。
+        outside_comfort_hours (float): PMVが快適範囲の外にあった時間（時間）。
+        aircon_intensity_score (float): 1日あたりのエアコン強度スコアの平均。
+    """
+
+    overrides: dict[str, float | str] = Field(..., description="変更した設定のパスと値")
+    """変更した設定のパスと値"""
+    command_counts: dict[str, int] = Field(..., description="コマンド名ごとの送信回数")
+    """コマンド名ごとの送信回数"""
+    command_count: int = Field(..., description="送信したコマンドの合計回数")
+    """送信したコマンドの合計回数"""
+    outside_comfort_hours: float = Field(..., description="PMVが快適範囲の外にあった時間")
+    """PMVが快適範囲の外にあった時間（時間）"""
+    aircon_intensity_score: float = Field(..., description="1日あたりのエアコン強度スコア")
+    """1日あたりのエアコン強度スコアの平均"""
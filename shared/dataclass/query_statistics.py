@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+
+
+class QueryStatistics(BaseModel):
+    """
+    同じSQL文の実行回数と所要時間を表すPydanticモデル。
+
+    Attributes:
+        statement (str): SQL文（パラメータはプレースホルダーのまま）。
+        count (int): 実行回数。
+        duplicate_count (int): 前に実行したものと同じパラメータで実行した回数。
+        total_seconds (float): 所要時間の合計（秒）。
+        max_seconds (float): 最も長かった所要時間（秒）。
+    """
+
+    statement: str = Field(..., description="SQL文")
+    """SQL文（パラメータはプレースホルダーのまま）"""
+    count: int = Field(default=0, description="実行回数")
+    """実行回数"""
+    duplicate_count: int = Field(default=0, description="同じパラメータで実行した回数")
+    """前に実行したものと同じパラメータで実行した回数"""
+    total_seconds: float = Field(default=0.0, description="所要時間の合計（秒）")
+    """所要時間の合計（秒）"""
+    max_seconds: float = Field(default=0.0, description="最も長かった所要時間（秒）")
+    """最も長かった所要時間（秒）"""
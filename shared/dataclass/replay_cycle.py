@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from shared.dataclass.home_sensor import HomeSensor
+
+
+class ReplayCycle(BaseModel):
+    """
+    再生する1回分の制御サイクルの入力を表すPydanticモデル。
+
+    Attributes:
+        measurement_time (datetime): 測定日時（現地時刻）。
+        home_sensor (HomeSensor): 記録したセンサーの測定値。
+    """
+
+    measurement_time: datetime = Field(..., description="測定日時")
+    """測定日時"""
+    home_sensor: HomeSensor = Field(..., description="記録したセンサーの測定値")
+    """記録したセンサーの測定値"""
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.circulator_settings import CirculatorSettings
+from shared.dataclass.comfort_factors import ComfortFactors
+from shared.dataclass.electric_fan_settings import ElectricFanSettings
+from shared.dataclass.pmv_result import PMVResult
+
+
+class ReplayDecision(BaseModel):
+    """
+    再生した1回分の制御サイクルの判断結果を表すPydanticモデル。
+
+    Attributes:
+        measurement_time (datetime): 測定日時。
+        comfort_factors (ComfortFactors): 計算したMETとCLO。
+        pmv_result (PMVResult): PMV計算結果。
+        aircon_settings (AirconSettings): 判断したエアコンの設定。
+        circulator_settings (CirculatorSettings): 判断したサーキュレーターの設定。
+        electric_fan_settings (ElectricFanSettings): 判断した扇風機の設定。
+    """
+
+    measurement_time: datetime = Field(..., description="測定日時")
+    """測定日時"""
+    comfort_factors: ComfortFactors = Field(..., description="計算したMETとCLO")
+    """計算したMETとCLO"""
+    pmv_result: PMVResult = Field(..., description="PMV計算結果")
+    """PMV計算結果"""
+    aircon_settings: AirconSettings = Field(..., description="判断したエアコンの設定")
+    """判断したエアコンの設定"""
+    circulator_settings: CirculatorSettings = Field(..., description="判断したサーキュレーターの設定")
+    """判断したサーキュレーターの設定"""
+    electric_fan_settings: ElectricFanSettings = Field(..., description="判断した扇風機の設定")
+    """判断した扇風機の設定"""
@@ -0,0 +1,64 @@
+from pydantic import BaseModel, Field
+
+from shared.dataclass.home_sensor import HomeSensor
+
+
+class SensorFeatures(BaseModel):
+    """
+    エアコンの設定の判断に使うセンサー測定値の集計値を表すPydanticモデル。
+
+    HomeSensorのプロパティは呼び出すたびに計算するため、1回の制御サイクルで1度だけ集計します。
+
+    Attributes:
+        main_temperature (float): メインセンサーの温度。
+        outdoor_temperature (float | None): 屋外センサーの温度。
+        average_indoor_humidity (float): 室内の平均湿度。
+        average_indoor_absolute_humidity (float): 室内の平均絶対湿度。
+        indoor_dew_point (float): 室内の露点温度。
+        main_co2_level (int | None): メインセンサーのCO2濃度。
+        max_temperature_difference (float): メインセンサーと補助センサーの温度差の最大値。
+    """
+
+    main_temperature: float = Field(..., description="メインセンサーの温度")
+    """メインセンサーの温度"""
+    outdoor_temperature: float | None = Field(..., description="屋外センサーの温度")
+    """屋外センサーの温度"""
+    average_indoor_humidity: float = Field(..., description="室内の平均湿度")
+    """室内の平均湿度"""
+    average_indoor_absolute_humidity: float = Field(..., description="室内の平均絶対湿度")
+    """室内の平均絶対湿度"""
+    indoor_dew_point: float = Field(..., description="室内の露点温度")
+    """室内の露点温度"""
+    main_co2_level: int | None = Field(..., description="メインセンサーのCO2濃度")
+    """メインセンサーのCO2濃度"""
+    max_temperature_difference: float = Field(
+        ..., description="メインセンサーと補助センサーの温度差の最大値"
+    )
+    """メインセンサーと補助センサーの温度差の最大値"""
+
+    @staticmethod
+    def from_home_sensor(home_sensor: HomeSensor) -> "SensorFeatures":
+        """
+        HomeSensorから集計値を作成するメソッド。
+
+        Args:
+            home_sensor (HomeSensor): 家のセンサー測定値
+
+        Returns:
+            SensorFeatures: 集計値
+        """
+        main_temperature = home_sensor.main.air_quality.temperature
+        return SensorFeatures(
+            main_temperature=main_temperature,
+            outdoor_temperature=(
+                home_sensor.outdoor.air_quality.temperature if home_sensor.outdoor else None
+            ),
+            average_indoor_humidity=home_sensor.average_indoor_humidity,
+            average_indoor_absolute_humidity=home_sensor.average_indoor_absolute_humidity,
+            indoor_dew_point=home_sensor.indoor_dew_point,
+            main_co2_level=home_sensor.main_co2_level,
+            max_temperature_difference=max(
+                abs(main_temperature - sup.air_quality.temperature)
+                for sup in home_sensor.supplementaries
+            ),
+        )
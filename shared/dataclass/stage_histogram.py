@@ -0,0 +1,27 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class StageHistogram(BaseModel):
+    """
+    制御サイクルの1つの処理の所要時間のヒストグラムを表すPydanticモデル。
+
+    Attributes:
+        stage (str): 処理の名前。
+        target (str): 処理の対象（センサーやコマンドの名前）。対象を区別しない場合は空文字列。
+        bucket_counts (List[int]): バケットごとの観測回数（累積しない）。末尾は最後の上限を超えた回数。
+        sum (float): 所要時間の合計（秒）。
+        count (int): 観測回数。
+    """
+
+    stage: str = Field(..., description="処理の名前")
+    """処理の名前"""
+    target: str = Field(default="", description="処理の対象")
+    """処理の対象（センサーやコマンドの名前）。対象を区別しない場合は空文字列"""
+    bucket_counts: List[int] = Field(..., description="バケットごとの観測回数")
+    """バケットごとの観測回数（累積しない）。末尾は最後の上限を超えた回数"""
+    sum: float = Field(default=0.0, description="所要時間の合計（秒）")
+    """所要時間の合計（秒）"""
+    count: int = Field(default=0, description="観測回数")
+    """観測回数"""
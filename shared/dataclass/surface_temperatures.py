@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class SurfaceTemperatures(BaseModel):
+    """
+    室内の各表面の温度を表すPydanticモデル。
+
+    Attributes:
+        wall (float): 壁の内部表面温度。
+        ceiling (float): 天井の内部表面温度。
+        floor (float): 床の内部表面温度。
+        updated_at (datetime): 温度を計算した日時。
+    """
+
+    wall: float = Field(..., description="壁の内部表面温度")
+    """壁の内部表面温度"""
+    ceiling: float = Field(..., description="天井の内部表面温度")
+    """天井の内部表面温度"""
+    floor: float = Field(..., description="床の内部表面温度")
+    """床の内部表面温度"""
+    updated_at: datetime = Field(..., description="温度を計算した日時")
+    """温度を計算した日時"""
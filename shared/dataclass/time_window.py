@@ -0,0 +1,27 @@
+from datetime import time
+
+from pydantic import BaseModel, Field
+
+
+class TimeWindow(BaseModel):
+    """
+    毎週繰り返す時間帯を表すPydanticモデル。
+
+    Attributes:
+        name (str): 時間帯の名前（例: "meal.lunch"）。
+        weekdays (list[int]): 時間帯が有効な曜日（月曜日が0）。
+        start_time (time): 開始時刻（この時刻を含む）。
+        end_time (time): 終了時刻。
+        include_end (bool): 終了時刻を含むかどうか。
+    """
+
+    name: str = Field(..., description="時間帯の名前")
+    """時間帯の名前（例: "meal.lunch"）"""
+    weekdays: list[int] = Field(default_factory=lambda: list(range(7)), description="有効な曜日")
+    """時間帯が有効な曜日（月曜日が0）"""
+    start_time: time = Field(..., description="開始時刻")
+    """開始時刻（この時刻を含む）"""
+    end_time: time = Field(..., description="終了時刻")
+    """終了時刻"""
+    include_end: bool = Field(default=True, description="終了時刻を含むかどうか")
+    """終了時刻を含むかどうか"""
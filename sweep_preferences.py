@@ -0,0 +1,98 @@
+# 設定の候補を記録したデータで評価するスクリプト
+# 実行方法: python sweep_preferences.py --start 2024-07-01 --end 2024-08-01 \
+#     --grid aircon_preference.conditional.circulator_threshold=1.5,2,2.5 \
+#     [--random aircon_preference.conditional.summer_condensation.dew_point_margin=0:2 --samples 100] \
+#     [--workers 8] [--output data/sweep.csv]
+#
+# --gridの値はすべての組み合わせを、--randomの範囲は--samplesの数だけ無作為に選んだ値を評価します。
+# --gridと--randomを両方指定した場合は、グリッドの各組み合わせに無作為の値を加えます。
+import argparse
+import csv
+import time
+
+from replay import parse_date
+from util.preference_sweep import PreferenceSweep
+from util.replay_engine import ReplayEngine
+
+
+def parse_value(value: str) -> float | str:
+    # 数値に変換できる値は数値として扱う
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_parameters(values: list[str], separator: str) -> dict:
+    # "パス=値"の形式の引数を辞書に変換する
+    parameters = {}
+    for value in values:
+        path, _, candidates = value.partition("=")
+        if separator == ":":
+            minimum, maximum = candidates.split(":")
+            parameters[path] = (float(minimum), float(maximum))
+        else:
+            parameters[path] = [parse_value(candidate) for candidate in candidates.split(",")]
+    return parameters
+
+
+def create_variants(args: argparse.Namespace) -> list[dict]:
+    grid = PreferenceSweep.grid(parse_parameters(args.grid, ","))
+    if not args.random:
+        return grid
+    samples = PreferenceSweep.sample(
+        parse_parameters(args.random, ":"), args.samples, seed=args.seed
+    )
+    return [{**variant, **sample} for variant in grid for sample in samples]
+
+
+def write_results(results, path: str):
+    # 候補ごとの評価結果をCSVに書き出す
+    paths = list(results[0].overrides)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            [*paths, "command_count", "outside_comfort_hours", "aircon_intensity_score"]
+        )
+        for result in results:
+            writer.writerow(
+                [
+                    *(result.overrides[path] for path in paths),
+                    result.command_count,
+                    round(result.outside_comfort_hours, 2),
+                    round(result.aircon_intensity_score),
+                ]
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="設定の候補を記録したデータで評価します")
+    parser.add_argument("--start", type=parse_date, required=True, help="開始日（YYYY-MM-DD）")
+    parser.add_argument("--end", type=parse_date, required=True, help="終了日（YYYY-MM-DD、含まない）")
+    parser.add_argument("--grid", action="append", default=[], help="パス=値1,値2,...")
+    parser.add_argument("--random", action="append", default=[], help="パス=最小値:最大値")
+    parser.add_argument("--samples", type=int, default=100, help="無作為に選ぶ候補の数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="ワーカープロセスの数（省略時はCPUのコア数）")
+    parser.add_argument("--output", help="評価結果を書き出すCSVファイル")
+    args = parser.parse_args()
+
+    variants = create_variants(args)
+    start = time.perf_counter()
+    sweep = PreferenceSweep(
+        ReplayEngine.load_from_database(args.start, args.end), max_workers=args.workers
+    )
+    print(f"{len(variants)}件の候補を{sweep.max_workers}プロセスで評価します", flush=True)
+    results = sweep.run(variants)
+    print(f"評価が完了しました（{time.perf_counter() - start:.1f}秒）")
+
+    # 快適範囲の外にあった時間が短い順に表示
+    for result in sorted(results, key=lambda result: result.outside_comfort_hours)[:10]:
+        print(
+            f"{result.overrides}: コマンド {result.command_count}回, "
+            f"快適範囲外 {result.outside_comfort_hours:.1f}時間, "
+            f"エアコン強度 {result.aircon_intensity_score:.0f}/日"
+        )
+    if args.output:
+        write_results(results, args.output)
+        print(f"評価結果を{args.output}に書き出しました")
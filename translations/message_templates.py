@@ -0,0 +1,207 @@
+import json
+import os
+
+import i18n
+import yaml
+from i18n.formatters import TranslationFormatter
+
+
+class _Arguments(dict):
+    """テンプレートに埋め込むデータ。ないプレースホルダーはi18nと同じくそのまま残す。"""
+
+    def __missing__(self, key: str) -> str:
+        # "%name"の形のプレースホルダーは、フィールド名に"%"を付けて区別している
+        if key.startswith("%"):
+            name = key[1:]
+            return self[name] if name in self else key
+        return f"%{{{key}}}"
+
+
+class MessageTemplates:
+    """
+    翻訳ファイルのメッセージを、あらかじめstr.formatのテンプレートに変換して使うクラス。
+
+    i18n.tはメッセージごとに正規表現でプレースホルダーを置き換えるため、1回の実行で多くのログを
+    出力すると時間がかかります。このクラスは翻訳ファイルのすべてのメッセージを最初に1回だけ変換し、
+    変換結果をファイルに保存して次回からはそれを読み込みます（翻訳ファイルを更新した場合は変換し直す）。
+    関数を呼び出すプレースホルダーや複数形など、変換できないメッセージと、ないキーはi18n.tで翻訳します。
+    """
+
+    CACHE_PATH = "data/message_templates.json"
+    """変換したテンプレートを保存するファイルのパス（build_message_templates.pyでも生成）"""
+
+    _FILE_VERSION = 1
+    """変換したテンプレートを保存するファイルの形式のバージョン"""
+
+    _locale: str | None = None
+    """変換したテンプレートのロケール"""
+
+    _templates: dict[str, str] = {}
+    """キーごとの変換したテンプレート"""
+
+    @staticmethod
+    def translate(key: str, **kwargs) -> str:
+        """
+        キーのメッセージにデータを埋め込んで返すメソッド。
+
+        Args:
+            key (str): 翻訳ファイルのキー（例: "log.polling.next_run"）
+            **kwargs: テンプレートに埋め込むデータ
+
+        Returns:
+            str: 翻訳したメッセージ。キーがない場合はi18n.tと同じくキーを返す
+        """
+        locale = i18n.config.get("locale")
+        if locale != MessageTemplates._locale:
+            MessageTemplates._templates = MessageTemplates.load(MessageTemplates.CACHE_PATH, locale)
+            MessageTemplates._locale = locale
+        template = MessageTemplates._templates.get(key)
+        if template is None:
+            return i18n.t(key, **kwargs)
+        return template.format_map(_Arguments(kwargs))
+
+    @staticmethod
+    def load(path: str, locale: str) -> dict[str, str]:
+        """
+        保存したテンプレートを読み込むメソッド。
+
+        保存したファイルがない場合や、翻訳ファイルが保存したときから変わっている場合は、
+        翻訳ファイルから変換して保存します。
+
+        Args:
+            path (str): 変換したテンプレートを保存するファイルのパス
+            locale (str): ロケール
+
+        Returns:
+            dict[str, str]: キーごとの変換したテンプレート
+        """
+        sources = MessageTemplates._list_sources(locale)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                data.get("version") == MessageTemplates._FILE_VERSION
+                and data.get("locale") == locale
+                and data.get("sources") == sources
+            ):
+                return data["templates"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        return MessageTemplates.build(path, locale)
+
+    @staticmethod
+    def build(path: str, locale: str) -> dict[str, str]:
+        """
+        翻訳ファイルのメッセージを変換して保存するメソッド。
+
+        Args:
+            path (str): 変換したテンプレートを保存するファイルのパス
+            locale (str): ロケール
+
+        Returns:
+            dict[str, str]: キーごとの変換したテンプレート
+        """
+        sources = MessageTemplates._list_sources(locale)
+        templates = MessageTemplates.compile(locale)
+        MessageTemplates.save(path, locale, sources, templates)
+        return templates
+
+    @staticmethod
+    def compile(locale: str) -> dict[str, str]:
+        """
+        翻訳ファイルのすべてのメッセージをstr.formatのテンプレートに変換するメソッド。
+
+        Args:
+            locale (str): ロケール
+
+        Returns:
+            dict[str, str]: キーごとの変換したテンプレート（変換できないメッセージは含まない）
+        """
+        templates: dict[str, str] = {}
+        for filename in MessageTemplates._list_sources(locale):
+            namespace = os.path.basename(filename).split(".")[0]
+            with open(filename, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            if not i18n.config.get("skip_locale_root_data"):
+                data = data.get(locale) or {}
+            MessageTemplates._compile_messages(namespace, data, templates)
+        return templates
+
+    @staticmethod
+    def _compile_messages(prefix: str, messages: dict, templates: dict[str, str]):
+        """入れ子になったメッセージを、キーを"."でつないで変換するメソッド。"""
+        for name, message in messages.items():
+            key = f"{prefix}.{name}"
+            if isinstance(message, dict):
+                MessageTemplates._compile_messages(key, message, templates)
+            elif isinstance(message, str):
+                template = MessageTemplates.compile_message(message)
+                if template is not None:
+                    templates[key] = template
+
+    @staticmethod
+    def compile_message(message: str) -> str | None:
+        """
+        i18nのメッセージをstr.formatのテンプレートに変換するメソッド。
+
+        "%{name}"は"{name!s}"に、"%name"は"{%name!s}"に、"%%"は"%"にし、それ以外の"{"と"}"はエスケープします。
+
+        Args:
+            message (str): i18nのメッセージ
+
+        Returns:
+            str | None: 変換したテンプレート。関数を呼び出すプレースホルダーなど、変換できない場合はNone
+        """
+        parts = []
+        position = 0
+        for match in TranslationFormatter.pattern.finditer(message):
+            parts.append(message[position : match.start()].replace("{", "{{").replace("}", "}}"))
+            position = match.end()
+            name = match.group("braced")
+            named = match.group("named")
+            if name is not None or named is not None:
+                if "(" in (name or named):
+                    return None
+                parts.append(f"{{{name}!s}}" if name is not None else f"{{%{named}!s}}")
+            elif match.group("escaped") is not None:
+                parts.append(TranslationFormatter.delimiter)
+            else:
+                return None
+        parts.append(message[position:].replace("{", "{{").replace("}", "}}"))
+        return "".join(parts)
+
+    @staticmethod
+    def _list_sources(locale: str) -> dict[str, int]:
+        """ロケールの翻訳ファイルと、その更新日時（ナノ秒）を返すメソッド。"""
+        suffix = f".{locale}.{i18n.config.get('file_format')}"
+        sources = {}
+        for directory in i18n.load_path:
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(suffix):
+                    path = os.path.join(directory, name)
+                    sources[path] = os.stat(path).st_mtime_ns
+        return sources
+
+    @staticmethod
+    def save(path: str, locale: str, sources: dict[str, int], templates: dict[str, str]):
+        """変換したテンプレートをファイルに保存するメソッド。保存できない場合は保存しません。"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": MessageTemplates._FILE_VERSION,
+                        "locale": locale,
+                        "sources": sources,
+                        "templates": templates,
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(temporary_path, path)
+        except OSError:
+            pass
@@ -1,3 +1,5 @@
+import numpy as np
+
 from shared.enums.aircon_fan_speed import AirconFanSpeed
 from shared.enums.aircon_mode import AirconMode
 from shared.enums.power_mode import PowerMode
@@ -56,3 +58,138 @@ class AirconIntensityCalculator:
             mode_score = 0
 
         return temp_score + fan_score + mode_score
+
+    TEMPERATURE_LEVELS = (24, 25, 26, 27, 28)
+    """温度スコアの区分（24以下、25、26、27、それ以外）を代表する温度"""
+
+    _score_table: np.ndarray | None = None
+
+    @staticmethod
+    def get_score_table() -> np.ndarray:
+        """
+        モード・風量・温度の区分・電源ごとの強度スコアの表を返すメソッド。
+
+        表はcalculate_intensityで作成するため、calculate_intensityと同じスコアになります。
+        モードと風量の番号が表にない場合は、番号0の行（該当なし）を使います。
+
+        Returns:
+            np.ndarray: [モードID, 風量ID, 温度の区分, 電源がオフかどうか]の強度スコア
+        """
+        if AirconIntensityCalculator._score_table is None:
+            mode_ids = range(max(mode.id for mode in AirconMode) + 1)
+            fan_speed_ids = range(max(fan_speed.id for fan_speed in AirconFanSpeed) + 1)
+            AirconIntensityCalculator._score_table = np.array(
+                [
+                    [
+                        [
+                            [
+                                AirconIntensityCalculator.calculate_intensity(
+                                    temperature, mode_id, fan_speed_id, power
+                                )
+                                for power in (None, PowerMode.OFF.id)
+                            ]
+                            for temperature in AirconIntensityCalculator.TEMPERATURE_LEVELS
+                        ]
+                        for fan_speed_id in fan_speed_ids
+                    ]
+                    for mode_id in mode_ids
+                ],
+                dtype=np.int64,
+            )
+        return AirconIntensityCalculator._score_table
+
+    @staticmethod
+    def calculate_intensity_array(
+        temperature: np.ndarray, mode_id: np.ndarray, fan_speed_id: np.ndarray, power: np.ndarray
+    ) -> np.ndarray:
+        """
+        複数の設定の強度スコアを、calculate_intensityと同じ値でまとめて計算するメソッド。
+
+        Args:
+            temperature (np.ndarray): 設定温度
+            mode_id (np.ndarray): モードID
+            fan_speed_id (np.ndarray): 風量ID
+            power (np.ndarray): 電源（calculate_intensityと同じくPowerMode.OFF.idと比較）
+
+        Returns:
+            np.ndarray: 強度スコア（int64）
+        """
+        table = AirconIntensityCalculator.get_score_table()
+        temperature = np.asarray(temperature, dtype=float)
+        mode_id = np.asarray(mode_id, dtype=np.int64)
+        fan_speed_id = np.asarray(fan_speed_id, dtype=np.int64)
+
+        # 温度の区分: 24以下、25、26、27、それ以外（小数を含む）
+        temperature_level = np.select(
+            [temperature <= 24, temperature == 25, temperature == 26, temperature == 27],
+            [0, 1, 2, 3],
+            default=4,
+        )
+        mode_index = np.where((mode_id >= 0) & (mode_id < table.shape[0]), mode_id, 0)
+        fan_speed_index = np.where(
+            (fan_speed_id >= 0) & (fan_speed_id < table.shape[1]), fan_speed_id, 0
+        )
+        is_off = np.asarray(power, dtype=object) == PowerMode.OFF.id
+        return table[mode_index, fan_speed_index, temperature_level, is_off.astype(np.int64)]
+
+    @staticmethod
+    def integrate_daily_intensity(
+        created_at: np.ndarray,
+        temperature: np.ndarray,
+        mode_id: np.ndarray,
+        fan_speed_id: np.ndarray,
+        power: np.ndarray,
+        day_starts: np.ndarray,
+        day_ends: np.ndarray,
+        calculate_last_duration: bool = True,
+    ) -> np.ndarray:
+        """
+        エアコン設定の強度スコアを、次の設定までの秒数で日ごとに積算するメソッド。
+
+        作成日時は秒以下を切り捨てます。各日の最後の設定は、calculate_last_durationがTrueの場合に
+        その日の終了日時まで続くものとして積算します。期間の外の設定は無視します。
+
+        Args:
+            created_at (np.ndarray): 設定の作成日時のUNIX時間（昇順）
+            temperature (np.ndarray): 設定温度
+            mode_id (np.ndarray): モードID
+            fan_speed_id (np.ndarray): 風量ID
+            power (np.ndarray): 電源
+            day_starts (np.ndarray): 各日の開始日時のUNIX時間（昇順、この日時を含む）
+            day_ends (np.ndarray): 各日の終了日時のUNIX時間（この日時を含まない）
+            calculate_last_duration (bool): 各日の最後の設定の持続時間を計算するかどうか
+
+        Returns:
+            np.ndarray: 日ごとの強度スコア（int64）
+        """
+        created_at = np.asarray(created_at, dtype=float)
+        day_starts = np.asarray(day_starts, dtype=float)
+        day_ends = np.asarray(day_ends, dtype=float)
+        totals = np.zeros(len(day_starts), dtype=np.int64)
+        if len(created_at) == 0 or len(day_starts) == 0:
+            return totals
+
+        # 各設定が含まれる日を求め、どの日にも含まれない設定を除く
+        day = np.searchsorted(day_starts, created_at, side="right") - 1
+        in_day = (day >= 0) & (created_at < day_ends[np.maximum(day, 0)])
+        day = day[in_day]
+        if len(day) == 0:
+            return totals
+        seconds = np.floor(created_at[in_day]).astype(np.int64)
+        scores = AirconIntensityCalculator.calculate_intensity_array(
+            np.asarray(temperature)[in_day],
+            np.asarray(mode_id)[in_day],
+            np.asarray(fan_speed_id)[in_day],
+            np.asarray(power, dtype=object)[in_day],
+        )
+
+        # 同じ日の次の設定までの秒数
+        same_day = day[1:] == day[:-1]
+        durations = np.zeros(len(day), dtype=np.int64)
+        durations[:-1] = np.where(same_day, seconds[1:] - seconds[:-1], 0)
+        if calculate_last_duration:
+            is_last = np.append(~same_day, True)
+            durations[is_last] = day_ends[day[is_last]].astype(np.int64) - seconds[is_last]
+
+        np.add.at(totals, day, scores * durations)
+        return totals
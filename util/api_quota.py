@@ -0,0 +1,224 @@
+import json
+import math
+import os
+from datetime import date, datetime, timedelta
+
+from logger.system_event_logger import SystemEventLogger
+from settings import app_preference
+from shared.dataclass.air_quality import AirQuality
+from shared.dataclass.api_quota_state import ApiQuotaState
+from shared.dataclass.cached_air_quality import CachedAirQuality
+from util.time_helper import TimeHelper
+
+
+class ApiQuota:
+    """
+    SwitchBot APIの呼び出し回数を記録し、その日の上限を超えそうかどうかを判定するクラス。
+
+    呼び出しは「デバイス:エンドポイント:結果」ごとに数え、リトライや風量の段階的な変更も
+    1回ずつ記録します。日末の呼び出し回数は、直近の呼び出しの速さがその日の終わりまで
+    続くものとして見込みます。見込みが1日の上限（polling.daily_api_budget）を超える場合、
+    メイン以外のセンサーの測定値を使い回し、サーキュレーターと扇風機の設定を変更しません。
+    記録しない設定の場合、record_callは何もせず、is_degradedは常にFalseを返します。
+    """
+
+    SLOT_MINUTES = 10
+    """呼び出し回数を数える時間の区切り（分）"""
+
+    _FILE_VERSION = 1
+    """状態を保存するファイルの形式のバージョン"""
+
+    _state: ApiQuotaState | None = None
+    """この実行で使う呼び出し回数の状態"""
+
+    _degraded: bool | None = None
+    """この実行で判定した、節約するかどうか"""
+
+    @staticmethod
+    def get() -> ApiQuotaState:
+        """
+        保存した状態を読み込み、今日の呼び出し回数の状態を返すメソッド。
+
+        読み込みは1回の実行で最初の1回だけ行います。日付が変わった場合は呼び出し回数を0にし、
+        センサーの測定値は残します。
+
+        Returns:
+            ApiQuotaState: 呼び出し回数の状態
+        """
+        today = TimeHelper.get_current_time().date()
+        if ApiQuota._state is None:
+            ApiQuota._state = ApiQuota.load(app_preference.api_quota.state_path, today)
+        if ApiQuota._state.budget_date != today:
+            ApiQuota._state = ApiQuotaState(budget_date=today, readings=ApiQuota._state.readings)
+        return ApiQuota._state
+
+    @staticmethod
+    def record_call(device: str, endpoint: str, outcome: str):
+        """
+        APIの呼び出しを1回記録して保存するメソッド。
+
+        Args:
+            device (str): 呼び出したデバイスの名前（circulator、aircon、センサーIDなど）
+            endpoint (str): 呼び出したエンドポイント（commands、status、devices）
+            outcome (str): 結果（success、api_error、http_error）
+        """
+        if not app_preference.api_quota.enabled:
+            return
+        state = ApiQuota.get()
+        key = f"{device}:{endpoint}:{outcome}"
+        state.calls[key] = state.calls.get(key, 0) + 1
+        state.slot_calls[ApiQuota._slot_index(TimeHelper.get_current_time())] += 1
+        ApiQuota.save(app_preference.api_quota.state_path, state)
+
+    @staticmethod
+    def count_calls() -> int:
+        """
+        今日の呼び出し回数の合計を返すメソッド。
+
+        Returns:
+            int: 今日の呼び出し回数
+        """
+        return sum(ApiQuota.get().calls.values())
+
+    @staticmethod
+    def project_daily_calls(state: ApiQuotaState, current_time: datetime) -> int:
+        """
+        直近の呼び出しの速さがその日の終わりまで続くものとして、日末の呼び出し回数を見込むメソッド。
+
+        Args:
+            state (ApiQuotaState): 呼び出し回数の状態
+            current_time (datetime): 現在時刻
+
+        Returns:
+            int: 日末の呼び出し回数の見込み
+        """
+        used = sum(state.calls.values())
+        elapsed_minutes = current_time.hour * 60 + current_time.minute + current_time.second / 60
+        # 直近の時間に入る区切りの呼び出し回数から速さを求める（0時過ぎは経過した時間だけで求める）
+        first_slot = max(
+            0,
+            math.ceil(
+                (elapsed_minutes - app_preference.api_quota.projection_window_minutes)
+                / ApiQuota.SLOT_MINUTES
+            ),
+        )
+        recent_calls = sum(state.slot_calls[first_slot : ApiQuota._slot_index(current_time) + 1])
+        # 0時直後に速さが極端に大きくならないように、1区切り分の時間は必ず含める
+        window_minutes = max(
+            elapsed_minutes - first_slot * ApiQuota.SLOT_MINUTES, ApiQuota.SLOT_MINUTES
+        )
+        remaining_minutes = 24 * 60 - elapsed_minutes
+        return round(used + recent_calls / window_minutes * remaining_minutes)
+
+    @staticmethod
+    def is_degraded() -> bool:
+        """
+        日末の呼び出し回数の見込みが1日の上限を超え、節約するかどうかを返すメソッド。
+
+        判定は1回の実行で最初の1回だけ行い、節約する場合はログに出力します。
+
+        Returns:
+            bool: 節約する場合はTrue
+        """
+        if not app_preference.api_quota.enabled:
+            return False
+        if ApiQuota._degraded is None:
+            state = ApiQuota.get()
+            projected = ApiQuota.project_daily_calls(state, TimeHelper.get_current_time())
+            budget = app_preference.polling.daily_api_budget
+            ApiQuota._degraded = projected > budget
+            if ApiQuota._degraded:
+                SystemEventLogger.log_info(
+                    "api_quota.degraded",
+                    calls=sum(state.calls.values()),
+                    projected=projected,
+                    budget=budget,
+                )
+        return ApiQuota._degraded
+
+    @staticmethod
+    def get_cached_reading(sensor_id: str, ttl_minutes: float) -> CachedAirQuality | None:
+        """
+        センサーから最後に読み取った値が指定した時間内であれば返すメソッド。
+
+        Args:
+            sensor_id (str): センサーID
+            ttl_minutes (float): 使い回す時間（分）
+
+        Returns:
+            CachedAirQuality | None: 最後に読み取った値。ない場合や古い場合はNone
+        """
+        reading = ApiQuota.get().readings.get(sensor_id)
+        if reading is None:
+            return None
+        if TimeHelper.get_current_time() - reading.read_at > timedelta(minutes=ttl_minutes):
+            return None
+        return reading
+
+    @staticmethod
+    def save_reading(sensor_id: str, air_quality: AirQuality):
+        """
+        センサーから読み取った値を保存するメソッド。
+
+        Args:
+            sensor_id (str): センサーID
+            air_quality (AirQuality): 読み取った値
+        """
+        state = ApiQuota.get()
+        state.readings[sensor_id] = CachedAirQuality(
+            air_quality=air_quality, read_at=TimeHelper.get_current_time()
+        )
+        ApiQuota.save(app_preference.api_quota.state_path, state)
+
+    @staticmethod
+    def log_summary():
+        """今日の呼び出し回数の内訳と日末の見込みをログに出力するメソッド。記録しない設定の場合は何もしません。"""
+        if not app_preference.api_quota.enabled:
+            return
+        state = ApiQuota.get()
+        SystemEventLogger.log_info(
+            "api_quota.summary",
+            calls=sum(state.calls.values()),
+            projected=ApiQuota.project_daily_calls(state, TimeHelper.get_current_time()),
+            budget=app_preference.polling.daily_api_budget,
+            breakdown=", ".join(f"{key}={count}" for key, count in sorted(state.calls.items())),
+        )
+
+    @staticmethod
+    def _slot_index(current_time: datetime) -> int:
+        """時刻が入る区切りの番号を返すメソッド。"""
+        return (current_time.hour * 60 + current_time.minute) // ApiQuota.SLOT_MINUTES
+
+    @staticmethod
+    def load(path: str, today: date) -> ApiQuotaState:
+        """
+        保存した状態を読み込むメソッド。
+
+        Returns:
+            ApiQuotaState: 読み込んだ状態。読み込めない場合は今日の空の状態
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return ApiQuotaState(budget_date=today)
+
+        if data.get("version") != ApiQuota._FILE_VERSION:
+            return ApiQuotaState(budget_date=today)
+        try:
+            return ApiQuotaState(**data["state"])
+        except (KeyError, TypeError, ValueError):
+            return ApiQuotaState(budget_date=today)
+
+    @staticmethod
+    def save(path: str, state: ApiQuotaState):
+        """状態をファイルに保存するメソッド。"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": ApiQuota._FILE_VERSION, "state": state.model_dump(mode="json")}, f
+            )
+        os.replace(temporary_path, path)
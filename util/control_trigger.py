@@ -0,0 +1,168 @@
+import json
+import os
+from datetime import timedelta
+
+from logger.system_event_logger import SystemEventLogger
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
+from settings import app_preference
+from shared.dataclass.control_snapshot import ControlSnapshot
+from shared.dataclass.home_sensor import HomeSensor
+from util.time_helper import TimeHelper
+from util.weekly_calendar import WeeklyCalendar
+
+
+class ControlTrigger:
+    """
+    前回制御した時点の測定値と比べて、制御を実行するかどうかを判定するクラス。
+
+    センサーの温度・湿度・CO2濃度の変化量、参照する天気予報の時刻、時間帯の切り替わり、
+    前回の制御からの経過時間のいずれかが条件を満たした場合に制御を実行します。
+    比較の基準は制御を実行した時点の測定値なので、少しずつの変化も積み重なれば条件を満たします。
+    """
+
+    _FILE_VERSION = 1
+    """測定値を保存するファイルの形式のバージョン"""
+
+    @staticmethod
+    def create_snapshot(
+        home_sensor: HomeSensor, closest_future_forecast: WeatherForecastHourlyModel | None
+    ) -> ControlSnapshot:
+        """
+        現在の測定値を作成するメソッド。
+
+        Args:
+            home_sensor (HomeSensor): 家のセンサー測定値
+            closest_future_forecast (WeatherForecastHourlyModel | None): 最も近い未来の天気予報
+
+        Returns:
+            ControlSnapshot: 現在の測定値
+        """
+        sensors = [home_sensor.main, home_sensor.sub, *home_sensor.supplementaries, home_sensor.outdoor]
+        current_time = TimeHelper.get_current_time()
+        return ControlSnapshot(
+            measured_at=current_time,
+            air_qualities={
+                sensor.id: sensor.air_quality.model_copy() for sensor in sensors if sensor
+            },
+            forecast_time=closest_future_forecast.forecast_time if closest_future_forecast else None,
+            active_windows=sorted(WeeklyCalendar.get().active_windows(current_time)),
+        )
+
+    @staticmethod
+    def should_control(snapshot: ControlSnapshot) -> bool:
+        """
+        保存した前回の測定値と比べて、制御を実行するかどうかを判定し、理由をログに出力するメソッド。
+
+        Args:
+            snapshot (ControlSnapshot): 現在の測定値
+
+        Returns:
+            bool: 制御を実行する場合はTrue
+        """
+        previous = ControlTrigger.load_snapshot(app_preference.control_trigger.state_path)
+        reason = ControlTrigger.find_trigger(previous, snapshot)
+        if reason is None:
+            SystemEventLogger.log_info(
+                "control_trigger.steady", measured_at=previous.measured_at.strftime("%H:%M")
+            )
+            return False
+
+        message_key, kwargs = reason
+        SystemEventLogger.log_info(message_key, **kwargs)
+        return True
+
+    @staticmethod
+    def find_trigger(
+        previous: ControlSnapshot | None, current: ControlSnapshot
+    ) -> tuple[str, dict] | None:
+        """
+        制御を実行する理由を求めるメソッド。
+
+        Args:
+            previous (ControlSnapshot | None): 前回制御した時点の測定値
+            current (ControlSnapshot): 現在の測定値
+
+        Returns:
+            tuple[str, dict] | None: 理由のメッセージKeyと、テンプレートに埋め込むデータ。
+                制御を実行しない場合はNone
+        """
+        if previous is None:
+            return "control_trigger.no_previous", {}
+
+        preference = app_preference.control_trigger
+        elapsed = current.measured_at - previous.measured_at
+        if elapsed < timedelta(0) or elapsed >= timedelta(minutes=preference.max_interval_minutes):
+            return "control_trigger.interval", {"minutes": int(elapsed.total_seconds() // 60)}
+
+        for sensor_id, air_quality in current.air_qualities.items():
+            previous_air_quality = previous.air_qualities.get(sensor_id)
+            if previous_air_quality is None:
+                return "control_trigger.sensor_added", {"sensor_id": sensor_id}
+
+            changes = [
+                ("temperature", preference.temperature_delta),
+                ("humidity", preference.humidity_delta),
+                ("co2_level", preference.co2_delta),
+            ]
+            for field, delta in changes:
+                before = getattr(previous_air_quality, field)
+                after = getattr(air_quality, field)
+                if before is None and after is None:
+                    continue
+                if before is None or after is None or abs(after - before) >= delta:
+                    return "control_trigger.sensor_changed", {
+                        "sensor_id": sensor_id,
+                        "field": field,
+                        "before": before,
+                        "after": after,
+                    }
+
+        if preference.forecast_change and current.forecast_time != previous.forecast_time:
+            return "control_trigger.forecast_changed", {
+                "before": previous.forecast_time,
+                "after": current.forecast_time,
+            }
+
+        if preference.time_window_change and current.active_windows != previous.active_windows:
+            return "control_trigger.time_window_changed", {
+                "before": ", ".join(previous.active_windows),
+                "after": ", ".join(current.active_windows),
+            }
+        return None
+
+    @staticmethod
+    def load_snapshot(path: str) -> ControlSnapshot | None:
+        """
+        保存した前回の測定値を読み込むメソッド。
+
+        Returns:
+            ControlSnapshot | None: 前回制御した時点の測定値。読み込めない場合はNone
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != ControlTrigger._FILE_VERSION:
+            return None
+        try:
+            return ControlSnapshot.model_validate(data["snapshot"])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def save_snapshot(path: str, snapshot: ControlSnapshot):
+        """制御した時点の測定値をファイルに保存するメソッド。"""
+        data = {
+            "version": ControlTrigger._FILE_VERSION,
+            "snapshot": snapshot.model_dump(mode="json"),
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 書き込み途中のファイルを読まないように、一時ファイルから置き換える
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
@@ -0,0 +1,247 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from logger.system_event_logger import SystemEventLogger
+from settings import app_preference
+from shared.dataclass.stage_histogram import StageHistogram
+
+
+class CycleMetrics:
+    """
+    制御サイクルの処理ごとの所要時間を計測し、ヒストグラムに集計するクラス。
+
+    measureで囲んだ処理の所要時間を実行中はメモリに記録し、flushで実行をまたいで保存した
+    ヒストグラムに加えます。ヒストグラムはOpenMetrics形式のテキストファイルに書き出し、
+    今回の所要時間とヒストグラムから求めたp50・p95・p99をログに出力します。
+    計測しない設定の場合、measureは時刻を取得せずに処理を実行するだけです。
+    """
+
+    METRIC_NAME = "home_comfort_control_stage_duration_seconds"
+    """所要時間のヒストグラムのメトリクス名"""
+
+    QUANTILE_METRIC_NAME = "home_comfort_control_stage_duration_quantile_seconds"
+    """ヒストグラムから求めた分位数のメトリクス名"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+    """ログとテキストファイルに出力する分位数"""
+
+    _FILE_VERSION = 1
+    """状態を保存するファイルの形式のバージョン"""
+
+    _observations: list[tuple[str, str, float]] = []
+    """この実行で計測した処理の名前・対象・所要時間（秒）"""
+
+    @staticmethod
+    @contextmanager
+    def measure(stage: str, target: str = "") -> Iterator[None]:
+        """
+        囲んだ処理の所要時間を計測するコンテキストマネージャー。
+
+        例外が発生した場合も、発生するまでの時間を記録します。
+
+        Args:
+            stage (str): 処理の名前
+            target (str): 処理の対象（センサーやコマンドの名前）
+        """
+        if not app_preference.cycle_metrics.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            CycleMetrics._observations.append((stage, target, time.perf_counter() - started))
+
+    @staticmethod
+    def flush():
+        """
+        この実行で計測した所要時間をヒストグラムに加えて保存し、テキストファイルとログに出力するメソッド。
+
+        計測した処理がない場合は何もしません。
+        """
+        observations = CycleMetrics._observations
+        if not observations:
+            return
+        CycleMetrics._observations = []
+
+        preference = app_preference.cycle_metrics
+        histograms = {
+            (histogram.stage, histogram.target): histogram
+            for histogram in CycleMetrics.load_histograms(preference.state_path, preference.buckets)
+        }
+        # 同じ処理を1回の実行で複数回計測した場合、ログには合計を出力する
+        totals: dict[tuple[str, str], float] = {}
+        for stage, target, seconds in observations:
+            key = (stage, target)
+            if key not in histograms:
+                histograms[key] = StageHistogram(
+                    stage=stage, target=target, bucket_counts=[0] * (len(preference.buckets) + 1)
+                )
+            CycleMetrics.observe(histograms[key], preference.buckets, seconds)
+            totals[key] = totals.get(key, 0.0) + seconds
+
+        CycleMetrics.save_histograms(
+            preference.state_path, preference.buckets, list(histograms.values())
+        )
+        CycleMetrics.write_textfile(
+            preference.textfile_path, preference.buckets, list(histograms.values())
+        )
+        for key, seconds in totals.items():
+            p50, p95, p99 = (
+                CycleMetrics.calculate_quantile(histograms[key], preference.buckets, quantile)
+                for quantile in CycleMetrics.QUANTILES
+            )
+            SystemEventLogger.log_info(
+                "cycle_metrics.stage",
+                stage=f"{key[0]}[{key[1]}]" if key[1] else key[0],
+                seconds=f"{seconds:.3f}",
+                p50=f"{p50:.3f}",
+                p95=f"{p95:.3f}",
+                p99=f"{p99:.3f}",
+            )
+
+    @staticmethod
+    def observe(histogram: StageHistogram, buckets: list[float], seconds: float):
+        """
+        ヒストグラムに所要時間を1回分加えるメソッド。
+
+        Args:
+            histogram (StageHistogram): ヒストグラム
+            buckets (list[float]): バケットの上限（秒）
+            seconds (float): 所要時間（秒）
+        """
+        index = next(
+            (i for i, upper in enumerate(buckets) if seconds <= upper), len(buckets)
+        )
+        histogram.bucket_counts[index] += 1
+        histogram.sum += seconds
+        histogram.count += 1
+
+    @staticmethod
+    def calculate_quantile(histogram: StageHistogram, buckets: list[float], quantile: float) -> float:
+        """
+        ヒストグラムから分位数を求めるメソッド。
+
+        Prometheusのhistogram_quantileと同じく、分位数が入るバケットの中で観測値が
+        一様に分布しているものとして線形補間します。最後の上限を超えるバケットに入る場合は最後の上限を返します。
+
+        Args:
+            histogram (StageHistogram): ヒストグラム
+            buckets (list[float]): バケットの上限（秒）
+            quantile (float): 分位数（0〜1）
+
+        Returns:
+            float: 分位数の所要時間（秒）。観測がない場合は0
+        """
+        if histogram.count == 0:
+            return 0.0
+        rank = quantile * histogram.count
+        cumulative = 0
+        for index, upper in enumerate(buckets):
+            count = histogram.bucket_counts[index]
+            if count and cumulative + count >= rank:
+                lower = buckets[index - 1] if index > 0 else 0.0
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return buckets[-1]
+
+    @staticmethod
+    def load_histograms(path: str, buckets: list[float]) -> list[StageHistogram]:
+        """
+        保存したヒストグラムを読み込むメソッド。
+
+        Returns:
+            list[StageHistogram]: ヒストグラム。読み込めない場合やバケットが設定と異なる場合は空
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+
+        if data.get("version") != CycleMetrics._FILE_VERSION or data.get("buckets") != buckets:
+            return []
+        try:
+            return [StageHistogram(**histogram) for histogram in data["histograms"]]
+        except (KeyError, TypeError, ValueError):
+            return []
+
+    @staticmethod
+    def save_histograms(path: str, buckets: list[float], histograms: list[StageHistogram]):
+        """ヒストグラムをファイルに保存するメソッド。"""
+        CycleMetrics._write_atomically(
+            path,
+            json.dumps(
+                {
+                    "version": CycleMetrics._FILE_VERSION,
+                    "buckets": buckets,
+                    "histograms": [histogram.model_dump() for histogram in histograms],
+                }
+            ),
+        )
+
+    @staticmethod
+    def write_textfile(path: str, buckets: list[float], histograms: list[StageHistogram]):
+        """
+        ヒストグラムと分位数をOpenMetrics形式のテキストファイルに書き出すメソッド。
+
+        Args:
+            path (str): 出力するファイルのパス
+            buckets (list[float]): バケットの上限（秒）
+            histograms (list[StageHistogram]): ヒストグラム
+        """
+        name = CycleMetrics.METRIC_NAME
+        quantile_name = CycleMetrics.QUANTILE_METRIC_NAME
+        lines = [
+            f"# TYPE {name} histogram",
+            f"# UNIT {name} seconds",
+            f"# HELP {name} Duration of each stage of the control cycle.",
+        ]
+        for histogram in histograms:
+            labels = CycleMetrics._format_labels(histogram)
+            cumulative = 0
+            for upper, count in zip([*buckets, "+Inf"], histogram.bucket_counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{upper}"}} {cumulative}')
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+
+        lines += [
+            f"# TYPE {quantile_name} gauge",
+            f"# UNIT {quantile_name} seconds",
+            f"# HELP {quantile_name} Quantiles of the stage duration estimated from the histogram.",
+        ]
+        for histogram in histograms:
+            labels = CycleMetrics._format_labels(histogram)
+            for quantile in CycleMetrics.QUANTILES:
+                value = CycleMetrics.calculate_quantile(histogram, buckets, quantile)
+                lines.append(f'{quantile_name}{{{labels},quantile="{quantile}"}} {value}')
+        lines.append("# EOF")
+        CycleMetrics._write_atomically(path, "\n".join(lines) + "\n")
+
+    @staticmethod
+    def _format_labels(histogram: StageHistogram) -> str:
+        """ヒストグラムの処理の名前と対象をラベルの文字列にするメソッド。"""
+        labels = {"stage": histogram.stage}
+        if histogram.target:
+            labels["target"] = histogram.target
+        return ",".join(
+            '{}="{}"'.format(
+                key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            )
+            for key, value in labels.items()
+        )
+
+    @staticmethod
+    def _write_atomically(path: str, content: str):
+        """読み込み中のファイルが書き込み途中にならないように、一時ファイルから置き換えるメソッド。"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temporary_path, path)
@@ -0,0 +1,223 @@
+import json
+import os
+from datetime import datetime
+
+from db.db_session_manager import DBSessionManager
+from repository.services.aircon_setting_service import AirconSettingService
+from repository.services.circulator_setting_service import CirculatorSettingService
+from repository.services.electric_fan_setting_service import ElectricFanSettingService
+from settings import app_preference
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.enums.aircon_fan_speed import AirconFanSpeed
+from shared.enums.aircon_mode import AirconMode
+from shared.enums.power_mode import PowerMode
+
+
+class DeviceShadow:
+    """
+    最後に送信した機器の状態（シャドウ）を保持するクラス。
+
+    状態はファイルに保存し、データベースを使う場合はデータベースの最新の設定の方が新しく、
+    設定が異なればそちらに合わせます。状態が分からない機器はNoneとし、コマンドをそのまま送信します。
+
+    Attributes:
+        aircon (AirconSettings | None): 最後に送信したエアコンの設定
+        aircon_updated_at (datetime | None): エアコンの設定を送信した日時
+        circulator_power (PowerMode | None): サーキュレーターの電源
+        circulator_fan_speed (int | None): サーキュレーターの風量
+        circulator_updated_at (datetime | None): サーキュレーターの状態を更新した日時
+        electric_fan_power (PowerMode | None): 扇風機の電源
+        electric_fan_updated_at (datetime | None): 扇風機の状態を更新した日時
+        saved_calls (int): この実行で送信しなかったAPI呼び出し回数
+        total_saved_calls (int): 送信しなかったAPI呼び出し回数の累計
+    """
+
+    _FILE_VERSION = 1
+    """状態を保存するファイルの形式のバージョン"""
+
+    _shadow: "DeviceShadow | None" = None
+
+    def __init__(self):
+        self.aircon: AirconSettings | None = None
+        self.aircon_updated_at: datetime | None = None
+        self.circulator_power: PowerMode | None = None
+        self.circulator_fan_speed: int | None = None
+        self.circulator_updated_at: datetime | None = None
+        self.electric_fan_power: PowerMode | None = None
+        self.electric_fan_updated_at: datetime | None = None
+        self.saved_calls = 0
+        self.total_saved_calls = 0
+
+    @staticmethod
+    def get() -> "DeviceShadow":
+        """
+        保存した状態を読み込み、データベースの最新の設定と突き合わせたシャドウを返すメソッド。
+
+        読み込みと突き合わせは1回の実行で最初の1回だけ行います。
+
+        Returns:
+            DeviceShadow: シャドウ
+        """
+        if DeviceShadow._shadow is None:
+            shadow = DeviceShadow.load(app_preference.device_shadow.state_path)
+            if app_preference.database.enabled:
+                shadow.reconcile_with_database()
+            DeviceShadow._shadow = shadow
+        return DeviceShadow._shadow
+
+    def reconcile_with_database(self):
+        """
+        データベースの最新の設定の方が新しく、設定が異なる機器は、データベースの設定に合わせるメソッド。
+
+        データベースには送信を省いたサイクルでも設定が記録されるため、設定が同じ場合は日時を更新しません
+        （更新すると、状態の再送信の間隔が経過しなくなります）。
+        """
+        with DBSessionManager.session() as session:
+            aircon_settings, aircon_time = AirconSettingService(session).get_latest_aircon_settings()
+            circulator_settings, circulator_time = CirculatorSettingService(
+                session
+            ).get_latest_circulator_settings_with_time()
+            electric_fan_settings, electric_fan_time = ElectricFanSettingService(
+                session
+            ).get_latest_electric_fan_settings_with_time()
+
+        if (
+            aircon_settings
+            and DeviceShadow._is_newer(aircon_time, self.aircon_updated_at)
+            and not DeviceShadow.is_same_aircon_settings(self.aircon, aircon_settings)
+        ):
+            self.aircon, self.aircon_updated_at = aircon_settings, aircon_time
+        if (
+            circulator_settings
+            and DeviceShadow._is_newer(circulator_time, self.circulator_updated_at)
+            and (
+                circulator_settings.power != self.circulator_power
+                or circulator_settings.fan_speed != self.circulator_fan_speed
+            )
+        ):
+            self.circulator_power = circulator_settings.power
+            self.circulator_fan_speed = circulator_settings.fan_speed
+            self.circulator_updated_at = circulator_time
+        if (
+            electric_fan_settings
+            and DeviceShadow._is_newer(electric_fan_time, self.electric_fan_updated_at)
+            and electric_fan_settings.power != self.electric_fan_power
+        ):
+            self.electric_fan_power = electric_fan_settings.power
+            self.electric_fan_updated_at = electric_fan_time
+
+    @staticmethod
+    def _is_newer(database_time: datetime | None, shadow_time: datetime | None) -> bool:
+        """データベースの設定の日時が、シャドウの日時より新しいかどうかを返すメソッド。"""
+        if database_time is None:
+            return False
+        return shadow_time is None or database_time > shadow_time
+
+    @staticmethod
+    def is_same_aircon_settings(current: AirconSettings | None, target: AirconSettings) -> bool:
+        """
+        エアコンの設定が同じかどうかを判定するメソッド。
+
+        Args:
+            current (AirconSettings | None): 最後に送信した設定
+            target (AirconSettings): 送信する設定
+
+        Returns:
+            bool: 温度、モード、風量、電源が同じ場合はTrue
+        """
+        return (
+            current is not None
+            and current.temperature == target.temperature
+            and current.mode.id == target.mode.id
+            and current.fan_speed.id == target.fan_speed.id
+            and current.power.id == target.power.id
+        )
+
+    @staticmethod
+    def load(path: str) -> "DeviceShadow":
+        """
+        保存した状態を読み込むメソッド。
+
+        Returns:
+            DeviceShadow: 読み込んだシャドウ。読み込めない場合はすべての機器の状態がNone
+        """
+        shadow = DeviceShadow()
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return shadow
+
+        if data.get("version") != DeviceShadow._FILE_VERSION:
+            return shadow
+        try:
+            aircon = data.get("aircon")
+            if aircon:
+                shadow.aircon = AirconSettings(
+                    temperature=aircon["temperature"],
+                    mode=AirconMode[aircon["mode"]],
+                    fan_speed=AirconFanSpeed[aircon["fan_speed"]],
+                    power=PowerMode[aircon["power"]],
+                )
+                shadow.aircon_updated_at = datetime.fromisoformat(aircon["updated_at"])
+            circulator = data.get("circulator")
+            if circulator:
+                shadow.circulator_power = DeviceShadow._to_power(circulator["power"])
+                shadow.circulator_fan_speed = circulator["fan_speed"]
+                shadow.circulator_updated_at = datetime.fromisoformat(circulator["updated_at"])
+            electric_fan = data.get("electric_fan")
+            if electric_fan:
+                shadow.electric_fan_power = DeviceShadow._to_power(electric_fan["power"])
+                shadow.electric_fan_updated_at = datetime.fromisoformat(electric_fan["updated_at"])
+            shadow.total_saved_calls = data.get("total_saved_calls", 0)
+        except (KeyError, TypeError, ValueError):
+            return DeviceShadow()
+        return shadow
+
+    @staticmethod
+    def _to_power(name: str | None) -> PowerMode | None:
+        """電源の名前をPowerModeに変換するメソッド。"""
+        return PowerMode[name] if name else None
+
+    def save(self, path: str):
+        """状態をファイルに保存するメソッド。"""
+        data = {
+            "version": DeviceShadow._FILE_VERSION,
+            "aircon": (
+                {
+                    "temperature": self.aircon.temperature,
+                    "mode": self.aircon.mode.name,
+                    "fan_speed": self.aircon.fan_speed.name,
+                    "power": self.aircon.power.name,
+                    "updated_at": self.aircon_updated_at.isoformat(),
+                }
+                if self.aircon and self.aircon_updated_at
+                else None
+            ),
+            "circulator": (
+                {
+                    "power": self.circulator_power.name if self.circulator_power else None,
+                    "fan_speed": self.circulator_fan_speed,
+                    "updated_at": self.circulator_updated_at.isoformat(),
+                }
+                if self.circulator_updated_at
+                else None
+            ),
+            "electric_fan": (
+                {
+                    "power": self.electric_fan_power.name if self.electric_fan_power else None,
+                    "updated_at": self.electric_fan_updated_at.isoformat(),
+                }
+                if self.electric_fan_updated_at
+                else None
+            ),
+            "total_saved_calls": self.total_saved_calls,
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 書き込み途中のファイルを読まないように、一時ファイルから置き換える
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
@@ -0,0 +1,186 @@
+import numpy as np
+
+from settings import aircon_preference
+
+
+class HouseThermalModel:
+    """
+    室温の変化を1次のRCモデルで計算するクラス。
+
+    室温Tは外気温に内部発熱と日射による上昇分を加えた温度（自然室温）に時定数τで近づき、
+    エアコンは1時間あたり最大で能力qだけ室温を動かせるものとします。
+
+        dT/dt = (T_out + offset - T) / τ - u,  0 <= u <= q（冷房の場合）
+
+    冷房は室温が設定温度より高い間は能力いっぱいで運転し、設定温度に達した後は
+    自然室温に近づく分だけを打ち消して設定温度を保ちます（暖房は向きが逆）。
+    外気温と設定温度が一定の区間では厳密に解けるため、候補の運転計画をまとめて配列で進められます。
+    """
+
+    COOLING = -1
+    """冷房の運転方向"""
+
+    HEATING = 1
+    """暖房の運転方向"""
+
+    IDLE = 0
+    """冷暖房をしない運転方向"""
+
+    @staticmethod
+    def get_parameters() -> tuple[float, float, float]:
+        """
+        設定からモデルのパラメータを取得するメソッド。
+
+        Returns:
+            tuple[float, float, float]: 家の時定数（時間）、エアコンの能力（度/時間）、発熱による室温の上昇（度）
+        """
+        predictive_control = aircon_preference.predictive_control
+        return (
+            predictive_control.house_time_constant_hours,
+            predictive_control.aircon_capacity,
+            predictive_control.heat_gain_offset,
+        )
+
+    @staticmethod
+    def advance(
+        temperature: np.ndarray,
+        outdoor_temperature: float | np.ndarray,
+        setpoint: np.ndarray,
+        direction: np.ndarray,
+        hours: float,
+        parameters: tuple[float, float, float] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        室温を指定した時間だけ進め、その間にエアコンが動かした熱量を求めるメソッド。
+
+        熱量は室温の変化に換算した値（度）で、冷房・暖房ともに正の値です。
+        暖房は温度の符号を反転して冷房と同じ式で計算します。
+
+        Args:
+            temperature (np.ndarray): 現在の室温
+            outdoor_temperature (float | np.ndarray): 区間の外気温
+            setpoint (np.ndarray): 設定温度
+            direction (np.ndarray): 運転方向（COOLING、HEATING、IDLE）
+            hours (float): 進める時間（時間）
+            parameters (tuple | None): get_parametersと同じ形式のパラメータ。Noneの場合は設定の値
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: 進めた後の室温と、エアコンが動かした熱量
+        """
+        time_constant, capacity, offset = parameters or HouseThermalModel.get_parameters()
+        direction = np.asarray(direction)
+        # 冷房の向きにそろえる（暖房と送風は符号を反転しても同じ式になる）
+        sign = np.where(direction == HouseThermalModel.HEATING, -1.0, 1.0)
+        running = direction != HouseThermalModel.IDLE
+        current = sign * temperature
+        target = sign * setpoint
+        free = sign * (outdoor_temperature + offset)
+        full = free - capacity * time_constant
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # 設定温度より低い間は自然室温に近づき、設定温度に達するまでの時間を求める
+            to_setpoint = np.where(
+                (current < target) & (free > target),
+                time_constant * np.log((free - current) / (free - target)),
+                np.where(current < target, np.inf, 0.0),
+            )
+            drift_hours = np.minimum(np.where(running, to_setpoint, hours), hours)
+            reached = running & (current < target) & (to_setpoint < hours)
+            current = np.where(
+                reached, target, free + (current - free) * np.exp(-drift_hours / time_constant)
+            )
+            remaining = hours - drift_hours
+
+            # 設定温度以上では能力いっぱいで運転し、設定温度まで下がる時間を求める
+            # （能力が足りず下げられない場合は区間の終わりまで能力いっぱいで運転する）
+            engaged = current >= target
+            pull_down = np.where(
+                engaged & (full < target),
+                time_constant * np.log((current - full) / (target - full)),
+                np.where(engaged, np.inf, 0.0),
+            )
+        full_hours = np.minimum(pull_down, remaining)
+        current = np.where(
+            full_hours > 0, full + (current - full) * np.exp(-full_hours / time_constant), current
+        )
+        remaining = remaining - full_hours
+
+        # 設定温度に達した後は、自然室温が設定温度より高い分だけ運転して保つ
+        hold_hours = np.where(free >= target, remaining, 0.0)
+        hold = np.maximum(free - target, 0.0) / time_constant
+        current = np.where(
+            remaining > 0,
+            np.where(
+                free >= target,
+                target,
+                free + (current - free) * np.exp(-remaining / time_constant),
+            ),
+            current,
+        )
+        heat = capacity * full_hours + hold * hold_hours
+        return sign * current, np.where(running, heat, 0.0)
+
+    @staticmethod
+    def fit(
+        elapsed_hours: np.ndarray,
+        temperature: np.ndarray,
+        outdoor_temperature: np.ndarray,
+        setpoint: np.ndarray,
+        direction: np.ndarray,
+        max_elapsed_hours: float = 0.5,
+        margin: float = 0.5,
+    ) -> tuple[float, float, float]:
+        """
+        室温の履歴に最もよく合うモデルのパラメータを求めるメソッド。
+
+        冷暖房をしていない時点の室温の変化率を、外気温との差と定数の1次式で最小二乗法により近似して
+        時定数と発熱による上昇分を求めます。能力は、室温が設定温度から余裕以上離れて
+        能力いっぱいで運転していた時点で、自然室温への変化と実際の変化の差の中央値とします。
+        直前の時点からの経過時間が0または上限を超える時点（測定の欠け）は使いません。
+
+        Args:
+            elapsed_hours (np.ndarray): 各時点の直前の時点からの経過時間（時間）。先頭の値は使わない
+            temperature (np.ndarray): 各時点の室温
+            outdoor_temperature (np.ndarray): 各時点の外気温
+            setpoint (np.ndarray): 各時点のエアコンの設定温度
+            direction (np.ndarray): 各時点のエアコンの運転方向
+            max_elapsed_hours (float): 使う時点の経過時間の上限（時間）
+            margin (float): 能力いっぱいで運転しているとみなす設定温度との差（度）
+
+        Returns:
+            tuple[float, float, float]: 家の時定数（時間）、エアコンの能力（度/時間）、発熱による室温の上昇（度）
+
+        Raises:
+            ValueError: データが足りない場合、または時定数や能力が正にならない場合
+        """
+        temperature = np.asarray(temperature, dtype=float)
+        previous = temperature[:-1]
+        outdoor_difference = np.asarray(outdoor_temperature, dtype=float)[:-1] - previous
+        setpoint_difference = np.asarray(setpoint, dtype=float)[:-1] - previous
+        direction = np.asarray(direction)[:-1]
+        elapsed = np.asarray(elapsed_hours, dtype=float)[1:]
+        valid = (elapsed > 0) & (elapsed <= max_elapsed_hours)
+        rate = np.zeros(elapsed.shape)
+        rate[valid] = np.diff(temperature)[valid] / elapsed[valid]
+
+        idle = valid & (direction == HouseThermalModel.IDLE)
+        if np.count_nonzero(idle) < 2:
+            raise ValueError("not enough idle samples")
+        features = np.column_stack((outdoor_difference, np.ones(outdoor_difference.shape)))
+        (house_rate, gain), *_ = np.linalg.lstsq(features[idle], rate[idle], rcond=None)
+        if house_rate <= 0:
+            raise ValueError("time constant must be positive")
+
+        # 能力いっぱいで運転していた時点の、自然室温への変化との差（冷房・暖房とも正）
+        free_rate = house_rate * outdoor_difference + gain
+        cooling = valid & (direction == HouseThermalModel.COOLING) & (setpoint_difference < -margin)
+        heating = valid & (direction == HouseThermalModel.HEATING) & (setpoint_difference > margin)
+        pulled = np.concatenate(
+            ((free_rate - rate)[cooling], (rate - free_rate)[heating])
+        )
+        if pulled.size == 0:
+            raise ValueError("not enough running samples")
+        capacity = float(np.median(pulled))
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        return float(1 / house_rate), capacity, float(gain / house_rate)
@@ -1,8 +1,17 @@
 import math
 
+import numpy as np
+
+from translations.translated_value_error import TranslatedValueError
+
 
 class HumidityMetrics:
-    """絶対湿度計算クラス"""
+    """絶対湿度計算クラス
+
+    スカラー版のメソッドはmathモジュールで、配列版のメソッドはNumPyで同じ式を計算します
+    （1件ずつの計算でNumPyを使うと10倍以上遅くなるため）。
+    配列版で欠測として扱う不正な入力は、スカラー版では例外にします。
+    """
 
     @staticmethod
     def calculate_absolute_humidity(temperature: float, relative_humidity: float) -> float:
@@ -28,6 +37,33 @@ class HumidityMetrics:
 
         return absolute_humidity  # 絶対湿度を返す
 
+    @staticmethod
+    def calculate_absolute_humidity_array(
+        temperature: float | np.ndarray, relative_humidity: float | np.ndarray
+    ) -> np.ndarray:
+        """絶対湿度を配列でまとめて計算するメソッド。
+
+        Args:
+            temperature (float | np.ndarray): 温度（摂氏）
+            relative_humidity (float | np.ndarray): 相対湿度（％）
+
+        Returns:
+            np.ndarray: 計算された絶対湿度（g/m³）
+        """
+        temperature = np.asarray(temperature, dtype=float)
+        relative_humidity = np.asarray(relative_humidity, dtype=float)
+
+        # 摂氏からケルビンに変換
+        temperature_kelvin = temperature + 273.15
+
+        # 飽和水蒸気圧の計算（hPa）
+        saturated_vapor_pressure = 6.1078 * np.power(
+            10.0, (7.5 * temperature) / (temperature + 237.3)
+        )
+
+        # 絶対湿度の計算（g/m³）
+        return (217 * (relative_humidity / 100) * saturated_vapor_pressure) / temperature_kelvin
+
     @staticmethod
     def calculate_dew_point(temperature_celsius: float, relative_humidity: float) -> float:
         """露点温度を計算するメソッド。
@@ -38,7 +74,14 @@ class HumidityMetrics:
 
         Returns:
             float: 計算された露点温度（摂氏）
+
+        Raises:
+            TranslatedValueError: 相対湿度が0以下の場合
         """
+        # 対数を計算できないため、配列版のようにNaNを返さず例外にする
+        if relative_humidity <= 0:
+            raise TranslatedValueError(cls=HumidityMetrics, relative_humidity=relative_humidity)
+
         a = 17.27  # 定数
         b = 237.7  # 定数
 
@@ -51,3 +94,32 @@ class HumidityMetrics:
         dew_point = math.ceil(((b * alpha) / (a - alpha)) * 10) / 10  # 小数点第一位まで切り上げ
 
         return dew_point  # 露点温度を返す
+
+    @staticmethod
+    def calculate_dew_point_array(
+        temperature_celsius: float | np.ndarray, relative_humidity: float | np.ndarray
+    ) -> np.ndarray:
+        """露点温度を配列でまとめて計算するメソッド。
+
+        相対湿度が0以下または欠測（NaN）の要素はNaNになります。
+
+        Args:
+            temperature_celsius (float | np.ndarray): 温度（摂氏）
+            relative_humidity (float | np.ndarray): 相対湿度（％）
+
+        Returns:
+            np.ndarray: 小数点第一位まで切り上げた露点温度（摂氏）
+        """
+        temperature_celsius = np.asarray(temperature_celsius, dtype=float)
+        relative_humidity = np.asarray(relative_humidity, dtype=float)
+        a = 17.27  # 定数
+        b = 237.7  # 定数
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # αを計算
+            alpha = ((a * temperature_celsius) / (b + temperature_celsius)) + np.log(
+                np.where(relative_humidity > 0, relative_humidity / 100.0, np.nan)
+            )
+
+            # 露点温度の計算（小数点第一位まで切り上げ）
+            return np.ceil(((b * alpha) / (a - alpha)) * 10) / 10
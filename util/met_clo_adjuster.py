@@ -1,10 +1,12 @@
 from db.db_session_manager import DBSessionManager
 from logger.system_event_logger import SystemEventLogger
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
 from repository.services.weather_forecast_hourly_service import WeatherForecastHourlyService
 from settings import app_preference, met_clo_preference
 from shared.dataclass.comfort_factors import ComfortFactors
 from shared.dataclass.effective_outdoor_temperature import EffectiveOutdoorTemperature
 from util.time_helper import TimeHelper
+from util.weekly_calendar import WeeklyCalendar
 
 
 class MetCloAdjuster:
@@ -17,7 +19,11 @@ class MetCloAdjuster:
     """
 
     @staticmethod
-    def calculate_comfort_factors(temperature: EffectiveOutdoorTemperature, is_sleeping: bool) -> ComfortFactors:
+    def calculate_comfort_factors(
+        temperature: EffectiveOutdoorTemperature,
+        is_sleeping: bool,
+        closest_future_forecast: WeatherForecastHourlyModel | None = None,
+    ) -> ComfortFactors:
         """
         ComfortFactorsを計算し、返す。
 
@@ -27,6 +33,8 @@ class MetCloAdjuster:
         引数:
             temperature (EffectiveOutdoorTemperature): 外気温（摂氏） 予報された最高気温（摂氏）。
             is_sleeping (bool): 就寝中かどうかのフラグ。
+            closest_future_forecast (WeatherForecastHourlyModel | None): 直近の天気予報。
+                省略した場合、太陽光利用の判定に必要な時にデータベースから取得します。
 
         戻り値:
             ComfortFactors: METとCLO値を含むインスタンス。
@@ -40,7 +48,9 @@ class MetCloAdjuster:
                 return MetCloAdjuster._calculate_high_temp_comfort_factors(is_sleeping)
             case temp if temp <= app_preference.temperature_thresholds.low:
                 # 低温条件の処理
-                return MetCloAdjuster._calculate_low_temp_comfort_factors(is_sleeping)
+                return MetCloAdjuster._calculate_low_temp_comfort_factors(
+                    is_sleeping, closest_future_forecast
+                )
             case _:
                 # 中間温度条件の処理
                 return MetCloAdjuster._calculate_mid_temp_comfort_factors(temperature.value, is_sleeping)
@@ -71,13 +81,14 @@ class MetCloAdjuster:
             if is_sleeping
             else met_clo_preference.high_temperature.clo.awake
         )
-        print(f"met: {met}, clo: {clo}")
         # 食事時間帯によるMETの調整を実施
         met = MetCloAdjuster.adjust_met_for_meal_times(met)
         return ComfortFactors(met=met, clo=clo)
 
     @staticmethod
-    def _calculate_low_temp_comfort_factors(is_sleeping: bool) -> ComfortFactors:
+    def _calculate_low_temp_comfort_factors(
+        is_sleeping: bool, closest_future_forecast: WeatherForecastHourlyModel | None = None
+    ) -> ComfortFactors:
         """
         低温時のComfortFactorsを計算。
 
@@ -105,11 +116,12 @@ class MetCloAdjuster:
 
         if met_clo_preference.low_temperature.time.heating.enabled:
             # 暖房抑制を適用
-            now = TimeHelper.get_current_time()
-            # 高コスト時間帯でのmet調整
-            current_day = now.weekday()
-            for period in met_clo_preference.low_temperature.time.heating.high_costs:
-                if (current_day not in [5, 6]) and (period.start_time <= now.time() <= period.end_time):
+            active_windows = WeeklyCalendar.get().active_windows(TimeHelper.get_current_time())
+            # 高コスト時間帯でのmet調整（平日のみ）
+            for index, period in enumerate(
+                met_clo_preference.low_temperature.time.heating.high_costs
+            ):
+                if f"heating.high_cost.{index}" in active_windows:
                     met += period.met_adjustment
                     SystemEventLogger.log_info(
                         "icl_adjustment.high_cost",
@@ -117,9 +129,11 @@ class MetCloAdjuster:
                         end_time=period.end_time,
                     )
 
-            # 低コスト時間帯でのmet調整
-            for period in met_clo_preference.low_temperature.time.heating.low_costs:
-                if (current_day not in [5, 6]) and (period.start_time <= now.time() <= period.end_time):
+            # 低コスト時間帯でのmet調整（平日のみ）
+            for index, period in enumerate(
+                met_clo_preference.low_temperature.time.heating.low_costs
+            ):
+                if f"heating.low_cost.{index}" in active_windows:
                     met += period.met_adjustment
                     SystemEventLogger.log_info(
                         "icl_adjustment.low_cost",
@@ -128,7 +142,7 @@ class MetCloAdjuster:
                     )
 
         # 太陽光利用
-        met = MetCloAdjuster._adjust_for_solar(met)
+        met = MetCloAdjuster._adjust_for_solar(met, closest_future_forecast)
 
         return ComfortFactors(met=met, clo=clo)
 
@@ -179,83 +193,66 @@ class MetCloAdjuster:
         戻り値:
             float: 調整されたMET値。
         """
-        # 食事時間帯の調整設定
-        meal_adjustments = [
-            (
-                met_clo_preference.high_temperature.time.lunch.enabled,
-                met_clo_preference.high_temperature.time.lunch.start_time,
-                met_clo_preference.high_temperature.time.lunch.end_time,
-                met_clo_preference.high_temperature.time.lunch.met_adjustment,
-            ),
-            (
-                met_clo_preference.high_temperature.time.dinner.enabled,
-                met_clo_preference.high_temperature.time.dinner.start_time,
-                met_clo_preference.high_temperature.time.dinner.end_time,
-                met_clo_preference.high_temperature.time.dinner.met_adjustment,
-            ),
-            (
-                met_clo_preference.high_temperature.time.sleep_prep.enabled,
-                met_clo_preference.high_temperature.time.sleep_prep.start_time,
-                met_clo_preference.high_temperature.time.sleep_prep.end_time,
-                met_clo_preference.high_temperature.time.sleep_prep.met_adjustment,
-            ),
-        ]
-
-        # 各食事時間帯に応じてMETを調整
-        for enabled, start, end, adjustment in meal_adjustments:
+        active_windows = WeeklyCalendar.get().active_windows(TimeHelper.get_current_time())
+
+        # 各食事時間帯（昼食、夕食、就寝前の順）に応じてMETを調整
+        for meal in WeeklyCalendar.MEALS:
+            period = getattr(met_clo_preference.high_temperature.time, meal)
             if (
-                enabled and start <= TimeHelper.get_current_time().time() <= end
+                period.enabled and f"meal.{meal}" in active_windows
             ):  # 設定が有効で、現在の時間帯に該当する場合
-                met = round(met + adjustment, 2)  # METを増加
+                met = round(met + period.met_adjustment, 2)  # METを増加
 
         return met
 
     @staticmethod
-    def _adjust_for_solar(met: float) -> float:
+    def _adjust_for_solar(
+        met: float, closest_future_forecast: WeatherForecastHourlyModel | None = None
+    ) -> float:
         """
         太陽光利用による暖房抑制を考慮してMET値を調整する。
 
         Args:
             met (float): 調整前のMET値
+            closest_future_forecast (WeatherForecastHourlyModel | None): 直近の天気予報。
+                省略した場合はデータベースから取得する
 
         Returns:
             float: 調整後のMET値
         """
-        # 現在の日時を取得
-        current_time = TimeHelper.get_current_time()
-
         # 太陽光利用による暖房抑制が有効でない場合は何もせず返す
         if not met_clo_preference.solar_utilization.heating_reduction.enabled:
             return met
 
         # 現在時刻が暖房抑制の設定時間外である場合は何もせず返す
         heating_reduction = met_clo_preference.solar_utilization.heating_reduction
-        if not (heating_reduction.start_time <= current_time.time() <= heating_reduction.end_time):
-            return met
-
-        # データベースが無効化されている場合は何もせず返す
-        if not app_preference.database.enabled:
+        if not WeeklyCalendar.get().is_active(
+            WeeklyCalendar.HEATING_REDUCTION, TimeHelper.get_current_time()
+        ):
             return met
 
-        # 現在時刻を基準に次の時間単位の天気予報を取得
-        with DBSessionManager.session() as session:
-            weather_service = WeatherForecastHourlyService(session)
-            weather_forecast = weather_service.get_closest_future_forecast()
-
-            # 天気予報データが存在する場合に処理を進める
-            if weather_forecast:
-
-                # 曇り度が指定された閾値を下回る場合にMET値を調整
-                if (
-                    weather_forecast.cloud_percentage is not None
-                    and weather_forecast.cloud_percentage
-                    < heating_reduction.cloudiness_threshold / 100
-                ):
-                    # 曇り度が閾値を下回ることをログに記録
-                    SystemEventLogger.log_solar_utilization_heating_reduction()
-
-                    # 太陽光利用の効果を加味してMET値を調整
-                    return met + heating_reduction.met_adjustment
+        # 天気予報が渡されない場合は、現在時刻を基準に次の時間単位の天気予報を取得
+        weather_forecast = closest_future_forecast
+        if weather_forecast is None:
+            # データベースが無効化されている場合は何もせず返す
+            if not app_preference.database.enabled:
+                return met
+
+            with DBSessionManager.session() as session:
+                weather_service = WeatherForecastHourlyService(session)
+                weather_forecast = weather_service.get_closest_future_forecast()
+
+        # 曇り度が指定された閾値を下回る場合にMET値を調整
+        if (
+            weather_forecast
+            and weather_forecast.cloud_percentage is not None
+            and weather_forecast.cloud_percentage < heating_reduction.cloudiness_threshold / 100
+        ):
+            # 曇り度が閾値を下回ることをログに記録
+            SystemEventLogger.log_solar_utilization_heating_reduction()
+
+            # 太陽光利用の効果を加味してMET値を調整
+            return met + heating_reduction.met_adjustment
 
         # デフォルトではMET値をそのまま返す
         return met
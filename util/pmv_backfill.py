@@ -0,0 +1,437 @@
+import bisect
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import Row
+
+from db.db_session_manager import DBSessionManager
+from home_comfort_control import HomeComfortControl
+from logger.system_event_logger import logger
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
+from repository.services.pmv_service import PmvService
+from repository.services.weather_forecast_hourly_service import WeatherForecastHourlyService
+from repository.services.weather_forecast_service import WeatherForecastService
+from settings import LOCAL_TZ, app_preference, met_clo_preference, thermal_preference
+from shared.dataclass.effective_outdoor_temperature import EffectiveOutdoorTemperature
+from shared.dataclass.surface_temperatures import SurfaceTemperatures
+from util.met_clo_adjuster import MetCloAdjuster
+from util.pmv_kernel import PMVKernel
+from util.thermal_comfort import ThermalComfort
+from util.time_helper import TimeHelper
+
+
+@dataclass
+class PMVBackfillChunk:
+    """
+    再計算する測定をまとめたチャンク。測定ごとの値を列ごとのリストで保持します。
+    """
+
+    pmv_ids: list[int] = field(default_factory=list)
+    """PMVのID"""
+    measurement_ids: list[int] = field(default_factory=list)
+    """測定ID"""
+    measurement_times: list[datetime] = field(default_factory=list)
+    """測定日時（現地時刻）"""
+    outdoor_temperatures: list[float] = field(default_factory=list)
+    """外気温度の有効値"""
+    floor_temperatures: list[float] = field(default_factory=list)
+    """床付近の室温（メインセンサーの温度）"""
+    ceiling_temperatures: list[float] = field(default_factory=list)
+    """天井付近の室温（サブセンサーの温度。ない場合はメインセンサーの温度）"""
+    dry_bulb_temperatures: list[float] = field(default_factory=list)
+    """室内の平均気温"""
+    humidities: list[float] = field(default_factory=list)
+    """室内の平均湿度"""
+    mets: list[float] = field(default_factory=list)
+    """測定日時の設定で求めたMET値"""
+    relative_air_speeds: list[float] = field(default_factory=list)
+    """測定日時の設定で求めた相対風速"""
+    dynamic_clos: list[float] = field(default_factory=list)
+    """測定日時の設定で求めた動的な衣服の断熱性"""
+    stored: list[tuple[float | None, ...]] = field(default_factory=list)
+    """保存されているPMV、PPD、壁表面温度、平均放射温度、乾球温度、MET値、相対風速、動的な衣服の断熱性"""
+
+    def __len__(self) -> int:
+        return len(self.pmv_ids)
+
+
+class _ForecastLookup:
+    """測定日時から外気温度の有効値と直近の天気予報を求めるために、保存済みの天気予報をまとめたクラス。"""
+
+    def __init__(
+        self,
+        max_temperatures: dict[date, float],
+        hourly_forecasts: Sequence[WeatherForecastHourlyModel],
+    ):
+        self.max_temperatures = max_temperatures
+        self.hourly_forecasts = hourly_forecasts
+        self._forecast_times = [forecast.forecast_time for forecast in hourly_forecasts]
+
+    def get_closest_future_forecast(
+        self, measurement_time: datetime
+    ) -> WeatherForecastHourlyModel | None:
+        """ReplayEngineと同じく、測定日時を含まず、それ以降で直近の天気予報を返すメソッド。"""
+        index = bisect.bisect_right(self._forecast_times, measurement_time)
+        return self.hourly_forecasts[index] if index < len(self.hourly_forecasts) else None
+
+
+class PMVBackfill:
+    """
+    保存済みの測定のPMVを現在の熱特性設定で再計算するクラス。
+
+    測定とセンサ測定値をサーバーサイドカーソルで少しずつ読み込み、一定件数ごとに配列でまとめて
+    再計算して、値が変わったPMVだけを一括で更新します。メモリに保持するのは1チャンク分だけです。
+    チャンクを書き込むたびに最後の測定IDをチェックポイントに保存するため、中断しても続きから再開できます。
+
+    MET値と衣服の断熱性は、測定日時を現在時刻として制御サイクルと同じくMetCloAdjusterで求め直します。
+    直近の天気予報には測定日時より後で最も近い保存済みの予報を使い、ない場合は太陽光利用の調整を行いません。
+    風速は保存されている相対風速と記録時のMET値から求め、サーキュレーターで風量を増やした測定もそのまま扱います。
+    """
+
+    _FILE_VERSION = 1
+    """チェックポイントのファイル形式のバージョン"""
+
+    _CHANGE_TOLERANCE = 1e-9
+    """この差以下の値は変わっていないとみなす"""
+
+    def __init__(self, checkpoint_path: str | None = None, restart: bool = False):
+        """
+        Args:
+            checkpoint_path (str | None): チェックポイントのファイルのパス。Noneの場合は保存しない
+            restart (bool): チェックポイントを無視して最初から再計算するかどうか
+        """
+        self.checkpoint_path = checkpoint_path
+        self.preference_hash = PMVBackfill.calculate_preference_hash()
+        self.last_measurement_id = 0
+        self.processed = 0
+        self.updated = 0
+        self.surface_state: SurfaceTemperatures | None = None
+        if checkpoint_path and not restart:
+            self.load_checkpoint()
+
+    @staticmethod
+    def calculate_preference_hash() -> str:
+        """再計算に使う熱特性設定・METとCLOの設定・起床時間と気温の閾値のハッシュ値を計算するメソッド。"""
+        preferences = (
+            thermal_preference,
+            met_clo_preference,
+            app_preference.temperature_thresholds,
+            app_preference.weekday_awake_period,
+            app_preference.weekend_awake_period,
+        )
+        data = "\n".join(preference.model_dump_json() for preference in preferences)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def load_checkpoint(self) -> bool:
+        """
+        チェックポイントを読み込むメソッド。
+
+        再計算に使う設定が保存時から変わっている場合は、最初から再計算するために読み込みません。
+
+        Returns:
+            bool: 読み込んだかどうか
+        """
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("version") != PMVBackfill._FILE_VERSION:
+            return False
+        if data.get("preference_hash") != self.preference_hash:
+            return False
+
+        self.last_measurement_id = data["last_measurement_id"]
+        self.processed = data["processed"]
+        self.updated = data["updated"]
+        surface_state = data.get("surface_state")
+        self.surface_state = (
+            SurfaceTemperatures(
+                wall=surface_state["wall"],
+                ceiling=surface_state["ceiling"],
+                floor=surface_state["floor"],
+                updated_at=datetime.fromisoformat(surface_state["updated_at"]),
+            )
+            if surface_state
+            else None
+        )
+        return True
+
+    def save_checkpoint(self):
+        """チェックポイントを保存するメソッド。"""
+        if not self.checkpoint_path:
+            return
+
+        data = {
+            "version": PMVBackfill._FILE_VERSION,
+            "preference_hash": self.preference_hash,
+            "last_measurement_id": self.last_measurement_id,
+            "processed": self.processed,
+            "updated": self.updated,
+            "surface_state": (
+                {
+                    "wall": self.surface_state.wall,
+                    "ceiling": self.surface_state.ceiling,
+                    "floor": self.surface_state.floor,
+                    "updated_at": self.surface_state.updated_at.isoformat(),
+                }
+                if self.surface_state
+                else None
+            ),
+        }
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 書き込み途中のファイルを読まないように、一時ファイルから置き換える
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def run(
+        self,
+        chunk_size: int = 1000,
+        dry_run: bool = False,
+        on_progress: Callable[["PMVBackfill", float], None] | None = None,
+    ):
+        """
+        チェックポイントの続きから最後の測定までPMVを再計算するメソッド。
+
+        METとCLOを求める間は現在時刻を測定日時に差し替え、過去の測定に現在の天気予報を使わないように
+        データベースの設定を無効にし、INFOレベルのログを出力しません。終了後は元に戻します。
+
+        Args:
+            chunk_size (int): まとめて再計算・更新する測定の件数
+            dry_run (bool): 再計算だけを行い、データベースとチェックポイントに書き込まないかどうか
+            on_progress (Callable | None): チャンクごとに呼び出す関数。自身と経過秒数を受け取る
+        """
+        start = time.perf_counter()
+        database_enabled = app_preference.database.enabled
+        log_level = logger.level
+        try:
+            app_preference.database.enabled = False
+            logger.setLevel(logging.WARNING)
+            with DBSessionManager.session() as read_session:
+                forecast_max_temperatures = WeatherForecastService(
+                    read_session
+                ).get_max_temperatures_by_date()
+                hourly_forecasts = WeatherForecastHourlyService(read_session).get_all()
+                rows = PmvService(read_session).stream_with_sensor_readings(
+                    self.last_measurement_id, yield_per=chunk_size * 4
+                )
+                for chunk in PMVBackfill.iterate_chunks(
+                    rows, chunk_size, forecast_max_temperatures, hourly_forecasts
+                ):
+                    values, self.surface_state = PMVBackfill.calculate(chunk, self.surface_state)
+                    if not dry_run:
+                        # 読み込み中のカーソルを閉じないように、書き込みは別のセッションで行う
+                        with DBSessionManager.auto_commit_session() as write_session:
+                            PmvService(write_session).bulk_update(values)
+                    self.last_measurement_id = chunk.measurement_ids[-1]
+                    self.processed += len(chunk)
+                    self.updated += len(values)
+                    if not dry_run:
+                        self.save_checkpoint()
+                    if on_progress:
+                        on_progress(self, time.perf_counter() - start)
+        finally:
+            app_preference.database.enabled = database_enabled
+            logger.setLevel(log_level)
+            TimeHelper.set_current_time(None)
+
+    @staticmethod
+    def iterate_chunks(
+        rows: Iterable[Row],
+        chunk_size: int,
+        forecast_max_temperatures: dict[date, float],
+        hourly_forecasts: Sequence[WeatherForecastHourlyModel],
+    ) -> Iterator[PMVBackfillChunk]:
+        """
+        PMVとセンサ測定値の組の行を測定ごとにまとめ、一定件数ごとのチャンクにするメソッド。
+
+        行はPMVのIDごとに連続している必要があります。メインセンサーの温度と湿度がない測定は除きます。
+        METとCLOを求めるため、測定ごとに現在時刻を測定日時に差し替えます。
+
+        Args:
+            rows (Iterable[Row]): PmvService.stream_with_sensor_readingsの行
+            chunk_size (int): チャンクの測定件数
+            forecast_max_temperatures (dict[date, float]): 外気センサーがない場合に使う日ごとの最高気温
+            hourly_forecasts (Sequence[WeatherForecastHourlyModel]): 予報時刻の順に並んだ天気予報
+
+        Yields:
+            PMVBackfillChunk: 測定をまとめたチャンク
+        """
+        control = HomeComfortControl()
+        forecasts = _ForecastLookup(forecast_max_temperatures, hourly_forecasts)
+        chunk = PMVBackfillChunk()
+        readings: list[Row] = []
+        for row in rows:
+            if readings and readings[0].pmv_id != row.pmv_id:
+                PMVBackfill._append_measurement(chunk, readings, control, forecasts)
+                readings = []
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = PMVBackfillChunk()
+            readings.append(row)
+
+        if readings:
+            PMVBackfill._append_measurement(chunk, readings, control, forecasts)
+        if len(chunk) > 0:
+            yield chunk
+
+    @staticmethod
+    def _append_measurement(
+        chunk: PMVBackfillChunk,
+        readings: list[Row],
+        control: HomeComfortControl,
+        forecasts: _ForecastLookup,
+    ):
+        """1件の測定のセンサ測定値から再計算に必要な値を求めてチャンクに追加するメソッド。"""
+        sensors: dict[str, list[Row]] = {}
+        for reading in readings:
+            if reading.temperature is not None and reading.humidity is not None:
+                sensors.setdefault(reading.category, []).append(reading)
+        if "main" not in sensors:
+            return
+
+        # HomeSensorと同じくメイン、サブ、補助センサーの順に平均する
+        main = sensors["main"][0]
+        sub = sensors["sub"][0] if "sub" in sensors else None
+        indoor = [main] + ([sub] if sub else []) + sensors.get("supplementary", [])
+        outdoor = sensors["outdoor"][0] if "outdoor" in sensors else None
+
+        first = readings[0]
+        measurement_time = first.measurement_time.astimezone(LOCAL_TZ)
+        outdoor_temperature = EffectiveOutdoorTemperature(
+            outdoor_temperature=outdoor.temperature if outdoor else None,
+            forecast_temperature=forecasts.max_temperatures.get(measurement_time.date()),
+        )
+
+        # 制御サイクルと同じく、測定日時の就寝状態と直近の天気予報からMETとCLOを求める
+        TimeHelper.set_current_time(measurement_time)
+        comfort_factors = MetCloAdjuster.calculate_comfort_factors(
+            outdoor_temperature,
+            control.is_within_sleeping_period(),
+            forecasts.get_closest_future_forecast(measurement_time),
+        )
+        # 保存されている相対風速は記録時のMET値で補正されているため、補正前の風速に戻してから求め直す
+        wind_speed = (
+            round(first.relative_air_speed - 0.3 * (first.met - 1), 3)
+            if first.met > 1
+            else first.relative_air_speed
+        )
+        relative_air_speed = PMVKernel.v_relative(wind_speed, comfort_factors.met).item(0)
+        dynamic_clo = PMVKernel.clo_dynamic(comfort_factors.clo, comfort_factors.met).item(0)
+
+        chunk.pmv_ids.append(first.pmv_id)
+        chunk.measurement_ids.append(first.measurement_id)
+        chunk.measurement_times.append(measurement_time)
+        chunk.outdoor_temperatures.append(outdoor_temperature.value)
+        chunk.floor_temperatures.append(main.temperature)
+        chunk.ceiling_temperatures.append(sub.temperature if sub else main.temperature)
+        chunk.dry_bulb_temperatures.append(
+            sum(reading.temperature for reading in indoor) / len(indoor)
+        )
+        chunk.humidities.append(sum(reading.humidity for reading in indoor) / len(indoor))
+        chunk.mets.append(comfort_factors.met)
+        chunk.relative_air_speeds.append(relative_air_speed)
+        chunk.dynamic_clos.append(dynamic_clo)
+        chunk.stored.append(
+            (
+                first.pmv,
+                first.ppd,
+                first.wall_surface_temperature,
+                first.mean_radiant_temperature,
+                first.dry_bulb_temperature,
+                first.met,
+                first.relative_air_speed,
+                first.dynamic_clo,
+            )
+        )
+
+    @staticmethod
+    def calculate(
+        chunk: PMVBackfillChunk, surface_state: SurfaceTemperatures | None = None
+    ) -> tuple[list[dict], SurfaceTemperatures | None]:
+        """
+        チャンクの測定のPMVをまとめて再計算するメソッド。
+
+        表面温度の過渡応答モデルが有効な場合は、前のチャンクの最後の表面温度から続けて計算します。
+
+        Args:
+            chunk (PMVBackfillChunk): 測定をまとめたチャンク
+            surface_state (SurfaceTemperatures | None): 前のチャンクの最後の表面温度
+
+        Returns:
+            tuple: 値が変わったPMVの更新内容（PmvService.bulk_updateの形式）と、チャンクの最後の表面温度
+        """
+        results, last_surface_state = ThermalComfort.calculate_pmv_array(
+            chunk.outdoor_temperatures,
+            chunk.floor_temperatures,
+            chunk.ceiling_temperatures,
+            chunk.dry_bulb_temperatures,
+            chunk.humidities,
+            chunk.mets,
+            chunk.relative_air_speeds,
+            chunk.dynamic_clos,
+            chunk.measurement_times,
+            surface_state,
+        )
+        recalculated = np.column_stack(
+            (
+                results["pmv"],
+                results["ppd"],
+                results["wall"],
+                results["mean_radiant_temperature"],
+                np.array(chunk.dry_bulb_temperatures, dtype=float),
+                np.array(chunk.mets, dtype=float),
+                np.array(chunk.relative_air_speeds, dtype=float),
+                np.array(chunk.dynamic_clos, dtype=float),
+            )
+        )
+        stored = np.array(chunk.stored, dtype=float)
+
+        # 計算できなかった測定は更新せず、値が変わった測定だけを更新する
+        valid = np.all(np.isfinite(recalculated), axis=1)
+        changed = ~np.all(
+            np.abs(recalculated - stored) <= PMVBackfill._CHANGE_TOLERANCE, axis=1
+        )
+        # clo・air_speedの列にはPmvService.insertと同じく動的な衣服の断熱性と相対風速を保存する
+        values = [
+            {
+                "id": chunk.pmv_ids[index],
+                "pmv": pmv,
+                "ppd": ppd,
+                "wall_surface_temperature": wall_surface_temperature,
+                "mean_radiant_temperature": mrt,
+                "dry_bulb_temperature": tdb,
+                "met": met,
+                "clo": dynamic_clo,
+                "air_speed": relative_air_speed,
+                "relative_air_speed": relative_air_speed,
+                "dynamic_clo": dynamic_clo,
+            }
+            for index, (
+                pmv,
+                ppd,
+                wall_surface_temperature,
+                mrt,
+                tdb,
+                met,
+                relative_air_speed,
+                dynamic_clo,
+            ) in zip(
+                np.flatnonzero(valid & changed).tolist(),
+                recalculated[valid & changed].tolist(),
+            )
+        ]
+        return values, last_surface_state
+
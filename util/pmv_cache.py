@@ -0,0 +1,131 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Callable
+
+
+class PMVCache:
+    """
+    PMV・PPDの計算結果を保持するLRUキャッシュクラス。
+
+    入力値はセンサーの分解能（温度0.1度、湿度1%、met・clo・風速0.01）で丸めてキーにするため、
+    前回からほとんど変化していない入力では計算を省略できます。
+    保存先のパスを指定すると、プロセスをまたいで計算結果を再利用できます。
+
+    Attributes:
+        hits (int): キャッシュから結果を返した回数
+        misses (int): 計算を実行した回数
+    """
+
+    _FILE_VERSION = 1
+    """保存ファイルの形式のバージョン"""
+
+    def __init__(self, max_size: int, namespace: str, persist_path: str | None = None):
+        """
+        Args:
+            max_size (int): 保持する計算結果の最大件数
+            namespace (str): 計算方法を識別する名前。保存ファイルの名前が一致しない場合は読み込まない
+            persist_path (str | None): 計算結果を保存するファイルのパス
+        """
+        self._entries: OrderedDict[tuple, tuple[float, float]] = OrderedDict()
+        self._max_size = max_size
+        self._namespace = namespace
+        self._persist_path = persist_path
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if persist_path:
+            self.load()
+
+    @staticmethod
+    def quantize(
+        tdb: float, tr: float, vr: float, rh: float, met: float, clo: float
+    ) -> tuple[float, float, float, float, float, float]:
+        """
+        入力値をセンサーの分解能で丸めるメソッド。
+
+        Returns:
+            tuple: 丸めた乾球温度、平均放射温度、相対風速、相対湿度、met、clo
+        """
+        return (
+            round(float(tdb), 1),
+            round(float(tr), 1),
+            round(float(vr), 2),
+            float(round(float(rh))),
+            round(float(met), 2),
+            round(float(clo), 2),
+        )
+
+    def get_or_calculate(
+        self,
+        key: tuple,
+        calculate: Callable[..., tuple[float, float]],
+    ) -> tuple[float, float]:
+        """
+        キャッシュに計算結果があれば返し、なければ計算してキャッシュに追加するメソッド。
+
+        Args:
+            key (tuple): quantizeで丸めた入力値
+            calculate (Callable): 入力値を引数にPMVとPPDを返す関数
+
+        Returns:
+            tuple[float, float]: PMVとPPD
+        """
+        result = self._entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = calculate(*key)
+        self._entries[key] = result
+        self._dirty = True
+        # 上限を超えた場合は最も古い結果を捨てる
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> dict:
+        """
+        キャッシュの利用状況を返すメソッド。
+
+        Returns:
+            dict: ヒット数、ミス数、保持件数
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def load(self):
+        """保存ファイルから計算結果を読み込むメソッド。読み込めない場合は空のまま使用する。"""
+        try:
+            with open(self._persist_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") != PMVCache._FILE_VERSION or data.get("namespace") != self._namespace:
+            return
+
+        for *key, pmv, ppd in data.get("entries", [])[-self._max_size :]:
+            self._entries[tuple(key)] = (pmv, ppd)
+
+    def save(self):
+        """計算結果を保存ファイルに書き出すメソッド。変更がない場合は何もしない。"""
+        if not self._persist_path or not self._dirty:
+            return
+
+        data = {
+            "version": PMVCache._FILE_VERSION,
+            "namespace": self._namespace,
+            # 古い順に書き出し、読み込み時にLRUの順序を復元する
+            "entries": [[*key, pmv, ppd] for key, (pmv, ppd) in self._entries.items()],
+        }
+        directory = os.path.dirname(self._persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 書き込み途中のファイルを読まないように、一時ファイルから置き換える
+        temporary_path = f"{self._persist_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, self._persist_path)
+        self._dirty = False
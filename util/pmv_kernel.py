@@ -0,0 +1,594 @@
+import math
+
+import numpy as np
+
+from util.root_finder import RootFinder
+
+
+class PMVKernel:
+    """
+    ASHRAE 55のPMV・PPDをNumPyだけで計算するクラス。
+
+    pythermalcomfort 2.10のpmv_ppd（standard="ASHRAE", limit_inputs=False）、v_relative、
+    clo_dynamic（ASHRAE基準）と同じ手順で計算します。相対風速が0.1m/sを超える場合の冷却効果は、
+    2ノードモデルのSET（標準新有効温度）が静穏気流と等しくなる温度差をBrent法で求めます。
+    pythermalcomfortはnumbaとscipyを読み込むため、起動時間とメモリを抑えたい場合に使います。
+    """
+
+    STILL_AIR_SPEED = 0.1
+    """冷却効果の計算で静穏気流とみなす風速（m/s）"""
+
+    COOLING_EFFECT_LIMIT = 40.0
+    """冷却効果を探索する上限（度）"""
+
+    SCALAR_COOLING_EFFECT_LIMIT = 16
+    """冷却効果を1件ずつPythonのfloatで計算する最大の件数。これより多い場合は配列でまとめて計算する"""
+
+    @staticmethod
+    def calculate_pmv_ppd(
+        tdb: float | np.ndarray,
+        tr: float | np.ndarray,
+        vr: float | np.ndarray,
+        rh: float | np.ndarray,
+        met: float | np.ndarray,
+        clo: float | np.ndarray,
+        wme: float | np.ndarray = 0,
+    ) -> dict[str, np.ndarray]:
+        """
+        pmv_ppdと同じ形式でPMVとPPDを返すメソッド。
+
+        Returns:
+            dict: 小数第2位に丸めたPMV（pmv）と小数第1位に丸めたPPD（ppd）
+        """
+        pmv = PMVKernel.calculate_pmv(tdb, tr, vr, rh, met, clo, wme)
+        ppd = 100.0 - 95.0 * np.exp(-0.03353 * pmv**4.0 - 0.2179 * pmv**2.0)
+        return {"pmv": np.around(pmv, 2), "ppd": np.around(ppd, 1)}
+
+    @staticmethod
+    def calculate_pmv(
+        tdb: float | np.ndarray,
+        tr: float | np.ndarray,
+        vr: float | np.ndarray,
+        rh: float | np.ndarray,
+        met: float | np.ndarray,
+        clo: float | np.ndarray,
+        wme: float | np.ndarray = 0,
+        cooling: float | np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        冷却効果で補正したPMVを丸めずに計算するメソッド。
+
+        Args:
+            cooling (float | np.ndarray | None): 事前に計算した冷却効果（度）。Noneの場合はcooling_effectで計算する
+
+        Returns:
+            np.ndarray: 丸めていないPMV
+        """
+        arrays = np.broadcast_arrays(
+            *(
+                np.asarray(value, dtype=float)
+                for value in (tdb, tr, vr, rh, met, clo, wme, 0 if cooling is None else cooling)
+            )
+        )
+        shape = arrays[0].shape
+        tdb, tr, vr, rh, met, clo, wme, cooling_array = (array.ravel() for array in arrays)
+        cooling = (
+            PMVKernel.cooling_effect(tdb, tr, vr, rh, met, clo, wme)
+            if cooling is None
+            else cooling_array
+        )
+        pmv = PMVKernel._calculate_fanger_pmv(
+            tdb - cooling,
+            tr - cooling,
+            np.where(cooling > 0, PMVKernel.STILL_AIR_SPEED, vr),
+            rh,
+            met,
+            clo,
+            wme,
+        )
+        return pmv.reshape(shape)
+
+    @staticmethod
+    def cooling_effect(
+        tdb: float | np.ndarray,
+        tr: float | np.ndarray,
+        vr: float | np.ndarray,
+        rh: float | np.ndarray,
+        met: float | np.ndarray,
+        clo: float | np.ndarray,
+        wme: float | np.ndarray = 0,
+    ) -> np.ndarray:
+        """
+        風による冷却効果（度）を計算するメソッド（pythermalcomfortのcooling_effectと同じ計算）。
+
+        相対風速が0.1m/s以下の場合、または探索範囲内に解がない場合は0になります。
+        冷却効果を求める要素が少ない場合は、配列の演算1回ごとのオーバーヘッドが計算時間の大半になるため、
+        1件ずつPythonのfloatで計算します（制御サイクルの1件の計算で約80msから数msになります）。
+
+        Returns:
+            np.ndarray: 小数第2位に丸めた冷却効果
+        """
+        arrays = np.broadcast_arrays(
+            *(np.asarray(value, dtype=float) for value in (tdb, tr, vr, rh, met, clo, wme))
+        )
+        shape = arrays[0].shape
+        tdb, tr, vr, rh, met, clo, wme = (array.ravel() for array in arrays)
+
+        cooling = np.zeros(tdb.size)
+        elevated = np.flatnonzero(vr > PMVKernel.STILL_AIR_SPEED)
+        if elevated.size == 0:
+            return cooling.reshape(shape)
+
+        if elevated.size <= PMVKernel.SCALAR_COOLING_EFFECT_LIMIT:
+            for index in elevated.tolist():
+                cooling[index] = PMVKernel._calculate_cooling_effect_scalar(
+                    tdb[index], tr[index], vr[index], rh[index], met[index], clo[index], wme[index]
+                )
+            return cooling.reshape(shape)
+
+        tdb, tr, vr, rh, met, clo, wme = (
+            array[elevated] for array in (tdb, tr, vr, rh, met, clo, wme)
+        )
+        initial = PMVKernel._calculate_standard_effective_temperature(
+            tdb, tr, vr, rh, met, clo, wme
+        )
+
+        def set_difference(x: np.ndarray, index: np.ndarray) -> np.ndarray:
+            # 静穏気流で温度をx度下げたときのSETと、実際の風速でのSETとの差
+            return (
+                PMVKernel._calculate_standard_effective_temperature(
+                    tdb[index] - x,
+                    tr[index] - x,
+                    PMVKernel.STILL_AIR_SPEED,
+                    rh[index],
+                    met[index],
+                    clo[index],
+                    wme[index],
+                )
+                - initial[index]
+            )
+
+        root = RootFinder.find_root_brent(
+            set_difference,
+            np.zeros(elevated.size),
+            np.full(elevated.size, PMVKernel.COOLING_EFFECT_LIMIT),
+        )
+        # pythermalcomfortと同じく、解が求まらない場合は冷却効果なしとする
+        cooling[elevated] = np.around(np.nan_to_num(root, nan=0.0), 2)
+        return cooling.reshape(shape)
+
+    @staticmethod
+    def _calculate_cooling_effect_scalar(
+        tdb: float, tr: float, vr: float, rh: float, met: float, clo: float, wme: float
+    ) -> float:
+        """1件の冷却効果をcooling_effectと同じ手順でPythonのfloatで計算するメソッド。"""
+        tdb, tr, vr, rh, met, clo, wme = (
+            float(value) for value in (tdb, tr, vr, rh, met, clo, wme)
+        )
+        initial = PMVKernel._calculate_standard_effective_temperature_scalar(
+            tdb, tr, vr, rh, met, clo, wme
+        )
+        root = RootFinder.find_root_brent_scalar(
+            # 静穏気流で温度をx度下げたときのSETと、実際の風速でのSETとの差
+            lambda x: PMVKernel._calculate_standard_effective_temperature_scalar(
+                tdb - x, tr - x, PMVKernel.STILL_AIR_SPEED, rh, met, clo, wme
+            )
+            - initial,
+            0.0,
+            PMVKernel.COOLING_EFFECT_LIMIT,
+        )
+        # pythermalcomfortと同じく、解が求まらない場合は冷却効果なしとする
+        return 0.0 if math.isnan(root) else float(np.around(root, 2))
+
+    @staticmethod
+    def v_relative(v: float | np.ndarray, met: float | np.ndarray) -> np.ndarray:
+        """体の動きを考慮した相対風速を計算するメソッド（pythermalcomfortのv_relativeと同じ計算）。"""
+        return np.where(met > 1, np.around(v + 0.3 * (met - 1), 3), v)
+
+    @staticmethod
+    def clo_dynamic(clo: float | np.ndarray, met: float | np.ndarray) -> np.ndarray:
+        """体の動きを考慮した動的な衣服の熱抵抗を計算するメソッド（pythermalcomfortのclo_dynamicのASHRAE基準と同じ計算）。"""
+        return np.where(met > 1.2, np.around(clo * (0.6 + 0.4 / met), 3), clo)
+
+    @staticmethod
+    def _calculate_fanger_pmv(
+        tdb: np.ndarray,
+        tr: np.ndarray,
+        vr: np.ndarray,
+        rh: np.ndarray,
+        met: np.ndarray,
+        clo: np.ndarray,
+        wme: np.ndarray,
+    ) -> np.ndarray:
+        """
+        FangerのPMVを計算するメソッド。
+
+        着衣表面温度の反復計算は要素ごとに収束判定し、収束していない要素だけを更新します。
+        """
+        pa = rh * 10 * np.exp(16.6536 - 4030.183 / (tdb + 235))
+
+        icl = 0.155 * clo  # 衣服の熱抵抗（m2K/W）
+        m = met * 58.15  # 代謝量（W/m2）
+        w = wme * 58.15  # 外部仕事（W/m2）
+        mw = m - w  # 体内での熱産生
+        f_cl = np.where(icl <= 0.078, 1 + 1.29 * icl, 1.05 + 0.645 * icl)  # 着衣面積係数
+
+        # 強制対流の熱伝達率
+        hcf = 12.1 * np.sqrt(vr)
+        hc = hcf.copy()
+        taa = tdb + 273
+        tra = tr + 273
+        t_cla = taa + (35.5 - tdb) / (3.5 * icl + 0.1)
+
+        p1 = icl * f_cl
+        p2 = p1 * 3.96
+        p3 = p1 * 100
+        p4 = p1 * taa
+        p5 = (308.7 - 0.028 * mw) + (p2 * (tra / 100.0) ** 4)
+        xn = t_cla / 100
+        xf = t_cla / 50
+        eps = 0.00015
+
+        # 着衣表面温度の反復計算
+        active = np.flatnonzero(np.abs(xn - xf) > eps)
+        iterations = 0
+        while active.size > 0:
+            xf[active] = (xf[active] + xn[active]) / 2
+            hcn = 2.38 * np.abs(100.0 * xf[active] - taa[active]) ** 0.25
+            hc[active] = np.where(hcf[active] > hcn, hcf[active], hcn)
+            xn[active] = (
+                p5[active] + p4[active] * hc[active] - p2[active] * xf[active] ** 4
+            ) / (100 + p3[active] * hc[active])
+            iterations += 1
+            if iterations > 150:
+                raise StopIteration("Max iterations exceeded")
+            active = active[np.abs(xn[active] - xf[active]) > eps]
+
+        tcl = 100 * xn - 273
+
+        hl1 = 3.05 * 0.001 * (5733 - (6.99 * mw) - pa)  # 皮膚からの拡散による熱損失
+        hl2 = np.where(mw > 58.15, 0.42 * (mw - 58.15), 0)  # 発汗による熱損失
+        hl3 = 1.7 * 0.00001 * m * (5867 - pa)  # 呼吸による潜熱損失
+        hl4 = 0.0014 * m * (34 - tdb)  # 呼吸による顕熱損失
+        hl5 = 3.96 * f_cl * (xn**4 - (tra / 100.0) ** 4)  # 放射による熱損失
+        hl6 = f_cl * hc * (tcl - tdb)  # 対流による熱損失
+
+        ts = 0.303 * np.exp(-0.036 * m) + 0.028
+        return ts * (mw - hl1 - hl2 - hl3 - hl4 - hl5 - hl6)
+
+    @staticmethod
+    def _calculate_standard_effective_temperature(
+        tdb: np.ndarray,
+        tr: np.ndarray,
+        v: float | np.ndarray,
+        rh: np.ndarray,
+        met: np.ndarray,
+        clo: np.ndarray,
+        wme: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Gaggeの2ノードモデルでSET（標準新有効温度）を計算するメソッド。
+
+        pythermalcomfortのset_tmp（calculate_ce=True, 立位, 大気圧101325Pa, 体表面積1.8258m2）と同じ計算で、
+        60分間の体温調節のシミュレーションは全要素をまとめて進め、
+        着衣表面温度とSETの反復計算は要素ごとに収束判定します。
+        """
+        tdb, tr, v, rh, met, clo, wme = np.broadcast_arrays(tdb, tr, v, rh, met, clo, wme)
+        vapor_pressure = rh * np.exp(18.6686 - 4030.183 / (tdb + 235.0)) / 100
+
+        air_speed = np.maximum(v, 0.1)
+        body_weight = 70  # 体重（kg）
+        met_factor = 58.2  # metの換算係数
+        sbc = 0.000000056697  # ステファン・ボルツマン定数
+        body_surface_area = 1.8258
+        temp_skin_neutral = 33.7
+        temp_core_neutral = 36.8
+        skin_blood_flow_neutral = 6.3
+
+        alfa = np.full(tdb.shape, 0.1)
+        temp_body_neutral = 0.1 * temp_skin_neutral + 0.9 * temp_core_neutral
+        t_skin = np.full(tdb.shape, temp_skin_neutral)
+        t_core = np.full(tdb.shape, temp_core_neutral)
+        m_bl = np.full(tdb.shape, skin_blood_flow_neutral)
+        e_skin = 0.1 * met
+
+        r_clo = 0.155 * clo  # 衣服の熱抵抗
+        f_a_cl = 1.0 + 0.15 * clo  # 着衣による体表面積の増加
+        lr = 2.2  # ルイス数
+        rm = (met - wme) * met_factor
+        m = met * met_factor
+        i_cl = np.where(clo > 0, 0.45, 1.0)  # 衣服の水蒸気透過効率
+        w_max = np.where(
+            clo > 0, 0.59 * air_speed**-0.08, 0.38 * air_speed**-0.29
+        )  # 皮膚ぬれ率の上限
+
+        h_cc = np.maximum(3.0, 8.600001 * air_speed**0.53)  # 対流熱伝達率
+        h_r = np.full(tdb.shape, 4.7)  # 放射熱伝達率
+        h_t = h_r + h_cc
+        r_a = 1.0 / (f_a_cl * h_t)
+        t_op = (h_r * tr + h_cc * tdb) / h_t  # 作用温度
+        q_res = 0.0023 * m * (44.0 - vapor_pressure)  # 呼吸による潜熱損失
+        c_res = 0.0014 * m * (34.0 - tdb)  # 呼吸による顕熱損失
+
+        # 1分ごとに60分間の体温調節をシミュレーションする
+        for _ in range(60):
+            t_cl = (r_a * t_skin + r_clo * t_op) / (r_a + r_clo)
+
+            # 着衣表面温度の反復計算（収束した要素は値を固定し、全要素が収束するまで繰り返す）
+            converged = np.zeros(tdb.shape, dtype=bool)
+            iterations = 0
+            while True:
+                h_r_new = 4.0 * 0.95 * sbc * ((t_cl + tr) / 2.0 + 273.15) ** 3.0 * 0.73
+                h_t_new = h_r_new + h_cc
+                r_a_new = 1.0 / (f_a_cl * h_t_new)
+                t_op_new = (h_r_new * tr + h_cc * tdb) / h_t_new
+                t_cl_new = (r_a_new * t_skin + r_clo * t_op_new) / (r_a_new + r_clo)
+                h_r = np.where(converged, h_r, h_r_new)
+                h_t = np.where(converged, h_t, h_t_new)
+                r_a = np.where(converged, r_a, r_a_new)
+                t_op = np.where(converged, t_op, t_op_new)
+                converged_now = ~converged & (np.abs(t_cl_new - t_cl) <= 0.01)
+                t_cl = np.where(converged, t_cl, t_cl_new)
+                converged |= converged_now
+                iterations += 1
+                if converged.all():
+                    break
+                if iterations > 150:
+                    raise StopIteration("Max iterations exceeded")
+
+            q_sensible = (t_skin - t_op) / (r_a + r_clo)  # 顕熱損失
+            hf_cs = (t_core - t_skin) * (5.28 + 1.163 * m_bl)
+            s_core = m - hf_cs - q_res - c_res - wme  # 核心部の蓄熱
+            s_skin = hf_cs - q_sensible - e_skin  # 皮膚の蓄熱
+            tc_sk = 0.97 * alfa * body_weight  # 皮膚の熱容量
+            tc_cr = 0.97 * (1 - alfa) * body_weight  # 核心部の熱容量
+            t_skin = t_skin + (s_skin * body_surface_area) / (tc_sk * 60.0)
+            t_core = t_core + s_core * body_surface_area / (tc_cr * 60.0)
+            t_body = alfa * t_skin + (1 - alfa) * t_core
+
+            # 体温調節の信号
+            sk_sig = t_skin - temp_skin_neutral
+            warm_sk = (sk_sig > 0) * sk_sig
+            colds = ((-1.0 * sk_sig) > 0) * (-1.0 * sk_sig)
+            c_reg_sig = t_core - temp_core_neutral
+            c_warm = (c_reg_sig > 0) * c_reg_sig
+            c_cold = ((-1.0 * c_reg_sig) > 0) * (-1.0 * c_reg_sig)
+            bd_sig = t_body - temp_body_neutral
+            warm_b = (bd_sig > 0) * bd_sig
+
+            # 皮膚血流量と発汗
+            m_bl = (skin_blood_flow_neutral + 120 * c_warm) / (1 + 0.5 * colds)
+            m_bl = np.where(m_bl > 90, 90, m_bl)
+            m_bl = np.where(m_bl < 0.5, 0.5, m_bl)
+            m_rsw = 170 * warm_b * np.exp(warm_sk / 10.7)
+            m_rsw = np.where(m_rsw > 500, 500, m_rsw)
+            e_rsw = 0.68 * m_rsw
+
+            # 蒸発による熱損失
+            r_ea = 1.0 / (lr * f_a_cl * h_cc)
+            r_ecl = r_clo / (lr * i_cl)
+            e_max = (np.exp(18.6686 - 4030.183 / (t_skin + 235.0)) - vapor_pressure) / (
+                r_ea + r_ecl
+            )
+            e_max = np.where(e_max == 0, 0.001, e_max)
+            p_rsw = e_rsw / e_max
+            w = 0.06 + 0.94 * p_rsw  # 皮膚ぬれ率
+            e_diff = w * e_max - e_rsw
+
+            saturated = w > w_max
+            w = np.where(saturated, w_max, w)
+            p_rsw = np.where(saturated, w_max / 0.94, p_rsw)
+            e_rsw = np.where(saturated, p_rsw * e_max, e_rsw)
+            e_diff = np.where(saturated, 0.06 * (1.0 - p_rsw) * e_max, e_diff)
+
+            condensing = e_max < 0
+            e_diff = np.where(condensing, 0, e_diff)
+            e_rsw = np.where(condensing, 0, e_rsw)
+            w = np.where(condensing, w_max, w)
+
+            e_skin = e_rsw + e_diff
+            m = rm + 19.4 * colds * c_cold  # ふるえによる熱産生を加える
+            alfa = 0.0417737 + 0.7451833 / (m_bl + 0.585417)
+
+        q_skin = q_sensible + e_skin  # 皮膚からの総熱損失
+        p_s_sk = np.exp(18.6686 - 4030.183 / (t_skin + 235.0))
+
+        # 標準環境での熱伝達
+        h_r_s = h_r
+        h_c_s = 3.0
+        h_t_s = h_c_s + h_r_s
+        r_clo_s = 1.52 / ((met - wme / met_factor) + 0.6944) - 0.1835
+        r_cl_s = 0.155 * r_clo_s
+        f_a_cl_s = 1.0 + 0.25 * r_clo_s
+        f_cl_s = 1.0 / (1.0 + 0.155 * f_a_cl_s * h_t_s * r_clo_s)
+        i_cl_s = 0.45 * h_c_s / h_t_s * (1 - f_cl_s) / (h_c_s / h_t_s - f_cl_s * 0.45)
+        r_a_s = 1.0 / (f_a_cl_s * h_t_s)
+        r_ea_s = 1.0 / (lr * f_a_cl_s * h_c_s)
+        r_ecl_s = r_cl_s / (lr * i_cl_s)
+        h_d_s = 1.0 / (r_a_s + r_cl_s)
+        h_e_s = 1.0 / (r_ea_s + r_ecl_s)
+
+        # 標準環境で皮膚からの熱損失が等しくなる温度を数値微分のニュートン法で求める
+        delta = 0.0001
+        set_old = np.around(t_skin - q_skin / h_d_s, 2)
+        _set = set_old.copy()
+        active = np.arange(tdb.size)
+        while active.size > 0:
+            x = set_old[active]
+            err_1 = (
+                q_skin[active]
+                - h_d_s[active] * (t_skin[active] - x)
+                - w[active]
+                * h_e_s[active]
+                * (p_s_sk[active] - 0.5 * np.exp(18.6686 - 4030.183 / (x + 235.0)))
+            )
+            err_2 = (
+                q_skin[active]
+                - h_d_s[active] * (t_skin[active] - (x + delta))
+                - w[active]
+                * h_e_s[active]
+                * (p_s_sk[active] - 0.5 * np.exp(18.6686 - 4030.183 / (x + delta + 235.0)))
+            )
+            _set[active] = x - delta * err_1 / (err_2 - err_1)
+            dx = _set[active] - x
+            set_old[active] = _set[active]
+            active = active[np.abs(dx) > 0.01]
+
+        return _set.reshape(tdb.shape)
+
+    @staticmethod
+    def _calculate_standard_effective_temperature_scalar(
+        tdb: float, tr: float, v: float, rh: float, met: float, clo: float, wme: float
+    ) -> float:
+        """
+        1件のSETを_calculate_standard_effective_temperatureと同じ手順でPythonのfloatで計算するメソッド。
+        """
+        exp = math.exp
+        vapor_pressure = rh * exp(18.6686 - 4030.183 / (tdb + 235.0)) / 100
+
+        air_speed = max(v, 0.1)
+        body_weight = 70  # 体重（kg）
+        met_factor = 58.2  # metの換算係数
+        sbc = 0.000000056697  # ステファン・ボルツマン定数
+        body_surface_area = 1.8258
+        temp_skin_neutral = 33.7
+        temp_core_neutral = 36.8
+        skin_blood_flow_neutral = 6.3
+
+        alfa = 0.1
+        temp_body_neutral = 0.1 * temp_skin_neutral + 0.9 * temp_core_neutral
+        t_skin = temp_skin_neutral
+        t_core = temp_core_neutral
+        m_bl = skin_blood_flow_neutral
+        e_skin = 0.1 * met
+
+        r_clo = 0.155 * clo  # 衣服の熱抵抗
+        f_a_cl = 1.0 + 0.15 * clo  # 着衣による体表面積の増加
+        lr = 2.2  # ルイス数
+        rm = (met - wme) * met_factor
+        m = met * met_factor
+        i_cl = 0.45 if clo > 0 else 1.0  # 衣服の水蒸気透過効率
+        w_max = (
+            0.59 * air_speed**-0.08 if clo > 0 else 0.38 * air_speed**-0.29
+        )  # 皮膚ぬれ率の上限
+
+        h_cc = max(3.0, 8.600001 * air_speed**0.53)  # 対流熱伝達率
+        h_r = 4.7  # 放射熱伝達率
+        h_t = h_r + h_cc
+        r_a = 1.0 / (f_a_cl * h_t)
+        t_op = (h_r * tr + h_cc * tdb) / h_t  # 作用温度
+        q_res = 0.0023 * m * (44.0 - vapor_pressure)  # 呼吸による潜熱損失
+        c_res = 0.0014 * m * (34.0 - tdb)  # 呼吸による顕熱損失
+        r_ea = 1.0 / (lr * f_a_cl * h_cc)
+        r_ecl = r_clo / (lr * i_cl)
+
+        # 1分ごとに60分間の体温調節をシミュレーションする
+        for _ in range(60):
+            t_cl = (r_a * t_skin + r_clo * t_op) / (r_a + r_clo)
+
+            # 着衣表面温度の反復計算
+            iterations = 0
+            while True:
+                h_r = 4.0 * 0.95 * sbc * ((t_cl + tr) / 2.0 + 273.15) ** 3.0 * 0.73
+                h_t = h_r + h_cc
+                r_a = 1.0 / (f_a_cl * h_t)
+                t_op = (h_r * tr + h_cc * tdb) / h_t
+                t_cl_new = (r_a * t_skin + r_clo * t_op) / (r_a + r_clo)
+                converged = abs(t_cl_new - t_cl) <= 0.01
+                t_cl = t_cl_new
+                iterations += 1
+                if converged:
+                    break
+                if iterations > 150:
+                    raise StopIteration("Max iterations exceeded")
+
+            q_sensible = (t_skin - t_op) / (r_a + r_clo)  # 顕熱損失
+            hf_cs = (t_core - t_skin) * (5.28 + 1.163 * m_bl)
+            s_core = m - hf_cs - q_res - c_res - wme  # 核心部の蓄熱
+            s_skin = hf_cs - q_sensible - e_skin  # 皮膚の蓄熱
+            tc_sk = 0.97 * alfa * body_weight  # 皮膚の熱容量
+            tc_cr = 0.97 * (1 - alfa) * body_weight  # 核心部の熱容量
+            t_skin = t_skin + (s_skin * body_surface_area) / (tc_sk * 60.0)
+            t_core = t_core + s_core * body_surface_area / (tc_cr * 60.0)
+            t_body = alfa * t_skin + (1 - alfa) * t_core
+
+            # 体温調節の信号
+            sk_sig = t_skin - temp_skin_neutral
+            warm_sk = sk_sig if sk_sig > 0 else 0.0
+            colds = -sk_sig if sk_sig < 0 else 0.0
+            c_reg_sig = t_core - temp_core_neutral
+            c_warm = c_reg_sig if c_reg_sig > 0 else 0.0
+            c_cold = -c_reg_sig if c_reg_sig < 0 else 0.0
+            bd_sig = t_body - temp_body_neutral
+            warm_b = bd_sig if bd_sig > 0 else 0.0
+
+            # 皮膚血流量と発汗
+            m_bl = (skin_blood_flow_neutral + 120 * c_warm) / (1 + 0.5 * colds)
+            m_bl = min(max(m_bl, 0.5), 90)
+            m_rsw = min(170 * warm_b * exp(warm_sk / 10.7), 500)
+            e_rsw = 0.68 * m_rsw
+
+            # 蒸発による熱損失
+            e_max = (exp(18.6686 - 4030.183 / (t_skin + 235.0)) - vapor_pressure) / (
+                r_ea + r_ecl
+            )
+            if e_max == 0:
+                e_max = 0.001
+            p_rsw = e_rsw / e_max
+            w = 0.06 + 0.94 * p_rsw  # 皮膚ぬれ率
+            e_diff = w * e_max - e_rsw
+
+            if w > w_max:
+                w = w_max
+                p_rsw = w_max / 0.94
+                e_rsw = p_rsw * e_max
+                e_diff = 0.06 * (1.0 - p_rsw) * e_max
+
+            if e_max < 0:
+                e_diff = 0
+                e_rsw = 0
+                w = w_max
+
+            e_skin = e_rsw + e_diff
+            m = rm + 19.4 * colds * c_cold  # ふるえによる熱産生を加える
+            alfa = 0.0417737 + 0.7451833 / (m_bl + 0.585417)
+
+        q_skin = q_sensible + e_skin  # 皮膚からの総熱損失
+        p_s_sk = exp(18.6686 - 4030.183 / (t_skin + 235.0))
+
+        # 標準環境での熱伝達
+        h_r_s = h_r
+        h_c_s = 3.0
+        h_t_s = h_c_s + h_r_s
+        r_clo_s = 1.52 / ((met - wme / met_factor) + 0.6944) - 0.1835
+        r_cl_s = 0.155 * r_clo_s
+        f_a_cl_s = 1.0 + 0.25 * r_clo_s
+        f_cl_s = 1.0 / (1.0 + 0.155 * f_a_cl_s * h_t_s * r_clo_s)
+        i_cl_s = 0.45 * h_c_s / h_t_s * (1 - f_cl_s) / (h_c_s / h_t_s - f_cl_s * 0.45)
+        r_a_s = 1.0 / (f_a_cl_s * h_t_s)
+        r_ea_s = 1.0 / (lr * f_a_cl_s * h_c_s)
+        r_ecl_s = r_cl_s / (lr * i_cl_s)
+        h_d_s = 1.0 / (r_a_s + r_cl_s)
+        h_e_s = 1.0 / (r_ea_s + r_ecl_s)
+
+        # 標準環境で皮膚からの熱損失が等しくなる温度を数値微分のニュートン法で求める
+        delta = 0.0001
+        set_old = float(np.around(t_skin - q_skin / h_d_s, 2))
+        while True:
+            err_1 = (
+                q_skin
+                - h_d_s * (t_skin - set_old)
+                - w * h_e_s * (p_s_sk - 0.5 * exp(18.6686 - 4030.183 / (set_old + 235.0)))
+            )
+            err_2 = (
+                q_skin
+                - h_d_s * (t_skin - (set_old + delta))
+                - w
+                * h_e_s
+                * (p_s_sk - 0.5 * exp(18.6686 - 4030.183 / (set_old + delta + 235.0)))
+            )
+            _set = set_old - delta * err_1 / (err_2 - err_1)
+            dx = _set - set_old
+            set_old = _set
+            if abs(dx) <= 0.01:
+                return _set
@@ -0,0 +1,150 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from util.pmv_kernel import PMVKernel
+
+
+class PMVTable:
+    """
+    事前計算したPMVの表を多重線形補間して、PMV・PPDを求めるクラス。
+
+    表は乾球温度・平均放射温度・相対風速・相対湿度・met・cloの6次元の格子上で
+    PMVKernel（pythermalcomfortのpmv_ppdのASHRAE基準と同じ計算）でPMVを計算したもので、
+    メモリマップで読み込みます。
+    PPDはPMVから定義式で計算するため、表にはPMVのみを格納します。
+    格子の範囲外の入力は範囲の端の値に丸めて補間します。
+    """
+
+    AXES: dict[str, list[float]] = {
+        "tdb": [float(t) for t in range(10, 36)],
+        "tr": [10.0, 12.5, 15.0, 17.5, 20.0, 22.5, 25.0, 27.5, 30.0, 32.5, 35.0],
+        "vr": [0.0, 0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.6, 0.8, 1.0],
+        "rh": [20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0],
+        "met": [round(0.7 + 0.1 * i, 1) for i in range(14)],
+        "clo": [round(0.3 + 0.1 * i, 1) for i in range(18)],
+    }
+    """表の各次元の格子点（pmv_ppdの引数の順）"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): 表を保存したファイル（.npy）のパス。格子点は同じ名前の.jsonファイルから読み込む
+        """
+        with open(PMVTable._axes_path(path), encoding="utf-8") as f:
+            axes = json.load(f)
+        self._axes = [np.asarray(axes[name], dtype=float) for name in PMVTable.AXES]
+        self._values = np.load(path, mmap_mode="r")
+        if self._values.shape != tuple(len(axis) for axis in self._axes):
+            raise ValueError(f"PMV table shape mismatch: {path}")
+
+    def calculate_pmv(
+        self,
+        tdb: float | np.ndarray,
+        tr: float | np.ndarray,
+        vr: float | np.ndarray,
+        rh: float | np.ndarray,
+        met: float | np.ndarray,
+        clo: float | np.ndarray,
+    ) -> np.ndarray:
+        """
+        表を多重線形補間してPMVを計算するメソッド。
+
+        Returns:
+            np.ndarray: 丸めていないPMV
+        """
+        inputs = np.broadcast_arrays(
+            *(np.asarray(value, dtype=float) for value in (tdb, tr, vr, rh, met, clo))
+        )
+        shape = inputs[0].shape
+
+        # 次元ごとに、入力を挟む格子点の番号と上側の重みを求める
+        lower_indices = []
+        upper_weights = []
+        for axis, values in zip(self._axes, inputs):
+            values = np.clip(values.ravel(), axis[0], axis[-1])
+            index = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, len(axis) - 2)
+            lower_indices.append(index)
+            upper_weights.append((values - axis[index]) / (axis[index + 1] - axis[index]))
+
+        # 2^6個の頂点の値を重み付きで足し合わせる
+        pmv = np.zeros(lower_indices[0].shape)
+        for corner in product((0, 1), repeat=len(self._axes)):
+            weight = np.ones(pmv.shape)
+            for offset, upper_weight in zip(corner, upper_weights):
+                weight *= upper_weight if offset else 1 - upper_weight
+            pmv += weight * self._values[
+                tuple(index + offset for index, offset in zip(lower_indices, corner))
+            ]
+
+        return pmv.reshape(shape)
+
+    def calculate_pmv_ppd(
+        self,
+        tdb: float | np.ndarray,
+        tr: float | np.ndarray,
+        vr: float | np.ndarray,
+        rh: float | np.ndarray,
+        met: float | np.ndarray,
+        clo: float | np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """
+        pmv_ppdと同じ形式でPMVとPPDを返すメソッド。
+
+        Returns:
+            dict: 小数第2位に丸めたPMV（pmv）と小数第1位に丸めたPPD（ppd）
+        """
+        pmv = self.calculate_pmv(tdb, tr, vr, rh, met, clo)
+        ppd = 100.0 - 95.0 * np.exp(-0.03353 * pmv**4.0 - 0.2179 * pmv**2.0)
+        return {"pmv": np.around(pmv, 2), "ppd": np.around(ppd, 1)}
+
+    @staticmethod
+    def generate(path: str, workers: int | None = None):
+        """
+        PMVKernelで表を計算し、ファイルに保存するメソッド。
+
+        乾球温度の格子点ごとに別プロセスで計算し、メモリマップしたファイルに直接書き込みます。
+
+        Args:
+            path (str): 保存先のファイル（.npy）のパス
+            workers (int | None): 計算に使うプロセス数。Noneの場合はCPU数
+        """
+        shape = tuple(len(axis) for axis in PMVTable.AXES.values())
+        table = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape)
+        del table
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(
+                executor.map(
+                    PMVTable._generate_slice,
+                    [path] * shape[0],
+                    range(shape[0]),
+                )
+            )
+
+        with open(PMVTable._axes_path(path), "w", encoding="utf-8") as f:
+            json.dump(PMVTable.AXES, f)
+
+    @staticmethod
+    def _generate_slice(path: str, tdb_index: int):
+        """
+        乾球温度の1つの格子点について表を計算して書き込むメソッド。
+
+        pythermalcomfortのpmv_ppdに格子全体を配列で渡すと、np.vectorizeした冷却効果の計算が
+        最初の要素（相対風速0で整数の0を返す）に合わせて整数になり、風速のある格子点のPMVがずれるため、
+        要素ごとに冷却効果を計算するPMVKernelを使います。補間の誤差を増やさないように丸めずに格納します。
+        """
+        axes = list(PMVTable.AXES.values())
+        grid = np.meshgrid(*axes[1:], indexing="ij")
+        pmv = PMVKernel.calculate_pmv(axes[0][tdb_index], *grid)
+
+        table = np.load(path, mmap_mode="r+")
+        table[tdb_index] = pmv
+        table.flush()
+
+    @staticmethod
+    def _axes_path(path: str) -> str:
+        """格子点を保存するファイルのパスを返すメソッド。"""
+        return f"{path.removesuffix('.npy')}.json"
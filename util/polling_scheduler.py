@@ -0,0 +1,264 @@
+import json
+import os
+from datetime import datetime, time, timedelta
+
+import i18n
+
+from logger.system_event_logger import SystemEventLogger
+from settings import LOCAL_TZ, aircon_preference, app_preference
+from shared.dataclass.home_sensor import HomeSensor
+from shared.dataclass.polling_state import PollingState
+from util.api_quota import ApiQuota
+from util.time_helper import TimeHelper
+from util.weekly_calendar import WeeklyCalendar
+
+
+class PollingScheduler:
+    """
+    室温とPMVの変化の速さから、次に制御サイクルを実行する時刻を決めるクラス。
+
+    次の実行までの間隔は、次のうち最も短いものを最短・最長の実行間隔の範囲に収めて決めます。
+
+    - 室温が設定した変化量だけ変化するまでの時間
+    - PMVが設定した変化量だけ変化するまでの時間
+    - PMVが変化している方向にある最も近いPMV閾値に届くまでの時間
+
+    就寝中は間隔を長くし、時間帯が切り替わる時刻にはその時刻に実行します。
+    1日のAPI呼び出し回数の上限を、その日の残りの時間で使い切る間隔より短くはしません。
+    """
+
+    _FILE_VERSION = 1
+    """状態を保存するファイルの形式のバージョン"""
+
+    _DUE_TOLERANCE = timedelta(seconds=30)
+    """起動時刻のずれを許容する時間。次の実行時刻のこの時間前から実行する"""
+
+    @staticmethod
+    def is_due() -> bool:
+        """
+        次の実行時刻を過ぎているかどうかを判定するメソッド。
+
+        Returns:
+            bool: 実行する場合はTrue
+        """
+        state = PollingScheduler.load_state(app_preference.polling.state_path)
+        if state is None or TimeHelper.get_current_time() + PollingScheduler._DUE_TOLERANCE >= (
+            state.next_run_at
+        ):
+            return True
+
+        SystemEventLogger.log_info(
+            "polling.not_due", next_run_at=state.next_run_at.astimezone(LOCAL_TZ).strftime("%H:%M:%S")
+        )
+        return False
+
+    @staticmethod
+    def schedule_next(home_sensor: HomeSensor, pmv: float | None, is_sleeping: bool) -> datetime:
+        """
+        今回の測定値から次の実行時刻を決めて保存するメソッド。
+
+        Args:
+            home_sensor (HomeSensor): 今回の家のセンサー測定値
+            pmv (float | None): 今回のPMV。計算を省略した場合はNone
+            is_sleeping (bool): 就寝中かどうか
+
+        Returns:
+            datetime: 次の実行時刻
+        """
+        preference = app_preference.polling
+        previous = PollingScheduler.load_state(preference.state_path)
+        current_time = TimeHelper.get_current_time()
+        temperature = home_sensor.main.air_quality.temperature
+
+        minutes, reason = PollingScheduler.calculate_interval(
+            previous, current_time, temperature, pmv, is_sleeping
+        )
+
+        # API呼び出し回数は日ごとに数える
+        calls_per_cycle = PollingScheduler.count_calls_per_cycle(home_sensor)
+        api_calls = calls_per_cycle
+        if previous and previous.budget_date == current_time.date():
+            api_calls += previous.api_calls
+        if app_preference.api_quota.enabled:
+            # 呼び出し回数を記録している場合は、リトライなども含めた実際の回数を使う
+            api_calls = ApiQuota.count_calls()
+        budget_minutes = PollingScheduler.calculate_budget_interval(
+            current_time, api_calls, calls_per_cycle
+        )
+
+        if budget_minutes > minutes:
+            minutes, reason = budget_minutes, "budget"
+            next_run_at = current_time + timedelta(minutes=minutes)
+        else:
+            next_run_at = current_time + timedelta(minutes=minutes)
+            # 時間帯が切り替わる場合は、切り替わった時刻に実行する
+            transition = WeeklyCalendar.get().next_transition(current_time)
+            earliest = current_time + timedelta(minutes=preference.min_interval_minutes)
+            if transition is not None and earliest <= transition < next_run_at:
+                next_run_at, reason = transition, "time_window"
+
+        PollingScheduler.save_state(
+            preference.state_path,
+            PollingState(
+                measured_at=current_time,
+                temperature=temperature,
+                pmv=pmv if pmv is not None else previous.pmv if previous else None,
+                pmv_measured_at=(
+                    current_time
+                    if pmv is not None
+                    else previous.pmv_measured_at if previous else None
+                ),
+                next_run_at=next_run_at,
+                budget_date=current_time.date(),
+                api_calls=api_calls,
+            ),
+        )
+        SystemEventLogger.log_info(
+            "polling.next_run",
+            next_run_at=next_run_at.strftime("%H:%M:%S"),
+            minutes=round((next_run_at - current_time).total_seconds() / 60, 1),
+            reason=i18n.t(f"log.polling.reasons.{reason}"),
+            api_calls=api_calls,
+            budget=preference.daily_api_budget,
+        )
+        return next_run_at
+
+    @staticmethod
+    def calculate_interval(
+        previous: PollingState | None,
+        current_time: datetime,
+        temperature: float,
+        pmv: float | None,
+        is_sleeping: bool,
+    ) -> tuple[float, str]:
+        """
+        前回からの室温とPMVの変化の速さから、次の実行までの間隔を求めるメソッド。
+
+        Args:
+            previous (PollingState | None): 前回実行した時点の状態
+            current_time (datetime): 現在の日時
+            temperature (float): 現在のメインセンサーの温度
+            pmv (float | None): 現在のPMV。計算を省略した場合はNone
+            is_sleeping (bool): 就寝中かどうか
+
+        Returns:
+            tuple[float, str]: 間隔（分）と、間隔を決めた理由
+        """
+        preference = app_preference.polling
+        candidates = [(preference.max_interval_minutes, "max")]
+
+        elapsed = (current_time - previous.measured_at).total_seconds() / 60 if previous else 0
+        # 前回の測定値がない場合や古すぎる場合は、変化の速さが分からないので最短の間隔で測り直す
+        if previous is None or not 0 < elapsed <= preference.max_interval_minutes * 2:
+            candidates.append((preference.min_interval_minutes, "no_previous"))
+        else:
+            temperature_rate = abs(temperature - previous.temperature) / elapsed
+            if temperature_rate > 0:
+                candidates.append((preference.temperature_step / temperature_rate, "temperature"))
+
+            # PMVの計算を省略したサイクルがあるため、PMVの変化の速さはPMVを計算した日時からの経過時間で求める
+            pmv_elapsed = (
+                (current_time - previous.pmv_measured_at).total_seconds() / 60
+                if previous.pmv_measured_at
+                else elapsed
+            )
+            if (
+                pmv is not None
+                and previous.pmv is not None
+                and pmv != previous.pmv
+                and 0 < pmv_elapsed <= preference.max_interval_minutes * 2
+            ):
+                pmv_rate = abs(pmv - previous.pmv) / pmv_elapsed
+                candidates.append((preference.pmv_step / pmv_rate, "pmv"))
+
+                # PMVが変化している方向にある閾値だけを対象にする
+                direction = pmv - previous.pmv
+                distances = [
+                    abs(threshold.threshold - pmv)
+                    for threshold in aircon_preference.aircon_settings.pmv_thresholds
+                    if (threshold.threshold - pmv) * direction > 0
+                ]
+                if distances:
+                    candidates.append((min(distances) / pmv_rate, "threshold"))
+
+        minutes, reason = min(candidates)
+        if is_sleeping:
+            minutes *= preference.sleeping_factor
+        return (
+            min(max(minutes, preference.min_interval_minutes), preference.max_interval_minutes),
+            reason,
+        )
+
+    @staticmethod
+    def calculate_budget_interval(
+        current_time: datetime, api_calls: int, calls_per_cycle: int
+    ) -> float:
+        """
+        その日の残りのAPI呼び出し回数を、日付が変わるまでに使い切る実行間隔を求めるメソッド。
+
+        Args:
+            current_time (datetime): 現在の日時
+            api_calls (int): 今回の実行を含むその日のAPI呼び出し回数
+            calls_per_cycle (int): 1回の実行で見込むAPI呼び出し回数
+
+        Returns:
+            float: 間隔（分）。上限に達した場合は日付が変わるまでの時間
+        """
+        next_day = LOCAL_TZ.localize(
+            datetime.combine(current_time.date() + timedelta(days=1), time.min)
+        )
+        remaining_minutes = (next_day - current_time).total_seconds() / 60
+        remaining_cycles = (app_preference.polling.daily_api_budget - api_calls) // max(
+            calls_per_cycle, 1
+        )
+        if remaining_cycles <= 0:
+            return remaining_minutes
+        return remaining_minutes / remaining_cycles
+
+    @staticmethod
+    def count_calls_per_cycle(home_sensor: HomeSensor) -> int:
+        """
+        1回の実行で見込むAPI呼び出し回数を返すメソッド。
+
+        Args:
+            home_sensor (HomeSensor): 家のセンサー
+
+        Returns:
+            int: センサーの読み取り回数と、見込んだ機器操作の回数の合計
+        """
+        sensors = [home_sensor.main, home_sensor.sub, *home_sensor.supplementaries, home_sensor.outdoor]
+        return sum(1 for sensor in sensors if sensor) + app_preference.polling.command_calls_per_cycle
+
+    @staticmethod
+    def load_state(path: str) -> PollingState | None:
+        """
+        保存した前回の状態を読み込むメソッド。
+
+        Returns:
+            PollingState | None: 前回実行した時点の状態。読み込めない場合はNone
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != PollingScheduler._FILE_VERSION:
+            return None
+        try:
+            return PollingState.model_validate(data["state"])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def save_state(path: str, state: PollingState):
+        """状態をファイルに保存するメソッド。"""
+        data = {"version": PollingScheduler._FILE_VERSION, "state": state.model_dump(mode="json")}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 書き込み途中のファイルを読まないように、一時ファイルから置き換える
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
@@ -0,0 +1,297 @@
+import itertools
+import os
+import random
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+
+import settings
+from models.aircon_change_interval_model import AirconChangeIntervalModel
+from shared.dataclass.preference_sweep_result import PreferenceSweepResult
+from shared.dataclass.replay_decision import ReplayDecision
+from util.aircon_intensity_calculator import AirconIntensityCalculator
+from util.replay_engine import ReplayEngine
+
+PREFERENCE_NAMES = (
+    "app_preference",
+    "aircon_preference",
+    "circulator_preference",
+    "electric_fan_preference",
+    "met_clo_preference",
+    "thermal_preference",
+)
+"""上書きできる設定（settingsのインスタンス名）"""
+
+# ワーカープロセスで共有する、読み込み済みの記録データ
+_engine_inputs: tuple | None = None
+# 上書き前の設定
+_base_preferences: dict[str, BaseModel] = {}
+
+
+class PreferenceSweep:
+    """
+    設定の候補を、記録したデータの再生で評価するクラス。
+
+    記録したデータは親プロセスで1回だけ読み込み、ワーカープロセスで共有します。
+    各候補はワーカープロセスで設定を上書きしてReplayEngineで再生し、
+    コマンドの送信回数、PMVが快適範囲の外にあった時間、エアコン強度スコアで評価します。
+
+    設定は"aircon_preference.conditional.circulator_threshold"のように、
+    settingsのインスタンス名から始まるパスで指定します。リストの要素は番号で指定します
+    （例: "aircon_preference.aircon_settings.pmv_thresholds.3.threshold"）。
+    """
+
+    def __init__(
+        self,
+        engine: ReplayEngine,
+        comfort_band: tuple[float, float] | None = None,
+        max_workers: int | None = None,
+    ):
+        """
+        Args:
+            engine (ReplayEngine): 再生する記録データを読み込んだインスタンス（再生前のもの）
+            comfort_band (tuple[float, float] | None): 快適とみなすPMVの範囲。
+                省略した場合はsetpoint_optimizer.comfort_bandを使います。
+            max_workers (int | None): ワーカープロセスの数。省略した場合はCPUのコア数
+        """
+        self.engine_inputs = (
+            engine.cycles,
+            engine.hourly_forecasts,
+            engine.forecast_max_temperatures,
+            [
+                (
+                    change_interval.mode_id,
+                    change_interval.temperature_min,
+                    change_interval.temperature_max,
+                    change_interval.duration_minutes,
+                )
+                for change_interval in engine.change_intervals
+            ],
+        )
+        band = settings.aircon_preference.setpoint_optimizer.comfort_band
+        self.comfort_band = comfort_band or (band.lower, band.upper)
+        self.max_workers = max_workers or os.cpu_count()
+
+    @staticmethod
+    def grid(parameters: dict[str, list[float | str]]) -> list[dict[str, float | str]]:
+        """
+        パラメータの値のすべての組み合わせを候補として返すメソッド。
+
+        Args:
+            parameters (dict[str, list]): 設定のパスと候補の値
+
+        Returns:
+            list[dict[str, float | str]]: 設定のパスと値の組み合わせ
+        """
+        paths = list(parameters)
+        return [
+            dict(zip(paths, values))
+            for values in itertools.product(*(parameters[path] for path in paths))
+        ]
+
+    @staticmethod
+    def sample(
+        parameters: dict[str, tuple[float, float] | list[float | str]], count: int, seed: int = 0
+    ) -> list[dict[str, float | str]]:
+        """
+        パラメータの値を無作為に選んだ候補を返すメソッド。
+
+        Args:
+            parameters (dict): 設定のパスと、値の範囲（最小値, 最大値）または候補の値
+            count (int): 候補の数
+            seed (int): 乱数のシード
+
+        Returns:
+            list[dict[str, float | str]]: 設定のパスと値の組み合わせ
+        """
+        rng = random.Random(seed)
+        return [
+            {
+                path: (
+                    round(rng.uniform(*values), 2)
+                    if isinstance(values, tuple)
+                    else rng.choice(values)
+                )
+                for path, values in parameters.items()
+            }
+            for _ in range(count)
+        ]
+
+    def run(
+        self,
+        variants: list[dict[str, float | str]],
+        on_result: Callable[[PreferenceSweepResult], None] | None = None,
+    ) -> list[PreferenceSweepResult]:
+        """
+        候補をワーカープロセスで並列に評価するメソッド。
+
+        Args:
+            variants (list[dict]): 評価する設定の候補
+            on_result (Callable | None): 候補の評価が終わるたびに呼び出す関数
+
+        Returns:
+            list[PreferenceSweepResult]: 候補と同じ順序の評価結果
+        """
+        # 設定のパスと値の誤りは、ワーカーを起動する前に確認する
+        for variant in variants:
+            PreferenceSweep.validate_overrides(variant)
+
+        results: list[PreferenceSweepResult | None] = [None] * len(variants)
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_initialize_worker,
+            initargs=(self.engine_inputs,),
+        ) as executor:
+            futures = {
+                executor.submit(_evaluate, variant, self.comfort_band): index
+                for index, variant in enumerate(variants)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result:
+                    on_result(result)
+        return results
+
+    @staticmethod
+    def validate_overrides(overrides: dict[str, Any]) -> dict[str, BaseModel]:
+        """
+        設定を上書きした場合の設定を作成するメソッド。
+
+        Args:
+            overrides (dict[str, Any]): 設定のパスと値
+
+        Returns:
+            dict[str, BaseModel]: 上書きした設定のインスタンス名と、上書き後の設定
+
+        Raises:
+            ValueError: 設定のパスが存在しない場合や、値が設定の条件を満たさない場合
+        """
+        preferences: dict[str, BaseModel] = {}
+        for path, value in overrides.items():
+            name, *keys = path.split(".")
+            if name not in PREFERENCE_NAMES or not keys:
+                raise ValueError(f"unknown preference path: {path}")
+            if name not in preferences:
+                preferences[name] = (
+                    _base_preferences.get(name) or getattr(settings, name)
+                ).model_copy(deep=True)
+
+            parent: Any = preferences[name]
+            for key in keys[:-1]:
+                parent = parent[int(key)] if isinstance(parent, list) else getattr(parent, key)
+            PreferenceSweep._set_value(parent, keys[-1], value, path)
+        return preferences
+
+    @staticmethod
+    def _set_value(parent: Any, key: str, value: Any, path: str):
+        """フィールドの型と条件で値を検証して設定するメソッド。"""
+        if isinstance(parent, list):
+            parent[int(key)] = value
+            return
+        if key not in type(parent).model_fields:
+            raise ValueError(f"unknown preference path: {path}")
+        # 親のモデルごと検証し、フィールドの条件とバリデーターを適用する
+        validated = type(parent).model_validate({**dict(parent), key: value})
+        setattr(parent, key, getattr(validated, key))
+
+    @staticmethod
+    def evaluate_decisions(
+        decisions: list[ReplayDecision], comfort_band: tuple[float, float]
+    ) -> tuple[float, float]:
+        """
+        再生した判断結果から、快適範囲の外にあった時間とエアコン強度スコアを求めるメソッド。
+
+        各サイクルの状態は次のサイクルまで続くものとして積算します。
+        エアコン強度スコアはAirconIntensityScoreServiceと同じく、強度と秒数の積の1日あたりの平均です。
+
+        Args:
+            decisions (list[ReplayDecision]): 再生した判断結果
+            comfort_band (tuple[float, float]): 快適とみなすPMVの範囲
+
+        Returns:
+            tuple[float, float]: 快適範囲の外にあった時間（時間）と、1日あたりのエアコン強度スコア
+        """
+        if len(decisions) < 2:
+            return 0.0, 0.0
+
+        timestamps = np.array([decision.measurement_time.timestamp() for decision in decisions])
+        durations = np.diff(timestamps)
+        pmv = np.array([decision.pmv_result.pmv for decision in decisions[:-1]])
+        outside = (pmv < comfort_band[0]) | (pmv > comfort_band[1])
+        intensity = np.array(
+            [
+                AirconIntensityCalculator.calculate_intensity(
+                    temperature=decision.aircon_settings.temperature,
+                    mode_id=decision.aircon_settings.mode.id,
+                    fan_speed_id=decision.aircon_settings.fan_speed.id,
+                    # aircon_settingsテーブルと同じく電源は名前で渡す
+                    power=decision.aircon_settings.power.name,
+                )
+                for decision in decisions[:-1]
+            ]
+        )
+        days = len({decision.measurement_time.date() for decision in decisions})
+        return (
+            float(durations[outside].sum() / 3600),
+            float((intensity * durations).sum() / days),
+        )
+
+
+def _initialize_worker(engine_inputs: tuple):
+    """ワーカープロセスで記録データと上書き前の設定を保持する関数。"""
+    global _engine_inputs
+    _engine_inputs = engine_inputs
+    for name in PREFERENCE_NAMES:
+        _base_preferences[name] = getattr(settings, name).model_copy(deep=True)
+
+
+def _apply_preferences(preferences: dict[str, BaseModel]):
+    """settingsの設定のインスタンスを、指定した設定または上書き前の設定の値に置き換える関数。"""
+    for name in PREFERENCE_NAMES:
+        source = preferences.get(name) or _base_preferences[name].model_copy(deep=True)
+        target = getattr(settings, name)
+        for field in type(target).model_fields:
+            setattr(target, field, getattr(source, field))
+
+
+def _evaluate(
+    overrides: dict[str, float | str], comfort_band: tuple[float, float]
+) -> PreferenceSweepResult:
+    """ワーカープロセスで1つの候補を再生して評価する関数。"""
+    cycles, hourly_forecasts, forecast_max_temperatures, change_intervals = _engine_inputs
+    _apply_preferences(PreferenceSweep.validate_overrides(overrides))
+    try:
+        engine = ReplayEngine(
+            cycles,
+            hourly_forecasts,
+            forecast_max_temperatures,
+            [
+                AirconChangeIntervalModel(
+                    mode_id=mode_id,
+                    temperature_min=temperature_min,
+                    temperature_max=temperature_max,
+                    duration_minutes=duration_minutes,
+                )
+                for mode_id, temperature_min, temperature_max, duration_minutes in change_intervals
+            ],
+        )
+        decisions = engine.run()
+    finally:
+        _apply_preferences({})
+
+    command_counts = dict(engine.count_commands())
+    outside_comfort_hours, aircon_intensity_score = PreferenceSweep.evaluate_decisions(
+        decisions, comfort_band
+    )
+    return PreferenceSweepResult(
+        overrides=overrides,
+        command_counts=command_counts,
+        command_count=sum(command_counts.values()),
+        outside_comfort_hours=outside_comfort_hours,
+        aircon_intensity_score=aircon_intensity_score,
+    )
+
@@ -0,0 +1,254 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from logger.system_event_logger import SystemEventLogger
+from shared.dataclass.query_statistics import QueryStatistics
+
+
+class QueryRecording:
+    """
+    記録中に実行したSQL文を、同じ文ごとに集計するクラス。
+
+    Attributes:
+        statistics (dict[str, QueryStatistics]): SQL文ごとの実行回数と所要時間
+    """
+
+    def __init__(self):
+        self.statistics: dict[str, QueryStatistics] = {}
+        self._executed: set[tuple[str, str]] = set()
+
+    def add(self, statement: str, parameters, seconds: float):
+        """
+        実行したSQL文を1回分加えるメソッド。
+
+        Args:
+            statement (str): SQL文
+            parameters: SQL文のパラメータ
+            seconds (float): 所要時間（秒）
+        """
+        statistics = self.statistics.get(statement)
+        if statistics is None:
+            statistics = self.statistics[statement] = QueryStatistics(statement=statement)
+        statistics.count += 1
+        statistics.total_seconds += seconds
+        statistics.max_seconds = max(statistics.max_seconds, seconds)
+        # 同じパラメータで同じ文を実行した場合は、結果を使い回せた可能性がある
+        executed = (statement, repr(parameters))
+        if executed in self._executed:
+            statistics.duplicate_count += 1
+        else:
+            self._executed.add(executed)
+
+    @property
+    def count(self) -> int:
+        """実行したSQL文の数"""
+        return sum(statistics.count for statistics in self.statistics.values())
+
+    @property
+    def total_seconds(self) -> float:
+        """実行したSQL文の所要時間の合計（秒）"""
+        return sum(statistics.total_seconds for statistics in self.statistics.values())
+
+    def get_slowest(self, limit: int) -> list[QueryStatistics]:
+        """最も長かった所要時間が長い順に、SQL文の集計を返すメソッド。"""
+        return sorted(self.statistics.values(), key=lambda s: s.max_seconds, reverse=True)[:limit]
+
+    def get_repeated(self, threshold: int) -> list[QueryStatistics]:
+        """指定した回数以上実行したSQL文の集計を、実行回数が多い順に返すメソッド。"""
+        return sorted(
+            (s for s in self.statistics.values() if s.count >= threshold),
+            key=lambda s: s.count,
+            reverse=True,
+        )
+
+
+class QueryProfiler:
+    """
+    SQLAlchemyのエンジンのイベントで、実行したSQL文の回数と所要時間を記録するクラス。
+
+    記録中のQueryRecordingがある間だけエンジンにイベントを登録し、カーソルで実行したSQL文を記録します
+    （イベントを登録するとSQL文ごとの処理が増えるため、記録していない間は登録しません）。
+    環境変数QUERY_PROFILERを有効にすると、制御サイクル全体のSQL文を記録し、
+    回数・所要時間の合計・遅いSQL文・繰り返し実行したSQL文（N+1の候補）をログに出力します。
+    assert_max_queriesで、処理が実行するSQL文の数の上限を確認できます。
+    """
+
+    ENVIRONMENT_VARIABLE = "QUERY_PROFILER"
+    """記録を有効にする環境変数（1、true、yes、onで有効）"""
+
+    SLOWEST_LIMIT = 3
+    """ログに出力する遅いSQL文の数"""
+
+    REPEATED_THRESHOLD = 3
+    """ログに繰り返し実行したSQL文として出力する実行回数"""
+
+    STATEMENT_LENGTH = 120
+    """ログに出力するSQL文の最大の長さ"""
+
+    _INFO_KEY = "query_profiler_started_at"
+    """接続のinfoに実行を開始した時刻を保存するキー"""
+
+    _engines: list[Engine] = []
+    """SQL文を記録するエンジン"""
+
+    _recordings: list[QueryRecording] = []
+    """記録中のQueryRecording"""
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        環境変数で制御サイクルのSQL文の記録が有効になっているかどうかを返すメソッド。
+
+        Returns:
+            bool: 有効な場合はTrue
+        """
+        return os.getenv(QueryProfiler.ENVIRONMENT_VARIABLE, "").lower() in ("1", "true", "yes", "on")
+
+    @staticmethod
+    def install(engine: Engine):
+        """
+        SQL文を記録するエンジンを登録するメソッド。
+
+        Args:
+            engine (Engine): SQLAlchemyのエンジン
+        """
+        QueryProfiler._engines.append(engine)
+        if QueryProfiler._recordings:
+            QueryProfiler._listen(engine)
+
+    @staticmethod
+    def _listen(engine: Engine):
+        """エンジンにSQL文の実行の前後のイベントを登録するメソッド。"""
+        event.listen(engine, "before_cursor_execute", QueryProfiler._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", QueryProfiler._after_cursor_execute)
+
+    @staticmethod
+    def _remove(engine: Engine):
+        """エンジンからSQL文の実行の前後のイベントを削除するメソッド。"""
+        event.remove(engine, "before_cursor_execute", QueryProfiler._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", QueryProfiler._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """SQL文を実行する前に、開始した時刻を接続に保存する。"""
+        conn.info.setdefault(QueryProfiler._INFO_KEY, []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """SQL文を実行した後に、所要時間を記録中のQueryRecordingに加える。"""
+        started_at = conn.info.get(QueryProfiler._INFO_KEY)
+        if not started_at:
+            return
+        seconds = time.perf_counter() - started_at.pop()
+        for recording in QueryProfiler._recordings:
+            recording.add(statement, parameters, seconds)
+
+    @staticmethod
+    @contextmanager
+    def record() -> Iterator[QueryRecording]:
+        """
+        囲んだ処理で実行したSQL文を記録するコンテキストマネージャー。
+
+        入れ子にした場合は、外側の記録にも同じSQL文を加えます。
+
+        Yields:
+            QueryRecording: 記録したSQL文の集計
+        """
+        recording = QueryRecording()
+        if not QueryProfiler._recordings:
+            for engine in QueryProfiler._engines:
+                QueryProfiler._listen(engine)
+        QueryProfiler._recordings.append(recording)
+        try:
+            yield recording
+        finally:
+            QueryProfiler._recordings.remove(recording)
+            if not QueryProfiler._recordings:
+                for engine in QueryProfiler._engines:
+                    QueryProfiler._remove(engine)
+
+    @staticmethod
+    @contextmanager
+    def profile_cycle() -> Iterator[None]:
+        """
+        環境変数で有効な場合に、囲んだ制御サイクルで実行したSQL文を記録してログに出力するコンテキストマネージャー。
+
+        無効な場合は処理を実行するだけです。
+        """
+        if not QueryProfiler.is_enabled():
+            yield
+            return
+        with QueryProfiler.record() as recording:
+            try:
+                yield
+            finally:
+                QueryProfiler.log_report(recording)
+
+    @staticmethod
+    @contextmanager
+    def assert_max_queries(max_queries: int) -> Iterator[QueryRecording]:
+        """
+        囲んだ処理で実行したSQL文の数が上限以下であることを確認するコンテキストマネージャー。
+
+        Args:
+            max_queries (int): 実行してよいSQL文の数の上限
+
+        Yields:
+            QueryRecording: 記録したSQL文の集計
+
+        Raises:
+            AssertionError: 実行したSQL文の数が上限を超えた場合。メッセージに実行回数の多い順にSQL文を含める
+        """
+        with QueryProfiler.record() as recording:
+            yield recording
+        if recording.count > max_queries:
+            statements = "\n".join(
+                f"  {statistics.count}回: {QueryProfiler._shorten(statistics.statement)}"
+                for statistics in recording.get_repeated(1)
+            )
+            raise AssertionError(
+                f"SQL文を{recording.count}回実行しました（上限 {max_queries}回）\n{statements}"
+            )
+
+    @staticmethod
+    def log_report(recording: QueryRecording):
+        """
+        記録したSQL文の回数・所要時間・遅いSQL文・繰り返し実行したSQL文をログに出力するメソッド。
+
+        Args:
+            recording (QueryRecording): 記録したSQL文の集計
+        """
+        SystemEventLogger.log_info(
+            "query_profiler.summary",
+            count=recording.count,
+            total_ms=f"{recording.total_seconds * 1000:.1f}",
+            statements=len(recording.statistics),
+        )
+        for statistics in recording.get_slowest(QueryProfiler.SLOWEST_LIMIT):
+            SystemEventLogger.log_info(
+                "query_profiler.slow",
+                max_ms=f"{statistics.max_seconds * 1000:.1f}",
+                count=statistics.count,
+                total_ms=f"{statistics.total_seconds * 1000:.1f}",
+                statement=QueryProfiler._shorten(statistics.statement),
+            )
+        for statistics in recording.get_repeated(QueryProfiler.REPEATED_THRESHOLD):
+            SystemEventLogger.log_info(
+                "query_profiler.repeated",
+                count=statistics.count,
+                duplicates=statistics.duplicate_count,
+                statement=QueryProfiler._shorten(statistics.statement),
+            )
+
+    @staticmethod
+    def _shorten(statement: str) -> str:
+        """SQL文の空白をまとめ、長い場合は切り詰めるメソッド。"""
+        statement = " ".join(statement.split())
+        if len(statement) > QueryProfiler.STATEMENT_LENGTH:
+            return statement[: QueryProfiler.STATEMENT_LENGTH] + "…"
+        return statement
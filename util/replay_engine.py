@@ -0,0 +1,457 @@
+import bisect
+import logging
+from collections import Counter
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from api.smart_home_devices.recording_smart_home_device import RecordingSmartHomeDevice
+from api.smart_home_devices.smart_home_device_factory import SmartHomeDeviceFactory
+from db.db_session_manager import DBSessionManager
+from devices.aircon.aircon_operation import AirconOperation
+from devices.aircon.aircon_settings_determiner import AirconSettingsDeterminer
+from devices.aircon.aircon_state_manager import AirconStateManager
+from home_comfort_control import HomeComfortControl
+from logger.system_event_logger import logger
+from models.aircon_change_interval_model import AirconChangeIntervalModel
+from models.measurement_model import MeasurementModel
+from models.weather_forecast_hourly_model import WeatherForecastHourlyModel
+from repository.services.aircon_change_intarval_service import AirconChangeIntarvalService
+from repository.services.measurement_service import MeasurementService
+from repository.services.weather_forecast_hourly_service import WeatherForecastHourlyService
+from repository.services.weather_forecast_service import WeatherForecastService
+from settings import LOCAL_TZ, app_preference
+from shared.dataclass.air_quality import AirQuality
+from shared.dataclass.aircon_settings import AirconSettings
+from shared.dataclass.circulator_settings import CirculatorSettings
+from shared.dataclass.comfort_factors import ComfortFactors
+from shared.dataclass.effective_outdoor_temperature import EffectiveOutdoorTemperature
+from shared.dataclass.electric_fan_settings import ElectricFanSettings
+from shared.dataclass.home_sensor import HomeSensor
+from shared.dataclass.pmv_result import PMVResult
+from shared.dataclass.replay_cycle import ReplayCycle
+from shared.dataclass.replay_decision import ReplayDecision
+from shared.dataclass.sensor import Sensor
+from shared.dataclass.surface_temperatures import SurfaceTemperatures
+from shared.enums.power_mode import PowerMode
+from shared.enums.sensor_type import SensorType
+from util.met_clo_adjuster import MetCloAdjuster
+from util.pmv_kernel import PMVKernel
+from util.thermal_comfort import ThermalComfort
+from util.time_helper import TimeHelper
+
+
+class ReplayEngine:
+    """
+    記録した測定値と天気予報を制御の判断処理に流し直し、判断結果を再現するクラス。
+
+    main.pyの制御サイクルと同じ順序でMetCloAdjuster、ThermalComfort、AirconSettingsDeterminer、
+    AirconOperationと、HomeComfortControlのサーキュレーター・扇風機の判断を呼び出します。
+    現在時刻は各サイクルの測定日時に置き換え、デバイスの操作はRecordingSmartHomeDeviceに記録し、
+    前回の設定や最小運転時間の開始時刻などのデータベースに保存していた状態はメモリ上で管理します。
+    API呼び出し回数は記録していないため、呼び出しを節約しない場合として判断します。
+
+    PMVはサイクルの判断に依存しないため、一定件数ごとに配列でまとめて計算します。
+    天気予報は記録した時点の予報ではなく、データベースに最後に保存された予報を使います。
+
+    Attributes:
+        device (RecordingSmartHomeDevice): 送信したコマンドを記録するデバイス
+        decisions (list[ReplayDecision]): 再生したサイクルの判断結果
+    """
+
+    WIND_SPEED = 0.08
+    """ThermalComfort.calculate_pmvの既定の風速（m/s）"""
+
+    CIRCULATOR_WIND_SPEED = 0.3
+    """サーキュレーターをオンにした場合にPMVを再計算する風速（m/s）"""
+
+    def __init__(
+        self,
+        cycles: list[ReplayCycle],
+        hourly_forecasts: list[WeatherForecastHourlyModel] | None = None,
+        forecast_max_temperatures: dict[date, float] | None = None,
+        change_intervals: list[AirconChangeIntervalModel] | None = None,
+    ):
+        """
+        Args:
+            cycles (list[ReplayCycle]): 再生するサイクルの入力
+            hourly_forecasts (list[WeatherForecastHourlyModel] | None): 時間単位の天気予報
+            forecast_max_temperatures (dict[date, float] | None): 日ごとの予報最高気温
+            change_intervals (list[AirconChangeIntervalModel] | None): エアコンの最小運転時間の設定
+        """
+        self.cycles = sorted(cycles, key=lambda cycle: cycle.measurement_time)
+        self.hourly_forecasts = sorted(
+            hourly_forecasts or [], key=lambda forecast: forecast.forecast_time
+        )
+        self._forecast_times = [forecast.forecast_time for forecast in self.hourly_forecasts]
+        self.forecast_max_temperatures = forecast_max_temperatures or {}
+        self.change_intervals = change_intervals or []
+        self.device = RecordingSmartHomeDevice()
+        self.decisions: list[ReplayDecision] = []
+
+        # データベースに保存していた状態
+        self.aircon_settings: AirconSettings | None = None
+        self.circulator_settings = CirculatorSettings(power=PowerMode.OFF, fan_speed=0)
+        self.electric_fan_settings = ElectricFanSettings()
+        self.electric_fan_on_time: datetime | None = None
+        self.surface_state: SurfaceTemperatures | None = None
+
+    @staticmethod
+    def load_from_database(start_time: datetime, end_time: datetime) -> "ReplayEngine":
+        """
+        指定した期間の測定値と天気予報をデータベースから読み込み、ReplayEngineを生成するメソッド。
+
+        Args:
+            start_time (datetime): 期間の開始日時（この日時を含む）
+            end_time (datetime): 期間の終了日時（この日時を含まない）
+
+        Returns:
+            ReplayEngine: 読み込んだデータを再生するインスタンス
+        """
+        with DBSessionManager.session() as session:
+            measurements = MeasurementService(session).get_with_sensor_readings(
+                start_time, end_time
+            )
+            cycles = [
+                cycle
+                for cycle in map(ReplayEngine._create_cycle, measurements)
+                if cycle is not None
+            ]
+            # 直近の予報は終了日時より後の予報になることがあるため、1日分多く取得する
+            hourly_forecasts = WeatherForecastHourlyService(session).get_between(
+                start_time, end_time + timedelta(days=1)
+            )
+            forecast_max_temperatures = WeatherForecastService(
+                session
+            ).get_max_temperatures_by_date()
+            change_intervals = AirconChangeIntarvalService(session).get_all()
+            # 再生中に開始時刻を書き換えるため、セッションから切り離して初期化する
+            session.expunge_all()
+            for change_interval in change_intervals:
+                change_interval.start_time = None
+
+        return ReplayEngine(cycles, hourly_forecasts, forecast_max_temperatures, change_intervals)
+
+    @staticmethod
+    def _create_cycle(measurement: MeasurementModel) -> ReplayCycle | None:
+        """測定日時とセンサ測定値から1回分のサイクルの入力を作成するメソッド。"""
+        sensors: dict[str, list[Sensor]] = {}
+        for reading in measurement.sensor_readings:
+            if reading.temperature is None or reading.humidity is None:
+                continue
+            sensors.setdefault(reading.sensor.category, []).append(
+                Sensor(
+                    id=reading.sensor.sensor_code,
+                    label=reading.sensor.label,
+                    location=reading.sensor.location,
+                    type=SensorType.get_by_id(reading.sensor.sensor_type_id),
+                    air_quality=AirQuality(
+                        temperature=reading.temperature,
+                        humidity=reading.humidity,
+                        co2_level=reading.co2_level,
+                    ),
+                )
+            )
+        if "main" not in sensors:
+            return None
+
+        return ReplayCycle(
+            measurement_time=measurement.measurement_time.astimezone(LOCAL_TZ),
+            home_sensor=HomeSensor(
+                main=sensors["main"][0],
+                sub=sensors["sub"][0] if "sub" in sensors else None,
+                supplementaries=sensors.get("supplementary", []),
+                outdoor=sensors["outdoor"][0] if "outdoor" in sensors else None,
+            ),
+        )
+
+    def run(
+        self,
+        chunk_size: int = 2016,
+        on_progress: Callable[["ReplayEngine"], None] | None = None,
+    ) -> list[ReplayDecision]:
+        """
+        すべてのサイクルを再生するメソッド。
+
+        再生中は現在時刻・デバイス・最小運転時間の設定を差し替え、データベースを無効にし、
+        INFOレベルのログを出力しません。終了後は元に戻します。
+
+        Args:
+            chunk_size (int): PMVをまとめて計算するサイクル数
+            on_progress (Callable | None): チャンクごとに呼び出す関数
+
+        Returns:
+            list[ReplayDecision]: 各サイクルの判断結果
+        """
+        control = HomeComfortControl()
+        database_enabled = app_preference.database.enabled
+        log_level = logger.level
+        # 差し替えの途中で例外が発生した場合も元に戻すため、差し替えもtryの中で行う
+        try:
+            SmartHomeDeviceFactory.set_device(self.device)
+            AirconStateManager.set_change_intervals(self.change_intervals)
+            app_preference.database.enabled = False
+            logger.setLevel(logging.WARNING)
+            for start in range(0, len(self.cycles), chunk_size):
+                cycles = self.cycles[start : start + chunk_size]
+                contexts = [self._prepare_cycle(control, cycle) for cycle in cycles]
+                pmv_results = self._calculate_pmv(cycles, [context[3] for context in contexts])
+                for cycle, context, pmv_result in zip(cycles, contexts, pmv_results):
+                    self._decide(control, cycle, *context, pmv_result)
+                if on_progress:
+                    on_progress(self)
+        finally:
+            SmartHomeDeviceFactory.set_device(None)
+            AirconStateManager.set_change_intervals(None)
+            app_preference.database.enabled = database_enabled
+            logger.setLevel(log_level)
+            TimeHelper.set_current_time(None)
+
+        return self.decisions
+
+    def count_commands(self) -> Counter:
+        """
+        再生中に送信したコマンドの回数をコマンド名ごとに返すメソッド。
+
+        Returns:
+            Counter: コマンド名と送信回数
+        """
+        return self.device.count_commands()
+
+    def get_closest_future_forecast(
+        self, current_time: datetime
+    ) -> WeatherForecastHourlyModel | None:
+        """
+        指定した日時を含まず、それ以降で直近の天気予報を返すメソッド。
+
+        Args:
+            current_time (datetime): 基準の日時
+
+        Returns:
+            WeatherForecastHourlyModel | None: 直近の天気予報
+        """
+        index = bisect.bisect_right(self._forecast_times, current_time)
+        return self.hourly_forecasts[index] if index < len(self.hourly_forecasts) else None
+
+    def _prepare_cycle(
+        self, control: HomeComfortControl, cycle: ReplayCycle
+    ) -> tuple[EffectiveOutdoorTemperature, WeatherForecastHourlyModel | None, bool, ComfortFactors]:
+        """サイクルの外気温度・直近の天気予報・就寝中かどうか・METとCLOを求めるメソッド。"""
+        TimeHelper.set_current_time(cycle.measurement_time)
+        home_sensor = cycle.home_sensor
+        closest_future_forecast = self.get_closest_future_forecast(cycle.measurement_time)
+        eff_temperature = EffectiveOutdoorTemperature(
+            outdoor_temperature=(
+                home_sensor.outdoor.air_quality.temperature if home_sensor.outdoor else None
+            ),
+            forecast_temperature=self.forecast_max_temperatures.get(
+                cycle.measurement_time.date()
+            ),
+        )
+        is_sleeping = control.is_within_sleeping_period()
+        comfort_factors = MetCloAdjuster.calculate_comfort_factors(
+            eff_temperature, is_sleeping, closest_future_forecast
+        )
+        return eff_temperature, closest_future_forecast, is_sleeping, comfort_factors
+
+    def _calculate_pmv(
+        self, cycles: list[ReplayCycle], comfort_factors: list[ComfortFactors]
+    ) -> list[PMVResult]:
+        """サイクルのPMVをThermalComfort.calculate_pmvと同じ方法でまとめて計算するメソッド。"""
+        home_sensors = [cycle.home_sensor for cycle in cycles]
+        met = np.array([factors.met for factors in comfort_factors])
+        relative_air_speed = PMVKernel.v_relative(ReplayEngine.WIND_SPEED, met)
+        dynamic_clothing_insulation = PMVKernel.clo_dynamic(
+            np.array([factors.clo for factors in comfort_factors]), met
+        )
+        dry_bulb_temperature = [sensor.average_indoor_temperature for sensor in home_sensors]
+        results, self.surface_state = ThermalComfort.calculate_pmv_array(
+            outdoor_temperature=[
+                EffectiveOutdoorTemperature(
+                    outdoor_temperature=(
+                        sensor.outdoor.air_quality.temperature if sensor.outdoor else None
+                    ),
+                    forecast_temperature=self.forecast_max_temperatures.get(
+                        cycle.measurement_time.date()
+                    ),
+                ).value
+                for cycle, sensor in zip(cycles, home_sensors)
+            ],
+            floor_temperature=[sensor.main.air_quality.temperature for sensor in home_sensors],
+            ceiling_temperature=[
+                (sensor.sub or sensor.main).air_quality.temperature for sensor in home_sensors
+            ],
+            dry_bulb_temperature=dry_bulb_temperature,
+            humidity=[sensor.average_indoor_humidity for sensor in home_sensors],
+            met=met,
+            relative_air_speed=relative_air_speed,
+            dynamic_clothing_insulation=dynamic_clothing_insulation,
+            current_times=[cycle.measurement_time for cycle in cycles],
+            surface_state=self.surface_state,
+        )
+
+        return [
+            PMVResult(
+                pmv=results["pmv"][index],
+                ppd=results["ppd"][index],
+                clo=dynamic_clothing_insulation[index],
+                air=relative_air_speed[index],
+                met=met[index],
+                wall=results["wall"][index],
+                ceiling=results["ceiling"][index],
+                floor=results["floor"][index],
+                mean_radiant_temperature=results["mean_radiant_temperature"][index],
+                dry_bulb_temperature=dry_bulb_temperature[index],
+                relative_air_speed=relative_air_speed[index],
+                dynamic_clothing_insulation=dynamic_clothing_insulation[index],
+            )
+            for index in range(len(cycles))
+        ]
+
+    def _decide(
+        self,
+        control: HomeComfortControl,
+        cycle: ReplayCycle,
+        eff_temperature: EffectiveOutdoorTemperature,
+        closest_future_forecast: WeatherForecastHourlyModel | None,
+        is_sleeping: bool,
+        comfort_factors: ComfortFactors,
+        pmv_result: PMVResult,
+    ):
+        """1回分のサイクルの判断とデバイスの操作を行うメソッド。"""
+        TimeHelper.set_current_time(cycle.measurement_time)
+        home_sensor = cycle.home_sensor
+
+        # 高温条件の場合の、サーキュレーターの状態を取得
+        circulator_settings_heat_conditions = CirculatorSettings()
+        if app_preference.circulator.enabled:
+            circulator_settings_heat_conditions = control.activate_circulator_in_heat_conditions(
+                home_sensor, pmv_result.pmv, eff_temperature.value
+            )
+            # サーキュレーターがオンになる場合、風量を増やしてPMV値を再計算
+            if circulator_settings_heat_conditions.power == PowerMode.ON:
+                pmv_result = ReplayEngine._recalculate_pmv_with_wind_speed(
+                    pmv_result, home_sensor, ReplayEngine.CIRCULATOR_WIND_SPEED
+                )
+
+        aircon_settings = self._update_aircon_settings(
+            AirconSettingsDeterminer.determine_aircon_settings(
+                pmv_result, home_sensor, closest_future_forecast, is_sleeping
+            ),
+            eff_temperature.value,
+        )
+        circulator_settings = self._update_circulator_settings(
+            control,
+            home_sensor,
+            circulator_settings_heat_conditions,
+            is_sleeping,
+            eff_temperature.value,
+        )
+        electric_fan_settings = self._update_electric_fan_settings(
+            control, is_sleeping, pmv_result.mean_radiant_temperature
+        )
+
+        self.decisions.append(
+            ReplayDecision(
+                measurement_time=cycle.measurement_time,
+                comfort_factors=comfort_factors,
+                pmv_result=pmv_result,
+                aircon_settings=aircon_settings,
+                circulator_settings=circulator_settings,
+                electric_fan_settings=electric_fan_settings,
+            )
+        )
+
+    @staticmethod
+    def _recalculate_pmv_with_wind_speed(
+        pmv_result: PMVResult, home_sensor: HomeSensor, wind_speed: float
+    ) -> PMVResult:
+        """表面温度はそのままで、風速を変えてPMVを再計算するメソッド。"""
+        relative_air_speed = PMVKernel.v_relative(wind_speed, pmv_result.met).item(0)
+        pmv, ppd = ThermalComfort.solve_pmv_ppd(
+            pmv_result.dry_bulb_temperature,
+            pmv_result.mean_radiant_temperature,
+            relative_air_speed,
+            home_sensor.average_indoor_humidity,
+            pmv_result.met,
+            pmv_result.dynamic_clothing_insulation,
+        )
+        return pmv_result.model_copy(
+            update={
+                "pmv": pmv,
+                "ppd": ppd,
+                "air": relative_air_speed,
+                "relative_air_speed": relative_air_speed,
+            }
+        )
+
+    def _update_aircon_settings(
+        self, aircon_settings: AirconSettings, outdoor_temperature: float
+    ) -> AirconSettings:
+        """HomeComfortControl.update_aircon_settingsと同じ判断を、メモリ上の前回の設定で行うメソッド。"""
+        if self.aircon_settings is None:
+            aircon_settings = AirconStateManager.update_aircon_settings(aircon_settings)
+        elif AirconOperation.update_aircon_if_necessary(
+            aircon_settings, self.aircon_settings, outdoor_temperature
+        ):
+            change_interval = AirconStateManager.find_change_interval(
+                aircon_settings.mode, outdoor_temperature
+            )
+            if change_interval:
+                change_interval.start_time = TimeHelper.get_current_time()
+
+        # データベースに記録した設定と同じく、強制送風のフラグは引き継がない
+        self.aircon_settings = aircon_settings.model_copy(
+            update={"force_fan_below_dew_point": False}
+        )
+        return aircon_settings
+
+    def _update_circulator_settings(
+        self,
+        control: HomeComfortControl,
+        home_sensor: HomeSensor,
+        circulator_settings_heat_conditions: CirculatorSettings,
+        is_sleeping: bool,
+        outdoor_temperature: float,
+    ) -> CirculatorSettings:
+        """HomeComfortControl.update_circulator_settingsと同じ判断を、メモリ上の前回の設定で行うメソッド。"""
+        if not app_preference.circulator.enabled:
+            return CirculatorSettings()
+
+        # API呼び出し回数は記録していないため、節約しない場合として判断する
+        self.circulator_settings = control.decide_circulator_settings(
+            home_sensor,
+            circulator_settings_heat_conditions,
+            is_sleeping,
+            outdoor_temperature,
+            self.circulator_settings,
+            is_degraded=False,
+        )
+        return self.circulator_settings
+
+    def _update_electric_fan_settings(
+        self, control: HomeComfortControl, is_sleeping: bool, mean_radiant_temperature: float
+    ) -> ElectricFanSettings:
+        """HomeComfortControl.update_electric_fan_settingsと同じ判断を、メモリ上の前回の設定で行うメソッド。"""
+        if not app_preference.electric_fan.enabled:
+            return ElectricFanSettings()
+
+        hours = 0
+        if self.electric_fan_on_time is not None:
+            hours, _ = TimeHelper.calculate_elapsed_time(self.electric_fan_on_time)
+        electric_fan_settings = control.decide_electric_fan_settings(
+            is_sleeping,
+            mean_radiant_temperature,
+            self.electric_fan_settings,
+            hours,
+            is_degraded=False,
+        )
+
+        # 連続して電源がオンになっている期間の開始時刻を記録
+        if electric_fan_settings.power != PowerMode.ON:
+            self.electric_fan_on_time = None
+        elif self.electric_fan_on_time is None:
+            self.electric_fan_on_time = TimeHelper.get_current_time()
+        self.electric_fan_settings = electric_fan_settings
+        return electric_fan_settings
@@ -0,0 +1,330 @@
+import math
+from typing import Callable
+
+import numpy as np
+
+
+class RootFinder:
+    """配列をまとめて扱う求根計算を行うクラス。"""
+
+    @staticmethod
+    def find_bracketed_root(
+        function: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        lower: np.ndarray,
+        upper: np.ndarray,
+        tolerance: float = 0.001,
+        max_iterations: int = 50,
+    ) -> np.ndarray:
+        """
+        区間内の根を、要素ごとに独立して挟み撃ち法（Illinois法）で求めるメソッド。
+
+        各要素の区間 [lower, upper] で関数値の符号が変わることを前提に、
+        収束していない要素だけを次の反復で評価します。
+        符号が変わらない要素の結果はNaNになります。
+
+        Args:
+            function (Callable): 評価点と要素番号の配列を受け取り、関数値を返す関数
+            lower (np.ndarray): 区間の下限
+            upper (np.ndarray): 区間の上限
+            tolerance (float): 区間幅または評価点の移動量がこれ以下になったら収束とみなす
+            max_iterations (int): 最大反復回数
+
+        Returns:
+            np.ndarray: 要素ごとの根
+        """
+        lower, upper = np.broadcast_arrays(
+            np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        )
+        a = lower.ravel().copy()
+        b = upper.ravel().copy()
+        index = np.arange(a.size)
+
+        fa = function(a, index)
+        fb = function(b, index)
+        root = np.full(a.size, np.nan)
+
+        # 端点がちょうど根の場合
+        root[fa == 0] = a[fa == 0]
+        root[fb == 0] = b[fb == 0]
+
+        # 符号が変わる要素だけを計算対象にする
+        active = np.flatnonzero(fa * fb < 0)
+        a, b, fa, fb = a[active], b[active], fa[active], fb[active]
+        previous_side = np.zeros(active.size, dtype=int)
+        previous_c = np.full(active.size, np.nan)
+
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+
+            # 割線と区間の交点を次の評価点にする
+            c = b - fb * (b - a) / (fb - fa)
+            fc = function(c, active)
+
+            # 根がaとcの間にある場合はbを、そうでなければaを更新する
+            left = fa * fc < 0
+            right = ~left
+            b = np.where(left, c, b)
+            fb = np.where(left, fc, fb)
+            a = np.where(right, c, a)
+            fa = np.where(right, fc, fa)
+
+            # 同じ側が続けて更新された場合は反対側の関数値を半分にして収束を速める（Illinois法）
+            side = np.where(left, -1, 1)
+            fa = np.where(left & (previous_side == -1), fa / 2, fa)
+            fb = np.where(right & (previous_side == 1), fb / 2, fb)
+            previous_side = side
+
+            # 区間が片側からしか縮まない場合に備え、評価点の移動量でも判定する
+            converged = (
+                (fc == 0)
+                | (np.abs(b - a) <= tolerance)
+                | (np.abs(c - previous_c) <= tolerance / 2)
+            )
+            root[active[converged]] = c[converged]
+
+            keep = ~converged
+            active = active[keep]
+            a, b, fa, fb = a[keep], b[keep], fa[keep], fb[keep]
+            previous_side = previous_side[keep]
+            previous_c = c[keep]
+
+        # 最大反復回数に達した要素は区間の中点を使う
+        root[active] = (a + b) / 2
+
+        return root.reshape(lower.shape)
+
+    @staticmethod
+    def find_root_brent(
+        function: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        lower: np.ndarray,
+        upper: np.ndarray,
+        xtol: float = 2e-12,
+        rtol: float = 4 * np.finfo(float).eps,
+        max_iterations: int = 100,
+    ) -> np.ndarray:
+        """
+        区間内の根を、要素ごとに独立してBrent法で求めるメソッド。
+
+        scipy.optimize.brentqと同じ手順（評価点の選び方・収束判定）を要素ごとに再現するため、
+        同じ関数に対してはbrentqと同じ根を返します。
+        端点で符号が変わらない要素、関数値がNaNになった要素、最大反復回数に達した要素の結果はNaNになります。
+
+        Args:
+            function (Callable): 評価点と要素番号の配列を受け取り、関数値を返す関数
+            lower (np.ndarray): 区間の下限
+            upper (np.ndarray): 区間の上限
+            xtol (float): 根の絶対許容誤差
+            rtol (float): 根の相対許容誤差
+            max_iterations (int): 最大反復回数
+
+        Returns:
+            np.ndarray: 要素ごとの根
+        """
+        lower, upper = np.broadcast_arrays(
+            np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        )
+        x_previous = lower.ravel().copy()
+        x_current = upper.ravel().copy()
+        index = np.arange(x_current.size)
+
+        f_previous = np.asarray(function(x_previous, index), dtype=float)
+        f_current = np.asarray(function(x_current, index), dtype=float)
+        root = np.full(x_current.size, np.nan)
+
+        # 端点がちょうど根の場合（brentqと同じく下限を優先）
+        root = np.where(f_current == 0, x_current, root)
+        root = np.where(f_previous == 0, x_previous, root)
+        active = (
+            (f_previous != 0)
+            & (f_current != 0)
+            & (np.signbit(f_previous) != np.signbit(f_current))
+            & ~np.isnan(f_previous)
+            & ~np.isnan(f_current)
+        )
+
+        # 根を挟むもう一方の端点と、直前2回のステップ幅
+        x_block = np.zeros(x_current.size)
+        f_block = np.zeros(x_current.size)
+        step_previous = np.zeros(x_current.size)
+        step_current = np.zeros(x_current.size)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(max_iterations):
+                if not np.any(active):
+                    break
+
+                # 直前の点と現在の点で符号が変わる場合は、直前の点を反対側の端点にする
+                sign_changed = (
+                    (f_previous != 0)
+                    & (f_current != 0)
+                    & (np.signbit(f_previous) != np.signbit(f_current))
+                )
+                x_block = np.where(sign_changed, x_previous, x_block)
+                f_block = np.where(sign_changed, f_previous, f_block)
+                step_previous = np.where(sign_changed, x_current - x_previous, step_previous)
+                step_current = np.where(sign_changed, x_current - x_previous, step_current)
+
+                # 関数値の絶対値が小さい方を現在の点にする
+                swap = np.abs(f_block) < np.abs(f_current)
+                x_previous, x_current, x_block = (
+                    np.where(swap, x_current, x_previous),
+                    np.where(swap, x_block, x_current),
+                    np.where(swap, x_current, x_block),
+                )
+                f_previous, f_current, f_block = (
+                    np.where(swap, f_current, f_previous),
+                    np.where(swap, f_block, f_current),
+                    np.where(swap, f_current, f_block),
+                )
+
+                delta = (xtol + rtol * np.abs(x_current)) / 2
+                bisection = (x_block - x_current) / 2
+                converged = active & ((f_current == 0) | (np.abs(bisection) < delta))
+                root = np.where(converged, x_current, root)
+                active &= ~converged
+                if not np.any(active):
+                    break
+
+                # 割線法（2点）または逆2次補間（3点）のステップ
+                secant = -f_current * (x_current - x_previous) / (f_current - f_previous)
+                slope_previous = (f_previous - f_current) / (x_previous - x_current)
+                slope_block = (f_block - f_current) / (x_block - x_current)
+                inverse_quadratic = (
+                    -f_current
+                    * (f_block * slope_block - f_previous * slope_previous)
+                    / (slope_block * slope_previous * (f_block - f_previous))
+                )
+                trial = np.where(x_previous == x_block, secant, inverse_quadratic)
+
+                # 補間のステップが十分小さい場合だけ採用し、そうでなければ二分する
+                interpolate = (
+                    (np.abs(step_previous) > delta)
+                    & (np.abs(f_current) < np.abs(f_previous))
+                    & (
+                        2 * np.abs(trial)
+                        < np.minimum(np.abs(step_previous), 3 * np.abs(bisection) - delta)
+                    )
+                )
+                step_previous = np.where(interpolate, step_current, bisection)
+                step_current = np.where(interpolate, trial, bisection)
+
+                x_previous = x_current
+                f_previous = f_current
+                x_current = x_current + np.where(
+                    np.abs(step_current) > delta,
+                    step_current,
+                    np.where(bisection > 0, delta, -delta),
+                )
+
+                # 収束していない要素だけを評価する
+                evaluated = np.flatnonzero(active)
+                f_current = f_current.copy()
+                f_current[evaluated] = function(x_current[evaluated], evaluated)
+                failed = np.isnan(f_current) & active
+                active &= ~failed
+
+        return root.reshape(lower.shape)
+
+    @staticmethod
+    def find_root_brent_scalar(
+        function: Callable[[float], float],
+        lower: float,
+        upper: float,
+        xtol: float = 2e-12,
+        rtol: float = 4 * np.finfo(float).eps,
+        max_iterations: int = 100,
+    ) -> float:
+        """
+        区間内の根を、1件だけBrent法で求めるメソッド。
+
+        find_root_brentと同じ手順をPythonのfloatで計算します。要素が少ない場合は
+        配列の演算1回ごとのオーバーヘッドが計算時間の大半になるため、こちらを使います。
+        端点で符号が変わらない場合、関数値がNaNになった場合、最大反復回数に達した場合はNaNを返します。
+
+        Args:
+            function (Callable): 評価点を受け取り、関数値を返す関数
+            lower (float): 区間の下限
+            upper (float): 区間の上限
+            xtol (float): 根の絶対許容誤差
+            rtol (float): 根の相対許容誤差
+            max_iterations (int): 最大反復回数
+
+        Returns:
+            float: 根
+        """
+        x_previous = float(lower)
+        x_current = float(upper)
+        f_previous = float(function(x_previous))
+        f_current = float(function(x_current))
+
+        # 端点がちょうど根の場合（brentqと同じく下限を優先）
+        if f_previous == 0:
+            return x_previous
+        if f_current == 0:
+            return x_current
+        if (
+            math.isnan(f_previous)
+            or math.isnan(f_current)
+            or math.copysign(1, f_previous) == math.copysign(1, f_current)
+        ):
+            return math.nan
+
+        # 根を挟むもう一方の端点と、直前2回のステップ幅
+        x_block = f_block = step_previous = step_current = 0.0
+        for _ in range(max_iterations):
+            # 直前の点と現在の点で符号が変わる場合は、直前の点を反対側の端点にする
+            if (
+                f_previous != 0
+                and f_current != 0
+                and math.copysign(1, f_previous) != math.copysign(1, f_current)
+            ):
+                x_block = x_previous
+                f_block = f_previous
+                step_previous = step_current = x_current - x_previous
+
+            # 関数値の絶対値が小さい方を現在の点にする
+            if abs(f_block) < abs(f_current):
+                x_previous, x_current, x_block = x_current, x_block, x_current
+                f_previous, f_current, f_block = f_current, f_block, f_current
+
+            delta = (xtol + rtol * abs(x_current)) / 2
+            bisection = (x_block - x_current) / 2
+            if f_current == 0 or abs(bisection) < delta:
+                return x_current
+
+            # 割線法（2点）または逆2次補間（3点）のステップが十分小さい場合だけ採用し、そうでなければ二分する
+            trial = math.nan
+            if abs(step_previous) > delta and abs(f_current) < abs(f_previous):
+                try:
+                    if x_previous == x_block:
+                        trial = -f_current * (x_current - x_previous) / (f_current - f_previous)
+                    else:
+                        slope_previous = (f_previous - f_current) / (x_previous - x_current)
+                        slope_block = (f_block - f_current) / (x_block - x_current)
+                        trial = (
+                            -f_current
+                            * (f_block * slope_block - f_previous * slope_previous)
+                            / (slope_block * slope_previous * (f_block - f_previous))
+                        )
+                except ZeroDivisionError:
+                    # find_root_brentと同じく、補間できない場合は二分する
+                    pass
+                if 2 * abs(trial) < min(abs(step_previous), 3 * abs(bisection) - delta):
+                    step_previous, step_current = step_current, trial
+                else:
+                    step_previous = step_current = bisection
+            else:
+                step_previous = step_current = bisection
+
+            x_previous = x_current
+            f_previous = f_current
+            if abs(step_current) > delta:
+                x_current += step_current
+            else:
+                x_current += delta if bisection > 0 else -delta
+            f_current = float(function(x_current))
+            if math.isnan(f_current):
+                return math.nan
+
+        return math.nan
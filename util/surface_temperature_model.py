@@ -0,0 +1,246 @@
+import json
+import math
+import os
+from datetime import datetime
+
+import numpy as np
+
+from settings import thermal_preference
+from shared.dataclass.surface_temperatures import SurfaceTemperatures
+
+
+class SurfaceTemperatureModel:
+    """
+    壁・天井・床の表面温度の過渡応答を1次のRCモデルで計算するクラス。
+
+    各表面は熱容量と熱抵抗を持つ1つの節点とみなし、外気と室温から求めた定常状態の温度
+    （平衡温度）に時定数τで近づくものとします。前回の計算からの経過時間をΔtとすると、
+    平衡温度が一定の区間では次の式で厳密に進められるため、1回の更新は表面ごとに指数関数1回で済みます。
+
+        T(t + Δt) = T_eq + (T(t) - T_eq) * exp(-Δt / τ)
+    """
+
+    SURFACES = ("wall", "ceiling", "floor")
+    """表面の名前（配列で扱う場合の列の順）"""
+
+    _FILE_VERSION = 1
+    """状態を保存するファイルの形式のバージョン"""
+
+    _MIN_LOG_DECAY = -50.0
+    """減衰率の対数の下限。これより小さい減衰は0とみなしても温度に影響しない"""
+
+    @staticmethod
+    def get_time_constants() -> np.ndarray:
+        """
+        設定から表面ごとの時定数を取得するメソッド。
+
+        Returns:
+            np.ndarray: 壁・天井・床の時定数（秒）
+        """
+        surface_model = thermal_preference.surface_model
+        return np.array(
+            [
+                surface_model.wall_time_constant_hours,
+                surface_model.ceiling_time_constant_hours,
+                surface_model.floor_time_constant_hours,
+            ]
+        ) * 3600
+
+    @staticmethod
+    def advance(
+        state: SurfaceTemperatures | None, equilibrium: SurfaceTemperatures
+    ) -> SurfaceTemperatures:
+        """
+        前回の表面温度を、前回からの経過時間だけ平衡温度に近づけるメソッド。
+
+        前回の状態がない場合、経過時間が負の場合、経過時間が設定の上限を超えた場合は平衡温度を返します。
+
+        Args:
+            state (SurfaceTemperatures | None): 前回の表面温度
+            equilibrium (SurfaceTemperatures): 現在の外気と室温から求めた定常状態の表面温度
+
+        Returns:
+            SurfaceTemperatures: 現在の表面温度
+        """
+        if state is None:
+            return equilibrium
+
+        elapsed_seconds = (equilibrium.updated_at - state.updated_at).total_seconds()
+        reset_seconds = thermal_preference.surface_model.reset_after_hours * 3600
+        if elapsed_seconds < 0 or elapsed_seconds > reset_seconds:
+            return equilibrium
+
+        temperatures = {}
+        for surface, time_constant in zip(
+            SurfaceTemperatureModel.SURFACES, SurfaceTemperatureModel.get_time_constants()
+        ):
+            decay = math.exp(-elapsed_seconds / time_constant)
+            target = getattr(equilibrium, surface)
+            temperatures[surface] = target + (getattr(state, surface) - target) * decay
+        return SurfaceTemperatures(**temperatures, updated_at=equilibrium.updated_at)
+
+    @staticmethod
+    def replay(
+        elapsed_seconds: np.ndarray,
+        equilibrium: np.ndarray,
+        time_constants: np.ndarray | None = None,
+        initial: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        平衡温度の履歴から表面温度の履歴をまとめて計算するメソッド。
+
+        各時点の温度は、直前の時点からadvanceで進めた場合と同じ値になります。
+        漸化式 T[k] = a[k] * T[k-1] + (1 - a[k]) * T_eq[k] を累積積と累積和で解き、
+        減衰率の累積積がアンダーフローしないように、累積の減衰が一定量を超えるごとに区切って計算します。
+
+        Args:
+            elapsed_seconds (np.ndarray): 各時点の直前の時点からの経過時間（秒）。先頭の値は使わない
+            equilibrium (np.ndarray): 各時点の平衡温度（時点×表面の2次元配列、または1次元配列）
+            time_constants (np.ndarray | None): 表面ごとの時定数（秒）。Noneの場合は設定の値
+            initial (np.ndarray | None): 先頭の時点の表面温度。Noneの場合は先頭の平衡温度
+
+        Returns:
+            np.ndarray: 各時点の表面温度（equilibriumと同じ形）
+        """
+        equilibrium = np.asarray(equilibrium, dtype=float)
+        columns = equilibrium.reshape(equilibrium.shape[0], -1)
+        if time_constants is None:
+            time_constants = SurfaceTemperatureModel.get_time_constants()
+        time_constants = np.broadcast_to(
+            np.asarray(time_constants, dtype=float), columns.shape[1:]
+        )
+        initial = columns[0] if initial is None else np.broadcast_to(initial, columns.shape[1:])
+
+        elapsed_seconds = np.asarray(elapsed_seconds, dtype=float).copy()
+        elapsed_seconds[0] = 0.0
+        reset_seconds = thermal_preference.surface_model.reset_after_hours * 3600
+        # advanceと同じく、経過時間が負または上限を超えた時点では平衡温度に戻す
+        reset = (elapsed_seconds < 0) | (elapsed_seconds > reset_seconds)
+
+        result = np.empty(columns.shape)
+        for column in range(columns.shape[1]):
+            log_decay = np.where(
+                reset,
+                SurfaceTemperatureModel._MIN_LOG_DECAY,
+                np.maximum(
+                    -elapsed_seconds / time_constants[column],
+                    SurfaceTemperatureModel._MIN_LOG_DECAY,
+                ),
+            )
+            decay = np.exp(log_decay)
+            forcing = (1 - decay) * columns[:, column]
+            cumulative_log_decay = np.cumsum(log_decay)
+
+            # 累積の減衰が_MIN_LOG_DECAYを超えるごとに区切り、区間の先頭を基準に累積積を計算する
+            segments = np.floor(cumulative_log_decay / SurfaceTemperatureModel._MIN_LOG_DECAY)
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(segments)) + 1))
+            ends = np.append(starts[1:], columns.shape[0])
+            previous = initial[column]
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                base = cumulative_log_decay[start - 1] if start > 0 else 0.0
+                relative = cumulative_log_decay[start:end] - base
+                values = np.exp(relative) * (
+                    previous + np.cumsum(np.exp(-relative) * forcing[start:end])
+                )
+                result[start:end, column] = values
+                previous = values[-1]
+
+        return result.reshape(equilibrium.shape)
+
+    @staticmethod
+    def fit_time_constant(
+        elapsed_seconds: np.ndarray,
+        equilibrium: np.ndarray,
+        observed: np.ndarray,
+        lower_hours: float = 0.1,
+        upper_hours: float = 48.0,
+        tolerance: float = 0.001,
+    ) -> float:
+        """
+        実測した表面温度の履歴に最もよく合う時定数を求めるメソッド。
+
+        replayで計算した温度と実測値の二乗誤差が最小になる時定数を、
+        時定数の対数について黄金分割探索で求めます。先頭の時点は実測値から計算を始めます。
+
+        Args:
+            elapsed_seconds (np.ndarray): 各時点の直前の時点からの経過時間（秒）
+            equilibrium (np.ndarray): 各時点の平衡温度
+            observed (np.ndarray): 各時点の実測した表面温度
+            lower_hours (float): 探索する時定数の下限（時間）
+            upper_hours (float): 探索する時定数の上限（時間）
+            tolerance (float): 時定数の対数の許容誤差
+
+        Returns:
+            float: 時定数（時間）
+        """
+        observed = np.asarray(observed, dtype=float)
+
+        def squared_error(log_hours: float) -> float:
+            replayed = SurfaceTemperatureModel.replay(
+                elapsed_seconds,
+                equilibrium,
+                time_constants=math.exp(log_hours) * 3600,
+                initial=observed[0],
+            )
+            return float(np.sum((replayed - observed) ** 2))
+
+        ratio = (math.sqrt(5) - 1) / 2
+        lower = math.log(lower_hours)
+        upper = math.log(upper_hours)
+        left = upper - ratio * (upper - lower)
+        right = lower + ratio * (upper - lower)
+        left_error = squared_error(left)
+        right_error = squared_error(right)
+        while upper - lower > tolerance:
+            if left_error <= right_error:
+                upper, right, right_error = right, left, left_error
+                left = upper - ratio * (upper - lower)
+                left_error = squared_error(left)
+            else:
+                lower, left, left_error = left, right, right_error
+                right = lower + ratio * (upper - lower)
+                right_error = squared_error(right)
+
+        return math.exp((lower + upper) / 2)
+
+    @staticmethod
+    def load_state(path: str) -> SurfaceTemperatures | None:
+        """
+        保存した表面温度を読み込むメソッド。
+
+        Returns:
+            SurfaceTemperatures | None: 前回の表面温度。読み込めない場合はNone
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != SurfaceTemperatureModel._FILE_VERSION:
+            return None
+        return SurfaceTemperatures(
+            wall=data["wall"],
+            ceiling=data["ceiling"],
+            floor=data["floor"],
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+        )
+
+    @staticmethod
+    def save_state(path: str, state: SurfaceTemperatures):
+        """表面温度をファイルに保存するメソッド。"""
+        data = {
+            "version": SurfaceTemperatureModel._FILE_VERSION,
+            "wall": state.wall,
+            "ceiling": state.ceiling,
+            "floor": state.floor,
+            "updated_at": state.updated_at.isoformat(),
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 書き込み途中のファイルを読まないように、一時ファイルから置き換える
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
@@ -1,12 +1,19 @@
-from datetime import time
+import atexit
+import warnings
+from datetime import datetime, time
 
-from pythermalcomfort.models import pmv_ppd
-from pythermalcomfort.utilities import clo_dynamic, v_relative
+import numpy as np
 
 from settings import thermal_preference
 from shared.dataclass.comfort_factors import ComfortFactors
 from shared.dataclass.home_sensor import HomeSensor
 from shared.dataclass.pmv_result import PMVResult
+from shared.dataclass.surface_temperatures import SurfaceTemperatures
+from util.pmv_cache import PMVCache
+from util.pmv_kernel import PMVKernel
+from util.pmv_table import PMVTable
+from util.root_finder import RootFinder
+from util.surface_temperature_model import SurfaceTemperatureModel
 from util.time_helper import TimeHelper
 
 
@@ -15,8 +22,13 @@ class ThermalComfort:
 
     Attributes:
         thermal_settings (ThermalPropertiesSettings): 熱特性設定
+        _pmv_cache (PMVCache or None): PMV計算結果のキャッシュ。初回の計算時に生成されます。
+        _pmv_table (PMVTable or None): 事前計算したPMVの表。表を使う設定の場合に初回の計算時に読み込みます。
     """
 
+    _pmv_cache: PMVCache | None = None
+    _pmv_table: PMVTable | None = None
+
     @staticmethod
     def calculate_pmv(
         home_sensor: HomeSensor,
@@ -47,12 +59,500 @@ class ThermalComfort:
         # 床の温度を取得（主センサーから）
         floor_temperature = home_sensor.main.air_quality.temperature
 
+        # 定常状態の壁、天井、床の内部表面温度を計算
+        surface_temperatures = ThermalComfort.calculate_steady_surface_temperatures(
+            outdoor_temperature, floor_temperature, ceiling_temperature
+        )
+
+        # 表面の熱容量による遅れを考慮する場合は、前回の表面温度から定常状態の温度に近づける
+        if thermal_preference.surface_model.enabled:
+            surface_temperatures = ThermalComfort._advance_surface_temperatures(
+                surface_temperatures
+            )
+        wall_surface_temp = surface_temperatures.wall
+        ceiling_surface_temp = surface_temperatures.ceiling
+        floor_surface_temp = surface_temperatures.floor
+
+        # 壁、天井、床の表面温度から平均放射温度を計算
+        mean_radiant_temp = (wall_surface_temp + ceiling_surface_temp + floor_surface_temp) / 3
+
+        # ドライバルブ温度（室温）を取得
+        dry_bulb_temp = home_sensor.average_indoor_temperature
+
+        # 湿度を取得
+        humidity = home_sensor.average_indoor_humidity
+
+        # 相対空気速度を計算（風速とメタボリック消費量に基づいて補正）
+        relative_air_speed = PMVKernel.v_relative(wind_speed, comfort_factors.met)
+
+        # 動的な衣服の熱抵抗を計算（活動量と衣服による熱抵抗の変化を考慮）
+        dynamic_clothing_insulation = PMVKernel.clo_dynamic(
+            comfort_factors.clo, comfort_factors.met
+        )
+
+        # PMVとPPDを計算
+        pmv, ppd = ThermalComfort.solve_pmv_ppd(
+            dry_bulb_temp,  # ドライバルブ温度
+            mean_radiant_temp,  # 平均放射温度
+            relative_air_speed.item(0),  # 相対空気速度
+            humidity,  # 湿度
+            comfort_factors.met,  # メタボリックエネルギー消費量
+            dynamic_clothing_insulation.item(0),  # 動的な衣服の熱抵抗
+        )
+
+        pmv_result = PMVResult(
+            pmv=pmv,  # PMV値（予測平均投票）
+            ppd=ppd,  # PPD値（不快感を示す指標）
+            clo=dynamic_clothing_insulation.item(0),  # 動的衣服熱抵抗（clo）
+            air=relative_air_speed.item(0),  # 相対空気速度
+            met=comfort_factors.met,  # メタボリックエネルギー消費量
+            wall=wall_surface_temp,  # 壁の内部表面温度
+            ceiling=ceiling_surface_temp,  # 天井の内部表面温度
+            floor=floor_surface_temp,  # 床の内部表面温度
+            mean_radiant_temperature=mean_radiant_temp,  # 平均放射温度
+            dry_bulb_temperature=dry_bulb_temp,  # ドライバルブ温度
+            relative_air_speed=relative_air_speed.item(0),  # 相対空気速度
+            dynamic_clothing_insulation=dynamic_clothing_insulation.item(0),  # 動的衣服熱抵抗
+        )
+
+        # PMV計算結果をPMVResultオブジェクトとして返す
+        return pmv_result
+
+    @staticmethod
+    def calculate_neutral_temperature(
+        humidity: float | np.ndarray,
+        relative_air_speed: float | np.ndarray,
+        met: float | np.ndarray,
+        dynamic_clothing_insulation: float | np.ndarray,
+        mean_radiant_temperature: float | np.ndarray,
+        dry_bulb_temperature: float | np.ndarray,
+        target_pmv: float | np.ndarray = 0.0,
+        lower_temperature: float = 10.0,
+        upper_temperature: float = 40.0,
+        tolerance: float = 0.001,
+    ) -> np.ndarray:
+        """目標のPMVになる室温（乾球温度）を逆算するメソッド。
+
+        平均放射温度は、現在の室温での値から室温の変化に追従して変化するものとして扱います。
+        引数は配列で渡すことができ、すべての条件・目標値の組み合わせをまとめて計算します。
+
+        相対風速が0.1m/sを超える場合の冷却効果（SETの反復計算）は1件あたり数msかかるため、
+        探索の評価ごとには計算せず、現在の室温での冷却効果で一度解き、解の室温での冷却効果で解き直します。
+        事前計算した表で計算する設定の場合は、冷却効果を含めた表の値でそのまま解きます。
+
+        Args:
+            humidity (float | np.ndarray): 相対湿度（%）
+            relative_air_speed (float | np.ndarray): 相対風速（m/s）
+            met (float | np.ndarray): 代謝量
+            dynamic_clothing_insulation (float | np.ndarray): 動的な衣服の熱抵抗
+            mean_radiant_temperature (float | np.ndarray): 現在の平均放射温度
+            dry_bulb_temperature (float | np.ndarray): 現在の室温
+            target_pmv (float | np.ndarray): 目標のPMV。デフォルトは0（中立）
+            lower_temperature (float): 探索する室温の下限
+            upper_temperature (float): 探索する室温の上限
+            tolerance (float): 室温の許容誤差
+
+        Returns:
+            np.ndarray: 目標のPMVになる室温。探索範囲内に解がない場合はNaN
+        """
+        arrays = np.broadcast_arrays(
+            *(
+                np.asarray(value, dtype=float)
+                for value in (
+                    humidity,
+                    relative_air_speed,
+                    met,
+                    dynamic_clothing_insulation,
+                    mean_radiant_temperature,
+                    dry_bulb_temperature,
+                    target_pmv,
+                )
+            )
+        )
+        shape = arrays[0].shape
+        humidity, relative_air_speed, met, clo, mrt, tdb, target_pmv = (
+            array.ravel() for array in arrays
+        )
+        sensitivity = ThermalComfort.calculate_mean_radiant_temperature_sensitivity()
+        use_table = thermal_preference.pmv_solver.backend == "table"
+        cooling = (
+            None
+            if use_table
+            else ThermalComfort._calculate_cooling_effect(
+                tdb, mrt, relative_air_speed, humidity, met, clo
+            )
+        )
+
+        def pmv_difference(temperature: np.ndarray, index: np.ndarray) -> np.ndarray:
+            # 室温に追従する平均放射温度でPMVを計算し、目標値との差を返す
+            radiant_temperature = mrt[index] + sensitivity * (temperature - tdb[index])
+            return (
+                ThermalComfort._calculate_pmv_unrounded(
+                    temperature,
+                    radiant_temperature,
+                    relative_air_speed[index],
+                    humidity[index],
+                    met[index],
+                    clo[index],
+                    None if cooling is None else cooling[index],
+                )
+                - target_pmv[index]
+            )
+
+        def solve() -> np.ndarray:
+            return RootFinder.find_bracketed_root(
+                pmv_difference,
+                np.full(tdb.size, lower_temperature),
+                np.full(tdb.size, upper_temperature),
+                tolerance=tolerance,
+            )
+
+        neutral_temperature = solve()
+        if cooling is not None and np.any(cooling > 0):
+            # 解の室温での冷却効果で解き直す（解がない条件は現在の室温での冷却効果のまま）
+            solved = np.isfinite(neutral_temperature)
+            cooling[solved] = ThermalComfort._calculate_cooling_effect(
+                neutral_temperature[solved],
+                mrt[solved] + sensitivity * (neutral_temperature[solved] - tdb[solved]),
+                relative_air_speed[solved],
+                humidity[solved],
+                met[solved],
+                clo[solved],
+            )
+            neutral_temperature = solve()
+        return neutral_temperature.reshape(shape)
+
+    @staticmethod
+    def _calculate_pmv_unrounded(
+        tdb: np.ndarray,
+        tr: np.ndarray,
+        vr: np.ndarray,
+        rh: np.ndarray,
+        met: np.ndarray,
+        clo: np.ndarray,
+        cooling: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """ASHRAE基準のPMVを丸めずに計算するメソッド。
+
+        pmv_ppdは結果を小数第2位に丸めるため、逆算では丸める前の値を使います。
+        相対風速が0.1m/sを超える場合は、pmv_ppdと同じく冷却効果で温度を補正します。
+        coolingを渡した場合は、冷却効果を計算せずにその値で補正します（表で計算する設定では使いません）。
+        """
+        backend = thermal_preference.pmv_solver.backend
+        if backend == "native":
+            return PMVKernel.calculate_pmv(tdb, tr, vr, rh, met, clo, cooling=cooling)
+        if backend == "table":
+            return ThermalComfort._get_pmv_table().calculate_pmv(tdb, tr, vr, rh, met, clo)
+
+        # 使わない設定では読み込まないように、使う時点で読み込む
+        from pythermalcomfort.models.pmv_ppd import _pmv_ppd_optimized
+
+        tdb, tr, vr, rh, met, clo = np.broadcast_arrays(tdb, tr, vr, rh, met, clo)
+        if cooling is None:
+            cooling = ThermalComfort._calculate_cooling_effect(tdb, tr, vr, rh, met, clo)
+        return _pmv_ppd_optimized(
+            tdb - cooling, tr - cooling, np.where(cooling > 0, 0.1, vr), rh, met, clo, 0
+        )
+
+    @staticmethod
+    def _calculate_cooling_effect(
+        tdb: np.ndarray,
+        tr: np.ndarray,
+        vr: np.ndarray,
+        rh: np.ndarray,
+        met: np.ndarray,
+        clo: np.ndarray,
+    ) -> np.ndarray:
+        """設定された計算方法で風による冷却効果（度）を計算するメソッド。相対風速が0.1m/s以下の場合は0です。"""
+        if thermal_preference.pmv_solver.backend != "pythermalcomfort":
+            return PMVKernel.cooling_effect(tdb, tr, vr, rh, met, clo)
+
+        # 使わない設定では読み込まないように、使う時点で読み込む
+        from pythermalcomfort.models.pmv_ppd import cooling_effect
+
+        tdb, tr, vr, rh, met, clo = np.broadcast_arrays(tdb, tr, vr, rh, met, clo)
+        cooling = np.zeros(tdb.shape)
+        elevated = vr > 0.1
+        if np.any(elevated):
+            # 冷却効果を計算できない入力では警告が出るが、pmv_ppdと同じく0として扱う
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                cooling[elevated] = [
+                    cooling_effect(*inputs)
+                    for inputs in zip(
+                        tdb[elevated],
+                        tr[elevated],
+                        vr[elevated],
+                        rh[elevated],
+                        met[elevated],
+                        clo[elevated],
+                    )
+                ]
+        return cooling
+
+    @staticmethod
+    def calculate_pmv_ppd(
+        tdb: float | np.ndarray,
+        tr: float | np.ndarray,
+        vr: float | np.ndarray,
+        rh: float | np.ndarray,
+        met: float | np.ndarray,
+        clo: float | np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """設定された計算方法でPMVとPPDを計算するメソッド。
+
+        引数と戻り値はpythermalcomfortのpmv_ppd（ASHRAE基準）と同じ形式で、配列をまとめて計算できます。
+
+        Args:
+            tdb (float | np.ndarray): 乾球温度
+            tr (float | np.ndarray): 平均放射温度
+            vr (float | np.ndarray): 相対風速
+            rh (float | np.ndarray): 相対湿度
+            met (float | np.ndarray): 代謝量
+            clo (float | np.ndarray): 動的な衣服の熱抵抗
+
+        Returns:
+            dict: 小数第2位に丸めたPMV（pmv）と小数第1位に丸めたPPD（ppd）
+        """
+        backend = thermal_preference.pmv_solver.backend
+        if backend == "native":
+            return PMVKernel.calculate_pmv_ppd(tdb, tr, vr, rh, met, clo)
+        if backend == "table":
+            return ThermalComfort._get_pmv_table().calculate_pmv_ppd(tdb, tr, vr, rh, met, clo)
+
+        # 使わない設定では読み込まないように、使う時点で読み込む
+        from pythermalcomfort.models import pmv_ppd
+
+        return pmv_ppd(
+            tdb=tdb,
+            tr=tr,
+            vr=vr,
+            rh=rh,
+            met=met,
+            clo=clo,
+            limit_inputs=False,
+            standard="ASHRAE",  # 計算基準（ASHRAE）
+        )
+
+    @staticmethod
+    def _get_pmv_table() -> PMVTable:
+        """事前計算したPMVの表を返すメソッド。初回の呼び出し時に読み込みます。"""
+        if ThermalComfort._pmv_table is None:
+            ThermalComfort._pmv_table = PMVTable(thermal_preference.pmv_solver.table_path)
+        return ThermalComfort._pmv_table
+
+    @staticmethod
+    def get_pmv_cache() -> PMVCache | None:
+        """PMV計算結果のキャッシュを返すメソッド。
+
+        初回の呼び出し時に設定からキャッシュを生成し、保存先が指定されている場合は
+        プロセス終了時に計算結果を保存します。
+
+        Returns:
+            PMVCache | None: キャッシュ。キャッシュを使用しない設定の場合はNone
+        """
+        cache_preference = thermal_preference.pmv_cache
+        if not cache_preference.enabled:
+            return None
+
+        if ThermalComfort._pmv_cache is None:
+            ThermalComfort._pmv_cache = PMVCache(
+                max_size=cache_preference.max_size,
+                namespace=thermal_preference.pmv_solver.backend,
+                persist_path=cache_preference.persist_path,
+            )
+            if cache_preference.persist_path:
+                atexit.register(ThermalComfort._pmv_cache.save)
+        return ThermalComfort._pmv_cache
+
+    @staticmethod
+    def solve_pmv_ppd(
+        tdb: float, tr: float, vr: float, rh: float, met: float, clo: float
+    ) -> tuple[float, float]:
+        """1件の条件のPMVとPPDを、設定された計算方法とキャッシュで計算するメソッド。
+
+        キャッシュを使用する設定の場合は、入力値をセンサーの分解能で丸めてキーにし、
+        同じ入力の計算結果はキャッシュから返します。使用しない場合は入力値をそのまま使って計算します。
+
+        Args:
+            tdb (float): 乾球温度
+            tr (float): 平均放射温度
+            vr (float): 相対風速
+            rh (float): 相対湿度
+            met (float): 代謝量
+            clo (float): 動的な衣服の熱抵抗
+
+        Returns:
+            tuple[float, float]: PMVとPPD
+        """
+        cache = ThermalComfort.get_pmv_cache()
+        if cache is None:
+            return ThermalComfort._calculate_pmv_ppd(tdb, tr, vr, rh, met, clo)
+        key = PMVCache.quantize(tdb, tr, vr, rh, met, clo)
+        return cache.get_or_calculate(key, ThermalComfort._calculate_pmv_ppd)
+
+    @staticmethod
+    def _calculate_pmv_ppd(
+        tdb: float, tr: float, vr: float, rh: float, met: float, clo: float
+    ) -> tuple[float, float]:
+        """PMVとPPDを1件だけ計算するメソッド。"""
+        results = ThermalComfort.calculate_pmv_ppd(tdb, tr, vr, rh, met, clo)
+        return float(results["pmv"]), float(results["ppd"])
+
+    @staticmethod
+    def calculate_pmv_array(
+        outdoor_temperature: np.ndarray,
+        floor_temperature: np.ndarray,
+        ceiling_temperature: np.ndarray,
+        dry_bulb_temperature: np.ndarray,
+        humidity: np.ndarray,
+        met: np.ndarray,
+        relative_air_speed: np.ndarray,
+        dynamic_clothing_insulation: np.ndarray,
+        current_times: list[datetime],
+        surface_state: SurfaceTemperatures | None = None,
+    ) -> tuple[dict[str, np.ndarray], SurfaceTemperatures | None]:
+        """時系列の測定のPMVを配列でまとめて計算するメソッド。
+
+        calculate_pmvを時刻の順に1件ずつ呼び出した場合と同じ値を計算します。
+        表面温度の過渡応答モデルが有効な場合は、保存した状態ファイルではなく
+        surface_stateから続けて計算し、最後の表面温度を返します。
+
+        Args:
+            outdoor_temperature (np.ndarray): 外気温度
+            floor_temperature (np.ndarray): 床付近の室温
+            ceiling_temperature (np.ndarray): 天井付近の室温
+            dry_bulb_temperature (np.ndarray): 室内の平均気温
+            humidity (np.ndarray): 室内の平均湿度
+            met (np.ndarray): 代謝量
+            relative_air_speed (np.ndarray): 相対風速
+            dynamic_clothing_insulation (np.ndarray): 動的な衣服の熱抵抗
+            current_times (list[datetime]): 各測定の日時（現地時刻、昇順）
+            surface_state (SurfaceTemperatures | None): 直前の時点の表面温度
+
+        Returns:
+            tuple: PMV・PPD・壁・天井・床・平均放射温度の配列の辞書と、最後の時点の表面温度
+                （過渡応答モデルが無効な場合はNone）
+        """
+        surface_temperatures = ThermalComfort.calculate_steady_surface_temperatures_array(
+            outdoor_temperature, floor_temperature, ceiling_temperature, current_times
+        )
+
+        last_surface_state = None
+        if thermal_preference.surface_model.enabled:
+            timestamps = np.array([current_time.timestamp() for current_time in current_times])
+            if surface_state is not None:
+                # 直前の時点を先頭に加え、その表面温度から進める
+                elapsed_seconds = np.diff(
+                    timestamps, prepend=surface_state.updated_at.timestamp()
+                )
+                equilibrium = np.vstack(
+                    (np.zeros((1, surface_temperatures.shape[1])), surface_temperatures)
+                )
+                initial = np.array(
+                    [
+                        getattr(surface_state, surface)
+                        for surface in SurfaceTemperatureModel.SURFACES
+                    ]
+                )
+                surface_temperatures = SurfaceTemperatureModel.replay(
+                    np.concatenate(([0.0], elapsed_seconds)), equilibrium, initial=initial
+                )[1:]
+            else:
+                surface_temperatures = SurfaceTemperatureModel.replay(
+                    np.diff(timestamps, prepend=timestamps[0]), surface_temperatures
+                )
+            last_surface_state = SurfaceTemperatures(
+                wall=float(surface_temperatures[-1, 0]),
+                ceiling=float(surface_temperatures[-1, 1]),
+                floor=float(surface_temperatures[-1, 2]),
+                updated_at=current_times[-1],
+            )
+
+        wall, ceiling, floor = surface_temperatures.T
+        mean_radiant_temperature = (wall + ceiling + floor) / 3
+
+        tdb = np.asarray(dry_bulb_temperature, dtype=float)
+        tr = mean_radiant_temperature
+        vr = np.asarray(relative_air_speed, dtype=float)
+        rh = np.asarray(humidity, dtype=float)
+        met = np.asarray(met, dtype=float)
+        clo = np.asarray(dynamic_clothing_insulation, dtype=float)
+        if ThermalComfort.get_pmv_cache() is not None:
+            # solve_pmv_ppdと同じく、キャッシュを使用する場合は入力をセンサーの分解能で丸めてから計算する
+            tdb, tr, vr, rh = np.round(tdb, 1), np.round(tr, 1), np.round(vr, 2), np.round(rh)
+            met, clo = np.round(met, 2), np.round(clo, 2)
+        results = ThermalComfort.calculate_pmv_ppd(tdb=tdb, tr=tr, vr=vr, rh=rh, met=met, clo=clo)
+        return {
+            "pmv": np.asarray(results["pmv"], dtype=float),
+            "ppd": np.asarray(results["ppd"], dtype=float),
+            "wall": wall,
+            "ceiling": ceiling,
+            "floor": floor,
+            "mean_radiant_temperature": mean_radiant_temperature,
+        }, last_surface_state
+
+    @staticmethod
+    def calculate_mean_radiant_temperature_sensitivity() -> float:
+        """室温の変化に対する平均放射温度の変化率を計算するメソッド。
+
+        壁・天井・床の内部表面温度は室温に対して線形なので、
+        室温が1度変化したときの平均放射温度の変化量は家のスペックだけで決まります。
+
+        Returns:
+            float: 室温1度あたりの平均放射温度の変化量
+        """
+        home_spec = thermal_preference.home_spec
+
+        # 壁の複合熱伝導率
+        composite_thermal_conductivity = (
+            home_spec.window_to_wall_ratio * home_spec.window_thermal_conductivity
+            + (1 - home_spec.window_to_wall_ratio) * home_spec.wall_thermal_conductivity
+        )
+
+        # 各表面の室温に対する変化率
+        wall = 1 - home_spec.wall_surface_heat_transfer_resistance * composite_thermal_conductivity
+        ceiling = (
+            1
+            - home_spec.ceiling_surface_heat_transfer_resistance
+            * home_spec.ceiling_thermal_conductivity
+        )
+        floor = (
+            1
+            - home_spec.floor_surface_heat_transfer_resistance
+            * home_spec.floor_thermal_conductivity
+            * home_spec.temp_diff_coefficient_under_floor
+        )
+
+        return (wall + ceiling + floor) / 3
+
+    @staticmethod
+    def calculate_steady_surface_temperatures(
+        outdoor_temperature: float,
+        floor_temperature: float,
+        ceiling_temperature: float,
+        current_time: datetime | None = None,
+    ) -> SurfaceTemperatures:
+        """定常状態の壁、天井、床の内部表面温度を計算するメソッド。
+
+        Args:
+            outdoor_temperature (float): 外気温度
+            floor_temperature (float): 床付近の室温
+            ceiling_temperature (float): 天井付近の室温
+            current_time (datetime | None): 計算する日時。Noneの場合は現在時刻
+
+        Returns:
+            SurfaceTemperatures: 定常状態の各表面の温度
+        """
+        if current_time is None:
+            current_time = TimeHelper.get_current_time()
+
         # 屋根の表面温度を計算（外気温度を元に計算）
         roof_surface_temp = ThermalComfort._calculate_roof_surface_temperature(outdoor_temperature)
 
         # 西側外壁の表面温度を計算（外気温度に基づく計算）
         west_wall_surface_temp = ThermalComfort._calculate_west_wall_temperature(
-            outdoor_temperature
+            outdoor_temperature, current_time
         )
 
         # 壁の内部表面温度を計算（西側外壁温度と床温度を元に計算）
@@ -84,50 +584,105 @@ class ThermalComfort:
             thermal_preference.home_spec.floor_surface_heat_transfer_resistance,  # 床の表面熱伝達抵抗
         )
 
-        # 壁、天井、床の表面温度から平均放射温度を計算
-        mean_radiant_temp = (wall_surface_temp + ceiling_surface_temp + floor_surface_temp) / 3
+        return SurfaceTemperatures(
+            wall=wall_surface_temp,
+            ceiling=ceiling_surface_temp,
+            floor=floor_surface_temp,
+            updated_at=current_time,
+        )
 
-        # ドライバルブ温度（室温）を取得
-        dry_bulb_temp = home_sensor.average_indoor_temperature
+    @staticmethod
+    def calculate_steady_surface_temperatures_array(
+        outdoor_temperature: np.ndarray,
+        floor_temperature: np.ndarray,
+        ceiling_temperature: np.ndarray,
+        current_times: list[datetime],
+    ) -> np.ndarray:
+        """定常状態の壁、天井、床の内部表面温度を配列でまとめて計算するメソッド。
 
-        # 湿度を取得
-        humidity = home_sensor.average_indoor_humidity
+        各要素はcalculate_steady_surface_temperaturesで1件ずつ計算した値と同じになります。
 
-        # 相対空気速度を計算（風速とメタボリック消費量に基づいて補正）
-        relative_air_speed = v_relative(v=wind_speed, met=comfort_factors.met)
+        Args:
+            outdoor_temperature (np.ndarray): 外気温度
+            floor_temperature (np.ndarray): 床付近の室温
+            ceiling_temperature (np.ndarray): 天井付近の室温
+            current_times (list[datetime]): 各要素の日時（現地時刻）
 
-        # 動的な衣服の熱抵抗を計算（活動量と衣服による熱抵抗の変化を考慮）
-        dynamic_clothing_insulation = clo_dynamic(clo=comfort_factors.clo, met=comfort_factors.met)
+        Returns:
+            np.ndarray: 壁・天井・床の表面温度（要素×表面の2次元配列）
+        """
+        outdoor_temperature = np.asarray(outdoor_temperature, dtype=float)
+        floor_temperature = np.asarray(floor_temperature, dtype=float)
+        ceiling_temperature = np.asarray(ceiling_temperature, dtype=float)
+        home_spec = thermal_preference.home_spec
+
+        # 西日が当たる時間帯かどうか
+        is_afternoon = np.array(
+            [time(13, 0) <= current_time.time() < time(18, 0) for current_time in current_times],
+            dtype=bool,
+        )
 
-        # PMVとPPDを計算
-        results = pmv_ppd(
-            tdb=dry_bulb_temp,  # ドライバルブ温度
-            tr=mean_radiant_temp,  # 平均放射温度
-            vr=relative_air_speed,  # 相対空気速度
-            rh=humidity,  # 湿度
-            met=comfort_factors.met,  # メタボリックエネルギー消費量
-            clo=dynamic_clothing_insulation,  # 動的な衣服の熱抵抗
-            limit_inputs=False,
-            standard="ASHRAE",  # 計算基準（ASHRAE）
+        # 屋根と西側外壁の表面温度（外気温度の区分ごとの設定値）
+        thresholds = [outdoor_temperature >= limit for limit in (40, 35, 30, 25)]
+        roof = thermal_preference.roof_surface_temperatures
+        roof_surface_temp = np.select(
+            thresholds,
+            [roof.over_25, roof.over_35, roof.over_30, roof.over_40],
+            default=outdoor_temperature,
+        )
+        wall = thermal_preference.wall_surface_temperatures
+        west_wall_surface_temp = np.where(
+            is_afternoon,
+            np.select(
+                thresholds,
+                [wall.over_25, wall.over_30, wall.over_35, wall.over_40],
+                default=outdoor_temperature,
+            ),
+            outdoor_temperature,
         )
 
-        pmv_result = PMVResult(
-            pmv=float(results["pmv"]),  # PMV値（予測平均投票）
-            ppd=float(results["ppd"]),  # PPD値（不快感を示す指標）
-            clo=dynamic_clothing_insulation.item(0),  # 動的衣服熱抵抗（clo）
-            air=relative_air_speed.item(0),  # 相対空気速度
-            met=comfort_factors.met,  # メタボリックエネルギー消費量
-            wall=wall_surface_temp,  # 壁の内部表面温度
-            ceiling=ceiling_surface_temp,  # 天井の内部表面温度
-            floor=floor_surface_temp,  # 床の内部表面温度
-            mean_radiant_temperature=mean_radiant_temp,  # 平均放射温度
-            dry_bulb_temperature=dry_bulb_temp,  # ドライバルブ温度
-            relative_air_speed=relative_air_speed.item(0),  # 相対空気速度
-            dynamic_clothing_insulation=dynamic_clothing_insulation.item(0),  # 動的衣服熱抵抗
+        wall_surface_temp = ThermalComfort._calculate_wall_surface_temperature(
+            west_wall_surface_temp,
+            floor_temperature,
+            home_spec.wall_thermal_conductivity,
+            home_spec.window_thermal_conductivity,
+            home_spec.window_to_wall_ratio,
+            home_spec.wall_surface_heat_transfer_resistance,
+        )
+        ceiling_surface_temp = ThermalComfort._calculate_interior_surface_temperature(
+            roof_surface_temp,
+            ceiling_temperature,
+            home_spec.ceiling_thermal_conductivity,
+            home_spec.ceiling_surface_heat_transfer_resistance,
+        )
+        floor_surface_temp = ThermalComfort._calculate_interior_surface_temperature(
+            (floor_temperature + outdoor_temperature)
+            * (1 - home_spec.temp_diff_coefficient_under_floor),
+            floor_temperature,
+            home_spec.floor_thermal_conductivity,
+            home_spec.floor_surface_heat_transfer_resistance,
         )
 
-        # PMV計算結果をPMVResultオブジェクトとして返す
-        return pmv_result
+        return np.column_stack((wall_surface_temp, ceiling_surface_temp, floor_surface_temp))
+
+    @staticmethod
+    def _advance_surface_temperatures(
+        surface_temperatures: SurfaceTemperatures,
+    ) -> SurfaceTemperatures:
+        """前回の表面温度を定常状態の温度に近づけ、結果を次回のために保存するメソッド。
+
+        Args:
+            surface_temperatures (SurfaceTemperatures): 定常状態の各表面の温度
+
+        Returns:
+            SurfaceTemperatures: 現在の各表面の温度
+        """
+        state_path = thermal_preference.surface_model.state_path
+        surface_temperatures = SurfaceTemperatureModel.advance(
+            SurfaceTemperatureModel.load_state(state_path), surface_temperatures
+        )
+        SurfaceTemperatureModel.save_state(state_path, surface_temperatures)
+        return surface_temperatures
 
     @staticmethod
     def _calculate_interior_surface_temperature(
@@ -195,9 +750,13 @@ class ThermalComfort:
         )
 
     @staticmethod
-    def _calculate_west_wall_temperature(outdoor_temperature) -> float:
+    def _calculate_west_wall_temperature(
+        outdoor_temperature, current_time: datetime | None = None
+    ) -> float:
         """外気温と時間に基づき西側外壁の表面温度を計算する"""
-        if not (time(13, 0) <= TimeHelper.get_current_time().time() < time(18, 0)):
+        if current_time is None:
+            current_time = TimeHelper.get_current_time()
+        if not (time(13, 0) <= current_time.time() < time(18, 0)):
             return outdoor_temperature
 
         if outdoor_temperature >= 40:
@@ -27,6 +27,18 @@ class TimeHelper:
             TimeHelper._now = datetime.now(LOCAL_TZ)
         return TimeHelper._now
 
+    @staticmethod
+    def set_current_time(now: datetime | None):
+        """
+        現在の日時情報を指定した日時に置き換えます。
+
+        記録したデータを再生する場合に、各サイクルの時刻を現在時刻として扱うために使います。
+
+        Args:
+            now (datetime | None): 現在時刻として扱う日時。Noneの場合は次の呼び出しで実際の時刻を取得します。
+        """
+        TimeHelper._now = now
+
     @staticmethod
     def parse_datetime_string(datetime_str):
         try:
@@ -0,0 +1,284 @@
+import bisect
+from datetime import datetime, time, timedelta
+
+from settings import app_preference, met_clo_preference
+from shared.dataclass.time_window import TimeWindow
+
+DAY_MICROSECONDS = 24 * 60 * 60 * 1_000_000
+WEEK_MICROSECONDS = 7 * DAY_MICROSECONDS
+WEEKDAYS = [0, 1, 2, 3, 4]
+WEEKENDS = [5, 6]
+
+
+class WeeklyCalendar:
+    """
+    設定ファイルの時間帯を1週間分の区間に変換し、現在有効な時間帯と次に切り替わる日時を求めるクラス。
+
+    すべての時間帯の開始・終了時刻を週の始め（月曜日0時）からのマイクロ秒で並べ、
+    有効な時間帯の組み合わせが変わる位置だけを区間の境界として保持します。
+    現在有効な時間帯と次の境界は、どちらも二分探索で求めます。
+
+    時間帯の名前:
+        awake: 起床時間（平日・休日）
+        meal.lunch, meal.dinner, meal.sleep_prep: 高温時の食事・就寝前の時間帯
+        heating.high_cost.{番号}, heating.low_cost.{番号}: 低温時の暖房の電気代の時間帯（平日のみ）
+        solar.heating_reduction: 太陽光利用による暖房抑制の時間帯
+        solar.active_hours: 太陽光パネルによる快適管理の時間帯
+        comfort_control.disabled.{曜日}, comfort_control.disabled.{曜日}.{番号}:
+            快適管理の無効期間（終日、または設定ファイルの番号の時間帯）
+
+    各時間帯の有効・無効の設定は含めないため、利用する側で確認します。
+    設定を置き換えた場合は、get()で自動的に変換し直します。
+    """
+
+    AWAKE = "awake"
+    MEALS = ("lunch", "dinner", "sleep_prep")
+    HEATING_REDUCTION = "solar.heating_reduction"
+    SOLAR_ACTIVE_HOURS = "solar.active_hours"
+
+    _calendar: "WeeklyCalendar | None" = None
+    _sources: tuple = ()
+
+    def __init__(self, windows: list[TimeWindow]):
+        """
+        Args:
+            windows (list[TimeWindow]): 時間帯のリスト
+        """
+        self.windows = windows
+
+        intervals = []
+        for window in windows:
+            start = WeeklyCalendar._time_to_microseconds(window.start_time)
+            end = WeeklyCalendar._time_to_microseconds(window.end_time) + window.include_end
+            # 終了時刻が開始時刻より前の時間帯は、元の比較と同じく常に無効
+            if end <= start:
+                continue
+            for weekday in set(window.weekdays):
+                offset = weekday * DAY_MICROSECONDS
+                intervals.append((offset + start, offset + end, window.name))
+
+        points = sorted({0, *(start for start, _, _ in intervals), *(end for _, end, _ in intervals)})
+        points = [point for point in points if point < WEEK_MICROSECONDS]
+
+        self.starts: list[int] = []
+        self.actives: list[frozenset[str]] = []
+        for point in points:
+            active = frozenset(name for start, end, name in intervals if start <= point < end)
+            # 有効な時間帯が変わらない境界は除く
+            if self.actives and self.actives[-1] == active:
+                continue
+            self.starts.append(point)
+            self.actives.append(active)
+
+    @staticmethod
+    def compile() -> "WeeklyCalendar":
+        """
+        現在の設定から変換し直すメソッド。
+
+        Returns:
+            WeeklyCalendar: 変換したカレンダー
+        """
+        WeeklyCalendar._sources = WeeklyCalendar._get_sources()
+        WeeklyCalendar._calendar = WeeklyCalendar(WeeklyCalendar.create_windows())
+        return WeeklyCalendar._calendar
+
+    @staticmethod
+    def get() -> "WeeklyCalendar":
+        """
+        変換済みのカレンダーを返すメソッド。時間帯の設定が置き換えられている場合は変換し直します。
+
+        Returns:
+            WeeklyCalendar: 変換したカレンダー
+        """
+        sources = WeeklyCalendar._get_sources()
+        if WeeklyCalendar._calendar is None or any(
+            source is not previous for source, previous in zip(sources, WeeklyCalendar._sources)
+        ):
+            return WeeklyCalendar.compile()
+        return WeeklyCalendar._calendar
+
+    @staticmethod
+    def _get_sources() -> tuple:
+        """時間帯を含む設定のインスタンスを返すメソッド。"""
+        return (
+            app_preference.weekday_awake_period,
+            app_preference.weekend_awake_period,
+            app_preference.comfort_control,
+            app_preference.comfort_control.solar_active_hours,
+            app_preference.comfort_control.disabled_periods,
+            met_clo_preference.high_temperature,
+            met_clo_preference.low_temperature,
+            met_clo_preference.solar_utilization,
+        )
+
+    @staticmethod
+    def create_windows() -> list[TimeWindow]:
+        """
+        設定ファイルの時間帯をTimeWindowのリストに変換するメソッド。
+
+        終了時刻を含むかどうかは、それぞれの時間帯を判定していた比較と同じにします。
+
+        Returns:
+            list[TimeWindow]: 時間帯のリスト
+        """
+        windows = [
+            TimeWindow(
+                name=WeeklyCalendar.AWAKE,
+                weekdays=WEEKDAYS,
+                start_time=app_preference.weekday_awake_period.start_time,
+                end_time=app_preference.weekday_awake_period.end_time,
+            ),
+            TimeWindow(
+                name=WeeklyCalendar.AWAKE,
+                weekdays=WEEKENDS,
+                start_time=app_preference.weekend_awake_period.start_time,
+                end_time=app_preference.weekend_awake_period.end_time,
+            ),
+        ]
+
+        # 高温時の食事・就寝前の時間帯
+        for meal in WeeklyCalendar.MEALS:
+            period = getattr(met_clo_preference.high_temperature.time, meal)
+            windows.append(
+                TimeWindow(
+                    name=f"meal.{meal}", start_time=period.start_time, end_time=period.end_time
+                )
+            )
+
+        # 低温時の暖房の電気代の時間帯（平日のみ）
+        heating = met_clo_preference.low_temperature.time.heating
+        for cost, periods in (("high_cost", heating.high_costs), ("low_cost", heating.low_costs)):
+            for index, period in enumerate(periods):
+                windows.append(
+                    TimeWindow(
+                        name=f"heating.{cost}.{index}",
+                        weekdays=WEEKDAYS,
+                        start_time=period.start_time,
+                        end_time=period.end_time,
+                    )
+                )
+
+        heating_reduction = met_clo_preference.solar_utilization.heating_reduction
+        windows.append(
+            TimeWindow(
+                name=WeeklyCalendar.HEATING_REDUCTION,
+                start_time=heating_reduction.start_time,
+                end_time=heating_reduction.end_time,
+            )
+        )
+        active_hours = app_preference.comfort_control.solar_active_hours
+        windows.append(
+            TimeWindow(
+                name=WeeklyCalendar.SOLAR_ACTIVE_HOURS,
+                start_time=active_hours.start_time,
+                end_time=active_hours.end_time,
+            )
+        )
+
+        # 快適管理の無効期間（曜日ごとに最初に一致する設定だけが判定に使われる）
+        weekdays = set()
+        for period in app_preference.comfort_control.disabled_periods:
+            if period.day in weekdays:
+                continue
+            weekdays.add(period.day)
+            if not period.times:
+                windows.append(
+                    TimeWindow(
+                        name=WeeklyCalendar.disabled_period_name(period.day),
+                        weekdays=[period.day],
+                        start_time=time.min,
+                        end_time=time.max,
+                    )
+                )
+            for index, time_range in enumerate(period.times):
+                windows.append(
+                    TimeWindow(
+                        name=WeeklyCalendar.disabled_period_name(period.day, index),
+                        weekdays=[period.day],
+                        start_time=time_range.start_time,
+                        end_time=time_range.end_time,
+                        include_end=False,
+                    )
+                )
+        return windows
+
+    @staticmethod
+    def disabled_period_name(weekday: int, index: int | None = None) -> str:
+        """
+        快適管理の無効期間の時間帯の名前を返すメソッド。
+
+        Args:
+            weekday (int): 曜日（月曜日が0）
+            index (int | None): 設定ファイルの時間帯の番号。終日無効の場合はNone
+
+        Returns:
+            str: 時間帯の名前
+        """
+        name = f"comfort_control.disabled.{weekday}"
+        return name if index is None else f"{name}.{index}"
+
+    @staticmethod
+    def _time_to_microseconds(value: time) -> int:
+        """時刻を0時からのマイクロ秒に変換するメソッド。"""
+        return (
+            (value.hour * 60 + value.minute) * 60 + value.second
+        ) * 1_000_000 + value.microsecond
+
+    @staticmethod
+    def _to_week_microseconds(current_datetime: datetime) -> int:
+        """日時を週の始め（月曜日0時）からのマイクロ秒に変換するメソッド。"""
+        return current_datetime.weekday() * DAY_MICROSECONDS + WeeklyCalendar._time_to_microseconds(
+            current_datetime.time()
+        )
+
+    def active_windows(self, current_datetime: datetime) -> frozenset[str]:
+        """
+        指定した日時に有効な時間帯の名前を返すメソッド。
+
+        Args:
+            current_datetime (datetime): 判定する日時
+
+        Returns:
+            frozenset[str]: 有効な時間帯の名前
+        """
+        index = bisect.bisect_right(
+            self.starts, WeeklyCalendar._to_week_microseconds(current_datetime)
+        )
+        return self.actives[index - 1]
+
+    def is_active(self, name: str, current_datetime: datetime) -> bool:
+        """
+        指定した時間帯が、指定した日時に有効かどうかを返すメソッド。
+
+        Args:
+            name (str): 時間帯の名前
+            current_datetime (datetime): 判定する日時
+
+        Returns:
+            bool: 有効な場合はTrue
+        """
+        return name in self.active_windows(current_datetime)
+
+    def next_transition(self, current_datetime: datetime) -> datetime | None:
+        """
+        指定した日時より後で、有効な時間帯の組み合わせが次に変わる日時を返すメソッド。
+
+        Args:
+            current_datetime (datetime): 基準の日時
+
+        Returns:
+            datetime | None: 次に変わる日時。時間帯が1つもない場合はNone
+        """
+        # 週の終わりと始めで有効な時間帯が同じ場合、月曜日0時は境界ではない
+        starts = self.starts
+        if len(self.actives) > 1 and self.actives[-1] == self.actives[0]:
+            starts = starts[1:]
+        if not starts or len(self.actives) == 1:
+            return None
+
+        position = WeeklyCalendar._to_week_microseconds(current_datetime)
+        index = bisect.bisect_right(starts, position)
+        next_position = (
+            starts[index] if index < len(starts) else starts[0] + WEEK_MICROSECONDS
+        )
+        return current_datetime + timedelta(microseconds=next_position - position)